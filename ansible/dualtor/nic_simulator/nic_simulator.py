@@ -47,6 +47,9 @@ SERVER_NIC_INTERFACE_PATTERN = r"nic-[\w-]+-\d+"
 
 # gRPC settings
 GRPC_TIMEOUT = 0.5
+GRPC_SET_DROP_TIMEOUT = 10
+# max number of concurrent calls from the mgmt server to the NiCs in one request
+GRPC_MGMT_CONCURRENCY = 64
 GRPC_SERVER_OPTIONS = [
     ('grpc.http2.min_ping_interval_without_data_ms', 1000),
     ('grpc.http2.max_ping_strikes',  0)
@@ -727,47 +730,94 @@ class NiCServer(nic_simulator_grpc_service_pb2_grpc.DualToRActiveServicer):
 class MgmtServer(nic_simulator_grpc_mgmt_service_pb2_grpc.DualTorMgmtServiceServicer):
     """Management gRPC server to interact with sonic-mgmt."""
 
-    def __init__(self, binding_address, binding_port):
+    def __init__(self, binding_address, binding_port, concurrency=GRPC_MGMT_CONCURRENCY):
         self.binding_address = binding_address
         self.binding_port = binding_port
+        self.concurrency = concurrency
         self.client_stubs = {}
+        self.client_stubs_lock = threading.Lock()
         self.server = None
 
     def _get_client_stub(self, nic_address):
-        if nic_address in self.client_stubs:
-            client_stub = self.client_stubs[nic_address]
-        else:
-            client_stub = nic_simulator_grpc_service_pb2_grpc.DualToRActiveStub(
-                grpc.insecure_channel(
-                    "%s:%s" % (nic_address, self.binding_port),
-                    options=GRPC_CLIENT_OPTIONS
+        with self.client_stubs_lock:
+            if nic_address in self.client_stubs:
+                client_stub = self.client_stubs[nic_address]
+            else:
+                client_stub = nic_simulator_grpc_service_pb2_grpc.DualToRActiveStub(
+                    grpc.insecure_channel(
+                        "%s:%s" % (nic_address, self.binding_port),
+                        options=GRPC_CLIENT_OPTIONS
+                    )
                 )
-            )
-            self.client_stubs[nic_address] = client_stub
+                self.client_stubs[nic_address] = client_stub
         return client_stub
 
+    def _call_nics(self, method, nic_addresses, requests, reply_class, timeout):
+        """
+        Call gRPC method on the NiCs concurrently, with at most `self.concurrency` calls in flight.
+
+        Return the replies, success flags and error messages in the order of `nic_addresses`, a failed
+        NiC gets an empty reply.
+        """
+        semaphore = threading.BoundedSemaphore(self.concurrency)
+        calls = []
+        for nic_address, request in zip(nic_addresses, requests):
+            semaphore.acquire()
+            try:
+                call = getattr(self._get_client_stub(nic_address), method).future(request, timeout=timeout)
+            except Exception as e:
+                semaphore.release()
+                calls.append((None, e))
+                continue
+            call.add_done_callback(lambda _: semaphore.release())
+            calls.append((call, None))
+
+        replies, success, error_messages = [], [], []
+        for nic_address, (call, error) in zip(nic_addresses, calls):
+            try:
+                if error is not None:
+                    raise error
+                replies.append(call.result())
+                success.append(True)
+                error_messages.append("")
+            except Exception as e:
+                if isinstance(e, grpc.RpcError):
+                    error_message = "Error in %s to %s: %s %s" % (method, nic_address, e.code(), e.details())
+                else:
+                    error_message = "Error in %s to %s: %s" % (method, nic_address, repr(e))
+                logging.error(error_message)
+                replies.append(reply_class())
+                success.append(False)
+                error_messages.append(error_message)
+        return replies, success, error_messages
+
+    @staticmethod
+    def _set_status(context, success, error_messages):
+        """Abort the whole request only if none of the NiCs succeeds."""
+        if success and not any(success):
+            context.set_code(grpc.StatusCode.ABORTED)
+            context.set_details("%s (failed on all %d NiCs)" % (error_messages[0], len(success)))
+
     def QueryAdminForwardingPortState(self, request, context):
         nic_addresses = request.nic_addresses
         logging.debug("QueryAdminForwardingPortState[mgmt]: request query admin port state for %s\n", nic_addresses)
-        query_responses = []
-        for nic_address in nic_addresses:
-            client_stub = self._get_client_stub(nic_address)
-            try:
-                state = client_stub.QueryAdminForwardingPortState(
-                    nic_simulator_grpc_service_pb2.AdminRequest(
-                        portid=[0, 1],
-                        state=[True, True]
-                    ),
-                    timeout=GRPC_TIMEOUT
-                )
-                query_responses.append(state)
-            except Exception as e:
-                context.set_code(grpc.StatusCode.ABORTED)
-                context.set_details("Error in QueryAdminForwardingPortState to %s: %s" % (nic_address, repr(e)))
-                return nic_simulator_grpc_mgmt_service_pb2.ListOfAdminReply()
+        admin_request = nic_simulator_grpc_service_pb2.AdminRequest(
+            portid=[0, 1],
+            state=[True, True]
+        )
+        query_responses, success, error_messages = self._call_nics(
+            "QueryAdminForwardingPortState",
+            nic_addresses,
+            [admin_request] * len(nic_addresses),
+            nic_simulator_grpc_service_pb2.AdminReply,
+            GRPC_TIMEOUT
+        )
+        self._set_status(context, success, error_messages)
         response = nic_simulator_grpc_mgmt_service_pb2.ListOfAdminReply(
             nic_addresses=nic_addresses,
-            admin_replies=query_responses
+            admin_replies=query_responses,
+            success=success,
+            error_messages=error_messages
         )
         logging.debug("QueryAdminForwardingPortState[mgmt]: response of query: %s", response)
         return response
@@ -776,22 +826,19 @@ class MgmtServer(nic_simulator_grpc_mgmt_service_pb2_grpc.DualTorMgmtServiceServ
         nic_addresses = request.nic_addresses
         admin_requests = request.admin_requests
         logging.debug("SetAdminForwardingPortState[mgmt]: request set admin port state: %s\n", request)
-        set_responses = []
-        for nic_address, admin_request in zip(nic_addresses, admin_requests):
-            client_stub = self._get_client_stub(nic_address)
-            try:
-                state = client_stub.SetAdminForwardingPortState(
-                    admin_request,
-                    timeout=GRPC_TIMEOUT
-                )
-                set_responses.append(state)
-            except Exception as e:
-                context.set_code(grpc.StatusCode.ABORTED)
-                context.set_details("Error in SetAdminForwardingPortState to %s: %s" % (nic_address, repr(e)))
-                return nic_simulator_grpc_mgmt_service_pb2.ListOfAdminRequest()
+        set_responses, success, error_messages = self._call_nics(
+            "SetAdminForwardingPortState",
+            nic_addresses,
+            admin_requests,
+            nic_simulator_grpc_service_pb2.AdminReply,
+            GRPC_TIMEOUT
+        )
+        self._set_status(context, success, error_messages)
         response = nic_simulator_grpc_mgmt_service_pb2.ListOfAdminReply(
-            nic_addresses=nic_addresses,
-            admin_replies=set_responses
+            nic_addresses=nic_addresses[:len(set_responses)],
+            admin_replies=set_responses,
+            success=success,
+            error_messages=error_messages
         )
         logging.debug("SetAdminForwardingPortState[mgmt]: response of query: %s", response)
         return response
@@ -803,22 +850,19 @@ class MgmtServer(nic_simulator_grpc_mgmt_service_pb2_grpc.DualTorMgmtServiceServ
         nic_addresses = request.nic_addresses
         drop_requests = request.drop_requests
         logging.debug("SetDrop[mgmt]: request set drop: %s\n", request)
-        set_drop_responses = []
-        for nic_address, drop_request in zip(nic_addresses, drop_requests):
-            client_stub = self._get_client_stub(nic_address)
-            try:
-                set_drop_response = client_stub.SetDrop(
-                    drop_request,
-                    timeout=10
-                )
-                set_drop_responses.append(set_drop_response)
-            except Exception as e:
-                context.set_code(grpc.StatusCode.ABORTED)
-                context.set_details("Error in SetDrop to %s: %s" % (nic_address, repr(e)))
-                return nic_simulator_grpc_mgmt_service_pb2.ListOfDropReply()
+        set_drop_responses, success, error_messages = self._call_nics(
+            "SetDrop",
+            nic_addresses,
+            drop_requests,
+            nic_simulator_grpc_service_pb2.DropReply,
+            GRPC_SET_DROP_TIMEOUT
+        )
+        self._set_status(context, success, error_messages)
         response = nic_simulator_grpc_mgmt_service_pb2.ListOfDropReply(
-            nic_addresses=nic_addresses,
-            drop_replies=set_drop_responses
+            nic_addresses=nic_addresses[:len(set_drop_responses)],
+            drop_replies=set_drop_responses,
+            success=success,
+            error_messages=error_messages
         )
         logging.debug("SetDrop[mgmt]: response of set drop: %s\n", response)
         return response
@@ -837,7 +881,7 @@ class MgmtServer(nic_simulator_grpc_mgmt_service_pb2_grpc.DualTorMgmtServiceServ
 class NiCSimulator(nic_simulator_grpc_service_pb2_grpc.DualToRActiveServicer):
     """NiC simulator class, define all the gRPC calls."""
 
-    def __init__(self, vm_set, mgmt_port, binding_port):
+    def __init__(self, vm_set, mgmt_port, binding_port, concurrency=GRPC_MGMT_CONCURRENCY):
         self.vm_set = vm_set
         self.server_nics = self._find_all_server_nics()
         self.server_nic_addresses = {nic: get_ip_address(nic) for nic in self.server_nics}
@@ -858,7 +902,7 @@ class NiCSimulator(nic_simulator_grpc_service_pb2_grpc.DualToRActiveServicer):
 
         self.servers = {}
         self.servers = {nic_addr: NiCServer(nic_addr, ovs_bridge) for nic_addr, ovs_bridge in self.ovs_bridges.items()}
-        self.mgmt_server = MgmtServer(self.mgmt_port_address, binding_port)
+        self.mgmt_server = MgmtServer(self.mgmt_port_address, binding_port, concurrency)
 
     def _find_all_server_nics(self):
         return [_ for _ in os.listdir('/sys/class/net') if re.search(NETNS_IFACE_PATTERN, _)]
@@ -916,6 +960,13 @@ def parse_args():
         action="store_true",
         help="Redirect log to stdout"
     )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=GRPC_MGMT_CONCURRENCY,
+        help="max number of concurrent calls to the NiCs in one mgmt request"
+    )
     args = parser.parse_args()
     return args
 
@@ -964,7 +1015,7 @@ def main():
     logging.debug("Start nic_simulator with args: %s", args)
     config_env()
     config_logging(args.vm_set, args.log_level.upper(), args.stdout_log)
-    nic_simulator = NiCSimulator(args.vm_set, "mgmt", args.port)
+    nic_simulator = NiCSimulator(args.vm_set, "mgmt", args.port, args.concurrency)
     nic_simulator.start_nic_servers()
     try:
         nic_simulator.start_mgmt_server()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Load generator of the nic_simulator mgmt server.
+
+Starts the given numbers of simulated NiC gRPC servers on loopback addresses, each of them
+emulates the OVS flow update with a configurable latency, and measures the latency of
+toggling all the NiCs through the mgmt server with sequential calls (concurrency 1) and
+with the concurrent fan-out.
+
+Usage:
+    python3 nic_simulator_benchmark.py --nics 1,16,64,128 --ovs_latency_ms 5 --iterations 5
+"""
+import argparse
+import logging
+import threading
+import time
+
+import grpc
+
+import nic_simulator
+import nic_simulator_grpc_service_pb2
+import nic_simulator_grpc_mgmt_service_pb2
+import nic_simulator_grpc_mgmt_service_pb2_grpc
+
+NIC_ADDRESS_TEMPLATE = "127.0.%d.%d"
+MGMT_ADDRESS = "127.0.0.1"
+BINDING_PORT = 50075
+
+
+class SimulatedOVSBridge(object):
+    """OVS bridge with the flow update emulated by sleep."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.states = [True, True]
+
+    def query_forwarding_state(self, portids):
+        return [self.states[portid] for portid in portids]
+
+    def set_forwarding_state(self, portids, states):
+        time.sleep(self.latency)
+        for portid, state in zip(portids, states):
+            self.states[portid] = state
+        return self.query_forwarding_state(portids)
+
+    def set_drop(self, portids, directions, recover):
+        time.sleep(self.latency)
+        return [True] * len(portids)
+
+
+def start_nic_servers(count, latency):
+    servers = []
+    for index in range(count):
+        nic_address = NIC_ADDRESS_TEMPLATE % (1 + index // 250, 1 + index % 250)
+        server = nic_simulator.NiCServer(nic_address, SimulatedOVSBridge(latency))
+        server.start(BINDING_PORT)
+        servers.append(server)
+    for server in servers:
+        grpc.channel_ready_future(
+            grpc.insecure_channel("%s:%s" % (server.nic_addr, BINDING_PORT))
+        ).result(timeout=10)
+    return servers
+
+
+def start_mgmt_server(concurrency):
+    mgmt_server = nic_simulator.MgmtServer(MGMT_ADDRESS, BINDING_PORT, concurrency)
+    thread = threading.Thread(target=mgmt_server.start, daemon=True)
+    thread.start()
+    while mgmt_server.server is None:
+        time.sleep(0.01)
+    return mgmt_server
+
+
+def toggle_latency(stub, nic_addresses, iterations):
+    """Return the average latency of toggling all the NiCs."""
+    durations = []
+    for iteration in range(iterations):
+        state = iteration % 2 == 0
+        request = nic_simulator_grpc_mgmt_service_pb2.ListOfAdminRequest(
+            nic_addresses=nic_addresses,
+            admin_requests=[nic_simulator_grpc_service_pb2.AdminRequest(portid=[0], state=[state])
+                            for _ in nic_addresses]
+        )
+        start = time.time()
+        reply = stub.SetAdminForwardingPortState(request, timeout=600)
+        durations.append(time.time() - start)
+        if not all(reply.success) or any(admin_reply.state != [state] for admin_reply in reply.admin_replies):
+            raise RuntimeError("Toggle failed: %s" % list(reply.error_messages))
+    return sum(durations) / len(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="nic_simulator mgmt server load generator")
+    parser.add_argument("--nics", default="1,16,64,128", help="comma separated numbers of simulated NiCs")
+    parser.add_argument("--ovs_latency_ms", type=float, default=5, help="emulated OVS flow update latency")
+    parser.add_argument("--concurrency", type=int, default=nic_simulator.GRPC_MGMT_CONCURRENCY)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    nic_counts = [int(_) for _ in args.nics.split(",")]
+    nic_servers = start_nic_servers(max(nic_counts), args.ovs_latency_ms / 1000.0)
+    try:
+        for concurrency in (1, args.concurrency):
+            mgmt_server = start_mgmt_server(concurrency)
+            stub = nic_simulator_grpc_mgmt_service_pb2_grpc.DualTorMgmtServiceStub(
+                grpc.insecure_channel("%s:%s" % (MGMT_ADDRESS, BINDING_PORT))
+            )
+            # warm up the channels from the mgmt server to the NiCs
+            toggle_latency(stub, [server.nic_addr for server in nic_servers], 1)
+            for count in nic_counts:
+                nic_addresses = [server.nic_addr for server in nic_servers[:count]]
+                latency = toggle_latency(stub, nic_addresses, args.iterations)
+                print("concurrency %3d, %3d NiCs: toggle latency %7.1f ms" % (concurrency, count, latency * 1000))
+            mgmt_server.server.stop(None).wait()
+    finally:
+        for server in nic_servers:
+            server.stop()
+            server.join()
+
+
+if __name__ == "__main__":
+    main()
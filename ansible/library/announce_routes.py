@@ -8,6 +8,8 @@ import requests
 import time
 import ipaddress
 import sys
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 
 from ansible.module_utils.basic import *
 
@@ -38,6 +40,14 @@ Options:
     - option-name: path
       description: to figure out the path of topo_{}.yml
       required: False
+
+    - option-name: batch_size
+      description: maximum number of routes sent to exabgp in one HTTP request
+      required: False
+
+    - option-name: concurrency
+      description: number of exabgp processes routes are sent to in parallel
+      required: False
 '''
 
 EXAMPLES = '''
@@ -65,6 +75,15 @@ TOR_ASN_START = 65500
 IPV4_BASE_PORT = 5000
 IPV6_BASE_PORT = 6000
 
+ANNOUNCE_BATCH_SIZE = 2000
+ANNOUNCE_CONCURRENCY = 16
+ANNOUNCE_RETRIES = 3
+ANNOUNCE_TIMEOUT = 90
+
+# Decimal and hex representation of octets, used to build prefixes without formatting every route
+DEC_OCTETS = [str(octet) for octet in range(1024)]
+HEX_OCTETS = ["%02X" % octet for octet in range(1024)]
+
 # Describe default number of COLOs
 COLO_NUMBER = 30
 # Describe default number of M0 devices in 1 colo
@@ -127,18 +146,62 @@ def read_topo(topo_name, path):
         return {}
 
 
-def change_routes(action, ptf_ip, port, routes):
+def change_routes(action, ptf_ip, port, routes, session=None, batch_size=ANNOUNCE_BATCH_SIZE):
+    """Send routes to exabgp in batches of batch_size routes, each batch is retried on failure"""
+    route_cmd = action + " route "
     messages = []
     for prefix, nexthop, aspath in routes:
         if aspath:
-            messages.append("{} route {} next-hop {} as-path [ {} ]".format(action, prefix, nexthop, aspath))
+            messages.append(route_cmd + prefix + " next-hop " + nexthop + " as-path [ " + str(aspath) + " ]")
         else:
-            messages.append("{} route {} next-hop {}".format(action, prefix, nexthop))
+            messages.append(route_cmd + prefix + " next-hop " + nexthop)
     wait_for_http(ptf_ip, port, timeout=60)
     url = "http://%s:%d" % (ptf_ip, port)
-    data = { "commands": ";".join(messages) }
-    r = requests.post(url, data=data, timeout=90)
-    assert r.status_code == 200
+    if session is None:
+        session = requests.Session()
+    for start in range(0, len(messages), batch_size):
+        data = {"commands": ";".join(messages[start:start + batch_size])}
+        for attempt in range(ANNOUNCE_RETRIES):
+            try:
+                r = session.post(url, data=data, timeout=ANNOUNCE_TIMEOUT)
+            except requests.exceptions.RequestException:
+                if attempt == ANNOUNCE_RETRIES - 1:
+                    raise
+            else:
+                if r.status_code == 200:
+                    break
+            time.sleep(1)
+        assert r.status_code == 200
+
+
+def change_routes_parallel(action, ptf_ip, port_routes, batch_size=ANNOUNCE_BATCH_SIZE,
+                           concurrency=ANNOUNCE_CONCURRENCY):
+    """
+    Send routes to exabgp processes in parallel.
+    Routes of the same exabgp process are sent in order over one keep-alive HTTP session.
+
+    port_routes: list of (port, routes) tuples
+    """
+    routes_by_port = OrderedDict()
+    for port, routes in port_routes:
+        routes_by_port.setdefault(port, []).append(routes)
+    if not routes_by_port:
+        return
+
+    def announce_port(port):
+        session = requests.Session()
+        try:
+            for routes in routes_by_port[port]:
+                change_routes(action, ptf_ip, port, routes, session=session, batch_size=batch_size)
+        finally:
+            session.close()
+
+    pool = ThreadPool(max(1, min(concurrency, len(routes_by_port))))
+    try:
+        pool.map(announce_port, list(routes_by_port.keys()))
+    finally:
+        pool.close()
+        pool.join()
 
 
 # AS path from Leaf router for T0 topology
@@ -271,103 +334,116 @@ def generate_routes(family, podset_number, tor_number, tor_subnet_number,
     # NOTE: Using large enough values (e.g., podset_number = 200,
     # us to overflow the 192.168.0.0/16 private address space here.
     # This should be fine for internal use, but may pose an issue if used otherwise
+    prefixlen_v4 = "/" + str(32 - int(math.log(tor_subnet_size, 2)))
+    tor_suffix_size = max_tor_subnet_number * tor_subnet_size
+    podset_suffix_size = tor_number * tor_suffix_size
+    # First 3 pods are advertised from T1 - so remove 3 from the total pods being advertised by T3
+    first_third_podset_number = int(math.ceil((podset_number - 3) / 3.0))
+    second_third_podset_number = int(math.ceil(((podset_number - 3) * 2) / 3.0))
+    with_v4 = family in ["v4", "both"]
+    with_v6 = family in ["v6", "both"]
+
     for podset in range(0, podset_number):
+        if skip_podset(router_type, topo, podset, set_num, first_third_podset_number, second_third_podset_number):
+            continue
+
+        leaf_asn = leaf_asn_start + podset
         for tor in range(0, tor_number):
-            for subnet in range(0, tor_subnet_number):
-                if router_type == "core":
-                    # Advertise podset 3+ to T2 DUT
-                    if podset < 3:
-                        continue
-
-                    # First 3 pods are advertised from T1 - so remove 3 from the total pods being advertised by T3
-                    first_third_podset_number = int(math.ceil((podset_number - 3) / 3.0))
-                    second_third_podset_number = int(math.ceil(((podset_number - 3) * 2) / 3.0))
-
-                    if set_num is not None:
-                        # For T2, we have 3 sets - 1 set advertises first 1/3 podsets, second set advertises second 1/3 podsets, and all VM's advertises the last 1/3 podsets
-                        if podset <= first_third_podset_number and set_num != 0:
-                            continue
-                        elif podset > first_third_podset_number and podset < second_third_podset_number and set_num != 1:
-                            continue
-                if router_type == "spine" or router_type == "mgmtleaf":
-                    # Skip podset 0 for T2
+            if router_type == "leaf" and topo not in ["t2", "t0-mclag"]:
+                # Skip tor 0 podset 0 for T1
+                if podset == 0 and tor == 0:
+                    continue
+            elif router_type == "tor" and tor != tor_index:
+                continue
+
+            tor_asn = tor_asn_start + tor
+            aspath = None
+            if router_type == "core":
+                aspath = "{} {}".format(leaf_asn, core_ra_asn)
+            elif router_type == "spine" or router_type == "mgmtleaf":
+                aspath = "{} {}".format(leaf_asn, tor_asn)
+            elif router_type == "leaf":
+                if topo == "t2":
+                    aspath = "{}".format(tor_asn)
+                elif topo == "t0-mclag":
+                    aspath = "{}".format(tor_asn)
+                else:
                     if podset == 0:
-                        continue
-                elif router_type == "leaf":
-                    if topo == 't2':
-                        # Send routes for podset 0-2 (first 3 pods) to the T2 DUT
-                        if podset > 2:
-                            continue
-
-                        if set_num is not None:
-                            # For T2, we have 3 sets - 1 set advertises podset 1, second set advertises podset 2, and all VM's advertises podset3
-                            if podset == 0 and set_num != 0:
-                                continue
-                            elif podset == 1 and set_num != 1:
-                                continue
-                    elif topo == 't0-mclag':
-                        if podset > 1:
-                            continue
-                        if set_num is not None:
-                            if podset == 0 and set_num != 0:
-                                continue
-                            elif podset == 1 and set_num != 1:
-                                continue
-                    else:
-                        # Skip tor 0 podset 0 for T1
-                        if podset == 0 and tor == 0:
-                            continue
-                elif router_type == "tor":
-                    # Skip non podset 0 for T0
-                    if podset != 0:
-                        continue
-                    # Skip subnet 0 (vlan ip) for M0
-                    elif topo == "m0" and subnet == 0:
-                        continue
-                    elif tor != tor_index:
-                        continue
-
-                suffix = ((podset * tor_number * max_tor_subnet_number * tor_subnet_size) + \
-                          (tor * max_tor_subnet_number * tor_subnet_size) + \
-                          (subnet * tor_subnet_size))
-                octet2 = (168 + int(suffix / (256 ** 2)))
-                octet1 = (192 + int(octet2 / 256))
-                octet2 = (octet2 % 256)
-                octet3 = (int(suffix / 256) % 256)
-                octet4 = (suffix % 256)
-                prefixlen_v4 = (32 - int(math.log(tor_subnet_size, 2)))
-
-                prefix = "{}.{}.{}.{}/{}".format(octet1, octet2, octet3, octet4, prefixlen_v4)
-                prefix_v6 = "20%02X:%02X%02X:0:%02X::/64" % (octet1, octet2, octet3, octet4)
-
-                leaf_asn = leaf_asn_start + podset
-                tor_asn = tor_asn_start + tor
-
-                aspath = None
-                if router_type == "core":
-                    aspath = "{} {}".format(leaf_asn, core_ra_asn)
-                elif router_type == "spine" or router_type == "mgmtleaf":
-                    aspath = "{} {}".format(leaf_asn, tor_asn)
-                elif router_type == "leaf":
-                    if topo == "t2":
-                        aspath = "{}".format(tor_asn)
-                    elif topo == "t0-mclag":
                         aspath = "{}".format(tor_asn)
                     else:
-                        if podset == 0:
-                            aspath = "{}".format(tor_asn)
-                        else:
-                            aspath = "{} {} {}".format(spine_asn, leaf_asn, tor_asn)
-
-                if family in ["v4", "both"]:
+                        aspath = "{} {} {}".format(spine_asn, leaf_asn, tor_asn)
+
+            tor_suffix = podset * podset_suffix_size + tor * tor_suffix_size
+            # Skip subnet 0 (vlan ip) for M0
+            first_subnet = 1 if router_type == "tor" and topo == "m0" else 0
+            for suffix in range(tor_suffix + first_subnet * tor_subnet_size,
+                                tor_suffix + tor_subnet_number * tor_subnet_size, tor_subnet_size):
+                octet2 = 168 + (suffix >> 16)
+                octet1 = 192 + (octet2 >> 8)
+                octet2 &= 0xff
+                octet3 = (suffix >> 8) & 0xff
+                octet4 = suffix & 0xff
+
+                if with_v4:
+                    prefix = DEC_OCTETS[octet1] + "." + DEC_OCTETS[octet2] + "." + DEC_OCTETS[octet3] + "." + \
+                        DEC_OCTETS[octet4] + prefixlen_v4
                     routes.append((prefix, nexthop, aspath))
-                if family in ["v6", "both"]:
+                if with_v6:
+                    prefix_v6 = "20" + HEX_OCTETS[octet1] + ":" + HEX_OCTETS[octet2] + HEX_OCTETS[octet3] + ":0:" + \
+                        HEX_OCTETS[octet4] + "::/64"
                     routes.append((prefix_v6, nexthop_v6, aspath))
 
     return routes
 
 
-def fib_t0(topo, ptf_ip, no_default_route=False, action="announce"):
+def skip_podset(router_type, topo, podset, set_num, first_third_podset_number, second_third_podset_number):
+    """Check whether routes of the podset are not advertised by the router"""
+    if router_type == "core":
+        # Advertise podset 3+ to T2 DUT
+        if podset < 3:
+            return True
+
+        if set_num is not None:
+            # For T2, we have 3 sets - 1 set advertises first 1/3 podsets, second set advertises second 1/3 podsets,
+            # and all VM's advertises the last 1/3 podsets
+            if podset <= first_third_podset_number and set_num != 0:
+                return True
+            elif podset > first_third_podset_number and podset < second_third_podset_number and set_num != 1:
+                return True
+    if router_type == "spine" or router_type == "mgmtleaf":
+        # Skip podset 0 for T2
+        if podset == 0:
+            return True
+    elif router_type == "leaf":
+        if topo == 't2':
+            # Send routes for podset 0-2 (first 3 pods) to the T2 DUT
+            if podset > 2:
+                return True
+
+            if set_num is not None:
+                # For T2, we have 3 sets - 1 set advertises podset 1, second set advertises podset 2,
+                # and all VM's advertises podset3
+                if podset == 0 and set_num != 0:
+                    return True
+                elif podset == 1 and set_num != 1:
+                    return True
+        elif topo == 't0-mclag':
+            if podset > 1:
+                return True
+            if set_num is not None:
+                if podset == 0 and set_num != 0:
+                    return True
+                elif podset == 1 and set_num != 1:
+                    return True
+    elif router_type == "tor":
+        # Skip non podset 0 for T0
+        if podset != 0:
+            return True
+    return False
+
+
+def fib_t0(topo, no_default_route=False):
+    port_routes = []
     common_config = topo['configuration_properties'].get('common', {})
     podset_number = common_config.get("podset_number", PODSET_NUMBER)
     tor_number = common_config.get("tor_number", TOR_NUMBER)
@@ -395,11 +471,14 @@ def fib_t0(topo, ptf_ip, no_default_route=False, action="announce"):
                                     nhipv6, nhipv6, tor_subnet_size, max_tor_subnet_number, "t0",
                                     no_default_route=no_default_route)
 
-        change_routes(action, ptf_ip, port, routes_v4)
-        change_routes(action, ptf_ip, port6, routes_v6)
+        port_routes.append((port, routes_v4))
+        port_routes.append((port6, routes_v6))
+
+    return port_routes
 
 
-def fib_t1_lag(topo, ptf_ip, no_default_route=False, action="announce"):
+def fib_t1_lag(topo, no_default_route=False):
+    port_routes = []
     common_config = topo['configuration_properties'].get('common', {})
     podset_number = common_config.get("podset_number", PODSET_NUMBER)
     tor_number = common_config.get("tor_number", TOR_NUMBER)
@@ -435,14 +514,16 @@ def fib_t1_lag(topo, ptf_ip, no_default_route=False, action="announce"):
                                         None, leaf_asn_start, tor_asn_start,
                                         nhipv4, nhipv6, tor_subnet_size, max_tor_subnet_number, "t1",
                                         router_type=router_type, tor_index=tor_index, no_default_route=no_default_route)
-            change_routes(action, ptf_ip, port, routes_v4)
-            change_routes(action, ptf_ip, port6, routes_v6)
+            port_routes.append((port, routes_v4))
+            port_routes.append((port6, routes_v6))
 
         if 'vips' in v:
             routes_vips = []
             for prefix in v["vips"]["ipv4"]["prefixes"]:
                 routes_vips.append((prefix, nhipv4, v["vips"]["ipv4"]["asn"]))
-            change_routes(action, ptf_ip, port, routes_vips)
+            port_routes.append((port, routes_vips))
+
+    return port_routes
 
 
 def get_new_ip(curr_ip, skip_count):
@@ -522,7 +603,8 @@ We would have the following distribution:
 """
 
 
-def fib_m0(topo, ptf_ip, action="announce"):
+def fib_m0(topo):
+    port_routes = []
     common_config = topo['configuration_properties'].get('common', {})
     colo_number = common_config.get("colo_number", COLO_NUMBER)
     m0_number = common_config.get("m0_number", M0_NUMBER)
@@ -585,8 +667,10 @@ def fib_m0(topo, ptf_ip, action="announce"):
                 m1_routes_v4 = routes_v4
                 m1_routes_v6 = routes_v6
 
-        change_routes(action, ptf_ip, port, routes_v4)
-        change_routes(action, ptf_ip, port6, routes_v6)
+        port_routes.append((port, routes_v4))
+        port_routes.append((port6, routes_v6))
+
+    return port_routes
 
 
 def generate_m0_subnet_routes(m0_subnet_number, m0_subnet_size, ip_base, nexthop, base_offset=0, m0_asn=None):
@@ -685,7 +769,8 @@ Routes announced by M0 can be broken down to 5 sets:
 """
 
 
-def fib_mx(topo, ptf_ip, action="announce"):
+def fib_mx(topo):
+    port_routes = []
     common_config = topo['configuration_properties'].get('common', {})
     colo_number = common_config.get("colo_number", COLO_NUMBER)
     m0_number = common_config.get("m0_number", M0_NUMBER)
@@ -737,8 +822,10 @@ def fib_mx(topo, ptf_ip, action="announce"):
             m0_routes_v4 = routes_v4
             m0_routes_v6 = routes_v6
 
-        change_routes(action, ptf_ip, port, routes_v4)
-        change_routes(action, ptf_ip, port6, routes_v6)
+        port_routes.append((port, routes_v4))
+        port_routes.append((port6, routes_v6))
+
+    return port_routes
 
 
 """
@@ -753,6 +840,7 @@ the same set in both the linecards. So, if linecard1 and linecard2 have T1 VMs c
     -  2nd set of routes should be advertised by the remaining 2/3 of the VMs on linecard1 and also by the remaining
         2/3 of the VMs on linecard2.
     -  3rd set of routes should be advertised by the all VMs on linecard1 and also by all VMs on linecard2
+
 It is assumed that tne number of T1 VMs that on both the linecards is the same.
 If we don't have 2 linecards for T1 VMs, then routes above would be advertised only by the first linecard that has T1 VMs
 
@@ -772,7 +860,7 @@ We would have the following distribution:
 """
 
 
-def fib_t2_lag(topo, ptf_ip, action="announce"):
+def fib_t2_lag(topo):
     vms = topo['topology']['VMs']
     # T1 VMs per linecard(asic) - key is the dut index, and value is a list of T1 VMs
     t1_vms = {}
@@ -791,11 +879,11 @@ def fib_t2_lag(topo, ptf_ip, action="announce"):
             if dut_index not in t3_vms:
                 t3_vms[dut_index] = list()
             t3_vms[dut_index].append(key)
-    generate_t2_routes(t1_vms, topo, ptf_ip, action="announce")
-    generate_t2_routes(t3_vms, topo, ptf_ip, action="announce")
+    return generate_t2_routes(t1_vms, topo) + generate_t2_routes(t3_vms, topo)
 
 
-def generate_t2_routes(dut_vm_dict, topo, ptf_ip, action="announce"):
+def generate_t2_routes(dut_vm_dict, topo):
+    port_routes = []
     common_config = topo['configuration_properties'].get('common', {})
     vms = topo['topology']['VMs']
     vms_config = topo['configuration']
@@ -849,16 +937,20 @@ def generate_t2_routes(dut_vm_dict, topo, ptf_ip, action="announce"):
                                             nhipv4, nhipv6, tor_subnet_size, max_tor_subnet_number, "t2",
                                             router_type=router_type, tor_index=tor_index, set_num=set_num,
                                             core_ra_asn=core_ra_asn)
-                change_routes(action, ptf_ip, port, routes_v4)
-                change_routes(action, ptf_ip, port6, routes_v6)
+                port_routes.append((port, routes_v4))
+                port_routes.append((port6, routes_v6))
 
                 if 'vips' in vms_config[a_vm]:
                     routes_vips = []
                     for prefix in vms_config[a_vm]["vips"]["ipv4"]["prefixes"]:
                         routes_vips.append((prefix, nhipv4, vms_config[a_vm]["vips"]["ipv4"]["asn"]))
-                    change_routes(action, ptf_ip, port, routes_vips)
+                    port_routes.append((port, routes_vips))
+
+    return port_routes
 
-def fib_t0_mclag(topo, ptf_ip, action="announce"):
+
+def fib_t0_mclag(topo):
+    port_routes = []
     common_config = topo['configuration_properties'].get('common', {})
     podset_number = common_config.get("podset_number", PODSET_NUMBER)
     tor_number = common_config.get("tor_number", TOR_NUMBER)
@@ -893,8 +985,11 @@ def fib_t0_mclag(topo, ptf_ip, action="announce"):
                                     nhipv6, nhipv6, tor_subnet_size, max_tor_subnet_number,
                                     "t0-mclag", set_num=set_num)
 
-        change_routes(action, ptf_ip, port, routes_v4)
-        change_routes(action, ptf_ip, port6, routes_v6)
+        port_routes.append((port, routes_v4))
+        port_routes.append((port6, routes_v6))
+
+    return port_routes
+
 
 def main():
     module = AnsibleModule(
@@ -902,7 +997,9 @@ def main():
             topo_name=dict(required=True, type='str'),
             ptf_ip=dict(required=True, type='str'),
             action=dict(required=False, type='str', default='announce', choices=["announce", "withdraw"]),
-            path=dict(required=False, type='str', default='')
+            path=dict(required=False, type='str', default=''),
+            batch_size=dict(required=False, type='int', default=ANNOUNCE_BATCH_SIZE),
+            concurrency=dict(required=False, type='int', default=ANNOUNCE_CONCURRENCY)
         ),
         supports_check_mode=False)
 
@@ -910,6 +1007,8 @@ def main():
     ptf_ip = module.params['ptf_ip']
     action = module.params['action']
     path = module.params['path']
+    batch_size = module.params['batch_size']
+    concurrency = module.params['concurrency']
 
     topo = read_topo(topo_name, path)
     if not topo:
@@ -921,25 +1020,21 @@ def main():
 
     try:
         if topo_type == "t0":
-            fib_t0(topo, ptf_ip, no_default_route=is_storage_backend, action=action)
-            module.exit_json(changed=True)
+            port_routes = fib_t0(topo, no_default_route=is_storage_backend)
         elif topo_type == "t1":
-            fib_t1_lag(topo, ptf_ip, no_default_route=is_storage_backend, action=action)
-            module.exit_json(changed=True)
+            port_routes = fib_t1_lag(topo, no_default_route=is_storage_backend)
         elif topo_type == "t2":
-            fib_t2_lag(topo, ptf_ip, action=action)
-            module.exit_json(changed=True)
+            port_routes = fib_t2_lag(topo)
         elif topo_type == "t0-mclag":
-            fib_t0_mclag(topo, ptf_ip, action=action)
-            module.exit_json(changed=True)
+            port_routes = fib_t0_mclag(topo)
         elif topo_type == "m0":
-            fib_m0(topo, ptf_ip, action=action)
-            module.exit_json(changed=True)
+            port_routes = fib_m0(topo)
         elif topo_type == "mx":
-            fib_mx(topo, ptf_ip, action=action)
-            module.exit_json(changed=True)
+            port_routes = fib_mx(topo)
         else:
             module.exit_json(msg='Unsupported topology "{}" - skipping announcing routes'.format(topo_name))
+        change_routes_parallel(action, ptf_ip, port_routes, batch_size=batch_size, concurrency=concurrency)
+        module.exit_json(changed=True)
     except Exception as e:
         module.fail_json(msg='Announcing routes failed, topo_name={}, topo_type={}, exception={}' \
                          .format(topo_name, topo_type, repr(e)))
@@ -3,7 +3,9 @@
 import lxml.etree as ET
 import yaml
 import os
+import json
 import logging
+import tempfile
 import traceback
 import ipaddr as ipaddress
 from operator import itemgetter
@@ -119,20 +121,94 @@ class Parse_Lab_Graph():
     This module conn_graph_file also parse the server links to have a full root fanout switches template for deployment.
     """
 
-    def __init__(self, xmlfile):
-        self.root = ET.parse(xmlfile)
-        self.devices = {}
-        self.vlanport = {}
+    def __init__(self, xmlfile, cache_path=None):
+        self.xmlfile = xmlfile
+        self.cache_path = cache_path if cache_path is not None else LAB_GRAPH_CACHE_PATH
+        self._root = None
+        self._sections = {}
+        self._cache = None
         self.vlanrange = {}
-        self.links = {}
-        self.consolelinks = {}
-        self.pdulinks = {}
         self.server = defaultdict(dict)
         self.pngtag = 'PhysicalNetworkGraphDeclaration'
         self.dpgtag = 'DataPlaneGraph'
         self.pcgtag = 'PowerControlGraphDeclaration'
         self.csgtag = 'ConsoleGraphDeclaration'
 
+    @property
+    def root(self):
+        if self._root is None:
+            self._root = ET.parse(self.xmlfile)
+        return self._root
+
+    @property
+    def devices(self):
+        return self._section('devices')
+
+    @property
+    def vlanport(self):
+        return self._section('vlanport')
+
+    @property
+    def links(self):
+        return self._section('links')
+
+    @property
+    def consolelinks(self):
+        return self._section('consolelinks')
+
+    @property
+    def pdulinks(self):
+        return self._section('pdulinks')
+
+    def _cache_file(self):
+        return os.path.join(self.cache_path, os.path.abspath(self.xmlfile).strip('/').replace('/', '_') + '.json')
+
+    def _load_cache(self):
+        """
+        Load the sections of the graph parsed before, if the graph file is not changed since then
+        The sections are kept as json strings, which are only decoded when the section is used
+        """
+        self._cache = {}
+        if not self.cache_path:
+            return
+        try:
+            with open(self._cache_file()) as fd:
+                cache = json.load(fd)
+            if cache['key'] == graph_file_key(self.xmlfile):
+                self._cache = cache['sections']
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            if not os.path.isdir(self.cache_path):
+                os.makedirs(self.cache_path)
+            cache_file = self._cache_file()
+            fd, tmp_file = tempfile.mkstemp(dir=self.cache_path)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'key': graph_file_key(self.xmlfile), 'sections': self._cache}, f)
+            os.rename(tmp_file, cache_file)
+        except (IOError, OSError) as e:
+            logging.debug("Failed to save parsed graph cache of %s: %s" % (self.xmlfile, repr(e)))
+
+    def _section(self, name):
+        """
+        Parse a section of the graph when it is used for the first time
+        """
+        if name not in self._sections:
+            if self._cache is None:
+                self._load_cache()
+            if name in self._cache:
+                self._sections[name] = json.loads(self._cache[name])
+            else:
+                self._sections[name] = getattr(self, '_parse_' + name)()
+                # Cached before being returned, the caller may modify the section
+                self._cache[name] = json.dumps(self._sections[name])
+                self._save_cache()
+        return self._sections[name]
+
     def port_vlanlist(self, vlanrange):
         vlans = []
         for vlanid in list(map(str.strip, vlanrange.split(','))):
@@ -152,6 +228,10 @@ class Parse_Lab_Graph():
         """
         Parse  the xml graph file
         """
+        for name in ['devices', 'vlanport', 'links', 'consolelinks', 'pdulinks']:
+            self._section(name)
+
+    def _parse_devices(self):
         deviceinfo = {}
         deviceroot = self.root.find(self.pngtag).find('Devices')
         devices = deviceroot.findall('Device')
@@ -172,9 +252,33 @@ class Parse_Lab_Graph():
                     deviceinfo[hostname]['Type'] = devtype
                     deviceinfo[hostname]['CardType'] = card_type
                     deviceinfo[hostname]["HwSkuType"] = hwsku_type
-                    self.links[hostname] = {}
-        devicel2info = {}
         devicel3s = self.root.find(self.dpgtag).findall('DevicesL3Info')
+        if devicel3s is not None:
+            for l3info in devicel3s:
+                hostname = l3info.attrib['Hostname']
+                if hostname is not None:
+                    management_ip = l3info.find('ManagementIPInterface').attrib['Prefix']
+                    deviceinfo[hostname]['ManagementIp'] = management_ip
+                    mgmtip = ipaddress.IPNetwork(management_ip)
+                    deviceinfo[hostname]['mgmtip'] = str(mgmtip.ip)
+                    management_gw = str(mgmtip.network+1)
+                    deviceinfo[hostname]['ManagementGw'] = management_gw
+        for dev in self._console_devices() + self._pdu_devices():
+            hostname = dev.attrib['Hostname']
+            if hostname is not None:
+                deviceinfo[hostname] = {}
+                hwsku = dev.attrib['HwSku']
+                devtype = dev.attrib['Type']
+                protocol = dev.attrib['Protocol']
+                mgmt_ip = dev.attrib['ManagementIp']
+                deviceinfo[hostname]['HwSku'] = hwsku
+                deviceinfo[hostname]['Type'] = devtype
+                deviceinfo[hostname]['Protocol'] = protocol
+                deviceinfo[hostname]['ManagementIp'] = mgmt_ip
+        return deviceinfo
+
+    def _parse_vlanport(self):
+        devicel2info = {}
         devicel2s = self.root.find(self.dpgtag).findall('DevicesL2Info')
         if devicel2s is not None:
             for l2info in devicel2s:
@@ -188,43 +292,51 @@ class Parse_Lab_Graph():
                         portvlanid = vlan.attrib['vlanids']
                         portvlanlist = self.port_vlanlist(portvlanid)
                         devicel2info[hostname][portname] = {'mode': portmode, 'vlanids': portvlanid, 'vlanlist': portvlanlist}
-        if devicel3s is not None:
-            for l3info in devicel3s:
-                hostname = l3info.attrib['Hostname']
-                if hostname is not None:
-                    management_ip = l3info.find('ManagementIPInterface').attrib['Prefix']
-                    deviceinfo[hostname]['ManagementIp'] = management_ip
-                    mgmtip = ipaddress.IPNetwork(management_ip)
-                    deviceinfo[hostname]['mgmtip'] = str(mgmtip.ip)
-                    management_gw = str(mgmtip.network+1)
-                    deviceinfo[hostname]['ManagementGw'] = management_gw
+        return devicel2info
+
+    def _parse_links(self):
+        links = {}
+        for dev in self.root.find(self.pngtag).find('Devices').findall('Device'):
+            if dev.attrib['Hostname'] is not None:
+                links[dev.attrib['Hostname']] = {}
         allinks = self.root.find(self.pngtag).find('DeviceInterfaceLinks').findall('DeviceInterfaceLink')
         if allinks is not None:
             for link in allinks:
                 start_dev = link.attrib['StartDevice']
                 end_dev = link.attrib['EndDevice']
                 if start_dev:
-                    self.links[start_dev][link.attrib['StartPort']] = {'peerdevice':link.attrib['EndDevice'], 'peerport': link.attrib['EndPort'], 'speed': link.attrib['BandWidth']}
+                    links[start_dev][link.attrib['StartPort']] = {'peerdevice':link.attrib['EndDevice'],
+                                                                  'peerport': link.attrib['EndPort'],
+                                                                  'speed': link.attrib['BandWidth']}
                 if end_dev:
-                    self.links[end_dev][link.attrib['EndPort']] = {'peerdevice': link.attrib['StartDevice'], 'peerport': link.attrib['StartPort'], 'speed': link.attrib['BandWidth']}
+                    links[end_dev][link.attrib['EndPort']] = {'peerdevice': link.attrib['StartDevice'],
+                                                              'peerport': link.attrib['StartPort'],
+                                                              'speed': link.attrib['BandWidth']}
+        return links
+
+    def _console_devices(self):
         console_root = self.root.find(self.csgtag)
         if console_root:
-            devicecsgroot = console_root.find('DevicesConsoleInfo')
-            devicescsg = devicecsgroot.findall('DeviceConsoleInfo')
+            devicescsg = console_root.find('DevicesConsoleInfo').findall('DeviceConsoleInfo')
             if devicescsg is not None:
-                for dev in devicescsg:
-                    hostname = dev.attrib['Hostname']
-                    if hostname is not None:
-                        deviceinfo[hostname] = {}
-                        hwsku = dev.attrib['HwSku']
-                        devtype = dev.attrib['Type']
-                        protocol = dev.attrib['Protocol']
-                        mgmt_ip = dev.attrib['ManagementIp']
-                        deviceinfo[hostname]['HwSku'] = hwsku
-                        deviceinfo[hostname]['Type'] = devtype
-                        deviceinfo[hostname]['Protocol'] = protocol
-                        deviceinfo[hostname]['ManagementIp'] = mgmt_ip
-                        self.consolelinks[hostname] = {}
+                return devicescsg
+        return []
+
+    def _pdu_devices(self):
+        pdu_root = self.root.find(self.pcgtag)
+        if pdu_root:
+            devicespcsg = pdu_root.find('DevicesPowerControlInfo').findall('DevicePowerControlInfo')
+            if devicespcsg is not None:
+                return devicespcsg
+        return []
+
+    def _parse_consolelinks(self):
+        consolelinks = {}
+        for dev in self._console_devices():
+            if dev.attrib['Hostname'] is not None:
+                consolelinks[dev.attrib['Hostname']] = {}
+        console_root = self.root.find(self.csgtag)
+        if console_root:
             console_link_root = console_root.find('ConsoleLinksInfo')
             if console_link_root:
                 allconsolelinks = console_link_root.findall('ConsoleLinkInfo')
@@ -240,9 +352,9 @@ class Parse_Lab_Graph():
                         baud_rate = attributes.get('BaudRate')
 
                         if start_dev:
-                            if start_dev not in self.consolelinks:
-                                self.consolelinks.update({start_dev : {}})
-                            self.consolelinks[start_dev][start_port] = {
+                            if start_dev not in consolelinks:
+                                consolelinks.update({start_dev : {}})
+                            consolelinks[start_dev][start_port] = {
                                 'peerdevice': end_dev,
                                 'peerport': end_port,
                                 'proxy':console_proxy,
@@ -250,34 +362,24 @@ class Parse_Lab_Graph():
                                 'baud_rate': baud_rate
                             }
                         if end_dev:
-                            if end_dev not in self.consolelinks:
-                                self.consolelinks.update({end_dev : {}})
-                            self.consolelinks[end_dev][end_port] = {
+                            if end_dev not in consolelinks:
+                                consolelinks.update({end_dev : {}})
+                            consolelinks[end_dev][end_port] = {
                                 'peerdevice': start_dev,
                                 'peerport': start_port,
                                 'proxy':console_proxy,
                                 'type':console_type,
                                 'baud_rate': baud_rate
                             }
+        return consolelinks
 
+    def _parse_pdulinks(self):
+        pdulinks = {}
+        for dev in self._pdu_devices():
+            if dev.attrib['Hostname'] is not None:
+                pdulinks[dev.attrib['Hostname']] = {}
         pdu_root = self.root.find(self.pcgtag)
         if pdu_root:
-            devicepcgroot = pdu_root.find('DevicesPowerControlInfo')
-            devicespcsg = devicepcgroot.findall('DevicePowerControlInfo')
-            if devicespcsg is not None:
-                for dev in devicespcsg:
-                    hostname = dev.attrib['Hostname']
-                    if hostname is not None:
-                        deviceinfo[hostname] = {}
-                        hwsku = dev.attrib['HwSku']
-                        devtype = dev.attrib['Type']
-                        protocol = dev.attrib['Protocol']
-                        mgmt_ip = dev.attrib['ManagementIp']
-                        deviceinfo[hostname]['HwSku'] = hwsku
-                        deviceinfo[hostname]['Type'] = devtype
-                        deviceinfo[hostname]['Protocol'] = protocol
-                        deviceinfo[hostname]['ManagementIp'] = mgmt_ip
-                        self.pdulinks[hostname] = {}
             pdu_link_root = pdu_root.find('PowerControlLinksInfo')
             if pdu_link_root:
                 allpdulinks = pdu_link_root.findall('PowerControlLinkInfo')
@@ -286,17 +388,22 @@ class Parse_Lab_Graph():
                         start_dev = pdulink.attrib['StartDevice']
                         end_dev = pdulink.attrib['EndDevice']
                         logging.debug("pdulink {}".format(pdulink.attrib))
-                        logging.debug("self.pdulinks {}".format(self.pdulinks))
+                        logging.debug("self.pdulinks {}".format(pdulinks))
                         if start_dev:
-                            if start_dev not in self.pdulinks:
-                                self.pdulinks.update({start_dev : {}})
-                            self.pdulinks[start_dev][pdulink.attrib['StartPort']] = {'peerdevice':pdulink.attrib['EndDevice'], 'peerport': pdulink.attrib['EndPort']}
+                            if start_dev not in pdulinks:
+                                pdulinks.update({start_dev : {}})
+                            pdulinks[start_dev][pdulink.attrib['StartPort']] = {
+                                'peerdevice': pdulink.attrib['EndDevice'],
+                                'peerport': pdulink.attrib['EndPort']
+                            }
                         if end_dev:
-                            if end_dev not in self.pdulinks:
-                                self.pdulinks.update({end_dev : {}})
-                            self.pdulinks[end_dev][pdulink.attrib['EndPort']] = {'peerdevice': pdulink.attrib['StartDevice'], 'peerport': pdulink.attrib['StartPort']}
-        self.devices = deviceinfo
-        self.vlanport = devicel2info
+                            if end_dev not in pdulinks:
+                                pdulinks.update({end_dev : {}})
+                            pdulinks[end_dev][pdulink.attrib['EndPort']] = {
+                                'peerdevice': pdulink.attrib['StartDevice'],
+                                'peerport': pdulink.attrib['StartPort']
+                            }
+        return pdulinks
 
     def convert_list2range(self, l):
         """
@@ -359,15 +466,7 @@ class Parse_Lab_Graph():
         return self.links.get(hostname)
 
     def contains_hosts(self, hostnames, part):
-        if not part:
-            return set(hostnames) <= set(self.devices)
-        # It's possible that not all devices are found in connect_graph when using in devutil
-        THRESHOLD = 0.8
-        count = 0
-        for hostname in hostnames:
-            if hostname in self.devices.keys():
-                count += 1
-        return hostnames and (count * 1.0 / len(hostnames) >= THRESHOLD)
+        return graph_contains_hosts(self.devices, hostnames, part)
 
 
     def get_host_console_info(self, hostname):
@@ -428,6 +527,56 @@ class Parse_Lab_Graph():
 LAB_CONNECTION_GRAPH_FILE = 'graph_files.yml'
 EMPTY_GRAPH_FILE = 'empty_graph.xml'
 LAB_GRAPHFILE_PATH = 'files/'
+# Parsed graph sections and the index of hostnames in each graph file, empty to disable caching
+LAB_GRAPH_CACHE_PATH = os.path.join(tempfile.gettempdir(), 'conn_graph_facts_cache_{}'.format(os.getuid()))
+HOST_INDEX_FILE = 'host_index.json'
+
+
+def graph_file_key(filename):
+    """
+    Return the key used for checking whether a graph file is changed
+    """
+    stat = os.stat(filename)
+    return [stat.st_mtime, stat.st_size]
+
+
+def graph_contains_hosts(devices, hostnames, part):
+    if not part:
+        return set(hostnames) <= set(devices)
+    # It's possible that not all devices are found in connect_graph when using in devutil
+    THRESHOLD = 0.8
+    count = 0
+    for hostname in hostnames:
+        if hostname in devices:
+            count += 1
+    return hostnames and (count * 1.0 / len(hostnames) >= THRESHOLD)
+
+
+def load_host_index():
+    """
+    Load the index of hostnames in the graph files, {graph file path: {'key': graph_file_key, 'hosts': hostnames}}
+    """
+    if not LAB_GRAPH_CACHE_PATH:
+        return {}
+    try:
+        with open(os.path.join(LAB_GRAPH_CACHE_PATH, HOST_INDEX_FILE)) as fd:
+            return json.load(fd)
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def save_host_index(host_index):
+    if not LAB_GRAPH_CACHE_PATH:
+        return
+    try:
+        if not os.path.isdir(LAB_GRAPH_CACHE_PATH):
+            os.makedirs(LAB_GRAPH_CACHE_PATH)
+        fd, tmp_file = tempfile.mkstemp(dir=LAB_GRAPH_CACHE_PATH)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(host_index, f)
+        os.rename(tmp_file, os.path.join(LAB_GRAPH_CACHE_PATH, HOST_INDEX_FILE))
+    except (IOError, OSError) as e:
+        logging.debug("Failed to save conn graph host index: %s" % repr(e))
 
 
 def find_graph(hostnames, part=False):
@@ -435,6 +584,9 @@ def find_graph(hostnames, part=False):
     Find a graph file contains all devices in testbed.
     duts are spcified by hostnames
 
+    The hostnames in each graph file are kept in an index, so that only the graph files changed since the last
+    lookup are parsed. The graph is returned unparsed, its sections are parsed when they are used.
+
     Parameters:
         hostnames: list of duts in the target testbed.
         part: select the graph file if over 80% of hosts are found in conn_graph when part is True
@@ -443,16 +595,30 @@ def find_graph(hostnames, part=False):
     with open(filename) as fd:
         file_list = yaml.safe_load(fd)
 
+    host_index = load_host_index()
+    index_changed = False
+    lab_graph = None
     # Finding the graph file contains all duts from hostnames,
     for fn in file_list:
         logging.debug("Looking at conn graph file: %s for hosts %s" % (fn, hostnames))
         filename = os.path.join(LAB_GRAPHFILE_PATH, fn)
         lab_graph = Parse_Lab_Graph(filename)
-        lab_graph.parse_graph()
-        logging.debug("For file %s, got hostnames %s" % (fn, lab_graph.devices))
-        if lab_graph.contains_hosts(hostnames, part):
+        index_key = os.path.abspath(filename)
+        file_key = graph_file_key(filename)
+        entry = host_index.get(index_key)
+        if not entry or entry.get('key') != file_key:
+            entry = {'key': file_key, 'hosts': list(lab_graph.devices)}
+            host_index[index_key] = entry
+            index_changed = True
+        logging.debug("For file %s, got hostnames %s" % (fn, entry['hosts']))
+        if graph_contains_hosts(set(entry['hosts']), hostnames, part):
             logging.debug("Returning lab graph from conn graph file: %s for hosts %s" % (fn, hostnames))
-            return lab_graph
+            break
+        lab_graph = None
+    if index_changed:
+        save_host_index(host_index)
+    if lab_graph:
+        return lab_graph
     # Fallback to return an empty connection graph, this is
     # needed to bridge the kvm test needs. The KVM test needs
     # A graph file, which used to be whatever hardcoded file.
@@ -511,19 +677,27 @@ def build_results(lab_graph, hostnames, ignore_error=False):
 
                 port_name_list_sorted = get_port_name_list(dev['HwSku'])
                 logging.debug("For %s with hwsku %s, port_name_list is %s" % (hostname, dev['HwSku'], port_name_list_sorted))
+                port_name_index = {}
+                for port_index, port_name in enumerate(port_name_list_sorted):
+                    port_name_index.setdefault(port_name, port_index)
+                # Ports of each vlan, in the order of the port vlan list for this hostname
+                vlan_ports = defaultdict(list)
+                for a_port in port_vlans:
+                    for vlan in set(port_vlans[a_port]['vlanlist']):
+                        vlan_ports[vlan].append(a_port)
                 for a_host_vlan in host_vlan["VlanList"]:
                     # Get the corresponding port for this vlan from the port vlan list for this hostname
                     found_port_for_vlan = False
-                    for a_port in port_vlans:
-                        if a_host_vlan in port_vlans[a_port]['vlanlist']:
-                            if a_port in port_name_list_sorted:
-                                port_index = port_name_list_sorted.index(a_port)
-                                device_vlan_map_list[hostname][port_index] = a_host_vlan
-                                found_port_for_vlan = True
-                                break
-                            elif not ignore_error:
-                                msg = "Did not find port for %s in the ports based on hwsku '%s' for host %s" % (a_port, dev['HwSku'], hostname)
-                                return (False, msg)
+                    for a_port in vlan_ports.get(a_host_vlan, []):
+                        if a_port in port_name_index:
+                            port_index = port_name_index[a_port]
+                            device_vlan_map_list[hostname][port_index] = a_host_vlan
+                            found_port_for_vlan = True
+                            break
+                        elif not ignore_error:
+                            msg = "Did not find port for %s in the ports based on hwsku '%s' for host %s" % \
+                                (a_port, dev['HwSku'], hostname)
+                            return (False, msg)
                     if not found_port_for_vlan and not ignore_error:
                         msg = "Did not find corresponding link for vlan %d in %s for host %s" % (a_host_vlan, port_vlans, hostname)
                         return (False, msg)
@@ -30,6 +30,13 @@ Options:
       required: True
       Default: None
 
+    - option-name: index_directory
+      description: a directory for the index files of the rotated log files. The first and last timestamps and
+                   the offsets of the searched start strings in each rotated log file are kept in its index file,
+                   so that later extractions don't need to search the rotated log files again.
+      required: False
+      Default: /tmp/extract_log_index
+
 '''
 
 EXAMPLES = '''
@@ -75,37 +82,27 @@ EXAMPLES = '''
 
 import os
 import gzip
+import json
+import locale
 import re
+import shutil
 import sys
 import hashlib
 import logging
 import logging.handlers
+import tempfile
 import traceback
-from datetime import datetime
+import datetime
 from functools import cmp_to_key
 from ansible.module_utils.basic import *
 
 
 logger = logging.getLogger('ExtractLog')
 
-def extract_lines(directory, filename, target_string):
-    path = os.path.join(directory, filename)
-    file = None
-    if 'gz' in path:
-        file = gzip.open(path, mode='rt')
-    else:
-        file = open(path)
-    result = None
-    with file:
-        # This might be a gunzip file or logrotate issue, there has
-        # been '\x00's in front of the log entry timestamp which
-        # messes up with the comparator.
-        # Prehandle lines to remove these sub-strings
-        dt = datetime.datetime.fromtimestamp(os.path.getctime(path))
-        sz = os.path.getsize(path)
-        result = [(filename, dt, line.replace('\x00', ''), sz) for line in file if target_string in line and 'extract_log' not in line]
-
-    return result
+DEFAULT_INDEX_DIRECTORY = '/tmp/extract_log_index'
+READ_BLOCK_SIZE = 1 << 20
+# Max number of start strings remembered in the index of a rotated log file
+INDEX_MARKERS_LIMIT = 64
 
 
 def extract_number(s):
@@ -119,9 +116,6 @@ def extract_number(s):
 def convert_date(fct, s):
     dt = None
     re_result = re.findall(r'^\S{3}\s{1,2}\d{1,2} \d{2}:\d{2}:\d{2}\.?\d*', s)
-    # Workaround for pytest-ansible
-    loc = locale.getlocale()
-    locale.setlocale(locale.LC_ALL, (None, None))
 
     if len(re_result) > 0:
         str_date = '{:04d} '.format(fct.year) + re_result[0]
@@ -134,7 +128,7 @@ def convert_date(fct, s):
         # but we still perform some wrap around test to avoid the race condition
         # 183 is the number of days in half year, just a reasonable choice
         if (dt - fct).days > 183:
-            dt.replace(year = dt.year - 1)
+            dt = dt.replace(year = dt.year - 1)
     else:
         re_result = re.findall(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}', s)
         if len(re_result) > 0:
@@ -146,29 +140,10 @@ def convert_date(fct, s):
             if len(re_result) > 0:
                 str_date = re_result[0]
                 dt = datetime.datetime.strptime(str_date, '%Y-%m-%d.%X.%f')
-    locale.setlocale(locale.LC_ALL, loc)
 
     return dt
 
 
-def comparator(l, r):
-    nl = extract_number(l[0])
-    nr = extract_number(r[0])
-    if nl == nr:
-        dl = convert_date(l[1], l[2])
-        dr = convert_date(r[1], r[2])
-        if dl == dr:
-            return 0
-        elif dl < dr:
-            return -1
-        else:
-            return 1
-    elif nl > nr:
-        return -1
-    else:
-        return 1
-
-
 def filename_comparator(l, r):
     """Compares log filenames, assumes file with greater number is
     older, e.g syslog.2 is older than syslog.1. This is how logrotate is currently configured.
@@ -198,78 +173,200 @@ def list_files(directory, prefixname):
             if filename.startswith(prefixname)], key=cmp_to_key(filename_comparator))
 
 
-def extract_latest_line_with_string(directory, filenames, start_string):
-    """Extracts latest line with string @start_string. Assumes @filenames are sorted
-    and first file in @filenames is the newest log file"""
-
-    target_lines = []
-    for filename in filenames:
-        extracted_lines = extract_lines(directory, filename, start_string)
-        if extracted_lines:
-            # found lines are the lates since we start from the newest file
-            # assignt to target_lines and break the loop
-            target_lines = extracted_lines
-            break
-
-    # find the latest line from traget_lines comparing by date in line
-    target = target_lines[0] if len(target_lines) > 0 else None
-    for line in target_lines:
-        if comparator(line, target) > 0:
-            target = line
-
-    if target is None:
-        raise Exception("{} was not found in {}".format(start_string, directory))
-
-    return target
-
+def open_log(path):
+    if 'gz' in path:
+        return gzip.open(path, mode='rb')
+    return open(path, 'rb')
 
-def calculate_files_to_copy(filenames, file_with_latest_line):
-    files_to_copy = filenames[:filenames.index(file_with_latest_line) + 1]
-    return files_to_copy
 
+def parse_timestamp(path, line):
+    """Returns the timestamp of a log line as a string, or None if the line has no timestamp"""
+    fct = datetime.datetime.fromtimestamp(os.path.getctime(path))
+    try:
+        dt = convert_date(fct, line.decode('utf-8', 'replace'))
+    except ValueError:
+        return None
+    return str(dt) if dt else None
+
+
+class LogIndex(object):
+    """Index of a rotated log file, saved in a sidecar file of the index directory.
+
+    A rotated log file doesn't change until it is rotated again, which changes its size and modification time.
+    The index keeps the timestamps of the first and last lines of the file and, for each searched start string,
+    the offset of the first line containing it and whether the start string was found in a line which is
+    not an output of this module.
+    """
+
+    def __init__(self, index_directory, path):
+        self.index_file = os.path.join(index_directory, path.strip('/').replace('/', '_') + '.json')
+        stat = os.stat(path)
+        self.key = [stat.st_size, stat.st_mtime]
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.markers = []
+        try:
+            with open(self.index_file) as f:
+                index = json.load(f)
+            if index['key'] == self.key:
+                self.first_timestamp = index['first_timestamp']
+                self.last_timestamp = index['last_timestamp']
+                self.markers = index['markers']
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def lookup(self, target_string):
+        """Returns (found, offset) of the start string, or None if the file wasn't searched for it"""
+        for marker, found, offset in self.markers:
+            if marker == target_string:
+                return found, offset
+        return None
+
+    def update(self, target_string, found, offset, first_timestamp, last_timestamp):
+        self.markers = [entry for entry in self.markers if entry[0] != target_string]
+        self.markers.append([target_string, found, offset])
+        self.markers = self.markers[-INDEX_MARKERS_LIMIT:]
+        self.first_timestamp = first_timestamp
+        self.last_timestamp = last_timestamp
+        try:
+            if not os.path.isdir(os.path.dirname(self.index_file)):
+                os.makedirs(os.path.dirname(self.index_file))
+            tmp_file = self.index_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump({'key': self.key, 'first_timestamp': first_timestamp,
+                           'last_timestamp': last_timestamp, 'markers': self.markers}, f)
+            os.rename(tmp_file, self.index_file)
+        except (IOError, OSError) as e:
+            logger.debug("extract_log failed to save index {}: {}".format(self.index_file, repr(e)))
+
+
+def scan_log(path, target_string, spool=None):
+    """Reads a log file once, searching for the lines with @target_string.
+    If @spool is given, the content of the file is copied into it.
+
+    Returns (found, offset, latest_line, first_timestamp, last_timestamp), where @offset is the offset
+    of the first line containing @target_string or -1, @found tells if @target_string is in a line
+    which is not an output of this module and @latest_line is the last one of these lines"""
+
+    target = target_string.encode('utf-8')
+    found = False
+    first_offset = -1
+    latest_line = None
+    first_line = None
+    last_line = b''
+    offset = 0      # offset in the file of the beginning of carry
+    carry = b''
+    with open_log(path) as f:
+        while True:
+            block = f.read(READ_BLOCK_SIZE)
+            if spool is not None and block:
+                spool.write(block)
+            data = carry + block
+            end = len(data) if not block else data.rfind(b'\n') + 1
+            if first_line is None and (end > 0 or not block):
+                first_line = data[:data.find(b'\n') + 1 if b'\n' in data else len(data)]
+            pos = data.find(target, 0, end)
+            while pos != -1:
+                line_start = data.rfind(b'\n', 0, pos) + 1
+                line_end = data.find(b'\n', pos, end)
+                line_end = end if line_end == -1 else line_end + 1
+                line = data[line_start:line_end]
+                if first_offset == -1:
+                    first_offset = offset + line_start
+                # This might be a gunzip file or logrotate issue, there has
+                # been '\x00's in front of the log entry timestamp
+                if b'extract_log' not in line:
+                    found = True
+                    latest_line = line.replace(b'\x00', b'')
+                pos = data.find(target, line_end, end)
+            if end > 0:
+                last_end = data.rfind(b'\n', 0, end - 1) + 1
+                last_line = data[last_end:end]
+            offset += end
+            carry = data[end:]
+            if not block:
+                break
+
+    first_timestamp = parse_timestamp(path, first_line.replace(b'\x00', b'')) if first_line else None
+    last_timestamp = parse_timestamp(path, last_line) if last_line else None
+    return found, first_offset, latest_line, first_timestamp, last_timestamp
+
+
+def copy_log(source, offset, fp):
+    """Copies the content of file object @source from @offset to file object @fp"""
+    source.seek(offset)
+    shutil.copyfileobj(source, fp, READ_BLOCK_SIZE)
+
+
+def extract_log(directory, prefixname, target_string, target_filename, index_directory=DEFAULT_INDEX_DIRECTORY):
+    """Saves the lines of the log files in @directory starting with @prefixname, from the first line with
+    @target_string of the newest log file which has it, to @target_filename.
+
+    The log files are read from the newest to the oldest, each of them at most once, and the files older
+    than the file with @target_string are not read. The rotated log files are indexed, so that they are only
+    copied without searching @target_string when the same start string is extracted again."""
 
-def combine_logs_and_save(directory, filenames, start_string, target_string, target_filename):
-    do_copy = False
-    line_processed = 0
-    line_copied = 0
-    with open(target_filename, 'w') as fp:
-        for filename in reversed(filenames):
-            path = os.path.join(directory, filename)
-            dt = datetime.datetime.fromtimestamp(os.path.getctime(path))
-            sz = os.path.getsize(path)
-            logger.debug("extract_log combine_logs from file {} create time {}, size {}".format(path, dt, sz))
-            file = None
-            if 'gz' in path:
-                file = gzip.open(path, mode='rt')
-            else:
-                file = open(path)
-
-            with file:
-                for line in file:
-                    line_processed += 1
-                    if do_copy == False:
-                        if line == start_string or target_string in line:
-                            do_copy = True
-                            fp.write(line)
-                            line_copied += 1
-                    else:
-                        fp.write(line)
-                        line_copied += 1
-
-            logger.debug("extract_log combine_logs from file {}, {} lines processed, {} lines copied".format(path, line_processed, line_copied))
-
-
-def extract_log(directory, prefixname, target_string, target_filename):
     logger.debug("extract_log for start string {}".format(target_string.replace("start-", "")))
     filenames = list_files(directory, prefixname)
     logger.debug("extract_log from files {}".format(filenames))
-    file_with_latest_line, file_create_time, latest_line, file_size = extract_latest_line_with_string(directory, filenames, target_string)
-    m = hashlib.md5()
-    m.update(latest_line.encode('utf-8'))
-    logger.debug("extract_log start file {} size {}, ctime {}, latest line md5sum {}".format(file_with_latest_line, file_size, file_create_time, m.hexdigest()))
-    files_to_copy = calculate_files_to_copy(filenames, file_with_latest_line)
-    logger.debug("extract_log subsequent files {}".format(files_to_copy))
-    combine_logs_and_save(directory, files_to_copy, latest_line, target_string, target_filename)
+
+    # Log files newer than the file with the start string, and their spooled content if they were read
+    newer_files = []
+    start = None
+    target_dir = os.path.dirname(os.path.abspath(target_filename))
+    try:
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            index = None
+            if extract_number(filename) > 0:
+                # Rotated log file
+                index = LogIndex(index_directory, path)
+                indexed = index.lookup(target_string)
+                if indexed is not None:
+                    found, offset = indexed
+                    logger.debug("extract_log file {} indexed, first line {}, last line {}".format(
+                        filename, index.first_timestamp, index.last_timestamp))
+                    if found:
+                        start = (path, None, offset, None)
+                        break
+                    newer_files.append((path, None))
+                    continue
+
+            spool = tempfile.TemporaryFile(dir=target_dir) if 'gz' in path else None
+            found, offset, latest_line, first_timestamp, last_timestamp = scan_log(path, target_string, spool)
+            logger.debug("extract_log file {} searched, first line {}, last line {}".format(
+                filename, first_timestamp, last_timestamp))
+            if index:
+                index.update(target_string, found, offset, first_timestamp, last_timestamp)
+            if found:
+                start = (path, spool, offset, latest_line)
+                break
+            newer_files.append((path, spool))
+
+        if start is None:
+            raise Exception("{} was not found in {}".format(target_string, directory))
+
+        path, spool, offset, latest_line = start
+        if latest_line is not None:
+            m = hashlib.md5()
+            m.update(latest_line)
+            logger.debug("extract_log start file {} size {}, latest line md5sum {}".format(
+                path, os.path.getsize(path), m.hexdigest()))
+        logger.debug("extract_log subsequent files {}".format([newer[0] for newer in newer_files]))
+
+        with open(target_filename, 'wb') as fp:
+            for path, spool, offset in [(path, spool, offset)] + [newer + (0,) for newer in reversed(newer_files)]:
+                if spool:
+                    copy_log(spool, offset, fp)
+                else:
+                    with open_log(path) as source:
+                        copy_log(source, offset, fp)
+                logger.debug("extract_log combine_logs from file {}, {} bytes copied".format(path, fp.tell()))
+    finally:
+        for _, spool in newer_files + ([start[:2]] if start else []):
+            if spool:
+                spool.close()
+
     filenames = list_files(directory, prefixname)
     logger.debug("extract_log check logs files {}".format(filenames))
 
@@ -281,6 +378,7 @@ def main():
             file_prefix=dict(required=True, type='str'),
             start_string=dict(required=True, type='str'),
             target_filename=dict(required=True, type='str'),
+            index_directory=dict(required=False, type='str', default=DEFAULT_INDEX_DIRECTORY),
         ),
         supports_check_mode=False)
 
@@ -290,11 +388,17 @@ def main():
 
     p = module.params
 
+    # Workaround for pytest-ansible
+    loc = locale.getlocale()
+    locale.setlocale(locale.LC_ALL, (None, None))
     try:
-        extract_log(p['directory'], p['file_prefix'], p['start_string'], p['target_filename'])
+        extract_log(p['directory'], p['file_prefix'], p['start_string'], p['target_filename'],
+                    p['index_directory'])
     except:
         tb = traceback.format_exc()
         module.fail_json(msg=tb)
+    finally:
+        locale.setlocale(locale.LC_ALL, loc)
     module.exit_json()
 
 
@@ -0,0 +1,130 @@
+'''
+Description:    Burst mode of the ECMP/LAG balancing checks of the PTF FIB and hash tests.
+
+                The packets of all the flows of a balancing check are built beforehand, each of them carrying a flow ID
+                at the beginning of its TCP payload. They are sent back to back and the dataplane receive queues are
+                drained once for the whole burst, the received packets are attributed to their flow by the flow ID.
+                Flows not received in the burst, e.g. dropped by the kernel of the PTF host, are sent again one at a
+                time and verified with verify_packet_any_port as in the per-packet mode.
+'''
+
+import itertools
+import logging
+import struct
+
+import ptf
+import ptf.packet as scapy
+
+from ptf.testutils import dp_poll
+from ptf.testutils import send_packet
+from ptf.testutils import verify_packet_any_port
+
+BURST_TAG = b'PTFBURST'
+FLOW_ID = struct.Struct('!I')
+DEFAULT_BURST_SIZE = 1000
+DRAIN_TIMEOUT = 1
+
+# Flow IDs are unique in a PTF run, so that late packets of a previous burst are never attributed to a new flow
+_flow_ids = itertools.count()
+
+
+class Flow(object):
+    '''
+    @summary: A packet sent to the switch and the expected packet forwarded on one of the destination ports
+    '''
+    def __init__(self, flow_id, src_port, pkt, exp_pkt, dst_ports):
+        self.flow_id = flow_id
+        self.src_port = src_port
+        self.pkt = pkt
+        self.exp_pkt = exp_pkt
+        self.dst_ports = dst_ports
+
+
+def new_flow_id():
+    return next(_flow_ids) % (1 << 32)
+
+
+def tag_packet(pkt, flow_id):
+    '''
+    @summary: Write the flow ID at the beginning of the payload of the packet, keeping the packet length
+    @param pkt: scapy packet, must be tagged before a Mask is built from it
+    @param flow_id: ID returned by new_flow_id
+    @return Boolean, False if the packet has no payload large enough for the flow ID
+    '''
+    if scapy.TCP not in pkt:
+        return False
+    payload = pkt[scapy.TCP].payload
+    tag = BURST_TAG + FLOW_ID.pack(flow_id)
+    load = bytes(getattr(payload, 'load', b''))
+    if len(load) < len(tag):
+        return False
+    payload.load = tag + load[len(tag):]
+    return True
+
+
+def get_flow_id(data):
+    '''
+    @summary: Get the flow ID of a received packet
+    @param data: bytes of the received packet
+    @return flow ID, None if the packet is not tagged
+    '''
+    index = data.find(BURST_TAG)
+    if index < 0 or index + len(BURST_TAG) + FLOW_ID.size > len(data):
+        return None
+    return FLOW_ID.unpack_from(data, index + len(BURST_TAG))[0]
+
+
+def send_burst(test, flows, timeout=DRAIN_TIMEOUT):
+    '''
+    @summary: Send the packets of the flows back to back and drain the dataplane receive queues once
+    @param test: the PTF test
+    @param flows: list of Flow
+    @param timeout: seconds to wait for the next packet before giving up on the flows not received yet
+    @return dict of flow ID to (rcvd_port, rcvd_pkt) of the flows received on one of their destination ports
+    '''
+    test.dataplane.flush()
+    for flow in flows:
+        send_packet(test, flow.src_port, flow.pkt)
+
+    pending = dict((flow.flow_id, flow) for flow in flows)
+    received = {}
+    while pending:
+        result = dp_poll(test, timeout=timeout)
+        if not isinstance(result, test.dataplane.PollSuccess):
+            break
+        flow = pending.get(get_flow_id(result.packet))
+        # Skip packets not sent by this burst and packets that the switch didn't forward as expected, the latter
+        # are verified again one at a time
+        if flow is None or not ptf.dataplane.match_exp_pkt(flow.exp_pkt, result.packet):
+            continue
+        if result.port not in flow.dst_ports:
+            test.fail("Received expected packet of flow {} on port {}, but it should have arrived on one of these "
+                      "ports: {}".format(flow.flow_id, result.port, flow.dst_ports))
+        received[flow.flow_id] = (result.port, result.packet)
+        del pending[flow.flow_id]
+    return received
+
+
+def send_flows(test, flows, burst_size=DEFAULT_BURST_SIZE, timeout=DRAIN_TIMEOUT):
+    '''
+    @summary: Send the flows in bursts of burst_size packets and verify that each of them is forwarded
+    @param test: the PTF test
+    @param flows: list of Flow
+    @param burst_size: number of packets sent back to back before draining the receive queues
+    @param timeout: seconds to wait for the next packet of a burst
+    @return list of (flow, rcvd_port, rcvd_pkt) in the order of the flows
+    '''
+    results = []
+    for start in range(0, len(flows), burst_size):
+        flows_in_burst = flows[start:start + burst_size]
+        received = send_burst(test, flows_in_burst, timeout)
+        missed = [flow for flow in flows_in_burst if flow.flow_id not in received]
+        if missed:
+            logging.info('{} of {} flows were not received in the burst, verifying them one at a time'
+                         .format(len(missed), len(flows_in_burst)))
+        for flow in missed:
+            send_packet(test, flow.src_port, flow.pkt)
+            rcvd_port_index, rcvd_pkt = verify_packet_any_port(test, flow.exp_pkt, flow.dst_ports)
+            received[flow.flow_id] = (flow.dst_ports[rcvd_port_index], rcvd_pkt)
+        results.extend((flow,) + received[flow.flow_id] for flow in flows_in_burst)
+    return results
@@ -1,8 +1,14 @@
+import hashlib
+import logging
+import os
 import re
 import six
+import sys
+import tempfile
 
-from ipaddress import ip_address, ip_network
-from lpm import LpmDict
+from ipaddress import ip_address
+from six.moves import cPickle as pickle
+from lpm import LpmDict, parse_prefix
 
 # These subnets are excluded from FIB test
 # reference: RFC 5735 Special Use IPv4 Addresses
@@ -25,26 +31,42 @@ EXCLUDE_IPV6_PREFIXES = [
         'ff00::/8'              # Multicast             RFC 4291
         ]
 
-class Fib():
-    class NextHop():
-        def __init__(self, next_hop = ''):
-            self._next_hop = []
-            matches = re.findall('\[([\s\d]+)\]', next_hop)
-            for match in matches:
-                self._next_hop.append([int(s) for s in match.split()])
+# The parsed FIB of a FIB file is cached there, so that the PTF tests run with the same FIB file don't parse it again
+FIB_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'ptf_fib_cache')
+FIB_CACHE_VERSION = 1
+
+
+# Defined at module level to be pickled in the FIB cache
+class NextHop():
+    def __init__(self, next_hop = ''):
+        self._next_hop = []
+        matches = re.findall('\[([\s\d]+)\]', next_hop)
+        for match in matches:
+            self._next_hop.append([int(s) for s in match.split()])
+
+    def __str__(self):
+        return str(self._next_hop)
 
-        def __str__(self):
-            return str(self._next_hop)
+    def get_next_hop(self):
+        return self._next_hop
 
-        def get_next_hop(self):
-            return self._next_hop
+    def get_next_hop_list(self):
+        port_list = [p for intf in self._next_hop for p in intf]
+        return port_list
 
-        def get_next_hop_list(self):
-            port_list = [p for intf in self._next_hop for p in intf]
-            return port_list
+
+class Fib():
+    NextHop = NextHop
 
     # Initialize FIB with FIB file
-    def __init__(self, file_path):
+    def __init__(self, file_path, cache_dir=FIB_CACHE_DIR):
+        cache_file = None
+        if cache_dir:
+            cache_name = 'fib_{}_py{}.pickle'.format(self._digest(file_path), sys.version_info[0])
+            cache_file = os.path.join(cache_dir, cache_name)
+            if self._load_cache(cache_file):
+                return
+
         self._ipv4_lpm_dict = LpmDict()
         for ip in EXCLUDE_IPV4_PREFIXES:
             self._ipv4_lpm_dict[ip] = self.NextHop()
@@ -56,30 +78,77 @@ class Fib():
         # filter out empty lines and lines starting with '#'
         pattern = re.compile("^#.*$|^[ \t]*$")
 
+        # Routes share a few ECMP groups, parse each of them once
+        next_hops = {}
+        prefixes = {4: [], 6: []}
         with open(file_path, 'r') as f:
-            for line in f.readlines():
+            for line in f:
                 if pattern.match(line): continue
                 entry = line.split(' ', 1)
-                prefix = ip_network(six.text_type(entry[0]))
-                next_hop = self.NextHop(entry[1])
-                if prefix.version is 4:
-                    self._ipv4_lpm_dict[str(prefix)] = next_hop
-                elif prefix.version is 6:
-                    self._ipv6_lpm_dict[str(prefix)] = next_hop
+                version, network, prefixlen = parse_prefix(entry[0])
+                next_hop = next_hops.get(entry[1])
+                if next_hop is None:
+                    next_hop = next_hops[entry[1]] = self.NextHop(entry[1])
+                prefixes[version].append(((network, prefixlen), next_hop))
+        self._ipv4_lpm_dict.update(prefixes[4])
+        self._ipv6_lpm_dict.update(prefixes[6])
+
+        if cache_file:
+            self._save_cache(cache_file)
+
+    @staticmethod
+    def _digest(file_path):
+        '''
+        @summary: Hash of the FIB file content and of the excluded prefixes
+        '''
+        digest = hashlib.sha1()
+        digest.update('{} {} {}'.format(FIB_CACHE_VERSION, EXCLUDE_IPV4_PREFIXES, EXCLUDE_IPV6_PREFIXES).encode())
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load_cache(self, cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                self._ipv4_lpm_dict, self._ipv6_lpm_dict = pickle.load(f)
+        except (IOError, OSError):
+            return False
+        except Exception as e:
+            logging.warning('Failed to load FIB cache {}: {}'.format(cache_file, repr(e)))
+            return False
+        return True
+
+    def _save_cache(self, cache_file):
+        # Write a temporary file and rename it, the FIB file can be parsed by several PTF tests at the same time
+        tmp_file = '{}.{}.tmp'.format(cache_file, os.getpid())
+        try:
+            if not os.path.isdir(os.path.dirname(cache_file)):
+                os.makedirs(os.path.dirname(cache_file))
+            with open(tmp_file, 'wb') as f:
+                pickle.dump((self._ipv4_lpm_dict, self._ipv6_lpm_dict), f, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp_file, cache_file)
+        except Exception as e:
+            logging.warning('Failed to save FIB cache {}: {}'.format(cache_file, repr(e)))
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
 
     def __getitem__(self, ip):
         ip = ip_address(six.text_type(ip))
-        if ip.version is 4:
-            return self._ipv4_lpm_dict[str(ip)]
-        elif ip.version is 6:
-            return self._ipv6_lpm_dict[str(ip)]
+        if ip.version == 4:
+            next_hop = self._ipv4_lpm_dict.lookup(int(ip))
+        else:
+            next_hop = self._ipv6_lpm_dict.lookup(int(ip))
+        if next_hop is None:
+            raise KeyError(str(ip))
+        return next_hop
 
     def __contains__(self, ip):
         ip_obj = ip_address(six.text_type(ip))
         if ip_obj.version == 4:
-            return self._ipv4_lpm_dict.contains(ip)
+            return self._ipv4_lpm_dict.lookup(int(ip_obj)) is not None
         elif ip_obj.version == 6:
-            return self._ipv6_lpm_dict.contains(ip)
+            return self._ipv6_lpm_dict.lookup(int(ip_obj)) is not None
 
     def ipv4_ranges(self):
         return self._ipv4_lpm_dict.ranges()
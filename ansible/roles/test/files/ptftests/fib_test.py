@@ -34,6 +34,7 @@ from ptf.testutils import send_packet
 from ptf.testutils import verify_packet_any_port
 from ptf.testutils import verify_no_packet_any
 
+import burst
 import fib
 import macsec
 
@@ -110,6 +111,9 @@ class FibTest(BaseTest):
          - dst_vid                vlan tag id of dst pkts. Default: None(untag)
          - ignore_ttl:            mask the ttl field in the expected packet
          - single_fib_for_duts:   have a single fib file for all DUTs in multi-dut case. Default: False
+         - burst_mode:            send the flows of the balancing test in bursts instead of one at a time.
+                                  Default: False
+         - burst_size:            number of packets sent back to back in burst mode. Default: 1000
         '''
         self.dataplane = ptf.dataplane_instance
         self.asic_type = self.test_params.get('asic_type')
@@ -159,6 +163,8 @@ class FibTest(BaseTest):
 
         self.ignore_ttl = self.test_params.get('ignore_ttl', False)
         self.single_fib = self.test_params.get('single_fib_for_duts', "multiple-fib")
+        self.burst_mode = self.test_params.get('burst_mode', False)
+        self.burst_size = self.test_params.get('burst_size', burst.DEFAULT_BURST_SIZE)
 
     def check_ip_ranges(self, ipv4=True):
         for dut_index, fib in enumerate(self.fibs):
@@ -255,9 +261,13 @@ class FibTest(BaseTest):
                 # Change balancing_test_times according to number of next hop groups
                 logging.info('Checking ip range balancing {}, src_port={}, exp_ports={}, dst_ip={}, dut_index={}'\
                     .format(ip_range, src_port, exp_port_lists, dst_ip, dut_index))
-                for i in range(0, self.balancing_test_times*len(list(itertools.chain(*exp_port_lists)))):
-                    (matched_port, _) = self.check_ip_route(src_port, dst_ip, exp_port_lists, ipv4)
-                    hit_count_map[matched_port] = hit_count_map.get(matched_port, 0) + 1
+                flow_count = self.balancing_test_times*len(list(itertools.chain(*exp_port_lists)))
+                if self.burst_mode:
+                    hit_count_map = self.check_ip_route_burst(src_port, dst_ip, exp_port_lists, flow_count, ipv4)
+                else:
+                    for i in range(0, flow_count):
+                        (matched_port, _) = self.check_ip_route(src_port, dst_ip, exp_port_lists, ipv4)
+                        hit_count_map[matched_port] = hit_count_map.get(matched_port, 0) + 1
                 for next_hop in next_hops:
                     # only check balance on a DUT
                     self.check_hit_count_map(next_hop.get_next_hop(), hit_count_map)
@@ -283,17 +293,62 @@ class FibTest(BaseTest):
 
         return (matched_port, received)
 
-    def check_ipv4_route(self, src_port, dst_ip_addr, dst_port_lists):
+    def check_ip_route_burst(self, src_port, dst_ip_addr, dst_port_lists, flow_count, ipv4=True):
         '''
-        @summary: Check IPv4 route works.
-        @param src_port: index of port to use for sending packet to switch
-        @param dest_ip_addr: destination IP to build packet with.
-        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
+        @summary: Send flows with random L4 ports in bursts and check that each of them is forwarded.
+        @param src_port: index of port to use for sending packets to switch
+        @param dst_ip_addr: destination IP to build packets with.
+        @param dst_port_lists: list of ports on which to expect packets to come back from the switch
+        @param flow_count: number of flows to send
+        @return dict of the number of packets received on each port
+        '''
+        dst_ports = list(itertools.chain(*dst_port_lists))
+        ip_src = "30.0.0.1" if ipv4 else '2000:0030::1'
+        flows = []
+        for _ in range(flow_count):
+            sport = random.randint(0, 65535)
+            dport = random.randint(0, 65535)
+            flow_id = burst.new_flow_id()
+            if ipv4:
+                pkt, masked_exp_pkt = self.build_ipv4_packets(src_port, ip_src, dst_ip_addr, sport, dport, flow_id)
+            else:
+                pkt, masked_exp_pkt = self.build_ipv6_packets(src_port, ip_src, dst_ip_addr, sport, dport, flow_id)
+            flows.append(burst.Flow(flow_id, src_port, pkt, masked_exp_pkt, dst_ports))
+        logging.info('Sending {} flows from port {} to {} in bursts of {} packets'
+                     .format(flow_count, src_port, dst_ip_addr, self.burst_size))
+
+        hit_count_map = {}
+        for _, rcvd_port, rcvd_pkt in burst.send_flows(self, flows, self.burst_size):
+            self.check_src_mac(ip_src, dst_ip_addr, src_port, rcvd_port, rcvd_pkt, dst_port_lists)
+            hit_count_map[rcvd_port] = hit_count_map.get(rcvd_port, 0) + 1
+        logging.info('hit count map: {}'.format(hit_count_map))
+        return hit_count_map
+
+    def check_src_mac(self, ip_src, ip_dst, src_port, rcvd_port, rcvd_pkt, dst_port_lists):
+        '''
+        @summary: Check that the packet was forwarded by the DUT connected to the port it was received on.
+        '''
+        exp_src_mac = None
+        if len(self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"]) > 1:
+            # active-active dualtor, the packet could be received from either ToR, so use the received
+            # port to find the corresponding ToR
+            for dut_index, port_list in enumerate(dst_port_lists):
+                if rcvd_port in port_list:
+                    exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][dut_index]
+        else:
+            exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][0]
+        actual_src_mac = scapy.Ether(rcvd_pkt).src
+        if exp_src_mac != actual_src_mac:
+            raise Exception("Pkt sent from {} to {} on port {} was rcvd pkt on {} which is one of the expected ports, "
+                            "but the src mac doesn't match, expected {}, got {}".
+                            format(ip_src, ip_dst, src_port, rcvd_port, exp_src_mac, actual_src_mac))
+
+    def build_ipv4_packets(self, src_port, ip_src, ip_dst, sport, dport, flow_id=None):
+        '''
+        @summary: Build the IPv4 packet to send to the switch and the masked packet expected back.
+        @param flow_id: flow ID written in the payload of the packets in burst mode
+        @return (pkt, masked_exp_pkt)
         '''
-        sport = random.randint(0, 65535)
-        dport = random.randint(0, 65535)
-        ip_src = "30.0.0.1"
-        ip_dst = dst_ip_addr
         src_mac = self.dataplane.get_mac(0, src_port)
 
         router_mac = self.ptf_test_port_map[str(src_port)]['target_dest_mac']
@@ -320,6 +375,9 @@ class FibTest(BaseTest):
                             ip_options=self.ip_options,
                             dl_vlan_enable=self.dst_vid is not None,
                             vlan_vid=self.dst_vid or 0)
+        if flow_id is not None:
+            burst.tag_packet(pkt, flow_id)
+            burst.tag_packet(exp_pkt, flow_id)
         masked_exp_pkt = Mask(exp_pkt)
         masked_exp_pkt.set_do_not_care_scapy(scapy.Ether, "dst")
         masked_exp_pkt.set_do_not_care_scapy(scapy.Ether, "src")
@@ -330,6 +388,22 @@ class FibTest(BaseTest):
             masked_exp_pkt.set_do_not_care_scapy(scapy.IP, "chksum")
             masked_exp_pkt.set_do_not_care_scapy(scapy.TCP, "chksum")
 
+        return pkt, masked_exp_pkt
+
+    def check_ipv4_route(self, src_port, dst_ip_addr, dst_port_lists):
+        '''
+        @summary: Check IPv4 route works.
+        @param src_port: index of port to use for sending packet to switch
+        @param dest_ip_addr: destination IP to build packet with.
+        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
+        '''
+        sport = random.randint(0, 65535)
+        dport = random.randint(0, 65535)
+        ip_src = "30.0.0.1"
+        ip_dst = dst_ip_addr
+
+        pkt, masked_exp_pkt = self.build_ipv4_packets(src_port, ip_src, ip_dst, sport, dport)
+
         send_packet(self, src_port, pkt)
         logging.info('Sent Ether(src={}, dst={})/IP(src={}, dst={})/TCP(sport={}, dport={}) on port {}'\
             .format(pkt.src,
@@ -354,38 +428,19 @@ class FibTest(BaseTest):
             len_rcvd_pkt = len(rcvd_pkt)
             logging.info('Recieved packet at port {} and packet is {} bytes'.format(rcvd_port,len_rcvd_pkt))
             logging.info('Recieved packet with length of {}'.format(len_rcvd_pkt))
-            exp_src_mac = None
-            if len(self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"]) > 1:
-                # active-active dualtor, the packet could be received from either ToR, so use the received
-                # port to find the corresponding ToR
-                for dut_index, port_list in enumerate(dst_port_lists):
-                    if rcvd_port in port_list:
-                        exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][dut_index]
-            else:
-                exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][0]
-            actual_src_mac = Ether(rcvd_pkt).src
-            if exp_src_mac != actual_src_mac:
-                raise Exception("Pkt sent from {} to {} on port {} was rcvd pkt on {} which is one of the expected ports, "
-                                "but the src mac doesn't match, expected {}, got {}".
-                                format(ip_src, ip_dst, src_port, rcvd_port, exp_src_mac, actual_src_mac))
+            self.check_src_mac(ip_src, ip_dst, src_port, rcvd_port, rcvd_pkt, dst_port_lists)
             return (rcvd_port, rcvd_pkt)
         elif self.pkt_action == self.ACTION_DROP:
             verify_no_packet_any(self, masked_exp_pkt, dst_ports)
             return (None, None)
     #---------------------------------------------------------------------
 
-    def check_ipv6_route(self, src_port, dst_ip_addr, dst_port_lists):
+    def build_ipv6_packets(self, src_port, ip_src, ip_dst, sport, dport, flow_id=None):
         '''
-        @summary: Check IPv6 route works.
-        @param source_port_index: index of port to use for sending packet to switch
-        @param dest_ip_addr: destination IP to build packet with.
-        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
-        @return Boolean
+        @summary: Build the IPv6 packet to send to the switch and the masked packet expected back.
+        @param flow_id: flow ID written in the payload of the packets in burst mode
+        @return (pkt, masked_exp_pkt)
         '''
-        sport = random.randint(0, 65535)
-        dport = random.randint(0, 65535)
-        ip_src = '2000:0030::1'
-        ip_dst = dst_ip_addr
         src_mac = self.dataplane.get_mac(0, src_port)
 
         router_mac = self.ptf_test_port_map[str(src_port)]['target_dest_mac']
@@ -410,6 +465,9 @@ class FibTest(BaseTest):
                                 ipv6_hlim=max(self.ttl-1, 0),
                                 dl_vlan_enable=self.dst_vid is not None,
                                 vlan_vid=self.dst_vid or 0)
+        if flow_id is not None:
+            burst.tag_packet(pkt, flow_id)
+            burst.tag_packet(exp_pkt, flow_id)
         masked_exp_pkt = Mask(exp_pkt)
         masked_exp_pkt.set_do_not_care_scapy(scapy.Ether,"dst")
         masked_exp_pkt.set_do_not_care_scapy(scapy.Ether,"src")
@@ -419,6 +477,23 @@ class FibTest(BaseTest):
             masked_exp_pkt.set_do_not_care_scapy(scapy.IPv6, "hlim")
             masked_exp_pkt.set_do_not_care_scapy(scapy.TCP, "chksum")
 
+        return pkt, masked_exp_pkt
+
+    def check_ipv6_route(self, src_port, dst_ip_addr, dst_port_lists):
+        '''
+        @summary: Check IPv6 route works.
+        @param source_port_index: index of port to use for sending packet to switch
+        @param dest_ip_addr: destination IP to build packet with.
+        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
+        @return Boolean
+        '''
+        sport = random.randint(0, 65535)
+        dport = random.randint(0, 65535)
+        ip_src = '2000:0030::1'
+        ip_dst = dst_ip_addr
+
+        pkt, masked_exp_pkt = self.build_ipv6_packets(src_port, ip_src, ip_dst, sport, dport)
+
         send_packet(self, src_port, pkt)
         logging.info('Sent Ether(src={}, dst={})/IPv6(src={}, dst={})/TCP(sport={}, dport={}) on port {}'\
             .format(pkt.src,
@@ -443,20 +518,7 @@ class FibTest(BaseTest):
             len_rcvd_pkt = len(rcvd_pkt)
             logging.info('Recieved packet at port {} and packet is {} bytes'.format(rcvd_port,len_rcvd_pkt))
             logging.info('Recieved packet with length of {}'.format(len_rcvd_pkt))
-            exp_src_mac = None
-            if len(self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"]) > 1:
-                # active-active dualtor, the packet could be received from either ToR, so use the received
-                # port to find the corresponding ToR
-                for dut_index, port_list in enumerate(dst_port_lists):
-                    if rcvd_port in port_list:
-                        exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][dut_index]
-            else:
-                exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][0]
-            actual_src_mac = Ether(rcvd_pkt).src
-            if exp_src_mac != actual_src_mac:
-                raise Exception("Pkt sent from {} to {} on port {} was rcvd pkt on {} which is one of the expected ports, "
-                                "but the src mac doesn't match, expected {}, got {}".
-                                format(ip_src, ip_dst, src_port, rcvd_port, exp_src_mac, actual_src_mac))
+            self.check_src_mac(ip_src, ip_dst, src_port, rcvd_port, rcvd_pkt, dst_port_lists)
             return (rcvd_port, rcvd_pkt)
         elif self.pkt_action == self.ACTION_DROP:
             verify_no_packet_any(self, masked_exp_pkt, dst_ports)
@@ -1,16 +1,18 @@
+import binascii
+import bisect
 import random
 import six
+import socket
 
-from ipaddress import ip_address, ip_network
-from SubnetTree import SubnetTree
+from ipaddress import IPv4Address, IPv6Address, ip_address
 
 '''
 LpmDict is a class used in FIB test for LPM and IP segmentation.
 
-This class contains a class variable SubnetTree() _subnet_tree to solve the
-LPM search functionality, which is achieved using Patricia tree. In order to
-have IP segmentation functionality: segment the whole IP space into different
-segments from start to end according to the prefixes (networks) it reads.
+The prefixes are kept in a dictionary keyed by the integer network address and
+the prefix length. In order to have IP segmentation functionality: segment the
+whole IP space into different segments from start to end according to the
+prefixes (networks) it reads.
 
 Initially, the whole IP space contains only one range. After inserting
 prefixes, the IP space is segmented into multiple ranges. The ranges()
@@ -19,11 +21,47 @@ sub-class IpInterval then could be used to get the first/last/random IP within
 this range. It could also check the length of the range and if an IP is within
 this range.
 
+The longest prefix matching any IP of a range is the same for all the IPs of
+the range, since the ranges are bounded by the first and next to last IPs of
+the prefixes. The LPM structure is compiled on first use after an update into
+a sorted array of the first IPs of the ranges and the array of the values of
+their longest matching prefixes, a lookup is a binary search of the integer
+address in the first array.
+
 To achieve the LPM functionality, use the LpmDict as a dictionary and use
 [] operator to get the corresponding value using the key (IP).
 
 Please check the test_lpm.py file to see the details of how this class works.
 '''
+
+
+def parse_prefix(key):
+    '''
+    @summary: Parse a prefix or an IP address without ipaddress objects
+    @param key: prefix string like '10.0.0.0/24' or IP string, an IP is a prefix with the full prefix length
+    @return (version, network as integer, prefix length), raise ValueError if the prefix has host bits set
+    '''
+    key = six.text_type(key)
+    if '/' in key:
+        ip, prefixlen = key.split('/', 1)
+    else:
+        ip, prefixlen = key, None
+    if ':' in ip:
+        version, bits, family = 6, 128, socket.AF_INET6
+    else:
+        version, bits, family = 4, 32, socket.AF_INET
+    try:
+        network = int(binascii.hexlify(socket.inet_pton(family, ip)), 16)
+        prefixlen = bits if prefixlen is None else int(prefixlen)
+    except (socket.error, ValueError):
+        raise ValueError('{} does not appear to be an IPv4 or IPv6 network'.format(key))
+    if prefixlen < 0 or prefixlen > bits:
+        raise ValueError('{} does not appear to be an IPv4 or IPv6 network'.format(key))
+    if network & ((1 << (bits - prefixlen)) - 1):
+        raise ValueError('{} has host bits set'.format(key))
+    return version, network, prefixlen
+
+
 class LpmDict():
     class IpInterval:
         def __init__(self, s):
@@ -57,53 +95,108 @@ class LpmDict():
 
     def __init__(self, ipv4=True):
         self._ipv4 = ipv4
-        self._prefix_set = set()
-        self._subnet_tree = SubnetTree()
-        # 0.0.0.0 is a non-routable meta-address that needs to be skipped
-        self._boundaries = { ip_address(u'0.0.0.0') : 1} if ipv4 else { ip_address(u'::') : 1}
+        self._bits = 32 if ipv4 else 128
+        self._address_class = IPv4Address if ipv4 else IPv6Address
+        # (network, prefix length) -> value
+        self._prefixes = {}
+        self._starts = None
+        self._values = None
+        self._ranges = None
+
+    def __getstate__(self):
+        # The IpIntervals of the ranges are cheap to build from the compiled LPM structure
+        self._compile()
+        state = self.__dict__.copy()
+        state['_ranges'] = None
+        return state
+
+    def _to_prefix(self, key):
+        version, network, prefixlen = parse_prefix(key)
+        if version != (4 if self._ipv4 else 6):
+            raise ValueError('{} is not an IPv{} prefix'.format(key, 4 if self._ipv4 else 6))
+        return network, prefixlen
+
+    def _to_int(self, key):
+        if isinstance(key, six.integer_types):
+            return key
+        return int(ip_address(six.text_type(key)))
+
+    def _invalidate(self):
+        self._starts = None
+        self._values = None
+        self._ranges = None
 
     def __setitem__(self, key, value):
-        prefix = ip_network(six.text_type(key))
-        # add the current key to self._prefix_set only when it is not the default route and it is not a duplicate key
-        if prefix.prefixlen and key not in self._prefix_set:
-            boundary = prefix[0]
-            self._boundaries[boundary] = self._boundaries.get(boundary, 0) + 1
-            if prefix[-1] != ip_address(u'255.255.255.255') and prefix[-1] != ip_address(u'ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff'):
-                next_boundary = prefix[-1] + 1
-                self._boundaries[next_boundary] = self._boundaries.get(next_boundary, 0) + 1
-            self._prefix_set.add(key)
-        self._subnet_tree.__setitem__(key, value)
+        self._prefixes[self._to_prefix(key)] = value
+        self._invalidate()
+
+    def update(self, prefixes):
+        '''
+        @summary: Add prefixes in bulk
+        @param prefixes: iterable of ((network as integer, prefix length), value)
+        '''
+        self._prefixes.update(prefixes)
+        self._invalidate()
 
     def __getitem__(self, key):
-        return self._subnet_tree[key]
+        value = self.lookup(self._to_int(key))
+        if value is None:
+            raise KeyError(key)
+        return value
 
     def __delitem__(self, key):
-        if '/0' not in key:
-            prefix = ip_network(six.text_type(key))
-            boundary = prefix[0]
-            next_boundary = prefix[-1] + 1
-            self._boundaries[boundary] = self._boundaries.get(boundary) - 1
-            if not self._boundaries[boundary]:
-                del self._boundaries[boundary]
-            self._boundaries[next_boundary] = self._boundaries.get(next_boundary) - 1
-            if not self._boundaries[next_boundary]:
-                del self._boundaries[next_boundary]
-            self._prefix_set.remove(key)
-        self._subnet_tree.__delitem__(key)
+        del self._prefixes[self._to_prefix(key)]
+        self._invalidate()
+
+    def _compile(self):
+        if self._starts is not None:
+            return
+        full = (1 << self._bits) - 1
+        # 0.0.0.0 is a non-routable meta-address that needs to be skipped
+        boundaries = set([0])
+        for network, prefixlen in self._prefixes:
+            # the default route doesn't segment the IP space
+            if prefixlen:
+                boundaries.add(network)
+                last = network | (full >> prefixlen)
+                if last != full:
+                    boundaries.add(last + 1)
+        starts = sorted(boundaries)
+
+        # Prefixes either contain each other or don't overlap, sorted by network and prefix length a prefix comes
+        # after the prefixes containing it. The stack holds the prefixes containing the current range, the longest
+        # on top.
+        prefixes = sorted(self._prefixes)
+        values = []
+        stack = []
+        index = 0
+        for start in starts:
+            while stack and stack[-1][0] < start:
+                stack.pop()
+            while index < len(prefixes) and prefixes[index][0] <= start:
+                network, prefixlen = prefixes[index]
+                stack.append((network | (full >> prefixlen), self._prefixes[prefixes[index]]))
+                index += 1
+            values.append(stack[-1][1] if stack else None)
+        self._starts = starts
+        self._values = values
+
+    def lookup(self, ip):
+        '''
+        @summary: Longest prefix match of an IP
+        @param ip: IP address as integer
+        @return the value of the longest prefix containing the IP, None if no prefix contains it
+        '''
+        self._compile()
+        return self._values[bisect.bisect_right(self._starts, ip) - 1]
 
     def ranges(self):
-        sorted_boundaries = sorted(self._boundaries.keys())
-        ranges = []
-        for index, boundary in enumerate(sorted_boundaries):
-            if index != len(sorted_boundaries) - 1:
-                interval = self.IpInterval(sorted_boundaries[index], sorted_boundaries[index + 1] - 1)
-            else:
-                if self._ipv4:
-                    interval = self.IpInterval(sorted_boundaries[index], ip_address(u'255.255.255.255'))
-                else:
-                    interval = self.IpInterval(sorted_boundaries[index], ip_address(u'ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff'))
-            ranges.append(interval)
-        return ranges
+        if self._ranges is None:
+            self._compile()
+            address = self._address_class
+            ends = self._starts[1:] + [(1 << self._bits)]
+            self._ranges = [self.IpInterval(address(start), address(end - 1)) for start, end in zip(self._starts, ends)]
+        return list(self._ranges)
 
     def contains(self, key):
-        return key in self._subnet_tree
+        return self.lookup(self._to_int(key)) is not None
@@ -0,0 +1 @@
+../burst.py
\ No newline at end of file
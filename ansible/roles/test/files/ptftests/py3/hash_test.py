@@ -26,6 +26,7 @@ from ptf.testutils import simple_tcpv6_packet
 from ptf.testutils import send_packet
 from ptf.testutils import verify_packet_any_port
 
+import burst
 import fib
 import lpm
 
@@ -90,6 +91,9 @@ class HashTest(BaseTest):
 
         self.ignore_ttl = self.test_params.get('ignore_ttl', False)
         self.single_fib = self.test_params.get('single_fib_for_duts', 'multiple-fib')
+        # send the flows of the balancing check in bursts instead of one at a time
+        self.burst_mode = self.test_params.get('burst_mode', False)
+        self.burst_size = self.test_params.get('burst_size', burst.DEFAULT_BURST_SIZE)
 
         # set the base mac here to make it persistent across calls of check_ip_route
         self.base_mac = self.dataplane.get_mac(*random.choice(list(self.dataplane.ports.keys())))
@@ -164,11 +168,17 @@ class HashTest(BaseTest):
             # in the hit count map.
             assert len(hit_count_map.keys()) == len(self.ptf_test_port_map[str(ingress_port)]["target_dut"])
         else:
-            for _ in range(0, self.balancing_test_times*len(list(itertools.chain(*exp_port_lists)))):
-                logging.info('Checking hash key {}, src_port={}, exp_ports={}, dst_ip={}'\
-                    .format(hash_key, src_port, exp_port_lists, dst_ip))
-                (matched_port, _) = self.check_ip_route(hash_key, src_port, dst_ip, exp_port_lists)
-                hit_count_map[matched_port] = hit_count_map.get(matched_port, 0) + 1
+            flow_count = self.balancing_test_times*len(list(itertools.chain(*exp_port_lists)))
+            if self.burst_mode:
+                logging.info('Checking hash key {} with {} flows in bursts, src_port={}, exp_ports={}, dst_ip={}'
+                             .format(hash_key, flow_count, src_port, exp_port_lists, dst_ip))
+                hit_count_map = self.check_ip_route_burst(hash_key, src_port, dst_ip, exp_port_lists, flow_count)
+            else:
+                for _ in range(0, flow_count):
+                    logging.info('Checking hash key {}, src_port={}, exp_ports={}, dst_ip={}'\
+                        .format(hash_key, src_port, exp_port_lists, dst_ip))
+                    (matched_port, _) = self.check_ip_route(hash_key, src_port, dst_ip, exp_port_lists)
+                    hit_count_map[matched_port] = hit_count_map.get(matched_port, 0) + 1
             logging.info("hash_key={}, hit count map: {}".format(hash_key, hit_count_map))
 
             for next_hop in next_hops:
@@ -187,6 +197,55 @@ class HashTest(BaseTest):
 
         return (matched_port, received)
 
+    def check_ip_route_burst(self, hash_key, src_port, dst_ip, dst_port_lists, flow_count):
+        '''
+        @summary: Send flows varying the hash key in bursts and check that each of them is forwarded.
+        @param hash_key: hash key to build packets with.
+        @param src_port: index of port to use for sending packets to switch
+        @param dst_ip: destination IP used to select the IP version of the packets
+        @param dst_port_lists: list of ports on which to expect packets to come back from the switch
+        @param flow_count: number of flows to send
+        @return dict of the number of packets received on each port
+        '''
+        ipv4 = ip_network(six.text_type(dst_ip)).version == 4
+        dst_ports = list(itertools.chain(*dst_port_lists))
+        flows = []
+        for _ in range(flow_count):
+            flow_id = burst.new_flow_id()
+            if ipv4:
+                pkt, masked_exp_pkt = self.build_ipv4_packets(hash_key, src_port, flow_id)
+            else:
+                pkt, masked_exp_pkt = self.build_ipv6_packets(hash_key, src_port, flow_id)
+            flows.append(burst.Flow(flow_id, src_port, pkt, masked_exp_pkt, dst_ports))
+
+        hit_count_map = {}
+        ip_layer = 'IP' if ipv4 else 'IPv6'
+        for flow, rcvd_port, rcvd_pkt in burst.send_flows(self, flows, self.burst_size):
+            self.check_src_mac(flow.pkt[ip_layer].src, flow.pkt[ip_layer].dst, src_port, rcvd_port, rcvd_pkt,
+                               dst_port_lists)
+            hit_count_map[rcvd_port] = hit_count_map.get(rcvd_port, 0) + 1
+        return hit_count_map
+
+    def check_src_mac(self, ip_src, ip_dst, src_port, rcvd_port, rcvd_pkt, dst_port_lists):
+        '''
+        @summary: Check that the packet was forwarded by the DUT connected to the port it was received on.
+        '''
+        exp_src_mac = None
+        if len(self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"]) > 1:
+            # active-active dualtor, the packet could be received from either ToR, so use the received
+            # port to find the corresponding ToR
+            for dut_index, port_list in enumerate(dst_port_lists):
+                if rcvd_port in port_list:
+                    exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][dut_index]
+        else:
+            exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][0]
+
+        actual_src_mac = scapy.Ether(rcvd_pkt).src
+        if exp_src_mac != actual_src_mac:
+            raise Exception("Pkt sent from {} to {} on port {} was rcvd pkt on {} which is one of the expected ports, "
+                            "but the src mac doesn't match, expected {}, got {}".
+                            format(ip_src, ip_dst, src_port, rcvd_port, exp_src_mac, actual_src_mac))
+
     def _get_ip_proto(self, ipv6=False):
         # ip_proto 2 is IGMP, should not be forwarded by router
         # ip_proto 4 and 41 are encapsulation protocol, ip payload will be malformat
@@ -203,12 +262,13 @@ class HashTest(BaseTest):
             if ip_proto not in skip_protos:
                 return ip_proto
 
-    def check_ipv4_route(self, hash_key, src_port, dst_port_lists):
+    def build_ipv4_packets(self, hash_key, src_port, flow_id=None):
         '''
-        @summary: Check IPv4 route works.
+        @summary: Build the IPv4 packet to send to the switch and the masked packet expected back.
         @param hash_key: hash key to build packet with.
         @param src_port: index of port to use for sending packet to switch
-        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
+        @param flow_id: flow ID written in the payload of the packets in burst mode
+        @return (pkt, masked_exp_pkt)
         '''
         ip_src = self.src_ip_interval.get_random_ip() if hash_key == 'src-ip' else self.src_ip_interval.get_first_ip()
         ip_dst = self.dst_ip_interval.get_random_ip() if hash_key == 'dst-ip' else self.dst_ip_interval.get_first_ip()
@@ -244,6 +304,9 @@ class HashTest(BaseTest):
         if hash_key == 'ip-proto':
             pkt['IP'].proto = ip_proto
             exp_pkt['IP'].proto = ip_proto
+        if flow_id is not None:
+            burst.tag_packet(pkt, flow_id)
+            burst.tag_packet(exp_pkt, flow_id)
         masked_exp_pkt = Mask(exp_pkt)
         masked_exp_pkt.set_do_not_care_scapy(scapy.Ether, "dst")
         # mask the chksum also if masking the ttl
@@ -253,6 +316,22 @@ class HashTest(BaseTest):
             masked_exp_pkt.set_do_not_care_scapy(scapy.TCP, "chksum")
         masked_exp_pkt.set_do_not_care_scapy(scapy.Ether, "src")
 
+        return pkt, masked_exp_pkt
+
+    def check_ipv4_route(self, hash_key, src_port, dst_port_lists):
+        '''
+        @summary: Check IPv4 route works.
+        @param hash_key: hash key to build packet with.
+        @param src_port: index of port to use for sending packet to switch
+        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
+        '''
+        pkt, masked_exp_pkt = self.build_ipv4_packets(hash_key, src_port)
+        ip_src = pkt['IP'].src
+        ip_dst = pkt['IP'].dst
+        sport = pkt['TCP'].sport
+        dport = pkt['TCP'].dport
+        ip_proto = pkt['IP'].proto if hash_key == 'ip-proto' else None
+
         send_packet(self, src_port, pkt)
         logging.info('Sent Ether(src={}, dst={})/IP(src={}, dst={}, proto={})/TCP(sport={}, dport={} on port {})'\
             .format(pkt.src,
@@ -276,30 +355,16 @@ class HashTest(BaseTest):
         rcvd_port_index, rcvd_pkt = verify_packet_any_port(self, masked_exp_pkt, dst_ports)
         rcvd_port = dst_ports[rcvd_port_index]
 
-        exp_src_mac = None
-        if len(self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"]) > 1:
-            # active-active dualtor, the packet could be received from either ToR, so use the received
-            # port to find the corresponding ToR
-            for dut_index, port_list in enumerate(dst_port_lists):
-                if rcvd_port in port_list:
-                    exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][dut_index]
-        else:
-            exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][0]
-
-        actual_src_mac = Ether(rcvd_pkt).src
-        if exp_src_mac != actual_src_mac:
-            raise Exception("Pkt sent from {} to {} on port {} was rcvd pkt on {} which is one of the expected ports, "
-                            "but the src mac doesn't match, expected {}, got {}".
-                            format(ip_src, ip_dst, src_port, rcvd_port, exp_src_mac, actual_src_mac))
+        self.check_src_mac(ip_src, ip_dst, src_port, rcvd_port, rcvd_pkt, dst_port_lists)
         return (rcvd_port, rcvd_pkt)
 
-    def check_ipv6_route(self, hash_key, src_port, dst_port_lists):
+    def build_ipv6_packets(self, hash_key, src_port, flow_id=None):
         '''
-        @summary: Check IPv6 route works.
+        @summary: Build the IPv6 packet to send to the switch and the masked packet expected back.
         @param hash_key: hash key to build packet with.
-        @param in_port: index of port to use for sending packet to switch
-        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
-        @return Boolean
+        @param src_port: index of port to use for sending packet to switch
+        @param flow_id: flow ID written in the payload of the packets in burst mode
+        @return (pkt, masked_exp_pkt)
         '''
         ip_src = self.src_ip_interval.get_random_ip() if hash_key == 'src-ip' else self.src_ip_interval.get_first_ip()
         ip_dst = self.dst_ip_interval.get_random_ip() if hash_key == 'dst-ip' else self.dst_ip_interval.get_first_ip()
@@ -336,6 +401,9 @@ class HashTest(BaseTest):
             pkt['IPv6'].nh = ip_proto
             exp_pkt['IPv6'].nh = ip_proto
 
+        if flow_id is not None:
+            burst.tag_packet(pkt, flow_id)
+            burst.tag_packet(exp_pkt, flow_id)
         masked_exp_pkt = Mask(exp_pkt)
         masked_exp_pkt.set_do_not_care_scapy(scapy.Ether,"dst")
         # mask the chksum also if masking the ttl
@@ -344,6 +412,23 @@ class HashTest(BaseTest):
             masked_exp_pkt.set_do_not_care_scapy(scapy.TCP, "chksum")
         masked_exp_pkt.set_do_not_care_scapy(scapy.Ether, "src")
 
+        return pkt, masked_exp_pkt
+
+    def check_ipv6_route(self, hash_key, src_port, dst_port_lists):
+        '''
+        @summary: Check IPv6 route works.
+        @param hash_key: hash key to build packet with.
+        @param in_port: index of port to use for sending packet to switch
+        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
+        @return Boolean
+        '''
+        pkt, masked_exp_pkt = self.build_ipv6_packets(hash_key, src_port)
+        ip_src = pkt['IPv6'].src
+        ip_dst = pkt['IPv6'].dst
+        sport = pkt['TCP'].sport
+        dport = pkt['TCP'].dport
+        ip_proto = pkt['IPv6'].nh if hash_key == 'ip-proto' else None
+
         send_packet(self, src_port, pkt)
         logging.info('Sent Ether(src={}, dst={})/IPv6(src={}, dst={}, proto={})/TCP(sport={}, dport={} on port {})'\
             .format(pkt.src,
@@ -367,21 +452,7 @@ class HashTest(BaseTest):
         rcvd_port_index, rcvd_pkt = verify_packet_any_port(self, masked_exp_pkt, dst_ports)
         rcvd_port = dst_ports[rcvd_port_index]
 
-        exp_src_mac = None
-        if len(self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"]) > 1:
-            # active-active dualtor, the packet could be received from either ToR, so use the received
-            # port to find the corresponding ToR
-            for dut_index, port_list in enumerate(dst_port_lists):
-                if rcvd_port in port_list:
-                    exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][dut_index]
-        else:
-            exp_src_mac = self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"][0]
-
-        actual_src_mac = Ether(rcvd_pkt).src
-        if exp_src_mac != actual_src_mac:
-            raise Exception("Pkt sent from {} to {} on port {} was rcvd pkt on {} which is one of the expected ports, "
-                            "but the src mac doesn't match, expected {}, got {}".
-                            format(ip_src, ip_dst, src_port, rcvd_port, exp_src_mac, actual_src_mac))
+        self.check_src_mac(ip_src, ip_dst, src_port, rcvd_port, rcvd_pkt, dst_port_lists)
         return (rcvd_port, rcvd_pkt)
 
     def check_within_expected_range(self, actual, expected):
@@ -28,6 +28,10 @@ import pprint
 import logging
 import logging.handlers
 import subprocess
+import mmap
+import gzip
+import json
+import shutil
 from datetime import datetime
 
 #---------------------------------------------------------------------
@@ -37,6 +41,8 @@ tokenizer = ','
 comment_key = '#'
 system_log_file = '/var/log/syslog'
 re_rsyslog_pid = re.compile("PID:\s+(\d+)")
+#-- Size of the block which is mapped and decoded at once during analysis
+analyze_chunk_size = 4 * 1024 * 1024
 
 #-- List of ERROR codes to be returned by AnsibleLogAnalyzer
 err_duplicate_start_marker = -1
@@ -392,11 +398,218 @@ class AnsibleLogAnalyzer:
 
         return ret_code
 
-    def analyze_file(self, log_file_path, match_messages_regex, ignore_messages_regex, expect_messages_regex):
+    def create_select_regex(self, markers, match_messages_regex, expect_messages_regex):
+        '''
+        @summary: Combine markers, 'match' and 'expect' expressions into one alternation.
+                  A line which doesn't match it can neither change analysis range
+                  nor be reported, so it is dropped before per-category regexes are run.
+
+        @param markers: List of marker strings.
+
+        @return: Compiled regex to be searched over blocks of lines, or None when
+            expressions can't be safely combined and every line must be checked.
+        '''
+        patterns = [re.escape(marker) for marker in markers]
+        for regex in (match_messages_regex, expect_messages_regex):
+            if regex is None:
+                continue
+            #-- String boundaries and lookbehinds have different meaning in a block of lines
+            if any(token in regex.pattern for token in (r'\A', r'\Z', '(?<')):
+                return None
+            patterns.append(regex.pattern)
+
+        if not patterns:
+            return None
+
+        try:
+            return re.compile('|'.join('(?:%s)' % pattern for pattern in patterns), re.MULTILINE)
+        except re.error as e:
+            self.print_diagnostic_message('unable to build select regex: %s' % repr(e))
+            return None
+    #---------------------------------------------------------------------
+
+    def find_start_marker_offset(self, log_map, start_marker):
+        '''
+        @summary: Scan mapped log file backwards for the last line containing
+                  start marker, the same line reverse analysis would stop at.
+
+        @param log_map: mmap instance of the log file.
+
+        @param start_marker: start marker string.
+
+        @return: Byte offset of the start marker line, 0 if there is no start marker.
+        '''
+        marker = start_marker.encode('utf-8')
+        end = len(log_map)
+        while True:
+            pos = log_map.rfind(marker, 0, end)
+            if pos == -1:
+                return 0
+
+            line_start = log_map.rfind(b'\n', 0, pos) + 1
+            line_end = log_map.find(b'\n', pos)
+            if line_end == -1:
+                line_end = len(log_map)
+
+            if b'extract_log' not in log_map[line_start:line_end]:
+                return line_start
+            end = line_start
+    #---------------------------------------------------------------------
+
+    def read_log_blocks(self, log_file_path, start_marker):
+        '''
+        @summary: Generator of blocks of whole lines of the log file, starting from
+                  the last start marker. File is mapped into memory and decoded in
+                  blocks of about analyze_chunk_size bytes, so it is never read as a whole.
+
+        @param log_file_path: Path to the log file.
+
+        @param start_marker: start marker string.
+        '''
+        with open(log_file_path, 'rb') as log_file:
+            size = os.fstat(log_file.fileno()).st_size
+            if size == 0:
+                return
+
+            log_map = mmap.mmap(log_file.fileno(), size, access=mmap.ACCESS_READ)
+            try:
+                offset = self.find_start_marker_offset(log_map, start_marker)
+                self.print_diagnostic_message('start analysis at offset %d of %d' % (offset, size))
+                while offset < size:
+                    end = min(offset + analyze_chunk_size, size)
+                    if end < size:
+                        #-- Cut block at the line boundary
+                        line_end = log_map.rfind(b'\n', offset, end)
+                        if line_end == -1:
+                            line_end = log_map.find(b'\n', end)
+                        end = size if line_end == -1 else line_end + 1
+
+                    block = log_map[offset:end].decode('utf-8', 'replace')
+                    offset = end
+                    if '\r' in block:
+                        #-- Keep universal newlines behavior of the text mode
+                        block = block.replace('\r\n', '\n').replace('\r', '\n')
+                    yield block
+            finally:
+                log_map.close()
+    #---------------------------------------------------------------------
+
+    def read_stdin_blocks(self):
+        '''
+        @summary: Generator of blocks of whole lines read from stdin.
+        '''
+        while True:
+            lines = sys.stdin.readlines(analyze_chunk_size)
+            if not lines:
+                return
+            yield ''.join(lines)
+    #---------------------------------------------------------------------
+
+    def select_lines(self, blocks, select_regex):
+        '''
+        @summary: Generator of lines containing a match of select_regex.
+                  The regex is searched over the whole block and search is resumed
+                  from the next line, so lines without a match are skipped without
+                  being split out of the block.
+
+        @param blocks: Iterable of blocks of whole lines.
+
+        @param select_regex: Regex built by create_select_regex(), None to select all lines.
+        '''
+        for block in blocks:
+            if select_regex is None:
+                lines = block.split('\n')
+                last = lines.pop()
+                for line in lines:
+                    yield line + '\n'
+                if last:
+                    yield last
+                continue
+
+            pos = 0
+            block_len = len(block)
+            while pos < block_len:
+                match = select_regex.search(block, pos)
+                if match is None:
+                    break
+                line_start = block.rfind('\n', pos, match.start()) + 1 or pos
+                if line_start >= block_len:
+                    break
+                line_end = block.find('\n', match.start())
+                line_end = block_len if line_end == -1 else line_end + 1
+                yield block[line_start:line_end]
+                pos = line_end
+    #---------------------------------------------------------------------
+
+    def record_file_offsets(self, log_file_list):
+        '''
+        @summary: Get current position of each log file, used instead of the start
+                  marker to analyze only content appended afterwards.
+
+        @param log_file_list: List of paths to the log files.
+
+        @return: map <file_name, (inode, size)>
+        '''
+        offsets = {}
+        for log_file in log_file_list:
+            file_stat = os.stat(log_file)
+            offsets[log_file] = (file_stat.st_ino, file_stat.st_size)
+            self.print_diagnostic_message('log file:%s, inode %d, offset %d'
+                                          % (log_file, file_stat.st_ino, file_stat.st_size))
+        return offsets
+    #---------------------------------------------------------------------
+
+    def extract_file_delta(self, log_file, inode, offset, out_file_path):
+        '''
+        @summary: Copy content appended to the log file since its position was recorded
+                  by record_file_offsets(). If the file was rotated meanwhile, tail of
+                  the rotated file ('.1' or '.1.gz') is copied before the current file.
+
+        @param log_file: Path to the log file.
+
+        @param inode: Inode of the log file at the moment of recording.
+
+        @param offset: Size of the log file at the moment of recording.
+
+        @param out_file_path: Path to the file to store extracted content.
+        '''
+        sources = []
+        file_stat = os.stat(log_file) if os.path.exists(log_file) else None
+        if file_stat and file_stat.st_ino == inode and file_stat.st_size >= offset:
+            sources.append((log_file, offset))
+        else:
+            rotated_file = log_file + '.1'
+            if os.path.exists(rotated_file) and (os.stat(rotated_file).st_ino == inode or
+                                                 (file_stat and file_stat.st_ino == inode)):
+                #-- Renamed or copied and truncated by logrotate
+                sources.append((rotated_file, offset))
+            elif os.path.exists(rotated_file + '.gz'):
+                sources.append((rotated_file + '.gz', offset))
+            else:
+                print('WARNING: unable to find rotated file of %s, analyzing the whole file' % log_file)
+            if file_stat:
+                sources.append((log_file, 0))
+
+        with open(out_file_path, 'wb') as out_file:
+            for path, start in sources:
+                self.print_diagnostic_message('extract %s from offset %d' % (path, start))
+                opener = gzip.open if path.endswith('.gz') else open
+                with opener(path, 'rb') as src_file:
+                    src_file.seek(start)
+                    shutil.copyfileobj(src_file, out_file, analyze_chunk_size)
+    #---------------------------------------------------------------------
+
+    def analyze_file(self, log_file_path, match_messages_regex, ignore_messages_regex, expect_messages_regex,
+                     require_markers=None):
         '''
         @summary: Analyze input file content for messages matching input regex
                   expressions. See line_matches() for details on matching criteria.
 
+                  Log file is streamed forward starting from the start marker.
+                  Only lines containing markers and lines which may be reported
+                  are kept, then they are processed from the end of the file,
+                  exactly like whole file used to be processed in reverse order.
+
         @param log_file_path: Patch to the log file.
 
         @param match_messages_regex:
@@ -410,6 +623,10 @@ class AnsibleLogAnalyzer:
 
         @param end_marker_regex - end marker
 
+        @param require_markers: Whether start/end markers must be present in the file.
+            Defaults to require_marker_check() result. Should be False for
+            content extracted by extract_file_delta().
+
         @return: List of strings match search criteria.
         '''
 
@@ -418,23 +635,31 @@ class AnsibleLogAnalyzer:
 
         #-- indicates whether log analyzer currently is in the log range between start
         #-- and end marker. see analyze_file method.
-        check_marker = self.require_marker_check(log_file_path)
+        check_marker = self.require_marker_check(log_file_path) if require_markers is None else require_markers
+        skip_long_lines = not self.require_marker_check(log_file_path)
         in_analysis_range = not check_marker
         stdin_as_input = self.is_filename_stdin(log_file_path)
         matching_lines = []
         expected_lines = []
         found_start_marker = False
         found_end_marker = False
-        if stdin_as_input:
-            log_file = sys.stdin
-        else:
-            log_file = open(log_file_path, 'r')
 
         start_marker = self.create_start_marker()
         end_marker = self.create_end_marker()
 
+        if stdin_as_input:
+            markers = []
+            log_blocks = self.read_stdin_blocks()
+        else:
+            markers = [end_marker, self.end_ignore_marker_prefix, self.start_ignore_marker_prefix, start_marker]
+            log_blocks = self.read_log_blocks(log_file_path, start_marker)
+
+        #-- Lines which neither contain a marker nor can be reported don't affect the result
+        select_regex = self.create_select_regex(markers, match_messages_regex, expect_messages_regex)
+        selected_lines = list(self.select_lines(log_blocks, select_regex))
+
         ignore_marker_run_ids = []
-        for rev_line in reversed(log_file.readlines()):
+        for rev_line in reversed(selected_lines):
             if stdin_as_input:
                 in_analysis_range = True
             else:
@@ -484,7 +709,7 @@ class AnsibleLogAnalyzer:
             if in_analysis_range:
                 # Skip long logs in sairedis recording since most likely they are bulk set operations for non-default routes
                 # without much insight while they are time consuming to analyze
-                if not check_marker and len(rev_line) > 1000:
+                if skip_long_lines and len(rev_line) > 1000:
                     continue
                 if self.line_is_expected(rev_line, expect_messages_regex):
                     expected_lines.append(rev_line)
@@ -505,7 +730,8 @@ class AnsibleLogAnalyzer:
         return matching_lines, expected_lines
     #---------------------------------------------------------------------
 
-    def analyze_file_list(self, log_file_list, match_messages_regex, ignore_messages_regex, expect_messages_regex):
+    def analyze_file_list(self, log_file_list, match_messages_regex, ignore_messages_regex, expect_messages_regex,
+                          require_markers=None):
         '''
         @summary: Analyze input files messages matching input regex expressions.
             See line_matches() for details on matching criteria.
@@ -521,6 +747,8 @@ class AnsibleLogAnalyzer:
         @param expect_messages_regex:
             regex class instance containing messages that are expected to appear in logfile.
 
+        @param require_markers: See analyze_file().
+
         @return: Returns map <file_name, list_of_matching_strings>
         '''
         res = {}
@@ -528,7 +756,8 @@ class AnsibleLogAnalyzer:
         for log_file in log_file_list:
             if not len(log_file):
                 continue
-            match_strings, expect_strings = self.analyze_file(log_file, match_messages_regex, ignore_messages_regex, expect_messages_regex)
+            match_strings, expect_strings = self.analyze_file(log_file, match_messages_regex, ignore_messages_regex,
+                                                              expect_messages_regex, require_markers)
 
             match_strings.reverse()
             expect_strings.reverse()
@@ -546,8 +775,14 @@ def usage():
     print('                                 to all log files specified in --logs parameter.')
     print('                                 analyze - perform log analysis of files specified in --logs parameter.')
     print('                                 add_end_marker - add end marker to all log files specified in --logs parameter.')
+    print('                                 record_offsets - print inode and size of log files specified in --logs parameter.')
+    print('                                 extract_delta - extract content appended to log files since offsets specified')
+    print('                                 in --offsets parameter were recorded into --out_dir.')
     print('--out_dir path                   Directory path where to place output files, ')
-    print('                                 must be present when --action == analyze')
+    print('                                 must be present when --action == analyze or extract_delta')
+    print('--offsets path:inode:offset{,path:inode:offset}')
+    print('                                 Log file positions printed by record_offsets action.')
+    print('                                 Must be present when action == extract_delta.')
     print('--logs path{,path}               List of full paths to log files to be analyzed.')
     print('                                 Implicitly system log file will be also processed')
     print('--run_id string                  String passed to loganalyzer, uniquely identifying ')
@@ -577,8 +812,12 @@ def check_action(action, log_files_in, out_dir, match_files_in, ignore_files_in,
 
     ret_code = True
 
-    if action in ['init', 'add_end_marker', 'add_start_ignore_mark', 'add_end_ignore_mark']:
+    if action in ['init', 'add_end_marker', 'add_start_ignore_mark', 'add_end_ignore_mark', 'record_offsets']:
         ret_code = True
+    elif action == 'extract_delta':
+        if out_dir is None or len(out_dir) == 0:
+            print('ERROR: missing required out_dir for extract_delta action')
+            ret_code = False
     elif action == 'analyze':
         if out_dir is None or len(out_dir) == 0:
             print('ERROR: missing required out_dir for analyze action')
@@ -715,10 +954,11 @@ def main(argv):
     match_files_in = None
     ignore_files_in = None
     expect_files_in = None
+    offsets_in = ""
     verbose = False
 
     try:
-        opts, args = getopt.getopt(argv, "a:r:s:l:o:m:i:e:vh", ["action=", "run_id=", "start_marker=", "logs=", "out_dir=", "match_files_in=", "ignore_files_in=", "expect_files_in=", "verbose", "help"])
+        opts, args = getopt.getopt(argv, "a:r:s:l:o:m:i:e:vh", ["action=", "run_id=", "start_marker=", "logs=", "out_dir=", "match_files_in=", "ignore_files_in=", "expect_files_in=", "offsets=", "verbose", "help"])
 
     except getopt.GetoptError:
         print("Invalid option specified")
@@ -754,6 +994,9 @@ def main(argv):
         elif (opt in ("-e", "--expect_files_in")):
             expect_files_in = arg
 
+        elif (opt == "--offsets"):
+            offsets_in = arg
+
         elif (opt in ("-v", "--verbose")):
             verbose = True
 
@@ -798,6 +1041,18 @@ def main(argv):
     elif action == "add_end_ignore_mark":
         analyzer.place_marker(log_file_list, analyzer.create_end_ignore_marker(), wait_for_marker=True)
         return 0
+    elif action == "record_offsets":
+        if not log_file_list:
+            log_file_list.append(system_log_file)
+        offsets = analyzer.record_file_offsets(log_file_list)
+        print(json.dumps(offsets))
+        return 0
+    elif action == "extract_delta":
+        for item in filter(None, offsets_in.split(tokenizer)):
+            log_file, inode, offset = item.rsplit(':', 2)
+            analyzer.extract_file_delta(log_file, int(inode), int(offset),
+                                        os.path.join(out_dir, os.path.basename(log_file)))
+        return 0
 
 
     else:
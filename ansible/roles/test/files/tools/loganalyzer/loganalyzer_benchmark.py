@@ -0,0 +1,124 @@
+'''
+Description:    Benchmark of the log analysis engine in loganalyzer.py.
+
+                Generates a synthetic syslog of the given size with start/end markers
+                placed near the end of the file, then analyzes it with the streaming
+                engine and with the legacy whole-file reverse scan, and reports
+                duration and peak memory usage of both.
+
+Usage:          python loganalyzer_benchmark.py --size_mb 1024 --window_mb 16
+'''
+
+from __future__ import print_function
+import argparse
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+
+from loganalyzer import AnsibleLogAnalyzer
+
+RUN_ID = 'benchmark'
+LINE_TEMPLATES = [
+    'Mar  9 10:11:12.{seq:06d} sonic NOTICE swss#orchagent: :- doTask: Processing route 192.168.{a}.{b}/32\n',
+    'Mar  9 10:11:12.{seq:06d} sonic INFO syncd#syncd: [none] SAI_API_PORT:_brcm_sai_read_counters:{a} read {b}\n',
+    'Mar  9 10:11:12.{seq:06d} sonic INFO bgp#bgpd[35]: %ADJCHANGE: neighbor 10.0.{a}.{b} Up\n',
+]
+ERROR_TEMPLATE = 'Mar  9 10:11:12.{seq:06d} sonic ERR swss#orchagent: :- addNeighbor: Failed to add neighbor 10.0.{a}.{b}\n'
+ERROR_INTERVAL = 1000
+
+
+def write_lines(log_file, size, seq):
+    written = 0
+    while written < size:
+        template = ERROR_TEMPLATE if seq % ERROR_INTERVAL == 0 else LINE_TEMPLATES[seq % len(LINE_TEMPLATES)]
+        line = template.format(seq=seq % 1000000, a=seq % 256, b=(seq >> 8) % 256)
+        log_file.write(line)
+        written += len(line)
+        seq += 1
+    return seq
+
+
+def generate_syslog(path, size_mb, window_mb):
+    analyzer = AnsibleLogAnalyzer(RUN_ID, False)
+    size = size_mb * 1024 * 1024
+    window = min(window_mb * 1024 * 1024, size)
+    with open(path, 'w') as log_file:
+        seq = write_lines(log_file, size - window, 0)
+        log_file.write('Mar  9 10:11:12.000000 sonic INFO LogAnalyzer: %s\n' % analyzer.create_start_marker())
+        seq = write_lines(log_file, window, seq)
+        log_file.write('Mar  9 10:11:12.000000 sonic INFO LogAnalyzer: %s\n' % analyzer.create_end_marker())
+
+
+def legacy_analyze_file(analyzer, log_file_path, match_regex, ignore_regex, expect_regex):
+    '''
+    Whole-file reverse scan, as it was done before the streaming engine (markers
+    validation is omitted, it doesn't affect the cost).
+    '''
+    matching_lines = []
+    expected_lines = []
+    in_analysis_range = False
+    with open(log_file_path, 'r') as log_file:
+        for rev_line in reversed(log_file.readlines()):
+            if analyzer.create_end_marker() in rev_line:
+                in_analysis_range = True
+                continue
+            if analyzer.create_start_marker() in rev_line:
+                break
+            if in_analysis_range:
+                if analyzer.line_is_expected(rev_line, expect_regex):
+                    expected_lines.append(rev_line)
+                elif analyzer.line_matches(rev_line, match_regex, ignore_regex):
+                    matching_lines.append(rev_line)
+    return matching_lines, expected_lines
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Log analyzer benchmark')
+    parser.add_argument('--size_mb', type=int, default=1024, help='Size of the synthetic syslog')
+    parser.add_argument('--window_mb', type=int, default=16, help='Size of the log between start and end markers')
+    parser.add_argument('--match_files_in', default=os.path.join(os.path.dirname(__file__),
+                                                                 'loganalyzer_common_match.txt'))
+    parser.add_argument('--ignore_files_in', default=os.path.join(os.path.dirname(__file__),
+                                                                  'loganalyzer_common_ignore.txt'))
+    parser.add_argument('--skip_legacy', action='store_true', help='Do not run the legacy analysis')
+    args = parser.parse_args()
+
+    analyzer = AnsibleLogAnalyzer(RUN_ID, False)
+    match_regex = analyzer.create_msg_regex(args.match_files_in.split(','))[0]
+    ignore_regex = analyzer.create_msg_regex(args.ignore_files_in.split(','))[0]
+    expect_regex = re.compile('Failed to add neighbor 10\\.0\\.232\\.\\d+')
+
+    fd, path = tempfile.mkstemp(prefix='syslog.benchmark.')
+    os.close(fd)
+    try:
+        start = time.time()
+        generate_syslog(path, args.size_mb, args.window_mb)
+        print('Generated %d MB syslog in %.1fs' % (os.path.getsize(path) >> 20, time.time() - start))
+
+        start = time.time()
+        result = analyzer.analyze_file(path, match_regex, ignore_regex, expect_regex)
+        print('streaming: %.2fs, peak RSS %.0f MB, matches %d, expected %d'
+              % (time.time() - start, peak_rss_mb(), len(result[0]), len(result[1])))
+
+        if not args.skip_legacy:
+            start = time.time()
+            legacy_result = legacy_analyze_file(analyzer, path, match_regex, ignore_regex, expect_regex)
+            print('legacy:    %.2fs, peak RSS %.0f MB, matches %d, expected %d'
+                  % (time.time() - start, peak_rss_mb(), len(legacy_result[0]), len(legacy_result[1])))
+            if legacy_result != result:
+                print('ERROR: results of streaming and legacy analysis differ')
+                return 1
+    finally:
+        os.remove(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
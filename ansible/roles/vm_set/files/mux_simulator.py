@@ -9,11 +9,15 @@ import re
 import shlex
 import subprocess
 import sys
+import tempfile
 import threading
 import traceback
 
 from collections import defaultdict
+from contextlib import contextmanager
+from copy import deepcopy
 from logging.handlers import RotatingFileHandler
+from multiprocessing.pool import ThreadPool
 
 from flask import Flask, request, abort
 from flask.logging import default_handler
@@ -29,6 +33,11 @@ DUMP_FLOW_CMD = 'ovs-ofctl --names dump-flows {}'
 DEL_FLOW_CMD = 'ovs-ofctl --names del-flows {} in_port="{}"'
 ADD_FLOW_CMD = 'ovs-ofctl --names add-flow {} in_port="{}",actions={}'
 MOD_FLOW_CMD = 'ovs-ofctl --names mod-flows {} in_port="{}",actions={}'
+BUNDLE_REPLACE_FLOWS_CMD = 'ovs-ofctl --names --bundle replace-flows {} {}'
+REPLACE_FLOWS_CMD = 'ovs-ofctl --names replace-flows {} {}'
+
+# Max number of mux bridges of which the flows are updated at the same time by bulk operations
+BULK_CONCURRENCY = 16
 
 RANDOM = 'random'
 TOGGLE = 'toggle'
@@ -163,7 +172,13 @@ class Mux(object):
         # If a request of getting mux status come in in the middle of such flow configuration change, the mux
         # status returned may not match the actual flow status. Purpose of the lock is to workaround such conflicts.
         # All the operations of updating mux config and getting mux status must acquire the lock firstly.
-        self.lock = threading.Lock()
+        # The lock is re-entrant, the flow update methods are called with the lock held by deferred_flows.
+        self.lock = threading.RLock()
+
+        # When flow commands are deferred, the flow updates only change the in-memory model of the flows. The flow
+        # table built from the model is applied to the bridge afterwards with one ovs-ofctl command.
+        self.deferred = False
+        self.flows_changed = False
 
         self.vm_set = vm_set
 
@@ -386,7 +401,7 @@ class Mux(object):
 
             if len(self.flows['downstream']['out_sides']) == 1:
                 action_desc = '{}:"{}"'.format(OUTPUT, self.ports[NIC])
-                run_cmd(DEL_FLOW_CMD.format(
+                self._run_flow_cmd(DEL_FLOW_CMD.format(
                     self.bridge,
                     self.active_port))
                 # Immediately update state after flow config changed to ensure consistency
@@ -394,7 +409,7 @@ class Mux(object):
                 self.flows['downstream']['in_side'] = self.active_side
                 self.flows['downstream']['out_sides'] = []
 
-                run_cmd(ADD_FLOW_CMD.format(
+                self._run_flow_cmd(ADD_FLOW_CMD.format(
                     self.bridge,
                     new_active_port,
                     action_desc))
@@ -428,7 +443,7 @@ class Mux(object):
 
         if new_action == DROP:
             # Update action from OUTPUT to DROP, del-flow
-            run_cmd(DEL_FLOW_CMD.format(
+            self._run_flow_cmd(DEL_FLOW_CMD.format(
                 self.bridge,
                 self.active_port))
             self.flows['downstream']['out_sides'] = []
@@ -441,7 +456,7 @@ class Mux(object):
             else:
                 active_side = self.active_side
 
-            run_cmd(ADD_FLOW_CMD.format(
+            self._run_flow_cmd(ADD_FLOW_CMD.format(
                 self.bridge,
                 self.ports[active_side],
                 action_desc))
@@ -484,20 +499,20 @@ class Mux(object):
                 operation = 'MOD-FLOW'   # Need to modify upstream flow
 
         if operation == 'DEL-FLOW':
-            run_cmd(DEL_FLOW_CMD.format(
+            self._run_flow_cmd(DEL_FLOW_CMD.format(
                     self.bridge,
                     self.ports[NIC]))
             self.flows['upstream']['out_sides'] = []
         elif operation == 'ADD-FLOW':
             action_desc = ','.join(['{}:"{}"'.format(OUTPUT, self.ports[out_side]) for out_side in target_out_sides])
-            run_cmd(ADD_FLOW_CMD.format(
+            self._run_flow_cmd(ADD_FLOW_CMD.format(
                     self.bridge,
                     self.ports[NIC],
                     action_desc))
             self.flows['upstream']['out_sides'] = target_out_sides
         elif operation == 'MOD-FLOW':
             action_desc = ','.join(['{}:"{}"'.format(OUTPUT, self.ports[out_side]) for out_side in target_out_sides])
-            run_cmd(MOD_FLOW_CMD.format(
+            self._run_flow_cmd(MOD_FLOW_CMD.format(
                     self.bridge,
                     self.ports[NIC],
                     action_desc))
@@ -532,6 +547,86 @@ class Mux(object):
             self.flap_counter = 0
             self.info('clear flap counter done')
 
+    def _run_flow_cmd(self, cmdline):
+        """Run a command changing the flows, or only mark the flows as changed when flow commands are deferred."""
+        if self.deferred:
+            self.debug('deferred: {}'.format(cmdline))
+            self.flows_changed = True
+            return
+        run_cmd(cmdline)
+
+    def _flow_table(self):
+        """Build the flow table of the bridge from the in-memory model, in the format of ovs-ofctl flow files.
+
+        Returns:
+            list: Flows like 'in_port="muxy-vms17-8-0",actions=output:"enp59s0f1.3216",output:"enp59s0f1.3272"'
+        """
+        table = []
+        for direction in ['upstream', 'downstream']:
+            in_side = self.flows[direction]['in_side']
+            out_sides = self.flows[direction]['out_sides']
+            if in_side is None or not out_sides:
+                continue
+            actions = ','.join(['{}:"{}"'.format(OUTPUT, self.ports[out_side]) for out_side in out_sides])
+            table.append('in_port="{}",actions={}'.format(self.ports[in_side], actions))
+        return table
+
+    def apply_flows(self):
+        """Replace the flows of the bridge with the flow table of the in-memory model using one ovs-ofctl command.
+
+        With '--bundle' the flows are replaced in one atomic OpenFlow transaction. If the bridge does not support
+        bundles (OpenFlow 1.4), the flows are replaced without it.
+        """
+        table = self._flow_table()
+        with tempfile.NamedTemporaryFile(mode='w', prefix='{}_'.format(self.bridge), delete=False) as flow_file:
+            flow_file.write('\n'.join(table) + '\n')
+        try:
+            try:
+                run_cmd(BUNDLE_REPLACE_FLOWS_CMD.format(self.bridge, flow_file.name))
+            except Exception as e:
+                self.error('failed to replace flows in a bundle: {}'.format(repr(e)))
+                run_cmd(REPLACE_FLOWS_CMD.format(self.bridge, flow_file.name))
+        finally:
+            os.remove(flow_file.name)
+        self.debug('applied flows:\n{}'.format('\n'.join(table)))
+
+    def _save_state(self):
+        return {
+            'active_side': self.active_side,
+            'active_port': self.active_port,
+            'standby_side': self.standby_side,
+            'standby_port': self.standby_port,
+            'flows': deepcopy(self.flows),
+            'flap_counter': self.flap_counter
+        }
+
+    def _restore_state(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @contextmanager
+    def deferred_flows(self):
+        """Context for updating the mux with the flow commands deferred.
+
+        The flow update methods called in the context only change the in-memory model. When the context exits, the
+        resulting flow table is applied with one ovs-ofctl command if any flow changed. If applying the flows fails,
+        the in-memory model is restored, so that it keeps matching the flows on the bridge.
+        """
+        with self.lock:
+            state = self._save_state()
+            self.deferred = True
+            self.flows_changed = False
+            try:
+                yield self
+                self.deferred = False
+                if self.flows_changed:
+                    self.apply_flows()
+            except Exception:
+                self._restore_state(state)
+                raise
+            finally:
+                self.deferred = False
+
 
 class Muxes(object):
 
@@ -566,24 +661,85 @@ class Muxes(object):
         else:
             return {mux.bridge: mux.status for mux in self.muxes.values()}
 
+    def bulk_update(self, mux_updates):
+        """Update muxes with the flow commands deferred, then apply the flow table of each changed mux bridge with
+        one ovs-ofctl command. The mux bridges are updated concurrently by a pool of threads.
+
+        Args:
+            mux_updates (list): List of (mux, update) tuples. update is a function called with the mux as argument,
+                which calls the flow update methods of the mux.
+        """
+        def _update(mux_update):
+            mux, update = mux_update
+            with mux.deferred_flows():
+                update(mux)
+
+        if len(mux_updates) <= 1:
+            [_update(mux_update) for mux_update in mux_updates]
+            return
+
+        pool = ThreadPool(min(BULK_CONCURRENCY, len(mux_updates)))
+        try:
+            pool.map(_update, mux_updates)
+        finally:
+            pool.close()
+            pool.join()
+
     def set_active_side(self, new_active_side, port_index=None):
         if port_index is not None:
             mux = self._port_to_mux(port_index)
-            mux.set_active_side(new_active_side)
+            self.bulk_update([(mux, lambda mux: mux.set_active_side(new_active_side))])
             return mux.status
         else:
-            [mux.set_active_side(new_active_side) for mux in self.muxes.values()]
+            self.bulk_update([(mux, lambda mux: mux.set_active_side(new_active_side)) for mux in self.muxes.values()])
             return {mux.bridge: mux.status for mux in self.muxes.values()}
 
     def update_flows(self, new_action, out_sides, port_index=None):
         if port_index is not None:
             mux = self._port_to_mux(port_index)
-            mux.update_flows(new_action, out_sides)
+            self.bulk_update([(mux, lambda mux: mux.update_flows(new_action, out_sides))])
             return mux.status
         else:
-            [mux.update_flows(new_action, out_sides) for mux in self.muxes.values()]
+            self.bulk_update([(mux, lambda mux: mux.update_flows(new_action, out_sides))
+                              for mux in self.muxes.values()])
             return {mux.bridge: mux.status for mux in self.muxes.values()}
 
+    def batch(self, operations):
+        """Apply a batch of operations, the flows of each mux bridge are changed once with all its operations applied.
+
+        Args:
+            operations (list): List of operations in posted order. Each operation is a dict like:
+                {"port_index": 0, "active_side": "upper_tor|lower_tor|toggle|random"}
+                {"port_index": 1, "action": "output|drop", "out_sides": ["nic", "upper_tor", "lower_tor"]}
+                {"port_index": 2, "action": "reset"}
+                The operation applies to all the muxes when "port_index" is not specified.
+
+        Returns:
+            dict: Status of the muxes changed by the operations.
+        """
+        ops_per_mux = {}
+        for operation in operations:
+            if operation.get('port_index') is not None:
+                muxes = [self._port_to_mux(operation['port_index'])]
+            else:
+                muxes = self.muxes.values()
+            for mux in muxes:
+                ops_per_mux.setdefault(mux.bridge, (mux, []))[1].append(operation)
+
+        def _apply(ops):
+            def _update(mux):
+                for operation in ops:
+                    if 'active_side' in operation:
+                        mux.set_active_side(operation['active_side'])
+                    elif operation['action'] == 'reset':
+                        mux.reset_flows()
+                    else:
+                        mux.update_flows(operation['action'], operation['out_sides'])
+            return _update
+
+        self.bulk_update([(mux, _apply(ops)) for mux, ops in ops_per_mux.values()])
+        return {mux.bridge: mux.status for mux, _ in ops_per_mux.values()}
+
     def reset_flows(self, port_index=None):
         return self.update_flows(OUTPUT, [NIC, UPPER_TOR, LOWER_TOR], port_index=port_index)
 
@@ -765,6 +921,70 @@ def mux_cable_flow_update(vm_set, port_index, action):
         return g_muxes.update_flows(action, data['out_sides'], port_index)
 
 
+def _validate_batch(request):
+    """Validate the posted data for a batch of operations.
+
+    Expected data:
+        {"operations": [{"port_index": 0, "active_side": "upper_tor|lower_tor|toggle|random"},
+                        {"port_index": 1, "action": "output|drop", "out_sides": ["nic|upper_tor|lower_tor", ...]},
+                        {"port_index": 2, "action": "reset"}, ...]}
+
+    Returns:
+        list: Return the list of operations.
+    """
+    data = request.get_json()
+    supported_out_sides = [NIC, UPPER_TOR, LOWER_TOR]
+    error = None
+    if not isinstance(data, dict) or not isinstance(data.get('operations'), list):
+        error = 'expected a list of "operations"'
+    else:
+        for operation in data['operations']:
+            if not isinstance(operation, dict):
+                error = 'operation {} is not a dict'.format(json.dumps(operation))
+            elif operation.get('port_index') is not None and (not isinstance(operation['port_index'], int) or
+                                                              isinstance(operation['port_index'], bool)):
+                error = 'port_index is not an integer in operation {}'.format(json.dumps(operation))
+            elif operation.get('port_index') is not None and not g_muxes.has_mux(operation['port_index']):
+                error = 'unknown port_index in operation {}'.format(json.dumps(operation))
+            elif 'active_side' in operation:
+                if operation['active_side'] not in [UPPER_TOR, LOWER_TOR, TOGGLE, RANDOM]:
+                    error = 'bad active_side in operation {}'.format(json.dumps(operation))
+            elif operation.get('action') in [OUTPUT, DROP]:
+                out_sides = operation.get('out_sides')
+                if not isinstance(out_sides, list) or any([side not in supported_out_sides for side in out_sides]):
+                    error = 'bad out_sides in operation {}'.format(json.dumps(operation))
+            elif operation.get('action') != 'reset':
+                error = 'expected "active_side" or "action" in operation {}'.format(json.dumps(operation))
+            if error:
+                break
+    if error:
+        abort(400, description='remote_addr={} method={} url={} data={} msg={}'.format(
+            request.remote_addr,
+            request.method,
+            request.url,
+            json.dumps(data),
+            error
+        ))
+    return data['operations']
+
+
+@app.route('/mux/<vm_set>/batch', methods=['POST'])
+def batch_handler(vm_set):
+    """Handler for applying a batch of active side and flow operations to the muxes.
+
+    The operations of a mux are applied in posted order to its in-memory model, then the resulting flows are applied to
+    the mux bridge with one ovs-ofctl command. Different mux bridges are updated concurrently.
+
+    Returns:
+        object: Return a flask response object, status of the muxes changed by the operations.
+    """
+    _validate_vm_set(vm_set)
+    operations = _validate_batch(request)
+    app.logger.info('===== {} POST {} with {} operations ====='.format(
+        request.remote_addr, request.url, len(operations)))
+    return g_muxes.batch(operations)
+
+
 @app.route('/mux/<vm_set>/reset', methods=['POST'])
 def reset_flow_handler(vm_set):
     _validate_vm_set(vm_set)
@@ -0,0 +1,172 @@
+"""
+Benchmark of the flow updates of the mux simulator
+
+Simulates the mux bridges of a vm_set with a fake ovs, which keeps the flow
+table of each bridge in memory and sleeps for a fixed latency per ovs-ofctl
+command, then toggles the active side of all the muxes and updates their
+flows, once the legacy way (commands of each mux run one by one, mux after
+mux) and once with the bulk updates of Muxes (one replace-flows command per
+mux bridge, bridges updated concurrently). The flows left on the bridges by
+both are compared. The latency of the HTTP requests is measured with the
+flask test client.
+
+Usage:
+    python mux_simulator_benchmark.py --muxes 128 --cmd-latency 0.01
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import re
+import shlex
+import threading
+import time
+
+import mux_simulator
+from mux_simulator import Muxes, UPPER_TOR, LOWER_TOR, NIC, OUTPUT, DROP, TOGGLE
+
+VM_SET = 'vms1-1'
+
+
+class FakeOvs(object):
+    """Flow tables of the fake mux bridges, flows[bridge][in_port] = [out_port, ...]"""
+
+    def __init__(self, num_muxes, latency):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.cmd_count = 0
+        self.ports = {}
+        self.flows = {}
+        for port_index in range(num_muxes):
+            bridge = mux_simulator.adaptive_name(mux_simulator.MUX_BRIDGE_TEMPLATE, VM_SET, port_index)
+            nic = mux_simulator.adaptive_name('muxy-%s-%d', VM_SET, port_index)
+            upper = 'enp59s0f1.{}'.format(3000 + port_index * 2)
+            lower = 'enp59s0f1.{}'.format(3000 + port_index * 2 + 1)
+            self.ports[bridge] = [upper, lower, nic]
+            self.flows[bridge] = {nic: [upper, lower], upper: [nic]}
+
+    def bridges(self):
+        return list(self.flows.keys())
+
+    def run_cmd(self, cmdline):
+        with self.lock:
+            self.cmd_count += 1
+        time.sleep(self.latency)
+        args = [arg for arg in shlex.split(cmdline) if not arg.startswith('--')]
+        cmd, bridge = args[1], args[2]
+        flows = self.flows[bridge]
+        if cmd == 'list-ports':
+            return '\n'.join(self.ports[bridge]) + '\n'
+        if cmd == 'dump-flows':
+            lines = []
+            for in_port, out_ports in flows.items():
+                actions = ','.join(['output:"{}"'.format(out_port) for out_port in out_ports])
+                lines.append(' cookie=0x0, table=0, in_port="{}" actions={}'.format(in_port, actions))
+            return '\n'.join(lines) + '\n'
+        if cmd == 'replace-flows':
+            with open(args[3]) as flow_file:
+                new_flows = dict(self._parse_flow(line) for line in flow_file.read().splitlines() if line)
+            self.flows[bridge] = new_flows
+            return ''
+        in_port, out_ports = self._parse_flow(args[3])
+        if cmd == 'del-flows':
+            flows.pop(in_port, None)
+        elif cmd == 'add-flow' or cmd == 'mod-flows':
+            flows[in_port] = out_ports
+        return ''
+
+    @staticmethod
+    def _parse_flow(flow):
+        in_port = re.search(r'in_port="?([^",]+)', flow).group(1)
+        return in_port, re.findall(r'output:"?([^",]+)', flow)
+
+    def snapshot(self):
+        return dict((bridge, dict((in_port, sorted(out_ports)) for in_port, out_ports in flows.items()))
+                    for bridge, flows in self.flows.items())
+
+
+def create_muxes(ovs):
+    mux_simulator.run_cmd = ovs.run_cmd
+    Muxes._mux_bridges = lambda self: ovs.bridges()
+    return Muxes(VM_SET)
+
+
+def legacy_set_active_side(muxes, new_active_side):
+    [mux.set_active_side(new_active_side) for mux in muxes.muxes.values()]
+    return {mux.bridge: mux.status for mux in muxes.muxes.values()}
+
+
+def legacy_update_flows(muxes, new_action, out_sides):
+    [mux.update_flows(new_action, out_sides) for mux in muxes.muxes.values()]
+    return {mux.bridge: mux.status for mux in muxes.muxes.values()}
+
+
+def run_scenario(ovs, muxes, set_active_side, update_flows):
+    """Run the same sequence of updates as a dualtor test toggling and breaking the muxes"""
+    steps = [
+        ('toggle', lambda: set_active_side(muxes, TOGGLE)),
+        ('set lower_tor', lambda: set_active_side(muxes, LOWER_TOR)),
+        ('drop nic upper_tor', lambda: update_flows(muxes, DROP, [NIC, UPPER_TOR])),
+        ('set upper_tor', lambda: set_active_side(muxes, UPPER_TOR)),
+        ('reset', lambda: update_flows(muxes, OUTPUT, [NIC, UPPER_TOR, LOWER_TOR])),
+    ]
+    timings = []
+    for name, step in steps:
+        count = ovs.cmd_count
+        start = time.time()
+        step()
+        timings.append((name, time.time() - start, ovs.cmd_count - count))
+    return timings
+
+
+def http_latency(ovs, iterations):
+    """Latency of the HTTP requests toggling the active side of all the muxes and a batch of half of them"""
+    mux_simulator.g_muxes = create_muxes(ovs)
+    mux_simulator.app.config['VERBOSE'] = False
+    client = mux_simulator.app.test_client()
+    port_indexes = [mux.port_index for mux in mux_simulator.g_muxes.muxes.values()]
+    batch = {'operations': [{'port_index': port_index, 'active_side': TOGGLE} for port_index in port_indexes[::2]]}
+    results = []
+    for name, url, data in [('POST /mux/<vm_set>', '/mux/{}'.format(VM_SET), {'active_side': TOGGLE}),
+                            ('POST /mux/<vm_set>/batch', '/mux/{}/batch'.format(VM_SET), batch)]:
+        start = time.time()
+        for _ in range(iterations):
+            resp = client.post(url, data=json.dumps(data), content_type='application/json')
+            assert resp.status_code == 200, resp.data
+        results.append((name, (time.time() - start) / iterations))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mux simulator flow update benchmark')
+    parser.add_argument('--muxes', type=int, default=128, help='number of mux bridges')
+    parser.add_argument('--cmd-latency', type=float, default=0.01, help='latency of each ovs command in seconds')
+    parser.add_argument('--http-iterations', type=int, default=3, help='number of HTTP requests of each kind')
+    args = parser.parse_args()
+
+    legacy_ovs = FakeOvs(args.muxes, args.cmd_latency)
+    legacy_timings = run_scenario(legacy_ovs, create_muxes(legacy_ovs), legacy_set_active_side, legacy_update_flows)
+
+    bulk_ovs = FakeOvs(args.muxes, args.cmd_latency)
+    bulk_timings = run_scenario(bulk_ovs, create_muxes(bulk_ovs),
+                                lambda muxes, side: muxes.set_active_side(side),
+                                lambda muxes, action, out_sides: muxes.update_flows(action, out_sides))
+
+    print('{} muxes, {:.3f} sec per ovs command'.format(args.muxes, args.cmd_latency))
+    for (name, legacy_time, legacy_cmds), (_, bulk_time, bulk_cmds) in zip(legacy_timings, bulk_timings):
+        print('{:<20} legacy {:8.3f} sec {:5d} cmds  bulk {:8.3f} sec {:5d} cmds  speedup {:.1f}x'.format(
+              name, legacy_time, legacy_cmds, bulk_time, bulk_cmds, legacy_time / max(bulk_time, 1e-6)))
+
+    for name, latency in http_latency(FakeOvs(args.muxes, args.cmd_latency), args.http_iterations):
+        print('{:<26} {:8.3f} sec per request'.format(name, latency))
+
+    if legacy_ovs.snapshot() != bulk_ovs.snapshot():
+        print('Flows on the bridges are different')
+        return 1
+    print('Flows on the bridges are identical')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,5 +1,6 @@
 #!/usr/bin/python
 
+import functools
 import hashlib
 import json
 import os.path
@@ -7,12 +8,17 @@ import re
 import subprocess
 import shlex
 import sys
+import tempfile
+import threading
 import time
 import traceback
 import logging
 import docker
 import ipaddress
 
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+
 from ansible.module_utils.debug_utils import config_module_logging
 from ansible.module_utils.basic import *
 
@@ -75,6 +81,7 @@ Parameters:
     - duts_mgmt_port: duts mgmt port
     - duts_name: duts names
     - fp_mtu: MTU for FP ports
+    - concurrency: max number of VMs or dualtor cables set up at the same time
 '''
 
 EXAMPLES = '''
@@ -156,6 +163,8 @@ SUB_INTERFACE_VLAN_ID = '10'
 
 RT_TABLE_FILEPATH = "/etc/iproute2/rt_tables"
 
+DEFAULT_CONCURRENCY = 8
+
 
 def construct_log_filename(cmd, vm_set_name):
     log_filename = 'vm_topology'
@@ -165,6 +174,28 @@ def construct_log_filename(cmd, vm_set_name):
         log_filename += '_' + vm_set_name
     return log_filename
 
+def timed_phase(func):
+    """Record the time taken by a VMTopology phase and the number of commands it ran in the timing report.
+
+    The phases called by another phase are accounted in the calling phase.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self._phase is not None:
+            return func(self, *args, **kwargs)
+        self._phase = func.__name__
+        start_time, start_count = time.time(), VMTopology.cmd_count
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self._phase = None
+            timing = self.phase_timings.setdefault(func.__name__, {'calls': 0, 'seconds': 0.0, 'commands': 0})
+            timing['calls'] += 1
+            timing['seconds'] += time.time() - start_time
+            timing['commands'] += VMTopology.cmd_count - start_count
+    return wrapper
+
+
 def adaptive_name(template, host, index):
     """
     A helper function for interface/bridge name calculation.
@@ -202,17 +233,33 @@ def adaptive_temporary_interface(vm_set_name, interface_name, reserved_space=0):
 
 class VMTopology(object):
 
-    def __init__(self, vm_names, vm_properties, fp_mtu, max_fp_num, topo):
+    # number of commands run, for the timing report
+    cmd_count = 0
+    _cmd_count_lock = threading.Lock()
+
+    def __init__(self, vm_names, vm_properties, fp_mtu, max_fp_num, topo, concurrency=DEFAULT_CONCURRENCY):
         self.vm_names = vm_names
         self.vm_properties = vm_properties
         self.fp_mtu = fp_mtu
         self.max_fp_num = max_fp_num
         self.topo = topo
+        self.concurrency = concurrency
         self._host_interfaces = None
         self._disabled_host_interfaces = None
         self._host_interfaces_active_active = None
+        self._phase = None
+        self.phase_timings = OrderedDict()
         return
 
+    def timing_report(self):
+        """Return the lines of the report of the time taken by each phase"""
+        lines = []
+        for phase, timing in self.phase_timings.items():
+            lines.append('%-32s %8.2fs %6d commands %4d calls' %
+                         (phase, timing['seconds'], timing['commands'], timing['calls']))
+        return lines
+
+    @timed_phase
     def init(self, vm_set_name, vm_base, duts_fp_ports, duts_name, ptf_exists=True, check_bridge=True):
         self.vm_set_name = vm_set_name
         self.duts_name = duts_name
@@ -356,55 +403,76 @@ class VMTopology(object):
 
         return vlans
 
+    @timed_phase
     def add_network_namespace(self):
         """Create a network namespace."""
         self.delete_network_namespace()
         VMTopology.cmd("ip netns add %s" % self.netns)
 
+    @timed_phase
     def delete_network_namespace(self):
         """Delete a network namespace."""
         if os.path.exists("/var/run/netns/%s" % self.netns):
             VMTopology.cmd("ip netns delete %s" % self.netns)
 
+    @timed_phase
     def add_mgmt_port_to_netns(self, mgmt_bridge, mgmt_ip, mgmt_gw, mgmt_ipv6_addr=None, mgmt_gw_v6=None):
         if VMTopology.intf_not_exists(MGMT_PORT_NAME, netns=self.netns):
             self.add_br_if_to_netns(mgmt_bridge, NETNS_MGMT_IF_TEMPLATE % self.vm_set_name, MGMT_PORT_NAME)
         self.add_ip_to_netns_if(MGMT_PORT_NAME, mgmt_ip, ipv6_addr=mgmt_ipv6_addr, default_gw=mgmt_gw, default_gw_v6=mgmt_gw_v6)
 
+    @timed_phase
     def create_bridges(self):
+        bridges = []
         for vm in self.vm_names:
             for fp_num in range(self.max_fp_num):
-                fp_br_name = adaptive_name(OVS_FP_BRIDGE_TEMPLATE, vm, fp_num)
-                self.create_ovs_bridge(fp_br_name, self.fp_mtu)
+                bridges.append(adaptive_name(OVS_FP_BRIDGE_TEMPLATE, vm, fp_num))
 
         if self.topo and 'DUT' in self.topo and 'vs_chassis' in self.topo['DUT']:
             # We have a KVM based virtual chassis, need to create bridge for midplane and inband.
-            self.create_ovs_bridge(VS_CHASSIS_INBAND_BRIDGE_NAME, self.fp_mtu)
-            self.create_ovs_bridge(VS_CHASSIS_MIDPLANE_BRIDGE_NAME, self.fp_mtu)
+            bridges.append(VS_CHASSIS_INBAND_BRIDGE_NAME)
+            bridges.append(VS_CHASSIS_MIDPLANE_BRIDGE_NAME)
+
+        self.create_ovs_bridges(bridges, self.fp_mtu)
 
     def create_ovs_bridge(self, bridge_name, mtu):
-        logging.info('=== Create bridge %s with mtu %d ===' % (bridge_name, mtu))
-        VMTopology.cmd('ovs-vsctl --may-exist add-br %s' % bridge_name)
+        self.create_ovs_bridges([bridge_name], mtu)
 
-        if mtu != DEFAULT_MTU:
-            VMTopology.cmd('ifconfig %s mtu %d' % (bridge_name, mtu))
+    def create_ovs_bridges(self, bridge_names, mtu):
+        """Create the ovs bridges in one ovs-vsctl transaction, set their mtu and bring them up in one 'ip -batch'"""
+        if not bridge_names:
+            return
+        logging.info('=== Create bridges %s with mtu %d ===' % (', '.join(bridge_names), mtu))
+        VMTopology.cmd('ovs-vsctl ' + ' '.join(['-- --may-exist add-br %s' % br for br in bridge_names]))
 
-        VMTopology.cmd('ifconfig %s up' % bridge_name)
+        if mtu != DEFAULT_MTU:
+            VMTopology.ip_batch(['link set dev %s mtu %d up' % (br, mtu) for br in bridge_names])
+        else:
+            VMTopology.ip_batch(['link set dev %s up' % br for br in bridge_names])
 
+    @timed_phase
     def destroy_bridges(self):
+        bridges = []
         for vm in self.vm_names:
             for fp_num in range(self.max_fp_num):
-                fp_br_name = adaptive_name(OVS_FP_BRIDGE_TEMPLATE, vm, fp_num)
-                self.destroy_ovs_bridge(fp_br_name)
+                bridges.append(adaptive_name(OVS_FP_BRIDGE_TEMPLATE, vm, fp_num))
 
         if self.topo and 'DUT' in self.topo and 'vs_chassis' in self.topo['DUT']:
             # In case of KVM based virtual chassis, need to destroy bridge for midplane and inband.
-            self.destroy_ovs_bridge(VS_CHASSIS_INBAND_BRIDGE_NAME)
-            self.destroy_ovs_bridge(VS_CHASSIS_MIDPLANE_BRIDGE_NAME)
+            bridges.append(VS_CHASSIS_INBAND_BRIDGE_NAME)
+            bridges.append(VS_CHASSIS_MIDPLANE_BRIDGE_NAME)
+
+        self.destroy_ovs_bridges(bridges)
 
     def destroy_ovs_bridge(self, bridge_name):
-        logging.info('=== Destroy bridge %s ===' % bridge_name)
-        VMTopology.cmd('ovs-vsctl --if-exists del-br %s' % bridge_name)
+        self.destroy_ovs_bridges([bridge_name])
+
+    def destroy_ovs_bridges(self, bridge_names):
+        """Destroy the ovs bridges in one ovs-vsctl transaction"""
+        if not bridge_names:
+            return
+        logging.info('=== Destroy bridges %s ===' % ', '.join(bridge_names))
+        VMTopology.cmd('ovs-vsctl ' + ' '.join(['-- --if-exists del-br %s' % br for br in bridge_names]))
 
     def get_vm_bridges(self, vmname):
         brs = []
@@ -417,6 +485,7 @@ class VMTopology(object):
 
         return brs
 
+    @timed_phase
     def add_injected_fp_ports_to_docker(self):
         """
         add injected front panel ports to docker
@@ -425,8 +494,8 @@ class VMTopology(object):
             PTF (int_if) ----------- injected port (ext_if)
 
         """
-        for vm, vlans in self.injected_fp_ports.items():
-            for vlan in vlans:
+        def add_vm_ports(vm):
+            for vlan in self.injected_fp_ports[vm]:
                 (_, _, ptf_index) = VMTopology.parse_vm_vlan_port(vlan)
                 ext_if = adaptive_name(INJECTED_INTERFACES_TEMPLATE, self.vm_set_name, ptf_index)
                 int_if = PTF_FP_IFACE_TEMPLATE % ptf_index
@@ -444,6 +513,10 @@ class VMTopology(object):
                 else:
                     self.add_veth_if_to_docker(ext_if, int_if)
 
+        # The veth pairs of different VMs are independent, set them up concurrently
+        self.run_concurrently(add_vm_ports, list(self.injected_fp_ports.keys()))
+
+    @timed_phase
     def add_mgmt_port_to_docker(self, mgmt_bridge, mgmt_ip, mgmt_gw, mgmt_ipv6_addr=None, mgmt_gw_v6=None, api_server_pid=None):
         if api_server_pid:
             self.pid = api_server_pid
@@ -454,6 +527,7 @@ class VMTopology(object):
                 self.add_br_if_to_docker(mgmt_bridge, 'apiserver', MGMT_PORT_NAME)
         self.add_ip_to_docker_if(MGMT_PORT_NAME, mgmt_ip, mgmt_ipv6_addr=mgmt_ipv6_addr, mgmt_gw=mgmt_gw, mgmt_gw_v6=mgmt_gw_v6, api_server_pid=api_server_pid)
 
+    @timed_phase
     def add_bp_port_to_docker(self, mgmt_ip, mgmt_ipv6):
         self.add_br_if_to_docker(self.bp_bridge, PTF_BP_IF_TEMPLATE % self.vm_set_name, BP_PORT_NAME)
         self.add_ip_to_docker_if(BP_PORT_NAME, mgmt_ip, mgmt_ipv6)
@@ -532,16 +606,37 @@ class VMTopology(object):
                     VMTopology.cmd("ip netns exec %s ip -6 route add default via %s dev %s" % (self.netns, default_gw_v6, int_if))
 
     def add_dut_if_to_docker(self, iface_name, dut_iface):
-        logging.info("=== Add DUT interface %s to PTF docker as %s ===" % (dut_iface, iface_name))
-        if VMTopology.intf_exists(dut_iface) \
-            and VMTopology.intf_not_exists(dut_iface, pid=self.pid) \
-            and VMTopology.intf_not_exists(iface_name, pid=self.pid):
-            VMTopology.cmd("ip link set netns %s dev %s" % (self.pid, dut_iface))
+        self.add_dut_ifs_to_docker([(iface_name, dut_iface)])
 
-        if VMTopology.intf_exists(dut_iface, pid=self.pid) and VMTopology.intf_not_exists(iface_name, pid=self.pid):
-            VMTopology.cmd("nsenter -t %s -n ip link set dev %s name %s" % (self.pid, dut_iface, iface_name))
+    def add_dut_ifs_to_docker(self, ifaces):
+        """Move DUT interfaces into the PTF docker and rename them.
 
-        VMTopology.iface_up(iface_name, pid=self.pid)
+        The interfaces of the host and of the PTF docker are listed once, the interfaces are moved with one 'ip -batch'
+        on the host and renamed and brought up with one 'ip -batch' in the PTF docker.
+
+        Args:
+            ifaces (list): List of (iface_name, dut_iface) tuples, iface_name is the name in the PTF docker.
+        """
+        if not ifaces:
+            return
+        host_intfs = VMTopology.get_intfs()
+        ptf_intfs = VMTopology.get_intfs(pid=self.pid)
+        host_cmds, ptf_cmds = [], []
+        for iface_name, dut_iface in ifaces:
+            logging.info("=== Add DUT interface %s to PTF docker as %s ===" % (dut_iface, iface_name))
+            if dut_iface in host_intfs and dut_iface not in ptf_intfs and iface_name not in ptf_intfs:
+                host_cmds.append("link set netns %s dev %s" % (self.pid, dut_iface))
+                ptf_intfs.add(dut_iface)
+
+            if dut_iface in ptf_intfs and iface_name not in ptf_intfs:
+                ptf_cmds.append("link set dev %s name %s" % (dut_iface, iface_name))
+                ptf_intfs.discard(dut_iface)
+                ptf_intfs.add(iface_name)
+
+            ptf_cmds.append("link set %s up" % iface_name)
+
+        VMTopology.ip_batch(host_cmds)
+        VMTopology.ip_batch(ptf_cmds, pid=self.pid)
 
     def add_dut_vlan_subif_to_docker(self, iface_name, vlan_separator, vlan_id):
         """Create a vlan sub interface for the ptf interface."""
@@ -552,18 +647,34 @@ class VMTopology(object):
         VMTopology.cmd("nsenter -t %s -n ip link set %s up" % (self.pid, vlan_sub_iface_name))
 
     def remove_dut_if_from_docker(self, iface_name, dut_iface):
+        self.remove_dut_ifs_from_docker([(iface_name, dut_iface)])
 
-        if self.pid is None:
+    def remove_dut_ifs_from_docker(self, ifaces):
+        """Rename DUT interfaces back and move them from the PTF docker to the host with one 'ip -batch'.
+
+        Args:
+            ifaces (list): List of (iface_name, dut_iface) tuples, iface_name is the name in the PTF docker.
+        """
+        if self.pid is None or not ifaces:
             return
 
-        if VMTopology.intf_exists(iface_name, pid=self.pid):
-            VMTopology.iface_down(iface_name, pid=self.pid)
+        host_intfs = VMTopology.get_intfs()
+        ptf_intfs = VMTopology.get_intfs(pid=self.pid)
+        ptf_cmds = []
+        for iface_name, dut_iface in ifaces:
+            if iface_name in ptf_intfs:
+                ptf_cmds.append("link set %s down" % iface_name)
+
+                if dut_iface not in ptf_intfs:
+                    ptf_cmds.append("link set dev %s name %s" % (iface_name, dut_iface))
+                    ptf_intfs.discard(iface_name)
+                    ptf_intfs.add(dut_iface)
 
-            if VMTopology.intf_not_exists(dut_iface, pid=self.pid):
-                VMTopology.cmd("nsenter -t %s -n ip link set dev %s name %s" % (self.pid, iface_name, dut_iface))
+            if dut_iface not in host_intfs and dut_iface in ptf_intfs:
+                ptf_cmds.append("link set netns 1 dev %s" % dut_iface)
+                ptf_intfs.discard(dut_iface)
 
-        if VMTopology.intf_not_exists(dut_iface) and VMTopology.intf_exists(dut_iface, pid=self.pid):
-            VMTopology.cmd("nsenter -t %s -n ip link set netns 1 dev %s" % (self.pid, dut_iface))
+        VMTopology.ip_batch(ptf_cmds, pid=self.pid)
 
     def remove_dut_vlan_subif_from_docker(self, iface_name, vlan_separator, vlan_id):
         """Remove the vlan sub interface created for the ptf interface."""
@@ -590,52 +701,8 @@ class VMTopology(object):
             int_sub_if = int_if + vlan_subintf_sep + vlan_subintf_vlan_id
             t_int_sub_if = t_int_if + vlan_subintf_sep + vlan_subintf_vlan_id
 
-        if VMTopology.intf_exists(t_int_if):
-            VMTopology.cmd("ip link del dev %s" % t_int_if)
-
-        if VMTopology.intf_not_exists(ext_if):
-            VMTopology.cmd("ip link add %s type veth peer name %s" % (ext_if, t_int_if))
-            if create_vlan_subintf:
-                VMTopology.cmd("vconfig add %s %s" % (t_int_if, vlan_subintf_vlan_id))
-
-        if self.fp_mtu != DEFAULT_MTU:
-            VMTopology.cmd("ip link set dev %s mtu %d" % (ext_if, self.fp_mtu))
-            if VMTopology.intf_exists(t_int_if):
-                VMTopology.cmd("ip link set dev %s mtu %d" % (t_int_if, self.fp_mtu))
-            elif VMTopology.intf_exists(t_int_if, pid=self.pid):
-                VMTopology.cmd("nsenter -t %s -n ip link set dev %s mtu %d" % (self.pid, t_int_if, self.fp_mtu))
-            elif VMTopology.intf_exists(int_if, pid=self.pid):
-                VMTopology.cmd("nsenter -t %s -n ip link set dev %s mtu %d" % (self.pid, int_if, self.fp_mtu))
-            if create_vlan_subintf:
-                if VMTopology.intf_exists(t_int_sub_if):
-                    VMTopology.cmd("ip link set dev %s mtu %d" % (t_int_sub_if, self.fp_mtu))
-                elif VMTopology.intf_exists(t_int_sub_if, pid=self.pid):
-                    VMTopology.cmd("nsenter -t %s -n ip link set dev %s mtu %d" % (self.pid, t_int_sub_if, self.fp_mtu))
-                elif VMTopology.intf_exists(int_sub_if, pid=self.pid):
-                    VMTopology.cmd("nsenter -t %s -n ip link set dev %s mtu %d" % (self.pid, int_sub_if, self.fp_mtu))
-
-        VMTopology.iface_up(ext_if)
-
-        if VMTopology.intf_exists(t_int_if) \
-            and VMTopology.intf_not_exists(t_int_if, pid=self.pid) \
-            and VMTopology.intf_not_exists(int_if, pid=self.pid):
-            VMTopology.cmd("ip link set netns %s dev %s" % (self.pid, t_int_if))
-        if create_vlan_subintf \
-            and VMTopology.intf_exists(t_int_sub_if) \
-            and VMTopology.intf_not_exists(t_int_sub_if, pid=self.pid) \
-            and VMTopology.intf_not_exists(int_sub_if, pid=self.pid):
-            VMTopology.cmd("ip link set netns %s dev %s" % (self.pid, t_int_sub_if))
-
-        if VMTopology.intf_exists(t_int_if, pid=self.pid) and VMTopology.intf_not_exists(int_if, pid=self.pid):
-            VMTopology.cmd("nsenter -t %s -n ip link set dev %s name %s" % (self.pid, t_int_if, int_if))
-        if create_vlan_subintf \
-            and VMTopology.intf_exists(t_int_sub_if, pid=self.pid) \
-            and VMTopology.intf_not_exists(int_sub_if, pid=self.pid):
-            VMTopology.cmd("nsenter -t %s -n ip link set dev %s name %s" % (self.pid, t_int_sub_if, int_sub_if))
-
-        VMTopology.iface_up(int_if, pid=self.pid)
-        if create_vlan_subintf:
-            VMTopology.iface_up(int_sub_if, pid=self.pid)
+        sub_if = (vlan_subintf_vlan_id, int_sub_if, t_int_sub_if) if create_vlan_subintf else None
+        self._add_veth_if(ext_if, int_if, t_int_if, sub_if=sub_if, pid=self.pid)
 
     def add_veth_if_to_netns(self, ext_if, int_if):
         """Create vethernet devices (ext_if, int_if) and put int_if into the netns for active-active."""
@@ -643,44 +710,88 @@ class VMTopology(object):
 
         t_int_if = adaptive_temporary_interface(self.vm_set_name, int_if)
 
-        if VMTopology.intf_exists(t_int_if):
-            VMTopology.cmd("ip link del dev %s" % t_int_if)
+        self._add_veth_if(ext_if, int_if, t_int_if, netns=self.netns)
 
-        if VMTopology.intf_not_exists(ext_if):
-            VMTopology.cmd("ip link add %s type veth peer name %s" % (ext_if, t_int_if))
+    def _add_veth_if(self, ext_if, int_if, t_int_if, sub_if=None, pid=None, netns=None):
+        """Create the veth pair (ext_if, t_int_if), move t_int_if to the docker of pid or to netns, rename it int_if.
+
+        The interfaces of the host and of the namespace are listed once. The changes on the host and in the namespace
+        are made with one 'ip -batch' each.
+
+        Args:
+            sub_if (tuple, optional): (vlan_id, int_sub_if, t_int_sub_if) of the vlan sub interface to be created.
+        """
+        ns = pid if pid is not None else netns
+        host_intfs = VMTopology.get_intfs()
+        ns_intfs = VMTopology.get_intfs(pid=pid, netns=netns)
+        host_cmds, ns_cmds = [], []
+
+        def set_mtu(intf, t_intf):
+            if t_intf in host_intfs:
+                host_cmds.append("link set dev %s mtu %d" % (t_intf, self.fp_mtu))
+            elif t_intf in ns_intfs:
+                ns_cmds.append("link set dev %s mtu %d" % (t_intf, self.fp_mtu))
+            elif intf in ns_intfs:
+                ns_cmds.append("link set dev %s mtu %d" % (intf, self.fp_mtu))
+
+        def move_and_rename(intf, t_intf):
+            if t_intf in host_intfs and t_intf not in ns_intfs and intf not in ns_intfs:
+                host_cmds.append("link set netns %s dev %s" % (ns, t_intf))
+                host_intfs.discard(t_intf)
+                ns_intfs.add(t_intf)
+            if t_intf in ns_intfs and intf not in ns_intfs:
+                ns_cmds.append("link set dev %s name %s" % (t_intf, intf))
+                ns_intfs.discard(t_intf)
+                ns_intfs.add(intf)
+
+        if t_int_if in host_intfs:
+            # Left by an interrupted add, deleting it also deletes its veth peer ext_if, which is created again below
+            host_cmds.append("link del dev %s" % t_int_if)
+            host_intfs.discard(t_int_if)
+            host_intfs.discard(ext_if)
+            if sub_if is not None:
+                host_intfs.discard(sub_if[2])
+
+        if ext_if not in host_intfs:
+            host_cmds.append("link add %s type veth peer name %s" % (ext_if, t_int_if))
+            host_intfs.update([ext_if, t_int_if])
+            if sub_if is not None:
+                host_cmds.append("link add link %s name %s type vlan id %s" % (t_int_if, sub_if[2], sub_if[0]))
+                host_intfs.add(sub_if[2])
 
         if self.fp_mtu != DEFAULT_MTU:
-            VMTopology.cmd("ip link set dev %s mtu %d" % (ext_if, self.fp_mtu))
-            if VMTopology.intf_exists(t_int_if):
-                VMTopology.cmd("ip link set dev %s mtu %d" % (t_int_if, self.fp_mtu))
-            elif VMTopology.intf_exists(t_int_if, netns=self.netns):
-                VMTopology.cmd("ip netns exec %s ip link set dev %s mtu %d" % (self.netns, t_int_if, self.fp_mtu))
-            elif VMTopology.intf_exists(int_if, netns=self.netns):
-                VMTopology.cmd("ip netns exec %s ip link set dev %s mtu %d" % (self.netns, int_if, self.fp_mtu))
+            host_cmds.append("link set dev %s mtu %d" % (ext_if, self.fp_mtu))
+            set_mtu(int_if, t_int_if)
+            if sub_if is not None:
+                set_mtu(sub_if[1], sub_if[2])
 
-        VMTopology.iface_up(ext_if)
+        host_cmds.append("link set %s up" % ext_if)
 
-        if VMTopology.intf_exists(t_int_if) \
-            and VMTopology.intf_not_exists(t_int_if, netns=self.netns) \
-            and VMTopology.intf_not_exists(int_if, netns=self.netns):
-            VMTopology.cmd("ip link set netns %s dev %s" % (self.netns, t_int_if))
+        move_and_rename(int_if, t_int_if)
+        if sub_if is not None:
+            move_and_rename(sub_if[1], sub_if[2])
 
-        if VMTopology.intf_exists(t_int_if, netns=self.netns) and VMTopology.intf_not_exists(int_if, netns=self.netns):
-            VMTopology.cmd("ip netns exec %s ip link set dev %s name %s" % (self.netns, t_int_if, int_if))
+        ns_cmds.append("link set %s up" % int_if)
+        if sub_if is not None:
+            ns_cmds.append("link set %s up" % sub_if[1])
 
-        VMTopology.iface_up(int_if, netns=self.netns)
+        VMTopology.ip_batch(host_cmds)
+        VMTopology.ip_batch(ns_cmds, pid=pid, netns=netns)
 
+    @timed_phase
     def bind_mgmt_port(self, br_name, mgmt_port):
         logging.info('=== Bind mgmt port %s to bridge %s ===' % (mgmt_port, br_name))
         _, if_to_br = VMTopology.brctl_show(br_name)
         if mgmt_port not in if_to_br:
             VMTopology.cmd("brctl addif %s %s" % (br_name, mgmt_port))
 
+    @timed_phase
     def unbind_mgmt_port(self, mgmt_port):
         _, if_to_br = VMTopology.brctl_show()
         if mgmt_port in if_to_br:
             VMTopology.cmd("brctl delif %s %s" % (if_to_br[mgmt_port], mgmt_port))
 
+    @timed_phase
     def bind_devices_interconnect(self):
         for link_index, vlans in self.devices_interconnect_interfaces.items():
             interconnection_bridge = OVS_INTERCONNECTION_BRIDGE_TEMPLATE % (self.vm_set_name, link_index)
@@ -691,6 +802,7 @@ class VMTopology(object):
             vlan2_iface = self.duts_fp_ports[self.duts_name[dut_index_1]][str(vlan_index_1)]
             self.bind_devices_interconnect_ports(interconnection_bridge, vlan1_iface, vlan2_iface)
 
+    @timed_phase
     def unbind_devices_interconnect(self):
         for link_index, vlans in self.devices_interconnect_interfaces.items():
             interconnection_bridge = OVS_INTERCONNECTION_BRIDGE_TEMPLATE % (self.vm_set_name, link_index)
@@ -703,19 +815,17 @@ class VMTopology(object):
             self.destroy_ovs_bridge(interconnection_bridge)
 
     def bind_devices_interconnect_ports(self, br_name, vlan1_iface, vlan2_iface):
-        ports = VMTopology.get_ovs_br_ports(br_name)
-        if vlan1_iface not in ports:
-            VMTopology.cmd('ovs-vsctl add-port %s %s' % (br_name, vlan1_iface))
-        if vlan2_iface not in ports:
-            VMTopology.cmd('ovs-vsctl add-port %s %s' % (br_name, vlan2_iface))
+        VMTopology.ovs_add_ports(br_name, [vlan1_iface, vlan2_iface])
         bindings = VMTopology.get_ovs_port_bindings(br_name)
         vlan1_iface_id = bindings[vlan1_iface]
         vlan2_iface_id = bindings[vlan2_iface]
-        # clear old bindings
-        VMTopology.cmd('ovs-ofctl del-flows %s' % br_name)
-        VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=output:%s" % (br_name, vlan1_iface_id, vlan2_iface_id))
-        VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=output:%s" % (br_name, vlan2_iface_id, vlan1_iface_id))
+        # replace old bindings
+        VMTopology.ovs_replace_flows(br_name, [
+            "table=0,in_port=%s,action=output:%s" % (vlan1_iface_id, vlan2_iface_id),
+            "table=0,in_port=%s,action=output:%s" % (vlan2_iface_id, vlan1_iface_id),
+        ])
 
+    @timed_phase
     def bind_fp_ports(self, disconnect_vm=False):
         """
         bind dut front panel ports to VMs
@@ -732,7 +842,7 @@ class VMTopology(object):
                             +----------------------+
 
         """
-        for attr in self.VMs.values():
+        def bind_vm_ports(attr):
             for idx, vlan in enumerate(attr['vlans']):
                 br_name = adaptive_name(OVS_FP_BRIDGE_TEMPLATE, self.vm_names[self.vm_base_index + attr['vm_offset']], idx)
                 vm_iface = OVS_FP_TAP_TEMPLATE % (self.vm_names[self.vm_base_index + attr['vm_offset']], idx)
@@ -742,18 +852,24 @@ class VMTopology(object):
                     continue
                 self.bind_ovs_ports(br_name, self.duts_fp_ports[self.duts_name[dut_index]][str(vlan_index)], injected_iface, vm_iface, disconnect_vm)
 
+        # Every VM port has its own ovs bridge, bind the ports of different VMs concurrently
+        self.run_concurrently(bind_vm_ports, list(self.VMs.values()))
+
         if self.topo and 'DUT' in self.topo and 'vs_chassis' in self.topo['DUT']:
             # We have a KVM based virtaul chassis, bind the midplane and inband ports
             self.bind_vs_dut_ports(VS_CHASSIS_INBAND_BRIDGE_NAME, self.topo['DUT']['vs_chassis']['inband_port'])
             self.bind_vs_dut_ports(VS_CHASSIS_MIDPLANE_BRIDGE_NAME, self.topo['DUT']['vs_chassis']['midplane_port'])
 
+    @timed_phase
     def unbind_fp_ports(self):
-        for attr in self.VMs.values():
+        def unbind_vm_ports(attr):
             for vlan_num, vlan in enumerate(attr['vlans']):
                 br_name = adaptive_name(OVS_FP_BRIDGE_TEMPLATE, self.vm_names[self.vm_base_index + attr['vm_offset']], vlan_num)
                 vm_iface = OVS_FP_TAP_TEMPLATE % (self.vm_names[self.vm_base_index + attr['vm_offset']], vlan_num)
                 self.unbind_ovs_ports(br_name, vm_iface)
 
+        self.run_concurrently(unbind_vm_ports, list(self.VMs.values()))
+
         if self.topo and 'DUT' in self.topo and 'vs_chassis' in self.topo['DUT']:
             # We have a KVM based virtaul chassis, unbind the midplane and inband ports
             self.unbind_vs_dut_ports(VS_CHASSIS_INBAND_BRIDGE_NAME, self.topo['DUT']['vs_chassis']['inband_port'])
@@ -761,9 +877,9 @@ class VMTopology(object):
             # Remove the bridges as well - this is here instead of destroy_bridges as that is called with cmd: 'destroy'
             # is called from 'testbed-cli.sh stop-vms' which takes a server name, an no testbed name, and thus has
             # no topology associated with it.
-            self.destroy_ovs_bridge(VS_CHASSIS_INBAND_BRIDGE_NAME)
-            self.destroy_ovs_bridge(VS_CHASSIS_MIDPLANE_BRIDGE_NAME)
+            self.destroy_ovs_bridges([VS_CHASSIS_INBAND_BRIDGE_NAME, VS_CHASSIS_MIDPLANE_BRIDGE_NAME])
 
+    @timed_phase
     def bind_vm_backplane(self):
 
         if VMTopology.intf_not_exists(self.bp_bridge):
@@ -771,16 +887,20 @@ class VMTopology(object):
 
         VMTopology.iface_up(self.bp_bridge)
 
+        br_to_ifs, _ = VMTopology.brctl_show()
+        cmds = []
         for attr in self.VMs.values():
             vm_name = self.vm_names[self.vm_base_index + attr['vm_offset']]
             bp_port_name = OVS_BP_TAP_TEMPLATE % vm_name
 
-            br_to_ifs, _ = VMTopology.brctl_show()
             if bp_port_name not in br_to_ifs[self.bp_bridge]:
-                VMTopology.cmd("brctl addif %s %s" % (self.bp_bridge, bp_port_name))
+                cmds.append("link set dev %s master %s" % (bp_port_name, self.bp_bridge))
+
+            cmds.append("link set %s up" % bp_port_name)
 
-            VMTopology.iface_up(bp_port_name)
+        VMTopology.ip_batch(cmds)
 
+    @timed_phase
     def unbind_vm_backplane(self):
 
         if VMTopology.intf_exists(self.bp_bridge):
@@ -792,26 +912,23 @@ class VMTopology(object):
         # 30 of each DUT together into bridge br_name
         # Also for vm, a dut's ports would be of the format <dut_hostname>-<port_num + 1>. So, port '30' on vm with
         # name 'vlab-02' would be 'vlab-02-31'
-        br_ports = VMTopology.get_ovs_br_ports(br_name)
+        port_names = []
         for dut_index, a_port in enumerate(dut_ports):
             dut_name = self.duts_name[dut_index]
-            port_name = "{}-{}".format(dut_name, (a_port + 1))
-            br = VMTopology.get_ovs_bridge_by_port(port_name)
-            if br is not None and br != br_name:
-                VMTopology.cmd('ovs-vsctl del-port %s %s' % (br, port_name))
-
-            if port_name not in br_ports:
-                VMTopology.cmd('ovs-vsctl add-port %s %s' % (br_name, port_name))
+            port_names.append("{}-{}".format(dut_name, (a_port + 1)))
+        VMTopology.ovs_add_ports(br_name, port_names)
 
     def unbind_vs_dut_ports(self, br_name, dut_ports):
         """unbind all ports except the vm port from an ovs bridge"""
         if VMTopology.intf_exists(br_name):
             ports = VMTopology.get_ovs_br_ports(br_name)
+            port_names = []
             for dut_index, a_port in enumerate(dut_ports):
                 dut_name = self.duts_name[dut_index]
                 port_name = "{}-{}".format(dut_name, (a_port + 1))
                 if port_name in ports:
-                    VMTopology.cmd('ovs-vsctl del-port %s %s' % (br_name, port_name))
+                    port_names.append(port_name)
+            VMTopology.ovs_del_ports(br_name, port_names)
 
     def bind_ovs_ports(self, br_name, dut_iface, injected_iface, vm_iface, disconnect_vm=False):
         """
@@ -823,71 +940,68 @@ class VMTopology(object):
                                    |                      +---- vm_iface
                                    +----------------------+
         """
-        br = VMTopology.get_ovs_bridge_by_port(injected_iface)
-        if br is not None and br != br_name:
-            VMTopology.cmd('ovs-vsctl del-port %s %s' % (br, injected_iface))
-
-        br = VMTopology.get_ovs_bridge_by_port(dut_iface)
-        if br is not None and br != br_name:
-            VMTopology.cmd('ovs-vsctl del-port %s %s' % (br, dut_iface))
-
-        ports = VMTopology.get_ovs_br_ports(br_name)
-        if injected_iface not in ports:
-            VMTopology.cmd('ovs-vsctl add-port %s %s' % (br_name, injected_iface))
-
-        if dut_iface not in ports:
-            VMTopology.cmd('ovs-vsctl add-port %s %s' % (br_name, dut_iface))
+        VMTopology.ovs_add_ports(br_name, [injected_iface, dut_iface])
 
         bindings = VMTopology.get_ovs_port_bindings(br_name, [dut_iface])
         dut_iface_id = bindings[dut_iface]
         injected_iface_id = bindings[injected_iface]
         vm_iface_id = bindings[vm_iface]
 
-        # clear old bindings
-        VMTopology.cmd('ovs-ofctl del-flows %s' % br_name)
+        # replace old bindings
+        flows = []
 
         if disconnect_vm:
             # Drop packets from VM
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=drop" % (br_name, vm_iface_id))
+            flows.append("table=0,in_port=%s,action=drop" % vm_iface_id)
         else:
             # Add flow from a VM to an external iface
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=output:%s" % (br_name, vm_iface_id, dut_iface_id))
+            flows.append("table=0,in_port=%s,action=output:%s" % (vm_iface_id, dut_iface_id))
 
         if disconnect_vm:
             # Add flow from external iface to ptf container
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=output:%s" % (br_name, dut_iface_id, injected_iface_id))
+            flows.append("table=0,in_port=%s,action=output:%s" % (dut_iface_id, injected_iface_id))
         else:
             # Add flow from external iface to a VM and a ptf container
             # Allow BGP, IPinIP, fragmented packets, ICMP, SNMP packets and layer2 packets from DUT to neighbors
             # Block other traffic from DUT to EOS for EOS's stability,
             # Allow all traffic from DUT to PTF.
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=10,tcp,in_port=%s,tp_src=179,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=10,tcp,in_port=%s,tp_dst=179,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=10,tcp6,in_port=%s,tp_src=179,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=10,tcp6,in_port=%s,tp_dst=179,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=10,ip,in_port=%s,nw_proto=4,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,ip,in_port=%s,nw_frag=yes,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,ipv6,in_port=%s,nw_frag=yes,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,icmp,in_port=%s,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,icmp6,in_port=%s,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,udp,in_port=%s,udp_src=161,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,udp,in_port=%s,udp_src=53,action=output:%s" % (br_name, dut_iface_id, vm_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,udp6,in_port=%s,udp_src=161,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=5,ip,in_port=%s,action=output:%s" % (br_name, dut_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=5,ipv6,in_port=%s,action=output:%s" % (br_name, dut_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=3,in_port=%s,action=output:%s,%s" % (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=10,tcp,in_port=%s,tp_src=179,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=10,tcp,in_port=%s,tp_dst=179,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=10,tcp6,in_port=%s,tp_src=179,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=10,tcp6,in_port=%s,tp_dst=179,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=10,ip,in_port=%s,nw_proto=4,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,ip,in_port=%s,nw_frag=yes,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,ipv6,in_port=%s,nw_frag=yes,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,icmp,in_port=%s,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,icmp6,in_port=%s,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,udp,in_port=%s,udp_src=161,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,udp,in_port=%s,udp_src=53,action=output:%s" % (dut_iface_id, vm_iface_id))
+            flows.append("table=0,priority=8,udp6,in_port=%s,udp_src=161,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=5,ip,in_port=%s,action=output:%s" % (dut_iface_id, injected_iface_id))
+            flows.append("table=0,priority=5,ipv6,in_port=%s,action=output:%s" % (dut_iface_id, injected_iface_id))
+            flows.append("table=0,priority=3,in_port=%s,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
 
         # Add flow from a ptf container to an external iface
-        VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=output:%s" % (br_name, injected_iface_id, dut_iface_id))
+        flows.append("table=0,in_port=%s,action=output:%s" % (injected_iface_id, dut_iface_id))
+        VMTopology.ovs_replace_flows(br_name, flows)
 
     def unbind_ovs_ports(self, br_name, vm_port):
         """unbind all ports except the vm port from an ovs bridge"""
         if VMTopology.intf_exists(br_name):
             ports = VMTopology.get_ovs_br_ports(br_name)
-
-            for port in ports:
-                if port != vm_port:
-                    VMTopology.cmd('ovs-vsctl del-port %s %s' % (br_name, port))
+            VMTopology.ovs_del_ports(br_name, [port for port in ports if port != vm_port])
 
     def unbind_ovs_port(self, br_name, port):
         """unbind a port from an ovs bridge"""
@@ -921,18 +1035,10 @@ class VMTopology(object):
 
         self.create_ovs_bridge(br_name, self.fp_mtu)
 
-        for intf in [host_if, upper_if, lower_if]:
-            br = VMTopology.get_ovs_bridge_by_port(intf)
-            if br is not None and br != br_name:
-                VMTopology.cmd('ovs-vsctl del-port %s %s' % (br, intf))
-
-        ports = VMTopology.get_ovs_br_ports(br_name)
         ports_to_be_attached = [host_if, upper_if, lower_if]
         if nic_if is not None:
             ports_to_be_attached.append(nic_if)
-        for intf in ports_to_be_attached:
-            if intf not in ports:
-                VMTopology.cmd('ovs-vsctl add-port %s %s' % (br_name, intf))
+        VMTopology.ovs_add_ports(br_name, ports_to_be_attached)
 
         bridge_ports = [upper_if, lower_if]
         if nic_if is not None:
@@ -944,29 +1050,38 @@ class VMTopology(object):
         if nic_if is not None:
             nic_if_id = bindings[nic_if]
 
-        # clear old bindings
-        VMTopology.cmd('ovs-ofctl del-flows %s' % br_name)
-
+        # replace old bindings
+        flows = []
         if nic_if is not None:
             # TODO: open-flow configuration for ovs-bridge simulating server smart NIC
             pass
         else:
             # open-flow configuration for ovs-bridge simulating mux of dualtor y-cable
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=output:%s,%s" % (br_name, host_if_id, upper_if_id, lower_if_id))
+            flows.append("table=0,in_port=%s,action=output:%s,%s" % (host_if_id, upper_if_id, lower_if_id))
             if active_if_index == 0:
-                VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=output:%s" % (br_name, upper_if_id, host_if_id))
+                flows.append("table=0,in_port=%s,action=output:%s" % (upper_if_id, host_if_id))
             else:
-                VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=output:%s" % (br_name, lower_if_id, host_if_id))
+                flows.append("table=0,in_port=%s,action=output:%s" % (lower_if_id, host_if_id))
+        VMTopology.ovs_replace_flows(br_name, flows)
 
     def remove_dualtor_cable(self, host_ifindex, is_active_active=False):
         """
         remove muxy cable
         """
-        br_template = ACTIVE_ACTIVE_BRIDGE_TEMPLATE if is_active_active else MUXY_BRIDGE_TEMPLATE
-        br_name = adaptive_name(br_template, self.vm_set_name, host_ifindex)
+        self.remove_dualtor_cables([(host_ifindex, is_active_active)])
 
-        self.destroy_ovs_bridge(br_name)
+    def remove_dualtor_cables(self, cables):
+        """
+        remove muxy cables, given as a list of (host_ifindex, is_active_active) tuples
+        """
+        bridges = []
+        for host_ifindex, is_active_active in cables:
+            br_template = ACTIVE_ACTIVE_BRIDGE_TEMPLATE if is_active_active else MUXY_BRIDGE_TEMPLATE
+            bridges.append(adaptive_name(br_template, self.vm_set_name, host_ifindex))
 
+        self.destroy_ovs_bridges(bridges)
+
+    @timed_phase
     def add_host_ports(self):
         """
         add dut port in the ptf docker
@@ -974,39 +1089,23 @@ class VMTopology(object):
         for non-dual topo, inject the dut port into ptf docker.
         for dual-tor topo, create ovs port and add to ptf docker.
         """
+        dualtor_ports = []
+        dut_ifs = []
+        vlan_subifs = []
         for i, intf in enumerate(self.host_interfaces):
             if self._is_multi_duts and not self._is_cable:
                 if isinstance(intf, list):
-                    # For dualtor interface: create veth link and inject one end into the ptf docker
-                    # For active-active interface: create veth link and inject one end into the netns
                     # If host interface index is explicitly specified by "@x" (len(intf[0]==3), use host interface
                     # index specified in topo definition.
                     # Otherwise, it means that host interface does not have "@x" in topo definition, then assume that
                     # there is no gap in sequence of host interfaces.
                     host_ifindex = intf[0][2] if len(intf[0]) == 3 else i
-                    is_active_active = intf in self.host_interfaces_active_active
-                    dual_if_template = ACTIVE_ACTIVE_INTERFACES_TEMPLATE if is_active_active else MUXY_INTERFACES_TEMPLATE
-                    dual_if = adaptive_name(dual_if_template, self.vm_set_name, host_ifindex)
-                    ptf_if = PTF_FP_IFACE_TEMPLATE % host_ifindex
-                    self.add_veth_if_to_docker(dual_if, ptf_if)
-
-                    if is_active_active:
-                        nic_if = adaptive_name(SERVER_NIC_INTERFACE_TEMPLATE, self.vm_set_name, host_ifindex)
-                        ns_if = NETNS_IFACE_TEMPLATE % host_ifindex
-                        self.add_veth_if_to_netns(nic_if, ns_if)
-                        self.add_ip_to_netns_if(ns_if, self.mux_cable_facts[host_ifindex]["soc_ipv4"])
-                    else:
-                        nic_if = None
-
-                    upper_tor_if = self.duts_fp_ports[self.duts_name[intf[0][0]]][str(intf[0][1])]
-                    lower_tor_if = self.duts_fp_ports[self.duts_name[intf[1][0]]][str(intf[1][1])]
-                    # create muxy cable or active_active_cable for dualtor
-                    self.create_dualtor_cable(host_ifindex, dual_if, upper_tor_if, lower_tor_if, nic_if=nic_if)
+                    dualtor_ports.append((host_ifindex, intf))
                 else:
                     host_ifindex = intf[2] if len(intf) == 3 else i
                     fp_port = self.duts_fp_ports[self.duts_name[intf[0]]][str(intf[1])]
                     ptf_if = PTF_FP_IFACE_TEMPLATE % host_ifindex
-                    self.add_dut_if_to_docker(ptf_if, fp_port)
+                    dut_ifs.append((ptf_if, fp_port))
             elif self._is_multi_duts and self._is_cable:
                 # Since there could be multiple ToR's in cable topology, some Ports
                 # can be connected to muxcable and some to a DAC cable. But it could
@@ -1020,27 +1119,60 @@ class VMTopology(object):
                 if self.duts_fp_ports[self.duts_name[intf[0][0]]].get(str(intf[0][1])) is not None:
                     fp_port = self.duts_fp_ports[self.duts_name[intf[0][0]]][str(intf[0][1])]
                     ptf_if = PTF_FP_IFACE_TEMPLATE % host_ifindex
-                    self.add_dut_if_to_docker(ptf_if, fp_port)
+                    dut_ifs.append((ptf_if, fp_port))
 
                 host_ifindex = intf[1][2]
                 if self.duts_fp_ports[self.duts_name[intf[1][0]]].get(str(intf[1][1])) is not None:
                     fp_port = self.duts_fp_ports[self.duts_name[intf[1][0]]][str(intf[1][1])]
                     ptf_if = PTF_FP_IFACE_TEMPLATE % host_ifindex
-                    self.add_dut_if_to_docker(ptf_if, fp_port)
+                    dut_ifs.append((ptf_if, fp_port))
             else:
                 fp_port = self.duts_fp_ports[self.duts_name[0]][str(intf)]
                 ptf_if = PTF_FP_IFACE_TEMPLATE % intf
-                self.add_dut_if_to_docker(ptf_if, fp_port)
+                dut_ifs.append((ptf_if, fp_port))
                 # only create sub interface for enabled ports defined in t0-backend
                 if self.dut_type == BACKEND_TOR_TYPE and intf not in self.disabled_host_interfaces:
                     vlan_separator = self.topo.get("DUT", {}).get("sub_interface_separator", SUB_INTERFACE_SEPARATOR)
                     vlan_id = self.vlan_ids[str(intf)]
-                    self.add_dut_vlan_subif_to_docker(ptf_if, vlan_separator, vlan_id)
+                    vlan_subifs.append((ptf_if, vlan_separator, vlan_id))
+
+        # Every dualtor cable has its own veth pair and ovs bridge, set them up concurrently
+        self.run_concurrently(lambda args: self.add_dualtor_host_port(*args), dualtor_ports)
+
+        self.add_dut_ifs_to_docker(dut_ifs)
+        for ptf_if, vlan_separator, vlan_id in vlan_subifs:
+            self.add_dut_vlan_subif_to_docker(ptf_if, vlan_separator, vlan_id)
 
+    def add_dualtor_host_port(self, host_ifindex, intf):
+        """
+        For dualtor interface: create veth link and inject one end into the ptf docker
+        For active-active interface: create veth link and inject one end into the netns
+        """
+        is_active_active = intf in self.host_interfaces_active_active
+        dual_if_template = ACTIVE_ACTIVE_INTERFACES_TEMPLATE if is_active_active else MUXY_INTERFACES_TEMPLATE
+        dual_if = adaptive_name(dual_if_template, self.vm_set_name, host_ifindex)
+        ptf_if = PTF_FP_IFACE_TEMPLATE % host_ifindex
+        self.add_veth_if_to_docker(dual_if, ptf_if)
+
+        if is_active_active:
+            nic_if = adaptive_name(SERVER_NIC_INTERFACE_TEMPLATE, self.vm_set_name, host_ifindex)
+            ns_if = NETNS_IFACE_TEMPLATE % host_ifindex
+            self.add_veth_if_to_netns(nic_if, ns_if)
+            self.add_ip_to_netns_if(ns_if, self.mux_cable_facts[host_ifindex]["soc_ipv4"])
+        else:
+            nic_if = None
+
+        upper_tor_if = self.duts_fp_ports[self.duts_name[intf[0][0]]][str(intf[0][1])]
+        lower_tor_if = self.duts_fp_ports[self.duts_name[intf[1][0]]][str(intf[1][1])]
+        # create muxy cable or active_active_cable for dualtor
+        self.create_dualtor_cable(host_ifindex, dual_if, upper_tor_if, lower_tor_if, nic_if=nic_if)
+
+    @timed_phase
     def enable_netns_loopback(self):
         """Enable loopback device in the netns."""
         VMTopology.cmd("ip netns exec %s ifconfig lo up" % self.netns)
 
+    @timed_phase
     def setup_netns_source_routing(self):
         """Setup policy-based routing to forward packet to its igress ports."""
 
@@ -1087,29 +1219,38 @@ class VMTopology(object):
                 VMTopology.cmd("ip netns exec %s ip route add %s dev %s table %s" % (self.netns, ns_if_addr.network, ns_if, rt_name))
                 VMTopology.cmd("ip netns exec %s ip route add default via %s dev %s table %s" % (self.netns, gateway_addr, ns_if, rt_name))
 
+    @timed_phase
     def remove_host_ports(self):
         """
         remove dut port from the ptf docker
         """
+        dualtor_cables = []
+        dut_ifs = []
+        vlan_subifs = []
         for i, intf in enumerate(self.host_interfaces):
             if self._is_multi_duts:
                 if isinstance(intf, list):
                     host_ifindex = intf[0][2] if len(intf[0]) == 3 else i
                     is_active_active = intf in self.host_interfaces_active_active
-                    self.remove_dualtor_cable(host_ifindex, is_active_active=is_active_active)
+                    dualtor_cables.append((host_ifindex, is_active_active))
                 else:
                     host_ifindex = intf[2] if len(intf) == 3 else i
                     fp_port = self.duts_fp_ports[self.duts_name[intf[0]]][str(intf[1])]
                     ptf_if = PTF_FP_IFACE_TEMPLATE % host_ifindex
-                    self.remove_dut_if_from_docker(ptf_if, fp_port)
+                    dut_ifs.append((ptf_if, fp_port))
             else:
                 fp_port = self.duts_fp_ports[self.duts_name[0]][str(intf)]
                 ptf_if = PTF_FP_IFACE_TEMPLATE % intf
-                self.remove_dut_if_from_docker(ptf_if, fp_port)
+                dut_ifs.append((ptf_if, fp_port))
                 if self.dut_type == BACKEND_TOR_TYPE:
                     vlan_separator = self.topo.get("DUT", {}).get("sub_interface_separator", SUB_INTERFACE_SEPARATOR)
                     vlan_id = self.vlan_ids[str(intf)]
-                    self.remove_dut_vlan_subif_from_docker(ptf_if, vlan_separator, vlan_id)
+                    vlan_subifs.append((ptf_if, vlan_separator, vlan_id))
+
+        self.remove_dualtor_cables(dualtor_cables)
+        self.remove_dut_ifs_from_docker(dut_ifs)
+        for ptf_if, vlan_separator, vlan_id in vlan_subifs:
+            self.remove_dut_vlan_subif_from_docker(ptf_if, vlan_separator, vlan_id)
 
     @staticmethod
     def _generate_fingerprint(name, digit=6):
@@ -1212,6 +1353,106 @@ class VMTopology(object):
         else:
             return VMTopology.cmd('nsenter -t %s -n ethtool -K %s tx off' % (pid, iface_name))
 
+    def run_concurrently(self, func, items):
+        """Call func for each item, in up to self.concurrency threads. The first exception raised is re-raised."""
+        if self.concurrency <= 1 or len(items) <= 1:
+            for item in items:
+                func(item)
+            return
+
+        pool = ThreadPool(min(self.concurrency, len(items)))
+        try:
+            pool.map(func, items)
+        finally:
+            pool.close()
+            pool.join()
+
+    @staticmethod
+    def _ns_cmd_prefix(pid=None, netns=None):
+        if pid is not None:
+            return 'nsenter -t %s -n ' % pid
+        elif netns is not None:
+            return 'ip netns exec %s ' % netns
+        return ''
+
+    @staticmethod
+    def get_intfs(pid=None, netns=None):
+        """Get the names of all the interfaces on host, in the docker of pid or in netns, with one command"""
+        out = VMTopology.cmd(VMTopology._ns_cmd_prefix(pid, netns) + 'ip -o link show')
+        intfs = set()
+        for line in out.splitlines():
+            # e.g. "12: eth0.10@eth0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 9100 ..."
+            fields = line.split(':', 2)
+            if len(fields) == 3:
+                intfs.add(fields[1].strip().split('@')[0])
+        return intfs
+
+    @staticmethod
+    def cmd_batch(cmdline, lines):
+        """Write lines to a temporary file and execute cmdline with the file name substituted for %s.
+
+        Args:
+            cmdline (str): The command line reading the file, e.g. 'ip -batch %s'.
+            lines (list): The lines of the file. Nothing is executed if it is empty.
+
+        Returns:
+            str: Output of the command.
+        """
+        if not lines:
+            return ''
+        with tempfile.NamedTemporaryFile(mode='w', prefix='vmtopology_', suffix='.batch', delete=False) as fp:
+            fp.write('\n'.join(lines) + '\n')
+        try:
+            logging.debug('*** BATCH %s:\n%s' % (fp.name, '\n'.join(lines)))
+            return VMTopology.cmd(cmdline % fp.name)
+        finally:
+            os.remove(fp.name)
+
+    @staticmethod
+    def ip_batch(lines, pid=None, netns=None):
+        """Execute ip commands, given without the leading 'ip', with one 'ip -batch' on host, in docker or in netns.
+
+        'ip -batch' stops and fails at the first command failing, like executing the commands one by one.
+        """
+        return VMTopology.cmd_batch(VMTopology._ns_cmd_prefix(pid, netns) + 'ip -batch %s', lines)
+
+    @staticmethod
+    def ovs_add_ports(br_name, ports):
+        """Add the ports not yet in an ovs bridge to it, removing them from their current bridge, in one transaction"""
+        br_ports = VMTopology.get_ovs_br_ports(br_name)
+        args = []
+        for port in ports:
+            if port not in br_ports:
+                args.append('-- --if-exists del-port %s -- add-port %s %s' % (port, br_name, port))
+                br_ports.add(port)
+        if args:
+            VMTopology.cmd('ovs-vsctl ' + ' '.join(args))
+
+    @staticmethod
+    def ovs_del_ports(br_name, ports):
+        """Remove the ports from an ovs bridge in one transaction"""
+        if ports:
+            args = ['-- --if-exists del-port %s %s' % (br_name, port) for port in ports]
+            VMTopology.cmd('ovs-vsctl ' + ' '.join(args))
+
+    @staticmethod
+    def ovs_replace_flows(br_name, flows):
+        """Replace all the flows of an ovs bridge.
+
+        The flows are installed from a file by 'ovs-ofctl --bundle replace-flows', in one atomic OpenFlow bundle so
+        that the traffic is not dropped in between. If the bridge does not support bundles (OpenFlow 1.4), the old
+        flows are deleted and the new ones added from the file.
+        """
+        if not flows:
+            VMTopology.cmd('ovs-ofctl del-flows %s' % br_name)
+            return
+        try:
+            VMTopology.cmd_batch('ovs-ofctl --bundle replace-flows %s %%s' % br_name, flows)
+        except Exception as e:
+            logging.warning('Failed to replace flows of %s in a bundle, %s. Delete and add them.' % (br_name, str(e)))
+            VMTopology.cmd('ovs-ofctl del-flows %s' % br_name)
+            VMTopology.cmd_batch('ovs-ofctl add-flows %s %%s' % br_name, flows)
+
     @staticmethod
     def cmd(cmdline, grep_cmd=None, retry=1, negative=False, shell=False, split_cmd=True):
         """Execute a command and return the output
@@ -1235,6 +1476,8 @@ class VMTopology(object):
             logging.debug('*** CMD: %s, grep: %s, attempt: %d' % (cmdline, grep_cmd, attempt+1))
             if split_cmd:
                 cmdline = shlex.split(cmdline_ori)
+            with VMTopology._cmd_count_lock:
+                VMTopology.cmd_count += 2 if grep_cmd else 1
             process = subprocess.Popen(
                 cmdline,
                 stdin=subprocess.PIPE,
@@ -1517,7 +1760,8 @@ def main():
             duts_name=dict(required=False, type='list'),
             fp_mtu=dict(required=False, type='int', default=DEFAULT_MTU),
             max_fp_num=dict(required=False, type='int', default=NUM_FP_VLANS_PER_FP),
-            netns_mgmt_ip_addr=dict(required=False, type='str', default=None)
+            netns_mgmt_ip_addr=dict(required=False, type='str', default=None),
+            concurrency=dict(required=False, type='int', default=DEFAULT_CONCURRENCY)
         ),
         supports_check_mode=False)
 
@@ -1536,7 +1780,7 @@ def main():
     try:
 
         topo = module.params['topo']
-        net = VMTopology(vm_names, vm_properties, fp_mtu, max_fp_num, topo)
+        net = VMTopology(vm_names, vm_properties, fp_mtu, max_fp_num, topo, module.params['concurrency'])
 
         if cmd == 'create':
             net.create_bridges()
@@ -1778,7 +2022,9 @@ def main():
         logging.error(traceback.format_exc())
         module.fail_json(msg=str(error))
 
-    module.exit_json(changed=True)
+    timing_report = net.timing_report()
+    logging.info('=== Timing report of %s ===\n%s' % (cmd, '\n'.join(timing_report)))
+    module.exit_json(changed=True, timing_report=timing_report)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of route generation and announcement in ansible/library/announce_routes.py.
+
+Route generation of the 'spine' router of t1 topology is compared with the legacy per-route formatting.
+Announcement is measured against local HTTP servers emulating exabgp http_api of PTF container, with configurable
+processing cost of one command by exabgp: legacy one-request-per-port sequential announcement is compared with
+batched parallel announcement.
+
+Usage:
+    python3 announce_routes_benchmark.py --vms 64 --podset_number 200 --batch_size 2000 --concurrency 16
+"""
+import argparse
+import math
+import os
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'library'))
+import announce_routes  # noqa: E402
+
+BASE_PORT = 15000
+
+
+def legacy_generate_routes(podset_number, tor_number, tor_subnet_number, leaf_asn_start, tor_asn_start, nexthop,
+                           tor_subnet_size, max_tor_subnet_number):
+    """Per-route formatting of the 'spine' router routes, as done before route generation was reworked"""
+    routes = []
+    for podset in range(0, podset_number):
+        for tor in range(0, tor_number):
+            for subnet in range(0, tor_subnet_number):
+                if podset == 0:
+                    continue
+                suffix = ((podset * tor_number * max_tor_subnet_number * tor_subnet_size) +
+                          (tor * max_tor_subnet_number * tor_subnet_size) +
+                          (subnet * tor_subnet_size))
+                octet2 = (168 + int(suffix / (256 ** 2)))
+                octet1 = (192 + int(octet2 / 256))
+                octet2 = (octet2 % 256)
+                octet3 = (int(suffix / 256) % 256)
+                octet4 = (suffix % 256)
+                prefixlen_v4 = (32 - int(math.log(tor_subnet_size, 2)))
+                prefix = "{}.{}.{}.{}/{}".format(octet1, octet2, octet3, octet4, prefixlen_v4)
+                aspath = "{} {}".format(leaf_asn_start + podset, tor_asn_start + tor)
+                routes.append((prefix, nexthop, aspath))
+    return routes
+
+
+def legacy_change_routes(action, ptf_ip, port, routes):
+    """One request with all routes of the port, as done before announcement was reworked"""
+    messages = []
+    for prefix, nexthop, aspath in routes:
+        messages.append("{} route {} next-hop {} as-path [ {} ]".format(action, prefix, nexthop, aspath))
+    r = requests.post("http://%s:%d" % (ptf_ip, port), data={"commands": ";".join(messages)}, timeout=90)
+    assert r.status_code == 200
+
+
+class ExabgpApiHandler(BaseHTTPRequestHandler):
+    """Emulates exabgp http_api: split commands and write them to the exabgp pipe"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        commands = parse_qs(body.decode())["commands"][0].split(";")
+        with open(os.devnull, "w") as pipe:
+            for cmd in commands:
+                pipe.write("%s\n" % cmd)
+        time.sleep(len(commands) * self.server.command_cost)
+        self.server.commands += len(commands)
+        self._reply()
+
+    def _reply(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "3")
+        self.end_headers()
+        self.wfile.write(b"OK\n")
+
+    def log_message(self, *args):
+        pass
+
+
+class ExabgpApiServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    commands = 0
+    command_cost = 0
+
+
+def start_servers(vms, command_cost):
+    servers = []
+    for vm in range(vms):
+        server = ExabgpApiServer(("127.0.0.1", BASE_PORT + vm), ExabgpApiHandler)
+        server.command_cost = command_cost
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def check_topo_routes():
+    """The route generator of each topology type returns a list of (port, routes) tuples"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for topo_name, fib in [("t0", announce_routes.fib_t0), ("t1", announce_routes.fib_t1_lag),
+                           ("t0-mclag", announce_routes.fib_t0_mclag), ("m0", announce_routes.fib_m0),
+                           ("mx", announce_routes.fib_mx)]:
+        port_routes = fib(announce_routes.read_topo(topo_name, path))
+        assert isinstance(port_routes, list) and port_routes, \
+            "Routes of topology {} are not a list of (port, routes): {!r}".format(topo_name, port_routes)
+        assert all(isinstance(port, int) and isinstance(routes, list) for port, routes in port_routes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="announce_routes benchmark")
+    parser.add_argument("--vms", type=int, default=64, help="number of emulated exabgp processes")
+    parser.add_argument("--podset_number", type=int, default=announce_routes.PODSET_NUMBER)
+    parser.add_argument("--batch_size", type=int, default=announce_routes.ANNOUNCE_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=announce_routes.ANNOUNCE_CONCURRENCY)
+    parser.add_argument("--command_cost_us", type=int, default=20, help="exabgp processing time of one command")
+    args = parser.parse_args()
+
+    check_topo_routes()
+
+    gen_args = (args.podset_number, announce_routes.TOR_NUMBER, announce_routes.TOR_SUBNET_NUMBER,
+                announce_routes.LEAF_ASN_START, announce_routes.TOR_ASN_START, announce_routes.NHIPV4,
+                announce_routes.TOR_SUBNET_SIZE, announce_routes.MAX_TOR_SUBNET_NUMBER)
+
+    start = time.time()
+    legacy_routes = legacy_generate_routes(*gen_args)
+    legacy_duration = time.time() - start
+    start = time.time()
+    routes = announce_routes.generate_routes("v4", args.podset_number, announce_routes.TOR_NUMBER,
+                                             announce_routes.TOR_SUBNET_NUMBER, None, announce_routes.LEAF_ASN_START,
+                                             announce_routes.TOR_ASN_START, announce_routes.NHIPV4,
+                                             announce_routes.NHIPV6, announce_routes.TOR_SUBNET_SIZE,
+                                             announce_routes.MAX_TOR_SUBNET_NUMBER, "t1", router_type="spine",
+                                             no_default_route=True)
+    duration = time.time() - start
+    assert routes == legacy_routes, "Generated routes differ from legacy implementation"
+    print("generate: legacy {:.0f} routes/sec, current {:.0f} routes/sec".format(
+        len(routes) / legacy_duration, len(routes) / duration))
+
+    servers = start_servers(args.vms, args.command_cost_us / 1000000.0)
+    # wait_for_http is not a subject of the benchmark
+    announce_routes.wait_for_http = lambda *args, **kwargs: True
+    port_routes = [(BASE_PORT + vm, routes) for vm in range(args.vms)]
+    total = len(routes) * args.vms
+    try:
+        start = time.time()
+        for port, vm_routes in port_routes:
+            legacy_change_routes("announce", "127.0.0.1", port, vm_routes)
+        legacy_duration = time.time() - start
+
+        start = time.time()
+        announce_routes.change_routes_parallel("announce", "127.0.0.1", port_routes,
+                                               batch_size=args.batch_size, concurrency=args.concurrency)
+        duration = time.time() - start
+    finally:
+        for server in servers:
+            server.shutdown()
+
+    assert sum(server.commands for server in servers) == 2 * total
+    print("announce {} routes to {} VMs: legacy {:.0f} routes/sec, current {:.0f} routes/sec".format(
+        total, args.vms, total / legacy_duration, total / duration))
+
+
+if __name__ == "__main__":
+    main()
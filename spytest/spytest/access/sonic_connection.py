@@ -38,6 +38,18 @@ def get_delay_factor(current):
     except Exception: factor = 1.0
     return current * factor
 
+class StreamError(IOError):
+    """
+    Error of SonicBaseConnection.send_command_stream, the first written
+    commands of cmd_list are written and output is the output read after
+    the last completed command.
+    """
+    def __init__(self, msg, cmd_list, written, output):
+        IOError.__init__(self, msg)
+        self.cmd_list = cmd_list
+        self.written = written
+        self.output = output
+
 class SonicBaseConnection(CiscoBaseConnection):
 
     def __init__(self, **kwargs):
@@ -45,6 +57,7 @@ class SonicBaseConnection(CiscoBaseConnection):
         self.trace_callback_arg1 = None
         self.trace_callback_arg2 = None
         self.cached_read_data = []
+        self.stream_max_in_flight = 0
         self.net_login = kwargs.pop("net_login", None)
         self.net_devname = kwargs.pop("net_devname", None)
         self.logger = kwargs.pop("logger", None)
@@ -467,6 +480,105 @@ class SonicBaseConnection(CiscoBaseConnection):
 
         return output
 
+    def send_command_stream(self, cmd_list, expect_string, window=16384,
+                            delay_factor=1, outputs=None, marker="SPYTEST-SEQ"):
+        """
+        Write the shell commands without waiting for the prompt after each.
+        Every command is followed by an echo of its sequence number, quoted
+        so that only the output of the echo matches the marker and not the
+        echoed command, the command is complete when its marker is read.
+        The output is read between the writes and at most window bytes are
+        written ahead of the last completed command, but always two commands
+        so that the next command is written while the current one runs.
+        The commands must not read the input, which holds the commands and
+        markers written ahead. An error raises StreamError, the commands which
+        are written and not complete are left running, wait_command_stream
+        waits for them.
+        :param outputs: list to append the output of each completed command
+        :return: list of the outputs of the commands
+        """
+        outputs = [] if outputs is None else outputs
+        self.clear_cached_read_data()
+        self.clear_buffer()
+        self.stream_max_in_flight = 0
+        return self._read_command_stream(cmd_list, len(cmd_list), expect_string, window,
+                                         delay_factor, outputs, marker, 0, "")
+
+    def wait_command_stream(self, exp, expect_string, delay_factor=1,
+                            outputs=None, marker="SPYTEST-SEQ"):
+        """
+        Wait for the commands written by send_command_stream before it raised
+        the StreamError exp to complete, without writing more commands.
+        :param outputs: list of the outputs of the completed commands, which
+                        the outputs of the commands completing are appended to
+        :return: list of the outputs of the commands
+        """
+        outputs = [] if outputs is None else outputs
+        return self._read_command_stream(exp.cmd_list, exp.written, expect_string, 0,
+                                         delay_factor, outputs, marker, exp.written, exp.output)
+
+    def _read_command_stream(self, cmd_list, count, expect_string, window,
+                             delay_factor, outputs, marker, index, output):
+        marker_re = re.compile(r"{}-(\d+)-".format(marker))
+        delay_factor = get_delay_factor(delay_factor)
+        max_idle = self.timeout * max(delay_factor, 1)
+
+        (done, in_flight) = (len(outputs), [0] * (index - len(outputs)))
+        last_read = time.time()
+        dbg_msg = []
+        try:
+            while done < count:
+                while index < count:
+                    data = "{}{}echo {}''-{}-{}".format(cmd_list[index], self.RETURN,
+                                                        marker, index, self.RETURN)
+                    if len(in_flight) >= 2 and sum(in_flight) + len(data) > window:
+                        break
+                    self.write_channel(data)
+                    in_flight.append(len(data))
+                    index += 1
+                    self.stream_max_in_flight = max(self.stream_max_in_flight, len(in_flight))
+
+                new_data = self.read_channel()
+                if not new_data:
+                    if time.time() - last_read > max_idle:
+                        msg1 = "Sequence marker {} never detected".format(done)
+                        for msg2 in "".join(self.cached_read_data).split("\n"):
+                            self.dmsg_append(dbg_msg, "Read Data: ", self.dmsg_fmt(msg2, ""))
+                        raise IOError(self.dmsg_str(dbg_msg, msg1, "STREAM-DBG"))
+                    time.sleep(0.02)
+                    continue
+
+                last_read = time.time()
+                new_data = self.strip_ansi_escape_codes(new_data)
+                output = self.normalize_linefeeds(output + new_data)
+                while True:
+                    match = marker_re.search(output)
+                    if not match:
+                        break
+                    if int(match.group(1)) != done:
+                        msg1 = "Sequence marker {} found instead of {}".format(match.group(1), done)
+                        raise IOError(self.dmsg_str(dbg_msg, msg1, "STREAM-DBG"))
+                    outputs.append(output[:match.start()])
+                    output = output[match.end():]
+                    in_flight.pop(0)
+                    done += 1
+                    self.dmsg_append(dbg_msg, "DONE:", done, "of", len(cmd_list))
+
+            # consume the prompt after the last marker
+            while not re.search(expect_string, output):
+                new_data = self.read_channel()
+                if new_data:
+                    last_read = time.time()
+                    output += self.normalize_linefeeds(self.strip_ansi_escape_codes(new_data))
+                elif time.time() - last_read > max_idle:
+                    raise IOError(self.dmsg_str(dbg_msg, "Prompt never detected", "STREAM-DBG"))
+                else:
+                    time.sleep(0.02)
+        except IOError as exp:
+            raise StreamError(str(exp), cmd_list, index, output)
+
+        self.clear_cached_read_data()
+        return outputs
 
     def _tostring(self, msg):
         msg = re.sub(r'(\x9B|\x1B\[)[0-?]*[ -\/]*[@-~]', ' ', msg)
@@ -0,0 +1,105 @@
+"""
+Deferred command batch of Net.
+
+The show/config calls made by the thread that opens the batch are queued
+instead of being sent to the devices. When the outermost batch context exits
+the queued calls are made, the calls to each device in the order they were
+queued and the devices concurrently using utilities.parallel.exec_all.
+
+    with st.deferred_batch() as batch:
+        for dut in st.get_dut_names():
+            st.config(dut, "config interface startup Ethernet0")
+        res = st.show(vars.D1, "show interfaces status")
+    st.log(res.value)
+    st.log(batch.results)
+"""
+import utilities.parallel as putils
+
+import spytest.env as env
+from spytest import profile
+from spytest.logger import get_thread_name
+from spytest.st_time import get_timenow
+
+
+class DeferredResult(object):
+    """
+    Result of a queued call, the value is filled when the batch is run
+    """
+
+    def __init__(self, devname, method, cmd):
+        self.devname = devname
+        self.method = method
+        self.cmd = cmd
+        self.value = None
+        self.done = False
+
+    def __repr__(self):
+        return "DeferredResult({}, {}, {})".format(self.devname, self.method, self.cmd)
+
+
+class DeferredBatch(object):
+
+    def __init__(self, net):
+        self.net = net
+        self.thid = get_thread_name()
+        self.depth = 0
+        self.entries = []
+        self.results = []
+
+    def __enter__(self):
+        if self.depth == 0:
+            self.net.deferred_batches[self.thid] = self
+        self.depth = self.depth + 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.depth = self.depth - 1
+        if self.depth > 0:
+            return False
+        self.net.deferred_batches.pop(self.thid, None)
+        if exc_type is None:
+            self.run()
+        return False
+
+    def add(self, devname, method, cmd, **kwargs):
+        """
+        Queue the call of Net.<method>(devname, cmd, **kwargs)
+        :return: DeferredResult
+        """
+        result = DeferredResult(devname, method, cmd)
+        self.entries.append([result, kwargs])
+        return result
+
+    def _run_device(self, entries):
+        start_time = get_timenow()
+        for result, kwargs in entries:
+            func = getattr(self.net, result.method)
+            result.value = func(result.devname, result.cmd, **kwargs)
+            result.done = True
+        return (get_timenow() - start_time).total_seconds()
+
+    def run(self):
+        """
+        Make the queued calls, concurrently across the devices
+        :return: values of the calls in the order they are queued
+        """
+        entries, self.entries = self.entries, []
+        per_device = dict()
+        for entry in entries:
+            devname = entry[0].devname
+            if devname not in per_device:
+                per_device[devname] = []
+            per_device[devname].append(entry)
+
+        if per_device:
+            use_threads = bool(env.get("SPYTEST_DEFERRED_BATCH_PARALLEL", "1") != "0")
+            start_time = get_timenow()
+            exec_entries = [[self._run_device, per_device[d]] for d in per_device]
+            [retvals, _] = putils.exec_all(use_threads, exec_entries)
+            cmd_time = int((get_timenow() - start_time).total_seconds() * 1000)
+            serial_time = int(sum([val or 0 for val in retvals]) * 1000)
+            profile.deferred(start_time, list(per_device.keys()), len(entries),
+                             serial_time, cmd_time)
+
+        self.results.extend([entry[0].value for entry in entries])
+        return self.results
@@ -121,6 +121,11 @@ dev_defaults = {
     "SPYTEST_HELPER_CONFIG_DB_RELOAD": "yes",
     "SPYTEST_CHECK_HELPER_SIGNATURE": "0",
     "SPYTEST_CLICK_HELPER_ARGS": "",
+    "SPYTEST_GNMI_NATIVE_CLIENT": "1",
+    "SPYTEST_DEFERRED_BATCH_PARALLEL": "1",
+    "SPYTEST_STREAM_COMMANDS": "1",
+    "SPYTEST_STREAM_WINDOW": "16384",
+    "SPYTEST_TEXTFSM_PARSE_MEMO_SIZE": "256",
 }
 
 def _get_logs_path():
@@ -704,6 +704,7 @@ class WorkArea(object):
         self.module_get_tech_support = False
         self.module_fetch_core_files = False
         self.stats_count = 0
+        self.module_parallel_stats = [0, 0, 0]
         self.module_tc_executed = 0
         self.min_topo_called = False
         self.tgen_reconnect = False
@@ -2185,6 +2186,19 @@ class WorkArea(object):
         sysinfo_csv = paths.get_sysinfo_csv(self._context.logs_path)
         Result.write_report_csv(sysinfo_csv, [row], ReportType.SYSINFO, False, True)
 
+    def _module_save_parallel_stats(self):
+        [count, estimate, saved] = self.module_parallel_stats
+        self.module_parallel_stats = [0, 0, 0]
+        mname = paths.get_mlog_basename(current_module.name)
+        lines = ["\n======================= PARALLEL: {} ===========================".format(mname)]
+        lines.append("CAN BE PARALLEL = {}".format(count))
+        lines.append("ESTIMATED SAVING = {}".format(utils.time_format(estimate, True)))
+        lines.append("DEFERRED SAVED = {}".format(utils.time_format(saved, True)))
+        lines.append("=========================================================\n")
+        self.log("\n".join(lines))
+        stats_txt = paths.get_stats_txt(self._context.logs_path)
+        utils.write_file(stats_txt, "\n".join(lines), "a")
+
     def _module_clean(self, nodeid, filepath):
         if not self.min_topo_called:
             self.error("Module {} Minimum Topology is not specified".format(filepath))
@@ -2201,6 +2215,7 @@ class WorkArea(object):
         if not batch.is_infra_test(filepath):
             self._post_module_cleanup(filepath)
             self._module_save_sysinfo()
+            self._module_save_parallel_stats()
 
         # update the node report files for every module
         # if we are not reporting run progress
@@ -2550,6 +2565,13 @@ class WorkArea(object):
             ofh.write("\nTOTAL HELPER Time = {}".format(stats.helper_cmd_time))
             ofh.write("\nTOTAL TG Time = {}".format(stats.tg_cmd_time))
             ofh.write("\nTOTAL PROMPT NFOUND = {}".format(stats.pnfound))
+            ofh.write("\nTOTAL CAN BE PARALLEL = {}".format(len(stats.canbe_parallel)))
+            ofh.write("\nTOTAL PARALLEL ESTIMATE = {}".format(utils.time_format(stats.parallel_estimate, True)))
+            ofh.write("\nTOTAL DEFERRED SAVED = {}".format(utils.time_format(stats.deferred_saved, True)))
+            ofh.write("\nTOTAL UPLOAD = {} bytes in {} ({} bytes/sec)".format(stats.upload_bytes,
+                      utils.time_format(stats.upload_time, True), stats.upload_rate))
+            ofh.write("\nTOTAL TEMPLATE MEMO HITS = {} MISSES = {}".format(stats.tmpl_memo_hits,
+                      stats.tmpl_memo_misses))
             for [start_time, thid, ctype, dut, cmd, ctime] in stats.cmds:
                 start_msg = "\n{} {}".format(get_timestamp(this=start_time), thid)
                 if ctype == "CMD":
@@ -2564,8 +2586,16 @@ class WorkArea(object):
                     ofh.write("{}TGWAIT TIME: {} = {}".format(start_msg, ctime, cmd))
                 elif ctype == "PROMPT_NFOUND":
                     ofh.write("{}PROMPT NFOUND: {}".format(start_msg, cmd))
+                elif ctype == "DEFERRED":
+                    ofh.write("{}DEFERRED TIME: {} = {}".format(start_msg, ctime, cmd))
+                elif ctype == "UPLOAD":
+                    ofh.write("{}UPLOAD TIME: {} {} = {}".format(start_msg, ctime, dut, cmd))
             ofh.write("\n=========================================================\n")
         self.stats_count = self.stats_count + 1
+        [count, estimate, saved] = self.module_parallel_stats
+        self.module_parallel_stats = [count + len(stats.canbe_parallel),
+                                      estimate + stats.parallel_estimate,
+                                      saved + stats.deferred_saved]
         row = [self.stats_count, module, func, res, time_taken, stats.helper_cmd_time,
                stats.tc_cmd_time, stats.tg_cmd_time, stats.tc_total_wait,
                stats.tg_total_wait, stats.pnfound, desc.replace(",", " ")]
@@ -3263,6 +3293,9 @@ class WorkArea(object):
     def config(self, dut, cmd, **kwargs):
         return self.net.config(dut, cmd, **kwargs)
 
+    def deferred_batch(self):
+        return self.net.deferred_batch()
+
     def exec_ssh_remote_dut(self, dut, ipaddress, username, password, command=None, timeout=30):
         return self.net.exec_ssh_remote_dut(dut, ipaddress, username, password, command, timeout)
 
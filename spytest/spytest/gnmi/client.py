@@ -0,0 +1,330 @@
+"""
+In-process gNMI client.
+
+The gRPC channels are opened once per target address and credentials and
+reused by all the requests, instead of starting the gnmi_get/gnmi_set tools
+for each request. The results have the same shape as the results of the tools
+run by Net._run_gnmi_command: {"output": text, "rc": exit code, "error": text}.
+
+The client needs the grpcio package, is_supported() returns False when it is
+not installed and the callers are expected to fall back to the tools.
+"""
+import json
+import socket
+import ssl
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+try:
+    import grpc
+    from google.protobuf import text_format
+    from spytest.gnmi import gnmi_pb2
+    from spytest.gnmi import gnmi_pb2_grpc
+except Exception:
+    grpc = None
+
+DEFAULT_TIMEOUT = 10
+
+_channels = dict()
+_channels_lock = threading.Lock()
+
+
+def is_supported():
+    return grpc is not None
+
+
+class GnmiClientError(Exception):
+    pass
+
+
+def _split_xpath(xpath):
+    elems, elem, depth = [], "", 0
+    for ch in xpath:
+        if ch == "[":
+            depth = depth + 1
+        elif ch == "]":
+            depth = depth - 1
+        if ch == "/" and depth == 0:
+            if elem:
+                elems.append(elem)
+            elem = ""
+        else:
+            elem = elem + ch
+    if depth != 0:
+        raise GnmiClientError("Unbalanced brackets in xpath {}".format(xpath))
+    if elem:
+        elems.append(elem)
+    return elems
+
+
+def parse_xpath(xpath, origin="", target=""):
+    """
+    Convert the xpath given to the gnmi tools to a gNMI Path
+    :param xpath: /openconfig-interfaces:interfaces/interface[name=Ethernet0]/config
+    :return: gnmi_pb2.Path
+    """
+    path = gnmi_pb2.Path(origin=origin, target=target)
+    for elem in _split_xpath(xpath):
+        name, _, keys = elem.partition("[")
+        path_elem = path.elem.add(name=name)
+        keys = "[" + keys if keys else ""
+        while keys:
+            end = keys.find("]")
+            key, _, value = keys[1:end].partition("=")
+            if end < 0 or not key:
+                raise GnmiClientError("Invalid key {} in xpath {}".format(keys, xpath))
+            path_elem.key[key] = value
+            keys = keys[end + 1:]
+    return path
+
+
+def path_to_xpath(path):
+    elems = []
+    for elem in path.elem:
+        keys = "".join("[{}={}]".format(k, v) for k, v in sorted(elem.key.items()))
+        elems.append(elem.name + keys)
+    return "/" + "/".join(elems)
+
+
+def decode_value(typed_value):
+    kind = typed_value.WhichOneof("value")
+    if kind is None:
+        return None
+    value = getattr(typed_value, kind)
+    if kind in ["json_val", "json_ietf_val"]:
+        return json.loads(value.decode("utf-8")) if value else None
+    if kind == "leaflist_val":
+        return [decode_value(element) for element in value.element]
+    if kind == "decimal_val":
+        return value.digits / float(10 ** value.precision)
+    return value
+
+
+def _to_update(xpath, value):
+    if not isinstance(value, (bytes, bytearray)):
+        if not isinstance(value, str):
+            value = json.dumps(value)
+        value = value.encode("utf-8")
+    val = gnmi_pb2.TypedValue(json_ietf_val=bytes(value))
+    return gnmi_pb2.Update(path=parse_xpath(xpath), val=val)
+
+
+def _status_code_name(code):
+    # same as the codes printed by the go tools e.g. DeadlineExceeded
+    return "".join(word.capitalize() for word in code.name.split("_"))
+
+
+def _server_certificate(ip, port, timeout):
+    # fetch the certificate of the server and the name to verify it against,
+    # this is used as the trusted certificate when the validation is skipped
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    context.set_alpn_protocols(["h2"])
+    sock = context.wrap_socket(socket.create_connection((ip, port), timeout))
+    try:
+        pem = ssl.DER_cert_to_PEM_cert(sock.getpeercert(True))
+    finally:
+        sock.close()
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.load_verify_locations(cadata=pem)
+    context.set_alpn_protocols(["h2"])
+    try:
+        sock = context.wrap_socket(socket.create_connection((ip, port), timeout))
+    except ssl.SSLError as exp:
+        # only self signed certificates can be trusted this way
+        raise GnmiClientError("Failed to validate server certificate: {}".format(exp))
+    try:
+        cert = sock.getpeercert()
+    finally:
+        sock.close()
+    for name_type, name in cert.get("subjectAltName", []):
+        if name_type in ["DNS", "IP Address"]:
+            return pem, name
+    for rdn in cert.get("subject", []):
+        for attr, name in rdn:
+            if attr == "commonName":
+                return pem, name
+    raise GnmiClientError("Failed to find the server name in the certificate")
+
+
+def _create_channel(ip, port, notls, insecure, cert, timeout):
+    target = "{}:{}".format(ip, port)
+    if notls:
+        return grpc.insecure_channel(target)
+    options = []
+    if cert:
+        with open(cert, "rb") as fh:
+            root_certificates = fh.read()
+    elif insecure:
+        root_certificates, name = _server_certificate(ip, int(port), timeout)
+        root_certificates = root_certificates.encode("utf-8")
+        options.append(("grpc.ssl_target_name_override", name))
+    else:
+        root_certificates = None
+    credentials = grpc.ssl_channel_credentials(root_certificates=root_certificates)
+    return grpc.secure_channel(target, credentials, options=options)
+
+
+def get_channel(ip, port, notls=False, insecure=True, cert=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Get the cached channel to the target, open it if there is none
+    """
+    key = (ip, str(port), bool(notls), bool(insecure), cert)
+    with _channels_lock:
+        if key not in _channels:
+            _channels[key] = _create_channel(ip, port, notls, insecure, cert, timeout)
+        return _channels[key]
+
+
+def close_channels(ip=None):
+    """
+    Close the cached channels to the target, all the channels when ip is None
+    """
+    with _channels_lock:
+        for key in list(_channels):
+            if ip is None or key[0] == ip:
+                _channels.pop(key).close()
+
+
+class GnmiClient(object):
+
+    def __init__(self, ip, port=8080, username=None, password=None, cert=None,
+                 insecure=True, notls=False, timeout=DEFAULT_TIMEOUT):
+        self.ip = ip
+        self.port = port
+        self.cert = cert
+        self.insecure = insecure
+        self.notls = notls
+        self.timeout = timeout
+        self.metadata = []
+        if username:
+            self.metadata.append(("username", username))
+        if password:
+            self.metadata.append(("password", password))
+        self.stub = gnmi_pb2_grpc.gNMIStub(self._channel())
+
+    def _channel(self):
+        return get_channel(self.ip, self.port, self.notls, self.insecure, self.cert, self.timeout)
+
+    def _call(self, method, request, name):
+        try:
+            response = method(request, timeout=self.timeout, metadata=self.metadata)
+        except grpc.RpcError as exp:
+            if exp.code() == grpc.StatusCode.UNAVAILABLE:
+                # drop the channel, the server may be restarting
+                close_channels(self.ip)
+                self.stub = gnmi_pb2_grpc.gNMIStub(self._channel())
+            error = "rpc error: code = {} desc = {}".format(_status_code_name(exp.code()), exp.details())
+            return {"output": "", "rc": 1, "error": error}
+        output = "== {}:\n{}".format(name, text_format.MessageToString(response))
+        return {"output": output, "rc": 0, "error": "", "response": response}
+
+    def get(self, xpaths, encoding="JSON_IETF"):
+        """
+        Get the values of one or more paths in a single GetRequest
+        """
+        if not isinstance(xpaths, list):
+            xpaths = [xpaths]
+        request = gnmi_pb2.GetRequest(path=[parse_xpath(xpath) for xpath in xpaths],
+                                      encoding=gnmi_pb2.Encoding.Value(encoding))
+        return self._call(self.stub.Get, request, "getResponse")
+
+    def set(self, updates=None, replaces=None, deletes=None):
+        """
+        Apply the updates, replaces and deletes in a single SetRequest
+        :param updates: list of (xpath, value), the value is JSON text or a JSON serializable object
+        :param replaces: list of (xpath, value)
+        :param deletes: list of xpath
+        """
+        request = gnmi_pb2.SetRequest()
+        request.update.extend([_to_update(xpath, value) for xpath, value in updates or []])
+        request.replace.extend([_to_update(xpath, value) for xpath, value in replaces or []])
+        request.delete.extend([parse_xpath(xpath) for xpath in deletes or []])
+        return self._call(self.stub.Set, request, "setResponse")
+
+    def values(self, result):
+        """
+        Get the decoded values of the updates of a get result or a subscription poll
+        :return: dict of xpath to value
+        """
+        retval = dict()
+        response = result.get("response")
+        notifications = getattr(response, "notification", response) or []
+        for notification in notifications:
+            prefix = path_to_xpath(notification.prefix) if notification.prefix.elem else ""
+            for update in notification.update:
+                retval[prefix + path_to_xpath(update.path)] = decode_value(update.val)
+        return retval
+
+    def subscribe(self, xpaths, mode="POLL", encoding="JSON_IETF"):
+        """
+        Open a POLL or ONCE subscription to the paths
+        """
+        return GnmiSubscription(self, xpaths, mode, encoding)
+
+
+class GnmiSubscription(object):
+    """
+    Subscription sharing the channel of the client. The notifications of
+    the initial synchronization are returned by the first call of poll(),
+    in POLL mode the next calls poll the target over the same stream.
+    """
+
+    def __init__(self, client, xpaths, mode="POLL", encoding="JSON_IETF"):
+        if not isinstance(xpaths, list):
+            xpaths = [xpaths]
+        self.client = client
+        self.mode = mode
+        self.requests = queue.Queue()
+        self.synced = False
+        subscription_list = gnmi_pb2.SubscriptionList(
+            mode=gnmi_pb2.SubscriptionList.Mode.Value(mode),
+            encoding=gnmi_pb2.Encoding.Value(encoding),
+            subscription=[gnmi_pb2.Subscription(path=parse_xpath(xpath)) for xpath in xpaths])
+        self.requests.put(gnmi_pb2.SubscribeRequest(subscribe=subscription_list))
+        self.responses = client.stub.Subscribe(self._requests(), metadata=client.metadata)
+
+    def _requests(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            yield request
+
+    def poll(self):
+        """
+        Wait for the notifications up to the next sync response
+        :return: the same dict as GnmiClient.get, the response is the list of notifications
+        """
+        if self.synced:
+            if self.mode != "POLL":
+                return {"output": "", "rc": 1, "error": "subscription is closed"}
+            self.requests.put(gnmi_pb2.SubscribeRequest(poll=gnmi_pb2.Poll()))
+        notifications = []
+        try:
+            for response in self.responses:
+                kind = response.WhichOneof("response")
+                if kind == "update":
+                    notifications.append(response.update)
+                elif kind == "sync_response":
+                    break
+                elif kind == "error":
+                    return {"output": "", "rc": 1, "error": response.error.message}
+        except grpc.RpcError as exp:
+            error = "rpc error: code = {} desc = {}".format(_status_code_name(exp.code()), exp.details())
+            return {"output": "", "rc": 1, "error": error}
+        self.synced = True
+        output = "\n".join(text_format.MessageToString(n) for n in notifications)
+        return {"output": "== subscribeResponse:\n{}".format(output), "rc": 0,
+                "error": "", "response": notifications}
+
+    def close(self):
+        self.requests.put(None)
+        self.responses.cancel()
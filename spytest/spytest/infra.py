@@ -411,6 +411,15 @@ def show(dut, cmd, **kwargs):
 def config(dut, cmd, **kwargs):
     return getwa().config(dut, cmd, **kwargs)
 
+def deferred_batch():
+    """
+    Context in which the show/config calls are queued and made concurrently
+    across the DUTs on exit, the calls return DeferredResult objects whose
+    value is filled on exit and the batch results are in the order of the calls
+    :return: context manager
+    """
+    return getwa().deferred_batch()
+
 def vtysh(dut, cmd):
     return getwa().config(dut, cmd, type="vtysh", conf=False)
 
@@ -20,6 +20,7 @@ import utilities.parallel as putils
 
 from spytest import profile
 from spytest.dicts import SpyTestDict
+from spytest.deferred import DeferredBatch
 from spytest.logger import Logger, get_thread_name
 from spytest.template import Template
 from spytest.access.connection import DeviceConnection, DeviceConnectionTimeout
@@ -29,6 +30,7 @@ from spytest.ansible import ansible_playbook
 from spytest.prompts import Prompts
 from spytest.rest import Rest
 from spytest.gnmi import gNMI
+from spytest.gnmi import client as gnmi_client
 from spytest.gnmi.translator import toRest, toGNMI
 from spytest.ordyaml import OrderedYaml
 from spytest.uicli import UICLI
@@ -106,9 +108,11 @@ class Net(object):
         self.orig_time_sleep = time.sleep
         self.force_console_transfer = False
         self.max_cmds_once = 100
+        self.stream_lines_once = 16
         self.pending_downloads = dict()
         self.log_dutid_fmt = env.get("SPYTEST_LOG_DUTID_FMT", "LABEL")
         self.dut_log_lock = putils.Lock()
+        self.deferred_batches = dict()
 
     def is_use_last_prompt(self):
         fcli = env.get("SPYTEST_FASTER_CLI_OVERRIDE")
@@ -1621,6 +1625,59 @@ class Net(object):
 
         return output
 
+    def _send_command_stream(self, access, cmd_list, expect, outputs=None):
+        """
+        Send the shell commands using the streaming sender of the connection
+        which tracks the completion using sequence markers instead of waiting
+        for the prompt after each command.
+        The outputs of the completed commands are appended to outputs.
+        On a streaming error, the commands already written are not interrupted,
+        they are waited for so that the caller can fall back to sending the
+        commands which were not written one by one.
+        :return: True on success, False when the caller needs to fall back
+        :raise: the streaming error when the written commands did not complete
+        """
+        devname = access["devname"]
+        if env.get("SPYTEST_STREAM_COMMANDS", "1") == "0":
+            return False
+        hndl = self._get_handle(devname)
+        if not hndl or not hasattr(hndl, "send_command_stream"):
+            return False
+
+        outputs = [] if outputs is None else outputs
+        window = int(env.get("SPYTEST_STREAM_WINDOW", "16384"))
+        msg = "Streaming {} commands".format(len(cmd_list))
+        self.dut_log(devname, msg)
+        self._cli_lock(access, msg)
+        pid = profile.start(msg, access["dut_name"])
+        try:
+            hndl.send_command_stream(cmd_list, expect, window, outputs=outputs)
+            retval = True
+        except Exception as exp:
+            msg = "Streaming failed after {} of {} commands - falling back: {}"
+            msg = msg.format(len(outputs), len(cmd_list), exp)
+            self.dut_log(devname, msg, lvl=logging.WARNING)
+            if not hasattr(exp, "written"):
+                raise
+            # wait for the commands already written instead of interrupting them
+            try:
+                hndl.wait_command_stream(exp, expect, outputs=outputs)
+            except Exception as exp2:
+                msg = "Streamed commands did not complete: {}".format(exp2)
+                self.dut_log(devname, msg, lvl=logging.ERROR)
+                raise exp2
+            retval = False
+        finally:
+            profile.stop(pid)
+            self._cli_unlock(access)
+            for cmd in cmd_list[:len(outputs)]:
+                self._trace_cli(access, cmd)
+        if len(cmd_list) > 1 and hndl.stream_max_in_flight < 2:
+            msg = "Streaming did not write the commands ahead, check SPYTEST_STREAM_WINDOW {}".format(window)
+            self.dut_log(devname, msg, lvl=logging.WARNING)
+        self._check_timeout(access)
+        return retval
+
     def _send_command_confirm(self, access, cmd, expect, skip_error_check=False,
                               delay_factor=0, trace_dut_log=3, new_line=True,
                               ufcli=True, line=None, confirm="y", **kwargs):
@@ -2444,10 +2501,20 @@ class Net(object):
         self._enter_linux_exit_vtysh(devname)
 
         mode_flag = ""
+        shell_cmds = []
         for cmd in cmdlist:
             if not cmd.strip():
                 continue
 
+            # collect the consecutive shell commands to send them together
+            if mode_flag == "" and self._is_script_stream_cmd(cmd):
+                shell_cmds.append(cmd)
+                continue
+            if shell_cmds:
+                self._apply_script_shell(devname, shell_cmds)
+                mode_flag = self._script_mode_flag(devname, mode_flag)
+                shell_cmds = []
+
             if cmd == "vtysh" or cmd == "sudo vtysh":
                 mode_flag = "vtysh"
                 continue
@@ -2475,17 +2542,11 @@ class Net(object):
             else:
                 self.config(devname, cmd)
 
-            current_mode = self._change_prompt(devname)
-            if current_mode == "mgmt-user":
-                mode_flag = "klish"
-            elif current_mode.startswith("mgmt"):
-                mode_flag = "klish-config"
-            elif current_mode == "vtysh-user":
-                mode_flag = "vtysh"
-            elif current_mode.startswith("vtysh"):
-                mode_flag = "vtysh-config"
-            elif current_mode.startswith("normal"):
-                mode_flag = ""
+            mode_flag = self._script_mode_flag(devname, mode_flag)
+
+        if shell_cmds:
+            self._apply_script_shell(devname, shell_cmds)
+            mode_flag = self._script_mode_flag(devname, mode_flag)
 
         # ensure we are in sonic mode after we exit
         if mode_flag == "":
@@ -2493,6 +2554,61 @@ class Net(object):
         else:
             self._exit_docker(devname)
 
+    def _script_mode_flag(self, devname, mode_flag):
+        current_mode = self._change_prompt(devname)
+        if current_mode == "mgmt-user":
+            mode_flag = "klish"
+        elif current_mode.startswith("mgmt"):
+            mode_flag = "klish-config"
+        elif current_mode == "vtysh-user":
+            mode_flag = "vtysh"
+        elif current_mode.startswith("vtysh"):
+            mode_flag = "vtysh-config"
+        elif current_mode.startswith("normal"):
+            mode_flag = ""
+        return mode_flag
+
+    def _is_script_stream_cmd(self, cmd):
+        """
+        Check if the shell command of a script can be streamed: it does not
+        change the CLI mode nor start a shell and it can run with the input
+        redirected from /dev/null in a group, see _apply_script_shell.
+        """
+        words = cmd.split()
+        if words and words[0] == "sudo":
+            words = words[1:]
+        if not words or words[0] in ["su", "-i", "-s", "bash", "sh", "exit", "logout", "vtysh", "sonic-cli"]:
+            return False
+        if words[-1] in ["bash", "sh", "vtysh", "sonic-cli"]:
+            return False
+        if "#" in cmd or "<<" in cmd or "{" in cmd or "}" in cmd:
+            return False
+        return not cmd.rstrip().endswith(("\\", "&", ";"))
+
+    def _apply_script_shell(self, devname, cmd_list):
+        """
+        Send the consecutive shell commands of a script using the streaming
+        sender. The input of each command is redirected from /dev/null so that
+        it does not read the commands written ahead. When the streaming fails,
+        the commands which were not written are sent one by one.
+        """
+        access = self._get_dev_access(devname)
+        opts = self._parse_cli_opts()
+        script_cmds = self._build_cmd_list(cmd_list, opts)
+        outputs = []
+        if len(script_cmds) > 1:
+            (_, _, expect_mode) = self._change_mode(devname, False, script_cmds[0], opts)
+            ifname_type = self.wa.get_cfg_ifname_type(devname)
+            expected_prompt = access["prompts"].get_prompt_for_mode(expect_mode, ifname_type)
+            stream_cmds = ["{{ {}; }} </dev/null".format(cmd) for cmd in script_cmds]
+            self._send_command_stream(access, stream_cmds, expected_prompt, outputs)
+            for cmd, output in zip(script_cmds, outputs):
+                self._check_error(access, cmd, output, opts.skip_error_check)
+
+        # the commands not written by the streaming are sent one by one
+        for cmd in cmd_list[len(outputs):]:
+            self.config(devname, cmd)
+
     def apply_json(self, devname, data):
         devname = self._check_devname(devname)
         try:
@@ -3173,6 +3289,25 @@ class Net(object):
         self._exec(devname, script_cmd, prompt)
         redir = ">"
         lines = utils.b64encode(src_file)
+
+        # stream the chunks, each well within the line limit of the console
+        script_cmds = []
+        for clist in utils.split_list(lines, self.stream_lines_once):
+            script_cmds.append("echo {} {} {}.tmp".format("".join(clist), redir, dst_file))
+            redir = ">>"
+        try:
+            streamed = self._send_command_stream(access, script_cmds, prompt)
+        except Exception as exp:
+            # the chunks are sent again from the first one, which truncates the file
+            msg = "Streaming upload of {} failed - sending again: {}".format(dst_file, exp)
+            self.dut_log(devname, msg, lvl=logging.WARNING)
+            streamed = False
+        if streamed:
+            script_cmd = "base64 -d {0}.tmp > {0}".format(dst_file)
+            self._exec(devname, script_cmd, prompt)
+            return
+
+        redir = ">"
         (count, split) = (len(lines), self.max_cmds_once)
         for i in range(0, count, split):
             script_cmds = []
@@ -3245,14 +3380,30 @@ class Net(object):
         devname = access["devname"]
         msg = "Creating: DST: {}".format(dst_file)
         self.dut_log(devname, msg)
+        start_time = get_timenow()
+        cli_prompt = self._get_cli_prompt(devname)
+        script_cmds = []
         redir = ">"
         for clist in utils.split_list(str_list, l_split):
             content = nl.join(clist)
-            script_cmd = "printf '{}\n' {} {}\n".format(content, redir, dst_file)
-            cli_prompt = self._get_cli_prompt(devname)
-            self._exec(devname, script_cmd, cli_prompt, ufcli=False, trace_dut_log=1)
+            script_cmds.append("printf '{}\n' {} {}".format(content, redir, dst_file))
             redir = ">>"
 
+        streamed = False
+        if not access["filemode"]:
+            try:
+                streamed = self._send_command_stream(access, script_cmds, cli_prompt)
+            except Exception as exp:
+                # the groups are sent again from the first one, which truncates the file
+                msg = "Streaming {} failed - sending again: {}".format(dst_file, exp)
+                self.dut_log(devname, msg, lvl=logging.WARNING)
+        if not streamed:
+            for script_cmd in script_cmds:
+                cli_prompt = self._get_cli_prompt(devname)
+                self._exec(devname, script_cmd + "\n", cli_prompt, ufcli=False, trace_dut_log=1)
+
+        size = sum([len(cmd) + 1 for cmd in str_list])
+        profile.upload(start_time, access["dut_name"], size)
         return dst_file
 
     def _upload_file(self, access, src_file, dst_file=None):
@@ -3266,8 +3417,10 @@ class Net(object):
         self.dut_log(devname, msg)
         if access["filemode"]:
             return dst_file
+        start_time = get_timenow()
         if force_console_transfer:
             self._transfer_base64(access, src_file, dst_file)
+            self._profile_upload(access, src_file, start_time)
             return dst_file
         try:
             connection_param = access["connection_param"]
@@ -3280,8 +3433,16 @@ class Net(object):
             print(e)
             self.dut_log(devname, "SFTP Failed - Doing Console transfer")
             self._transfer_base64(access, src_file, dst_file)
+        self._profile_upload(access, src_file, start_time)
         return dst_file
 
+    def _profile_upload(self, access, src_file, start_time):
+        try:
+            size = os.path.getsize(src_file)
+        except Exception:
+            return
+        profile.upload(start_time, access["dut_name"], size)
+
     def _upload_file2(self, devname, access, src_file, md5check=False):
         remote_dir = "/etc/spytest"
 
@@ -4830,7 +4991,24 @@ class Net(object):
     def parse_show(self, devname, cmd, output):
         return self._tmpl_apply(devname, cmd, output)
 
+    def deferred_batch(self):
+        """
+        Context in which the show/config calls of this thread are queued
+        and made concurrently across the devices when the context exits
+        :return: DeferredBatch
+        """
+        return self.deferred_batches.get(get_thread_name()) or DeferredBatch(self)
+
+    def _get_deferred_batch(self):
+        if not self.deferred_batches:
+            return None
+        return self.deferred_batches.get(get_thread_name())
+
     def show(self, devname, cmd, **kwargs):
+        batch = self._get_deferred_batch()
+        if batch is not None:
+            return batch.add(self._check_devname(devname), "show", cmd, **kwargs)
+
         opts = self._parse_cli_opts(**kwargs)
 
         # switch to console if the command can cause IP change
@@ -4922,6 +5100,10 @@ class Net(object):
         return self._tmpl_apply(devname, actual_cmd, output)
 
     def config(self, devname, cmd, **kwargs):
+        batch = self._get_deferred_batch()
+        if batch is not None:
+            return batch.add(self._check_devname(devname), "config", cmd, **kwargs)
+
         opts = self._parse_cli_opts(**kwargs)
         cmd_list = self._build_cmd_list(cmd, opts)
         if not cmd_list: return ""
@@ -6167,22 +6349,24 @@ class Net(object):
             kwargs.update({"devname": devname})
             kwargs.update({"json_content": json_content})
             kwargs.update({"data_file_path": tmp_path})
-            command = self._prepare_gnmi_command(xpath, **kwargs)
-            file_operation = utils.write_to_json_file(json_content, tmp_path)
-            if not file_operation:
-                self.logger.error("File operation failed.")
-                return False
             container_crash_err_strngs = ["transport is closing", "connection refused", "Error response from daemon:"]
             docker_crash = False
             docker_status_cmd = "docker inspect -f '{{.State.Running}}' telemetry"
-            output = self._run_gnmi_command(command)
+            output = self._gnmi_request(xpath, **kwargs)
+            if output is None:
+                command = self._prepare_gnmi_command(xpath, **kwargs)
+                file_operation = utils.write_to_json_file(json_content, tmp_path)
+                if not file_operation:
+                    self.logger.error("File operation failed.")
+                    return False
+                output = self._run_gnmi_command(command)
+                for rm_cmd in rm_cmds:
+                    self._run_gnmi_command(rm_cmd)
             self.logger.debug("OUTPUT : {}".format(output))
-            for rm_cmd in rm_cmds:
-                self._run_gnmi_command(rm_cmd)
             if not output.get("error"):
                 return output
             for err_code_str in container_crash_err_strngs:
-                if err_code_str in output.get("error"):
+                if err_code_str.lower() in str(output.get("error")).lower():
                     self.logger.info("Observed {} error, may be telemetry docker got crashed".format(err_code_str))
                     docker_crash = True
                     break
@@ -6233,15 +6417,17 @@ class Net(object):
 
         try:
             kwargs.update({"devname": devname})
-            command = self._prepare_gnmi_command(xpath, **kwargs)
             docker_status_cmd = "docker inspect -f '{{.State.Running}}' telemetry"
             container_crash_err_strngs = ["transport is closing", "connection refused", "Error response from daemon:"]
             docker_crash = False
-            output = self._run_gnmi_command(command)
+            output = self._gnmi_request(xpath, **kwargs)
+            if output is None:
+                command = self._prepare_gnmi_command(xpath, **kwargs)
+                output = self._run_gnmi_command(command)
             if not output.get("error"):
                 return output
             for err_code_str in container_crash_err_strngs:
-                if err_code_str in output.get("error"):
+                if err_code_str.lower() in str(output.get("error")).lower():
                     self.logger.info("Observed {} error, may be telemetry docker got crashed".format(err_code_str))
                     docker_crash = True
                     break
@@ -6291,16 +6477,18 @@ class Net(object):
         self.logger.info("Performing GNMI DELETE OPERATION ...")
         try:
             kwargs.update({"devname":devname})
-            command = self._prepare_gnmi_command(xpath, **kwargs)
             container_crash_err_strngs = ["transport is closing", "connection refused", "Error response from daemon:"]
             docker_crash = False
             docker_status_cmd = "docker inspect -f '{{.State.Running}}' telemetry"
-            output = self._run_gnmi_command(command)
+            output = self._gnmi_request(xpath, **kwargs)
+            if output is None:
+                command = self._prepare_gnmi_command(xpath, **kwargs)
+                output = self._run_gnmi_command(command)
             self.logger.debug("OUTPUT : {}".format(output))
             if not output.get("error"):
                 return output
             for err_code_str in container_crash_err_strngs:
-                if err_code_str in output.get("error"):
+                if err_code_str.lower() in str(output.get("error")).lower():
                     self.logger.info("Observed {} error, may be telemetry docker got crashed".format(err_code_str))
                     docker_crash = True
                     break
@@ -6337,6 +6525,98 @@ class Net(object):
             self.logger.error(e)
             return False
 
+    def _gnmi_client(self, **kwargs):
+        """
+        Get the in-process gNMI client of the DUT
+        :return: GnmiClient, None when the gnmi tools need to be used instead
+        """
+        if not gnmi_client.is_supported() or env.get("SPYTEST_GNMI_NATIVE_CLIENT") == "0":
+            return None
+        credentials = self.get_credentials(kwargs.get("devname"))
+        ip_address = kwargs.get('mgmt_ip', '127.0.0.1')
+        port = kwargs.get('port', '8080')
+        username = kwargs.get('username', credentials[0])
+        password = kwargs.get('password', credentials[3])
+        try:
+            return gnmi_client.GnmiClient(ip_address, port, username=username, password=password,
+                                          cert=kwargs.get('cert'), notls=kwargs.get('notls', False))
+        except Exception as e:
+            self.logger.info("Failed to create gNMI client, using gnmi tools: {}".format(e))
+            return None
+
+    def _gnmi_request(self, xpath, **kwargs):
+        """
+        Run the GNMI operation with the in-process client
+        :return: same as _run_gnmi_command, None when the gnmi tools need to be used instead
+        """
+        client = self._gnmi_client(**kwargs)
+        if not client:
+            return None
+        action = kwargs.get("action", "get")
+        self.logger.info("GNMI {}: {}".format(action.upper(), xpath))
+        if action == "set":
+            changes = [(xpath, kwargs.get("json_content"))]
+            if "replace" in kwargs.get('mode', '--update'):
+                result = client.set(replaces=changes)
+            else:
+                result = client.set(updates=changes)
+        elif action == "delete":
+            result = client.set(deletes=[xpath])
+        else:
+            result = client.get(xpath)
+        result.pop("response", None)
+        self.logger.info("RESULT {}".format(result))
+        return result
+
+    def gnmi_batch_set(self, devname, updates=None, replaces=None, deletes=None, **kwargs):
+        """
+        API to apply multiple GNMI changes in a single SetRequest
+        :param devname:
+        :param updates: list of (xpath, json_content)
+        :param replaces: list of (xpath, json_content)
+        :param deletes: list of xpath
+        :param kwargs: mgmt_ip, port, username, password, cert, notls
+        :return: same as _run_gnmi_command, False on failure
+        """
+        kwargs.update({"devname": devname})
+        client = self._gnmi_client(**kwargs)
+        if not client:
+            # the changes are applied one at a time by the gnmi tools
+            for mode, changes in [('--update', updates), ('--replace', replaces)]:
+                for xpath, json_content in changes or []:
+                    kwargs.update({"action": "set", "mode": mode, "json_content": json_content})
+                    if not self._gnmi_set(devname, xpath, **kwargs):
+                        return False
+            for xpath in deletes or []:
+                kwargs.update({"action": "delete"})
+                if not self._gnmi_delete(devname, xpath, **kwargs):
+                    return False
+            return {"output": "", "rc": 0, "error": ""}
+        result = client.set(updates=updates, replaces=replaces, deletes=deletes)
+        result.pop("response", None)
+        self.logger.info("RESULT {}".format(result))
+        if result.get("error"):
+            self.logger.info(result.get("error"))
+            return False
+        return result
+
+    def gnmi_subscribe(self, devname, xpaths, mode="POLL", **kwargs):
+        """
+        API to subscribe to GNMI paths, call poll() on the returned subscription in
+        polling loops instead of repeating GNMI get operations and close() at the end
+        :param devname:
+        :param xpaths: xpath or list of xpaths
+        :param mode: POLL or ONCE
+        :param kwargs: mgmt_ip, port, username, password, cert, notls
+        :return: GnmiSubscription, None when the in-process gNMI client is not supported
+        """
+        kwargs.update({"devname": devname})
+        client = self._gnmi_client(**kwargs)
+        if not client:
+            self.logger.info("GNMI subscription needs the grpcio package")
+            return None
+        return client.subscribe(xpaths, mode=mode)
+
     def _prepare_gnmi_command(self, xpath, **kwargs):
         credentials = self.get_credentials(kwargs.get("devname"))
         ip_address = kwargs.get('mgmt_ip', '127.0.0.1')
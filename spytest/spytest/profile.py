@@ -19,6 +19,11 @@ class Profile(object):
         self.cmds = []
         self.profile_ids = dict()
         self.canbe_parallel = []
+        self.deferred_saved = 0
+        self.upload_bytes = 0
+        self.upload_time = 0
+        self.tmpl_memo_hits = 0
+        self.tmpl_memo_misses = 0
 
     def init(self):
         self.__init__()
@@ -64,6 +69,52 @@ class Profile(object):
             self.tc_total_wait = self.tc_total_wait + val
             self.cmds.append([start_time, thid, "WAIT", None, "static delay", val])
 
+    def deferred(self, start_time, duts, count, serial_time, cmd_time):
+        thid = logger.get_thread_name()
+        self.deferred_saved = self.deferred_saved + max(serial_time - cmd_time, 0)
+        msg = "{} commands on {}".format(count, ",".join(duts))
+        self.cmds.append([start_time, thid, "DEFERRED", None, msg, cmd_time])
+
+    def upload(self, start_time, dut, size):
+        delta = get_timenow() - start_time
+        cmd_time = int(delta.total_seconds() * 1000)
+        thid = logger.get_thread_name()
+        self.upload_bytes = self.upload_bytes + size
+        self.upload_time = self.upload_time + cmd_time
+        msg = "{} bytes at {} bytes/sec".format(size, self.throughput(size, cmd_time))
+        self.cmds.append([start_time, thid, "UPLOAD", dut, msg, cmd_time])
+
+    def throughput(self, size, cmd_time):
+        return int(size * 1000 / cmd_time) if cmd_time else size
+
+    def parallel_estimate(self):
+        """
+        Estimate the time that can be saved by running the consecutive main
+        thread commands that are the same on different DUTs concurrently
+        :return: time in milli seconds
+        """
+        saving, run = 0, []
+        for [_, thid, ctype, dut, msg, cmd_time] in self.cmds:
+            if thid != "T0000: ":
+                continue
+            if run and ctype == "CMD" and msg == run[0][1] and dut not in [r[0] for r in run]:
+                run.append([dut, msg, cmd_time])
+                continue
+            if len(run) > 1:
+                times = [r[2] for r in run]
+                saving = saving + sum(times) - max(times)
+            run = [[dut, msg, cmd_time]] if ctype == "CMD" else []
+        if len(run) > 1:
+            times = [r[2] for r in run]
+            saving = saving + sum(times) - max(times)
+        return saving
+
+    def template_memo(self, hit):
+        if hit:
+            self.tmpl_memo_hits = self.tmpl_memo_hits + 1
+        else:
+            self.tmpl_memo_misses = self.tmpl_memo_misses + 1
+
     def prompt_nfound(self, cmd):
         start_time = get_timenow()
         thid = logger.get_thread_name()
@@ -83,6 +134,13 @@ class Profile(object):
         stats.cmds = self.cmds
         stats.canbe_parallel = self.canbe_parallel
         stats.pnfound = self.pnfound
+        stats.parallel_estimate = self.parallel_estimate()
+        stats.deferred_saved = self.deferred_saved
+        stats.upload_bytes = self.upload_bytes
+        stats.upload_time = self.upload_time
+        stats.upload_rate = self.throughput(self.upload_bytes, self.upload_time)
+        stats.tmpl_memo_hits = self.tmpl_memo_hits
+        stats.tmpl_memo_misses = self.tmpl_memo_misses
         return stats
 
 obj = Profile()
@@ -98,6 +156,15 @@ def stop(pid):
 def wait(val, is_tg=False):
     return obj.wait(val, is_tg)
 
+def deferred(start_time, duts, count, serial_time, cmd_time):
+    return obj.deferred(start_time, duts, count, serial_time, cmd_time)
+
+def upload(start_time, dut, size):
+    return obj.upload(start_time, dut, size)
+
+def template_memo(hit):
+    return obj.template_memo(hit)
+
 def get_stats():
     return obj.get_stats()
 
@@ -2,6 +2,9 @@ import sys
 import os
 import re
 import json
+import hashlib
+import threading
+from collections import OrderedDict
 
 import textfsm
 try:
@@ -9,8 +12,125 @@ try:
 except Exception:
     import textfsm.clitable as clitable
 
+from spytest import profile
 import spytest.env as env
 
+class TemplateRegistry(object):
+    """
+    Templates of an index file shared by all the Template objects.
+    The index row of each set of attributes is looked up once and each
+    TextFSM template is compiled once, the compiled state machines are
+    reset and reused. The parsed rows of identical outputs are memoized
+    when SPYTEST_TEXTFSM_PARSE_MEMO_SIZE is not 0.
+    """
+
+    def __init__(self, root, index_file):
+        self.root = root
+        self.cli_table = clitable.CliTable(index_file, root)
+        self.lock = threading.Lock()
+        self.rows = dict()
+        self.fsms = dict()
+        self.memo = OrderedDict()
+        self.memo_size = int(env.get("SPYTEST_TEXTFSM_PARSE_MEMO_SIZE", "256"))
+
+    def find(self, attrs):
+        """
+        Find the templates of the index row matching the attributes
+        :return: template names separated by ':' or None
+        """
+        key = tuple(sorted(attrs.items()))
+        with self.lock:
+            if key not in self.rows:
+                row_idx = self.cli_table.index.GetRowMatch(attrs)
+                if row_idx == 0:
+                    self.rows[key] = None
+                else:
+                    self.rows[key] = self.cli_table.index.index[row_idx]['Template']
+            return self.rows[key]
+
+    def _acquire(self, tmpl_file):
+        with self.lock:
+            idle = self.fsms.setdefault(tmpl_file, [])
+            if idle:
+                return idle.pop()
+        with open(os.path.join(self.root, tmpl_file), "r") as tmpl_fp:
+            return textfsm.TextFSM(tmpl_fp)
+
+    def _release(self, tmpl_file, fsm):
+        fsm.Reset()
+        with self.lock:
+            self.fsms[tmpl_file].append(fsm)
+
+    def parse_textfsm(self, tmpl_file, data):
+        """
+        Parse the data using the compiled template
+        :return: [header, records]
+        """
+        fsm = self._acquire(tmpl_file)
+        try:
+            return [list(fsm.header), fsm.ParseText(data)]
+        finally:
+            self._release(tmpl_file, fsm)
+
+    def parse(self, templates, data):
+        """
+        Parse the data using the templates of an index row
+        :return: [header, records]
+        """
+        if ":" in templates:
+            # the tables of multiple templates are merged by CliTable
+            with self.lock:
+                self.cli_table.ParseCmd(data, templates=templates)
+                return [list(self.cli_table.header), [list(row) for row in self.cli_table]]
+        if self.memo_size <= 0:
+            return self.parse_textfsm(templates, data)
+
+        key = (templates, _digest(data or ""))
+        with self.lock:
+            retval = self.memo.get(key)
+            if retval is not None:
+                self.memo.pop(key)
+                self.memo[key] = retval
+        if retval is not None:
+            profile.template_memo(True)
+            return retval
+        profile.template_memo(False)
+        retval = self.parse_textfsm(templates, data)
+        with self.lock:
+            self.memo[key] = retval
+            while len(self.memo) > self.memo_size:
+                self.memo.popitem(last=False)
+        return retval
+
+def _digest(data):
+    try:
+        data = data.encode("utf-8", "replace")
+    except Exception:
+        pass
+    return hashlib.md5(data).hexdigest()
+
+registries = dict()
+registries_lock = threading.Lock()
+
+def get_registry(root, index_file):
+    key = (os.path.abspath(root), index_file)
+    with registries_lock:
+        if key not in registries:
+            registries[key] = TemplateRegistry(root, index_file)
+        return registries[key]
+
+def _copy_rows(header, records):
+    # the callers may modify the rows, the List values are copied as well
+    retval = []
+    for record in records:
+        row = dict()
+        for index, element in enumerate(record):
+            if isinstance(element, list):
+                element = list(element)
+            row[header[index]] = element
+        retval.append(row)
+    return retval
+
 class Template(object):
 
     def __init__(self, platform=None, cli=None):
@@ -20,17 +140,14 @@ class Template(object):
         self.root = os.path.join(os.path.dirname(__file__), '..', 'templates')
         self.samples = os.path.join(self.root, 'test')
         index_file = env.get("SPYTEST_TEXTFSM_INDEX_FILENAME", "index")
-        self.cli_table = clitable.CliTable(index_file, self.root)
+        self.registry = get_registry(self.root, index_file)
+        self.cli_table = self.registry.cli_table
         self.platform = platform
         self.cli = cli
 
     # find the template given command
     def get_tmpl(self, cmd):
-        attrs = dict(Command=cmd)
-        row_idx = self.cli_table.index.GetRowMatch(attrs)
-        if row_idx == 0:
-            return None
-        return self.cli_table.index.index[row_idx]['Template']
+        return self.registry.find(dict(Command=cmd))
 
     # retrive template and sameple file given the command
     def read_sample(self, cmd):
@@ -60,28 +177,25 @@ class Template(object):
         attrs = dict(Command=cmd)
         if self.platform: attrs["Platform"] = self.platform
         if self.cli: attrs["cli"] = self.cli
+        templates = self.registry.find(attrs)
+        if not templates:
+            msg = 'No template found for attributes: "%s"' % attrs
+            raise Exception('Unable to parse command "%s" - %s' % (cmd, msg))
         try:
-            self.cli_table.ParseCmd(output, attrs)
-            objs = []
-            for row in self.cli_table:
-                temp_dict = {}
-                for index, element in enumerate(row):
-                    if index >= len(self.cli_table.header):
-                        print("HEADER: {} ROW: {}".format(self.cli_table.header, row))
-                    temp_dict[self.cli_table.header[index].lower()] = element
-                objs.append(temp_dict)
-            tmpl_file = self.get_tmpl(cmd)
-            return [tmpl_file, objs]
+            [header, records] = self.registry.parse(templates, output)
         except clitable.CliTableError as e:
             raise Exception('Unable to parse command "%s" - %s' % (cmd, str(e)))
+        header = [name.lower() for name in header]
+        for record in records:
+            if len(record) > len(header):
+                print("HEADER: {} ROW: {}".format(header, record))
+        objs = _copy_rows(header, records)
+        tmpl_file = self.get_tmpl(cmd)
+        return [tmpl_file, objs]
 
     # apply the given template on given data
     def apply_textfsm(self, tmpl_file, data):
-        tmpl_file2 = os.path.join(self.root, tmpl_file)
-        tmpl_fp = open(tmpl_file2, "r")
-        out = textfsm.TextFSM(tmpl_fp).ParseText(data)
-        tmpl_fp.close()
-        return out
+        return self.registry.parse_textfsm(tmpl_file, data)[1]
 
 if __name__ == "__main__":
     template = Template()
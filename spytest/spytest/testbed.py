@@ -5,7 +5,6 @@ import json
 import shutil
 import tempfile
 from random import Random
-from itertools import permutations
 from collections import OrderedDict
 
 from spytest.ordyaml import OrderedYaml
@@ -1619,6 +1618,29 @@ class Testbed(object):
         cache[from_dev][to_dev][dev_type] = entries
         return entries
 
+    def get_link_counts(self):
+        """
+        Count the links of all the devices in one pass over the links
+        :return: [dut_counts, tg_counts] where dut_counts[(dut, peer)] is the
+                 same as len(get_links(dut, peer, "DUT")) and tg_counts[dut]
+                 is the same as len(get_links(dut, None, "TG"))
+        """
+        dut_counts, tg_counts = dict(), dict()
+        for _, linfo in self.links.items():
+            from_type, to_type = linfo["from_type"], linfo["to_type"]
+            from_dut, to_dut = linfo["from_dut"], linfo["to_dut"]
+            from_port, to_port = linfo["from_port"], linfo["to_port"]
+            if not self._is_valid_port(from_dut, from_port, to_dut, to_port):
+                continue
+            for dut, peer, peer_type in [(from_dut, to_dut, to_type), (to_dut, from_dut, from_type)]:
+                if not self._is_valid_dut(peer, peer_type):
+                    continue
+                if peer_type == "DUT":
+                    dut_counts[(dut, peer)] = dut_counts.get((dut, peer), 0) + 1
+                elif peer_type == "TG":
+                    tg_counts[dut] = tg_counts.get(dut, 0) + 1
+        return [dut_counts, tg_counts]
+
     @staticmethod
     def identify_topology_randomise(log, tb, rdict, num, randomise, *args):
 
@@ -1642,107 +1664,24 @@ class Testbed(object):
             if dut not in used_list:
                 dut_list.append(dut)
 
-        links_cache = {}
+        matcher = TopologyMatcher(log, tb, requests, properties, len(req_duts))
 
         found_setups = []
         for setup in range(0, num):
-          dut_list2 = []
-          used_list = [j for i in found_setups for j in i]
-          for dut in dut_list:
-              if dut not in used_list or randomise:
-                  dut_list2.append(dut)
-          if not Testbed.check_dut_name_any(log, dut_list2, properties):
-            continue
-          dut_list2 = Testbed.check_dut_names_any(log, dut_list2, properties)
-          if len(dut_list2) < len(req_duts):
-            continue
-          found_match = []
-          perm_iterator = permutations(dut_list2, len(req_duts))
-          for perm in perm_iterator:
-            if randomise and [item for item in perm] in found_setups:
-                continue
-            perm_list = list(perm)
-            perm_dict = {"D{}".format(i+1) : item for i, item in enumerate(perm_list)}
-            Testbed.trace2(log, perm, perm_list, perm_dict)
-            # check if names is enforced
-            if not Testbed.check_dut_names(log, tb, perm_list, properties):
-                Testbed.trace2(log, "no matching dut names", requests)
-                found_match = []
-                continue
-            for from_dev, to_dev, res, arg in requests:
-                count = int(res.group(3))
-                if from_dev == 'D' and to_dev == 'T':
-                    dut1_req = "D{}".format(res.group(1))
-                    Testbed.trace2(log, "checking-tg", arg, perm_list, dut1_req)
-                    if dut1_req not in perm_dict:
-                        Testbed.trace2(log, "no match tg dut position", arg, count, dut1_req)
-                        found_match = []
-                        break
-                    dut1 = perm_dict[dut1_req]
-                    # check if name is enforced
-                    if not Testbed.check_dut_name(log, tb, dut1_req, dut1, properties):
-                        Testbed.trace2(log, "no matching dut name", arg, count, dut1_req)
-                        found_match = []
-                        break
-                    # check if model is enforced
-                    if not Testbed.check_model(log, tb, dut1_req, dut1, properties):
-                        Testbed.trace2(log, "no matching dut model", arg, count, dut1_req)
-                        found_match = []
-                        break
-                    # check if chip is enforced
-                    if not Testbed.check_chip(log, tb, dut1_req, dut1, properties):
-                        Testbed.trace2(log, "no matching dut chip", arg, count, dut1_req, properties)
-                        found_match = []
-                        break
-                    # check if tg links are suffient
-                    entries = tb.get_links_cached(dut1, None, "TG", links_cache)
-                    if len(entries) < count:
-                        Testbed.trace2(log, "no match tg links", arg, len(entries), count, dut1_req, dut1)
-                        found_match = []
-                        break
-                    found_match = perm_list
-                elif from_dev == 'D' and to_dev == 'D':
-                    dut1_req = "D{}".format(res.group(1))
-                    dut2_req = "D{}".format(res.group(2))
-                    Testbed.trace2(log, "checking-dut", arg, perm_list, dut1_req, dut2_req, "links_req", count)
-                    if dut1_req not in perm_dict:
-                        Testbed.trace2(log, "no match dut links - 1", arg, count, perm_list, dut1_req, dut2_req)
-                        found_match = []
-                        break
-                    if dut2_req not in perm_dict:
-                        Testbed.trace2(log, "no match dut links - 2", arg, count, perm_list, dut1_req, dut2_req)
-                        found_match = []
-                        break
-                    dut1 = perm_dict[dut1_req]
-                    if not Testbed.check_model(log, tb, dut1_req, dut1, properties):
-                        Testbed.trace2(log, "no matching dut-1 model", arg, count, dut1_req, dut1)
-                        found_match = []
-                        break
-                    if not Testbed.check_chip(log, tb, dut1_req, dut1, properties):
-                        Testbed.trace2(log, "no matching dut-1 chip", arg, count, dut1_req, dut1)
-                        found_match = []
-                        break
-                    dut2 = perm_dict[dut2_req]
-                    if not Testbed.check_model(log, tb, dut2_req, dut2, properties):
-                        Testbed.trace2(log, "no matching dut-2 model", arg, count, dut2_req, dut2)
-                        found_match = []
-                        break
-                    if not Testbed.check_chip(log, tb, dut2_req, dut2, properties):
-                        Testbed.trace2(log, "no matching dut-2 chip", arg, count, dut2_req, dut2)
-                        found_match = []
-                        break
-                    entries = tb.get_links_cached(dut1, dut2, "DUT", links_cache)
-                    if len(entries) < count:
-                        Testbed.trace2(log, "no match dut links", arg, len(entries), count, perm_list, dut1, dut2)
-                        found_match = []
-                        break
-                    found_match = perm_list
-                else:
-                    print("UNKNOWN", arg)
-            if found_match:
-              Testbed.trace2(log, "found match", found_match, "req_duts", req_duts, properties)
-              found_setups.append(found_match)
-              break
+            dut_list2 = []
+            used_list = [j for i in found_setups for j in i]
+            for dut in dut_list:
+                if dut not in used_list or randomise:
+                    dut_list2.append(dut)
+            if not Testbed.check_dut_name_any(log, dut_list2, properties):
+                break
+            dut_list2 = Testbed.check_dut_names_any(log, dut_list2, properties)
+            found_match = matcher.match(dut_list2, found_setups if randomise else None)
+            # the next setups are searched in the same devices when there is no match
+            if not found_match:
+                break
+            Testbed.trace2(log, "found match", found_match, "req_duts", req_duts, properties)
+            found_setups.append(found_match)
 
         if not found_setups:
             Testbed.trace2(log, "not found match", "req_duts", req_duts, properties)
@@ -1965,3 +1904,109 @@ class Testbed(object):
         except Exception:
             return None
 
+
+class TopologyMatcher(object):
+    """
+    Match the DUT positions D1..Dn of a topology against the testbed devices.
+    The candidate devices of each position are first filtered with the name,
+    model, chip and TG links requirements of the position, the positions are
+    then assigned in order by backtracking on the DUT links requirements,
+    which are checked against the link counts of the device pairs.
+    The setups are found in the same order as the permutations of the devices.
+    """
+
+    def __init__(self, log, tb, requests, properties, num_duts):
+        self.log = log
+        self.tb = tb
+        self.properties = properties
+        self.slots = ["D{}".format(i+1) for i in range(num_duts)]
+        [self.dut_counts, self.tg_counts] = tb.get_link_counts()
+        self.device_cache = dict()
+        self.valid = False
+        self.name_slots, self.device_slots, self.tg_links = set(), set(), dict()
+        # DUT links requirements checked when the later of the two positions is assigned
+        self.dut_links = [[] for _ in self.slots]
+        for from_dev, to_dev, res, arg in requests:
+            count = int(res.group(3))
+            if from_dev == 'D' and to_dev == 'T':
+                slot = "D{}".format(res.group(1))
+                if slot not in self.slots:
+                    Testbed.trace2(log, "no match tg dut position", arg, count, slot)
+                    self.valid = False
+                    return
+                self.name_slots.add(slot)
+                self.device_slots.add(slot)
+                self.tg_links[slot] = max(count, self.tg_links.get(slot, 0))
+            elif from_dev == 'D' and to_dev == 'D':
+                slot1 = "D{}".format(res.group(1))
+                slot2 = "D{}".format(res.group(2))
+                if slot1 not in self.slots or slot2 not in self.slots:
+                    Testbed.trace2(log, "no match dut links position", arg, count, slot1, slot2)
+                    self.valid = False
+                    return
+                self.device_slots.update([slot1, slot2])
+                [index1, index2] = [self.slots.index(slot1), self.slots.index(slot2)]
+                self.dut_links[max(index1, index2)].append([index1, index2, count])
+            else:
+                print("UNKNOWN", arg)
+                continue
+            self.valid = True
+
+    def _check_device(self, slot, dut):
+        key = (slot, dut)
+        if key not in self.device_cache:
+            [log, tb, props] = [self.log, self.tb, self.properties]
+            rv = True
+            if slot in self.name_slots:
+                rv = Testbed.check_dut_name(log, tb, slot, dut, props)
+            if rv and slot in self.device_slots:
+                rv = Testbed.check_model(log, tb, slot, dut, props)
+                rv = rv and Testbed.check_chip(log, tb, slot, dut, props)
+            if rv and slot in self.tg_links:
+                rv = bool(self.tg_counts.get(dut, 0) >= self.tg_links[slot])
+            self.device_cache[key] = rv
+        return self.device_cache[key]
+
+    def _check_links(self, index, dut, assigned):
+        for index1, index2, count in self.dut_links[index]:
+            dut1 = dut if index1 == index else assigned[index1]
+            dut2 = dut if index2 == index else assigned[index2]
+            if self.dut_counts.get((dut1, dut2), 0) < count:
+                return False
+        return True
+
+    def _search(self, candidates, assigned, exclude):
+        index = len(assigned)
+        if index == len(self.slots):
+            if exclude and assigned in exclude:
+                return None
+            if not Testbed.check_dut_names(self.log, self.tb, assigned, self.properties):
+                return None
+            return list(assigned)
+        for dut in candidates[index]:
+            if dut in assigned or not self._check_links(index, dut, assigned):
+                continue
+            assigned.append(dut)
+            rv = self._search(candidates, assigned, exclude)
+            if rv:
+                return rv
+            assigned.pop()
+        return None
+
+    def match(self, dut_list, exclude=None):
+        """
+        Find the first setup, in the order of permutations(dut_list, len(slots)),
+        meeting the requirements of the topology
+        :param dut_list: available devices
+        :param exclude: setups to skip
+        :return: list of devices for D1..Dn, None if there is no match
+        """
+        if not self.valid or len(dut_list) < len(self.slots):
+            return None
+        candidates = []
+        for slot in self.slots:
+            candidates.append([dut for dut in dut_list if self._check_device(slot, dut)])
+            if not candidates[-1]:
+                Testbed.trace2(self.log, "no matching device", slot, dut_list, self.properties)
+                return None
+        return self._search(candidates, [], exclude)
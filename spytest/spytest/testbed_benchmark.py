@@ -0,0 +1,210 @@
+"""
+Benchmark of the topology matching of Testbed.identify_topology
+
+Generates synthetic testbeds with random DUT models, chips, DUT links and TG
+links and identifies the bucket topologies and topologies with model/chip
+requirements in them, once with the legacy check of all the permutations of
+the devices and once with the TopologyMatcher. The setups found by both are
+compared.
+
+Usage, from the spytest directory:
+    python -m spytest.testbed_benchmark --sizes 8 16 24 32 --legacy-max-size 8
+"""
+
+from __future__ import print_function
+
+import os
+import time
+import argparse
+import tempfile
+from random import Random
+from itertools import permutations
+
+from spytest.testbed import Testbed
+
+MODELS = [["AS7712", "TD3"], ["AS7816", "TH2"], ["AS9716", "TH3"], ["Z9332F", "TH3"]]
+
+TOPOLOGIES = [
+    "D1T1:2",
+    "D1T1:4 D1D2:6 D2T1:2",
+    "D1 D2 D3",
+    "D1T1:2 D2T1:2 D3T1:2 D4T1:2 D1D2:4 D2D3:4 D3D4:4 D4D1:4",
+    "D1D2:2 D1D3:2 D2D3:2 D1T1:1 D2T1:1 D3T1:1",
+    "D1T1:2 D1D2:2 D2D3:2 D3D4:2 D1MODEL:AS9716 D4CHIP:TH3",
+    "D1D2:2 D2D3:2 D3D4:2 D4D5:2 D5D6:2 CHIP:TH3",
+    "D1D2:4 D1D3:4 D1D4:4 D2D3:4 D2D4:4 D3D4:4",
+]
+
+TESTBED_HEADER = """version: 2.0
+
+services: {default: !include sonic_services.yaml}
+
+builds: !include sonic_builds.yaml
+speeds: !include sonic_speeds.yaml
+errors: !include sonic_errors.yaml
+instrument: !include sonic_instrument.yaml
+
+configs:
+    default: !include sonic_configs.yaml
+    empty: {current: [], restore: []}
+
+params:
+    def_tg: {}
+    def_link: {}
+    def_tg_link: {}
+"""
+
+
+def generate_testbed(num_duts, seed, link_prob=0.5):
+    rand = Random(seed)
+    lines = [TESTBED_HEADER]
+    for model, chip in MODELS:
+        lines.append("    def_{}: {{model: {}, chip: {}}}".format(model, model, chip))
+    lines.extend(["", "devices:"])
+    duts = ["dut-{:02d}".format(i+1) for i in range(num_duts)]
+    for i, dut in enumerate(duts):
+        model = rand.choice(MODELS)[0]
+        lines.append("    {}:".format(dut))
+        lines.append("        device_type: DevSonic")
+        lines.append("        access: {{protocol: telnet, ip: 1.2.3.4, port: {}}}".format(2000 + i))
+        lines.append("        credentials: {username: admin, password: YourPaSsWoRd, altpassword: broadcom}")
+        lines.append("        properties: {{config: default, build: default, services: default, "
+                     "params: def_{}, speed: default}}".format(model))
+    lines.append("    tg-01:")
+    lines.append("        device_type: TGEN")
+    lines.append("        properties: {type: scapy, version: 1.0, ip: 1.2.3.5, params: def_tg}")
+    lines.extend(["", "topology:"])
+    ports = dict((dut, 0) for dut in duts)
+    tg_port = 0
+    for i, dut in enumerate(duts):
+        lines.append("    {}:".format(dut))
+        lines.append("        interfaces:")
+        for _ in range(rand.randint(0, 4)):
+            tg_port = tg_port + 1
+            lines.append("            Ethernet{}: {{EndDevice: tg-01, EndPort: 1/{}, params: def_tg_link}}".format(
+                         ports[dut], tg_port))
+            ports[dut] = ports[dut] + 1
+        for peer in duts[i+1:]:
+            if rand.random() >= link_prob:
+                continue
+            for _ in range(rand.randint(1, 6)):
+                lines.append("            Ethernet{}: {{EndDevice: {}, EndPort: Ethernet{}, params: def_link}}".format(
+                             ports[dut], peer, ports[peer]))
+                ports[dut] = ports[dut] + 1
+                ports[peer] = ports[peer] + 1
+    return "\n".join(lines) + "\n"
+
+
+def legacy_match(log, tb, requests, properties, perm_list, links_cache):
+    """Legacy check of one permutation of the devices"""
+    perm_dict = {"D{}".format(i+1): item for i, item in enumerate(perm_list)}
+    if not Testbed.check_dut_names(log, tb, perm_list, properties):
+        return False
+    found_match = False
+    for from_dev, to_dev, res, _ in requests:
+        count = int(res.group(3))
+        if from_dev == 'D' and to_dev == 'T':
+            dut1_req = "D{}".format(res.group(1))
+            if dut1_req not in perm_dict:
+                return False
+            dut1 = perm_dict[dut1_req]
+            if not Testbed.check_dut_name(log, tb, dut1_req, dut1, properties):
+                return False
+            if not Testbed.check_model(log, tb, dut1_req, dut1, properties):
+                return False
+            if not Testbed.check_chip(log, tb, dut1_req, dut1, properties):
+                return False
+            if len(tb.get_links_cached(dut1, None, "TG", links_cache)) < count:
+                return False
+            found_match = True
+        elif from_dev == 'D' and to_dev == 'D':
+            dut1_req = "D{}".format(res.group(1))
+            dut2_req = "D{}".format(res.group(2))
+            if dut1_req not in perm_dict or dut2_req not in perm_dict:
+                return False
+            dut1, dut2 = perm_dict[dut1_req], perm_dict[dut2_req]
+            for dut_req, dut in [[dut1_req, dut1], [dut2_req, dut2]]:
+                if not Testbed.check_model(log, tb, dut_req, dut, properties):
+                    return False
+                if not Testbed.check_chip(log, tb, dut_req, dut, properties):
+                    return False
+            if len(tb.get_links_cached(dut1, dut2, "DUT", links_cache)) < count:
+                return False
+            found_match = True
+    return found_match
+
+
+def legacy_identify_topology(log, tb, num, randomise, *args):
+    """Legacy identify_topology_randomise checking all the permutations of the devices"""
+    arg_list = Testbed._split_args(*args)
+    [requests, properties, req_duts, errs] = Testbed.normalize_topo(*arg_list)
+    if Testbed.ensure_tgen_model_and_card(log, tb, properties, errs):
+        return None
+    dut_list = tb.get_device_names("DUT")
+    links_cache = {}
+    found_setups = []
+    for _ in range(0, num):
+        used_list = [j for i in found_setups for j in i]
+        dut_list2 = [dut for dut in dut_list if dut not in used_list or randomise]
+        if not Testbed.check_dut_name_any(log, dut_list2, properties):
+            continue
+        dut_list2 = Testbed.check_dut_names_any(log, dut_list2, properties)
+        if len(dut_list2) < len(req_duts):
+            continue
+        for perm in permutations(dut_list2, len(req_duts)):
+            if randomise and list(perm) in found_setups:
+                continue
+            if legacy_match(log, tb, requests, properties, list(perm), links_cache):
+                found_setups.append(list(perm))
+                break
+    return found_setups or None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Testbed topology matching benchmark')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[8, 16, 24, 32],
+                        help='number of DUTs of the synthetic testbeds')
+    parser.add_argument('--num', type=int, default=100,
+                        help='number of setups to identify, 100 as in the batch buckets')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the synthetic testbeds')
+    parser.add_argument('--legacy-max-size', type=int, default=8,
+                        help='run the legacy permutations check only up to this number of DUTs')
+    args = parser.parse_args()
+
+    mismatches = 0
+    tmpdir = tempfile.mkdtemp(prefix="testbed_benchmark_")
+    for size in args.sizes:
+        filename = os.path.join(tmpdir, "testbed_{}.yaml".format(size))
+        with open(filename, "w") as fp:
+            fp.write(generate_testbed(size, args.seed + size))
+        tb = Testbed(filename, flex_dut=True)
+        for topo in TOPOLOGIES:
+            for randomise in [False, True]:
+                num = 10 if randomise else args.num
+                start = time.time()
+                [setups, _, _] = Testbed.identify_topology_randomise(None, tb, None, num, randomise, topo)
+                elapsed = time.time() - start
+                msg = "{:2d} DUTs {:<60} {:<9} setups {:3d} matcher {:.4f} sec".format(
+                      size, topo, "randomise" if randomise else "", len(setups or []), elapsed)
+                if size > args.legacy_max_size:
+                    print(msg)
+                    continue
+                start = time.time()
+                legacy_setups = legacy_identify_topology(None, tb, num, randomise, topo)
+                legacy_elapsed = time.time() - start
+                msg = "{} legacy {:.4f} sec speedup {:.1f}x".format(
+                      msg, legacy_elapsed, legacy_elapsed / max(elapsed, 1e-6))
+                if legacy_setups != setups:
+                    mismatches = mismatches + 1
+                    msg = "{} MISMATCH {} != {}".format(msg, setups, legacy_setups)
+                print(msg)
+
+    if mismatches:
+        print("{} topologies identified differently".format(mismatches))
+        return 1
+    print("Setups of all topologies are identical")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
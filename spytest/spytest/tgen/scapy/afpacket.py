@@ -1,11 +1,14 @@
 """
-AF_PACKET receive support
+AF_PACKET receive and batched transmit support
 
 When VLAN offload is enabled on the NIC Linux will not deliver the VLAN tag
 in the data returned by recv. Instead, it delivers the VLAN TCI in a control
 message. Python 2.x doesn't have built-in support for recvmsg, so we have to
 use ctypes to call it. The recv function exported by this module reconstructs
 the VLAN tag if it was offloaded.
+
+The sendmmsg function exported by this module sends a list of frames with
+a single system call, which is used by the TX fast path of templated streams.
 """
 
 import struct
@@ -24,6 +27,7 @@ from ctypes import c_ushort
 from ctypes import c_uint
 from ctypes import Structure
 from ctypes import c_uint32
+from ctypes import c_char_p
 
 ETH_P_8021Q = 0x8100
 SOL_PACKET = 263
@@ -47,6 +51,12 @@ class struct_msghdr(Structure):
         ("msg_flags", c_int),
     ]
 
+class struct_mmsghdr(Structure):
+    _fields_ = [
+        ("msg_hdr", struct_msghdr),
+        ("msg_len", c_uint),
+    ]
+
 class struct_cmsghdr(Structure):
     _fields_ = [
         ("cmsg_len", c_size_t),
@@ -70,6 +80,13 @@ recvmsg = libc.recvmsg
 recvmsg.argtypes = [c_int, POINTER(struct_msghdr), c_int]
 recvmsg.retype = c_int
 
+try:
+    libc_sendmmsg = libc.sendmmsg
+    libc_sendmmsg.argtypes = [c_int, POINTER(struct_mmsghdr), c_uint, c_int]
+    libc_sendmmsg.restype = c_int
+except AttributeError:
+    libc_sendmmsg = None
+
 def enable_auxdata(sk):
     """
     Ask the kernel to return the VLAN tag in a control message
@@ -124,3 +141,34 @@ def recv(sk, bufsize):
         return buf.raw[:12] + tag + buf.raw[12:rv]
     else:
         return buf.raw[:rv]
+
+
+def sendmmsg(sk, frames):
+    """
+    Send frames on an AF_PACKET socket using one sendmmsg call
+    @sk Socket bound to the interface
+    @frames List of frames (str/bytes)
+    """
+    if not libc_sendmmsg:
+        for frame in frames:
+            sk.send(frame)
+        return len(frames)
+
+    count = len(frames)
+    iovs = (struct_iovec * count)()
+    msgs = (struct_mmsghdr * count)()
+    for index, frame in enumerate(frames):
+        # frames are kept alive by the caller, no need to copy them
+        iovs[index].iov_base = cast(c_char_p(frame), c_void_p)
+        iovs[index].iov_len = len(frame)
+        msgs[index].msg_hdr.msg_iov = pointer(iovs[index])
+        msgs[index].msg_hdr.msg_iovlen = 1
+
+    sent = 0
+    while sent < count:
+        rv = libc_sendmmsg(sk.fileno(), byref(msgs, sent * sizeof(struct_mmsghdr)), count - sent, 0)
+        if rv <= 0:
+            msg = "sendmmsg failed: rv={} errno={}".format(rv, get_errno())
+            raise RuntimeError(msg)
+        sent = sent + rv
+    return sent
@@ -18,6 +18,64 @@ def isLinkUp(intf, dbg = False):
           return True
     return False
 
+class RxCounters(object):
+    """
+    RX statistics updated only by the RX thread without any locking and
+    folded into the port and stream statistics when those are read.
+    Each reader remembers the values already folded, so that only the
+    increments since the previous fold are added.
+    """
+    def __init__(self):
+        self.lock = threading.Lock() # serializes the readers only
+        self.port = [0, 0, 0] # frames, bytes, oversize frames
+        self.port_folded = [0, 0, 0]
+        self.streams = {} # signature: [stream, frames, bytes, folded frames, folded bytes]
+        self.tracked = None
+
+    def track(self, track_streams):
+        """Return the signature map of the tracked streams, called from RX thread"""
+        if self.tracked == track_streams:
+            return self.streams
+        streams = {}
+        for stream in track_streams:
+            sid = stream.get_sid()
+            if not sid: continue
+            key = sid.encode()
+            if key in streams: continue # first stream matches as before
+            entry = self.streams.get(key)
+            if not entry or entry[0] is not stream:
+                entry = [stream, 0, 0, 0, 0]
+            streams[key] = entry
+        self.tracked = list(track_streams)
+        self.streams = streams
+        return streams
+
+    def add(self, length, entry):
+        """Count the received frame, called from RX thread"""
+        port = self.port
+        port[0] += 1
+        port[1] += length
+        if length > 1518:
+            port[2] += 1
+        if entry:
+            entry[1] += 1
+            entry[2] += length
+
+    def fold(self, port=None):
+        """Add the increments to the statistics or discard them when port is None"""
+        with self.lock:
+            names = ['framesReceived', 'bytesReceived', 'oversizeFramesReceived']
+            for index, name in enumerate(names):
+                value = self.port[index]
+                if port: port.incrStat(name, value - self.port_folded[index])
+                self.port_folded[index] = value
+            for entry in list(self.streams.values()):
+                (stream, frames, nbytes) = entry[:3]
+                if port:
+                    stream.incrStat('framesReceived', frames - entry[3])
+                    stream.incrStat('bytesReceived', nbytes - entry[4])
+                entry[3], entry[4] = frames, nbytes
+
 class ScapyDriver(object):
     def __init__(self, port, dry=False, dbg=0, logger=None):
         self.port = port
@@ -29,6 +87,7 @@ class ScapyDriver(object):
         self.utils = Utils(self.dry, logger=self.logger)
         self.iface = port.iface
         self.iface_status = None
+        self.rx_counters = RxCounters()
         self.packet = ScapyPacket(port.iface, dry=self.dry, dbg=self.dbg,
                                   logger=self.logger)
         self.rxInit()
@@ -118,6 +177,9 @@ class ScapyDriver(object):
             # read packets
             while self.rx_any_enable():
                 try:
+                    if self.packet.rx_ring:
+                        self.handle_recv_ring()
+                        continue
                     packet = self.packet.readp(iface=self.iface)
                     if packet:
                         self.handle_recv(None, packet)
@@ -144,17 +206,11 @@ class ScapyDriver(object):
 
     def handle_stats(self, packet):
         pktlen = 0 if not packet else len(packet)
-        framesReceived = self.port.incrStat('framesReceived')
-        self.port.incrStat('bytesReceived', pktlen)
+        streams = self.rx_counters.track(self.port.track_streams)
+        signature = self.packet.signature(packet) if packet else None
+        self.rx_counters.add(pktlen, streams.get(signature))
         if self.dbg > 2:
-            self.logger.debug("{} framesReceived: {}".format(self.iface, framesReceived))
-        if pktlen > 1518:
-            self.port.incrStat('oversizeFramesReceived')
-        for stream in self.port.track_streams:
-            if self.packet.match_stream(stream, packet):
-                stream.incrStat('framesReceived')
-                stream.incrStat('bytesReceived', pktlen)
-                break # no need to check in other streams
+            self.logger.debug("{} framesReceived: {}".format(self.iface, self.rx_counters.port[0]))
 
     def handle_capture(self, packet):
         self.pkts_captured.append(packet)
@@ -165,6 +221,17 @@ class ScapyDriver(object):
         if self.captureState.is_set():
             self.handle_capture(packet)
 
+    def handle_recv_ring(self):
+        stats = self.statState.is_set()
+        capture = self.captureState.is_set()
+        streams = self.rx_counters.track(self.port.track_streams)
+        for (length, signature, packet) in self.packet.readp_ring(self.iface, capture):
+            if stats: self.rx_counters.add(length, streams.get(signature))
+            if capture: self.handle_capture(packet)
+
+    def fold_stats(self):
+        self.rx_counters.fold(self.port)
+
     def txInit(self):
         self.txState = threading.Event()
         self.txState.clear()
@@ -277,6 +344,7 @@ class ScapyDriver(object):
                 break
 
     def clear_stats(self):
+        self.rx_counters.fold()
         self.packet.clear_stats()
 
     def txThreadMain(self):
@@ -301,7 +369,7 @@ class ScapyDriver(object):
                     self.logger.debug(" start {} {}/{}".format(stream.stream_id, stream.enable, stream.enable2))
                 if stream.enable and stream.enable2:
                     pwa = self.packet.build_first(stream)
-                    pwa.tx_time = time.clock()
+                    pwa.tx_time = time.time()
                     pwa_list.append(pwa)
                     sids[stream.stream_id] = 0
                     self.stop_ack_wait(stream.stream_id)
@@ -334,11 +402,16 @@ class ScapyDriver(object):
                 if not pwa.stream.enable or not pwa.stream.enable2:
                     continue
                 self.pwa_wait(pwa)
+                if pwa.template:
+                    (pwa, frames_sent) = self.send_batch(pwa)
+                    tx_count = tx_count + frames_sent
+                    if pwa: pwa_next_list.append(pwa)
+                    continue
                 try:
-                    send_start_time = time.clock()
+                    send_start_time = time.time()
                     pkt = self.send_packet(pwa, pwa.stream.stream_id)
                     bytesSent = len(pkt)
-                    send_time = time.clock() - send_start_time
+                    send_time = time.time() - send_start_time
 
                     # increment port counters
                     framesSent = self.port.incrStat('framesSent')
@@ -359,21 +432,60 @@ class ScapyDriver(object):
                     self.logger.log_exception(e, traceback.format_exc())
                     pwa.stream.enable2 = False
                 else:
-                    build_start_time = time.clock()
+                    build_start_time = time.time()
                     pwa = self.packet.build_next(pwa)
                     if not pwa: continue
-                    build_time = time.clock() - build_start_time
+                    build_time = time.time() - build_start_time
                     ipg = self.packet.build_ipg(pwa)
-                    pwa.tx_time = time.clock() + ipg - build_time - send_time
+                    pwa.tx_time = time.time() + ipg - build_time - send_time
                     pwa_next_list.append(pwa)
             pwa_list = pwa_next_list
         self.logger.debug("txThreadMainInner {} Completed {}".format(self.iface, tx_count))
 
+    def send_batch(self, pwa):
+        # collect the templated stream packets which are already due
+        (frames, ipg, now) = ([], 0, time.time())
+        next_pwa = pwa
+        while next_pwa and len(frames) < self.packet.tx_batch:
+            frames.append(pwa.template.frame())
+            next_pwa = self.packet.build_next(pwa)
+            if next_pwa:
+                ipg = ipg + self.packet.build_ipg(next_pwa)
+                if pwa.tx_time + ipg > now:
+                    break
+
+        try:
+            self.packet.send_batch(frames, self.iface, pwa.stream.stream_id, pwa.left)
+        except Exception as e:
+            self.logger.log_exception(e, traceback.format_exc())
+            pwa.stream.enable2 = False
+            return (None, 0)
+
+        # increment port counters
+        bytesSent = sum([len(frame) for frame in frames])
+        framesSent = self.port.incrStat('framesSent', len(frames))
+        self.port.incrStat('bytesSent', bytesSent)
+        if self.dbg > 2:
+            self.logger.debug("{} framesSent: {}".format(self.iface, framesSent))
+        pwa.stream.incrStat('framesSent', len(frames))
+        pwa.stream.incrStat('bytesSent', bytesSent)
+
+        # increment stream counters
+        stream_tx = self.stream_pkts[pwa.stream.stream_id] + len(frames)
+        self.stream_pkts[pwa.stream.stream_id] = stream_tx
+        if self.dbg > 1:
+            self.logger.debug("{}/{} framesSent: {}".format(self.iface,
+                                pwa.stream.stream_id, stream_tx))
+
+        if next_pwa:
+            next_pwa.tx_time = pwa.tx_time + ipg
+        return (next_pwa, len(frames))
+
     def pwa_sort(self, pwa):
         return pwa.tx_time
 
     def pwa_wait(self, pwa):
-        delay = pwa.tx_time - time.clock()
+        delay = pwa.tx_time - time.time()
         if self.dbg > 2 or (self.dbg > 1 and pwa.left != 0):
             self.logger.debug("stream: {} delay: {} pps: {}".format(pwa.stream.stream_id, delay, pwa.rate_pps))
         if delay <= 0:
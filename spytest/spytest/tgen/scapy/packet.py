@@ -22,6 +22,8 @@ from scapy.config import Conf
 from dicts import SpyTestDict
 from utils import Utils
 from logger import Logger
+from packet_template import PacketTemplate
+from rxring import RxRing
 
 try: print("SCAPY VERSION = {}".format(Conf().version))
 except Exception: print("SCAPY VERSION = UNKNOWN")
@@ -130,6 +132,9 @@ class ScapyPacket(object):
         except Exception: self.logger.info("SCAPY VERSION = UNKNOWN")
         self.utils = Utils(self.dry, logger=self.logger)
         self.max_rate_pps = self.utils.get_env_int("SPYTEST_SCAPY_MAX_RATE_PPS", 100)
+        self.tx_template = self.utils.get_env_int("SPYTEST_SCAPY_TX_TEMPLATE", 1)
+        self.tx_batch = self.utils.get_env_int("SPYTEST_SCAPY_TX_BATCH", 64)
+        self.rx_ring_blocks = self.utils.get_env_int("SPYTEST_SCAPY_RX_RING_BLOCKS", 64)
         self.dbg = dbg
         self.show_summary = bool(self.dbg > 2)
         self.hex = hex
@@ -138,7 +143,9 @@ class ScapyPacket(object):
         self.tx_count = 0
         self.rx_count = 0
         self.rx_sock = None
+        self.rx_ring = None
         self.tx_sock = None
+        self.tx_batch_sock = None
         self.finished = False
         self.exabgp_nslist = []
         self.cleanup()
@@ -226,12 +233,20 @@ class ScapyPacket(object):
         self.exabgpd_stop_all()
         self.finished = True
         self.rx_sock = self.close_sock(self.rx_sock)
+        self.rx_ring = self.close_sock(self.rx_ring)
         self.tx_sock = self.close_sock(self.tx_sock)
+        self.tx_batch_sock = self.close_sock(self.tx_batch_sock)
         self.init_bridge(self.iface)
         self.finished = False
 
     def rx_open(self):
         if not self.iface or self.dry: return
+        if self.rx_ring_blocks > 0:
+            try:
+                self.rx_ring = RxRing(self.iface+"-rx", block_nr=self.rx_ring_blocks)
+                return
+            except Exception as exp:
+                self.logger.debug("Failed to create RX ring {} {}".format(self.iface, exp))
         ETH_P_ALL = 3
         self.rx_sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
         self.rx_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 12 * 1024)
@@ -271,6 +286,27 @@ class ScapyPacket(object):
 
         return packet
 
+    def readp_ring(self, iface, decode):
+        """
+        Read the frames of the next RX ring block
+        Yields (length, signature, packet) where the packet is decoded only when requested
+        """
+        ring = self.rx_ring
+        for (offset, snaplen, length, vlan_tag) in ring.frames():
+            if vlan_tag: length = length + 4
+            self.rx_count = self.rx_count + 1
+            signature = ring.ring[offset + snaplen - 12:offset + snaplen - 4]
+            packet = None
+            if decode or self.dbg > 1:
+                packet = Ether(ring.data(offset, snaplen, vlan_tag))
+                if self.dbg > 1:
+                    cmd = "" if not self.show_summary else packet.command()
+                    msg = "readp:{} len:{} count:{} {}".format
+                    self.logger.debug(msg(iface, length, self.rx_count, cmd))
+                if self.dbg > 2:
+                    self.trace_packet(packet, self.hex)
+            yield (length, signature, packet)
+
     def sendp(self, pkt, data, iface, stream_name, left):
         self.tx_count = self.tx_count + 1
         self.trace_stats()
@@ -316,7 +352,33 @@ class ScapyPacket(object):
         if fields: self.show_pkt(pkt)
         if hex: hexdump(pkt)
 
-    def send_packet(self, pwa, iface, stream_name, left):
+    def send_batch(self, frames, iface, stream_name, left):
+        if self.dbg > 1 and left != 0:
+            msg = "send_batch:{}:{} frames:{} count:{}".format
+            self.logger.debug(msg(iface, stream_name, len(frames), self.tx_count))
+
+        if not self.dry:
+            if not self.tx_batch_sock:
+                try:
+                    self.tx_batch_sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW)
+                    self.tx_batch_sock.bind((iface, 0))
+                except Exception as exp:
+                    self.logger.debug("Failed to create TX socket {} {}".format(iface, exp))
+                    self.tx_batch_sock = self.close_sock(self.tx_batch_sock)
+
+            if self.tx_batch_sock:
+                try:
+                    afpacket.sendmmsg(self.tx_batch_sock, frames)
+                    self.tx_count = self.tx_count + len(frames)
+                    self.trace_stats()
+                    return
+                except Exception as exp:
+                    self.logger.debug("Failed to send batch {} {}".format(iface, exp))
+
+        for data in frames:
+            self.sendp(None, data, iface, stream_name, left)
+
+    def build_frame(self, pwa):
         if pwa.padding:
             strpkt = str(pwa.pkt/pwa.padding)
         else:
@@ -328,6 +390,10 @@ class ScapyPacket(object):
             if not sid: sid = "DeadBeef"
             if sid: strpkt = strpkt[:-len(sid)] + sid
 
+        return strpkt
+
+    def send_packet(self, pwa, iface, stream_name, left):
+        strpkt = self.build_frame(pwa)
         pkt_bytes = self.utils.tobytes(strpkt)
         try:
             crc1 = '{:08x}'.format(socket.htonl(zlib.crc32(pkt_bytes) & 0xFFFFFFFF))
@@ -768,6 +834,16 @@ class ScapyPacket(object):
         pwa.frame_size_step = frame_size_step
         self.add_padding(pwa, True)
 
+        # packets of the stream which only differ by incrementing fields
+        # are patched in serialized template instead of rebuilding
+        pwa.template = None
+        if self.tx_template and self.dbg <= 2:
+            try:
+                pwa.template = PacketTemplate.create(pwa, self.build_frame(pwa))
+            except Exception as exp:
+                self.logger.debug("Failed to create template {} {}".format(stream.stream_id, exp))
+            self.logger.debug("stream {} template {}".format(stream.stream_id, bool(pwa.template)))
+
         return pwa
 
     def add_padding(self, pwa, first):
@@ -985,9 +1061,9 @@ class ScapyPacket(object):
             tcp_dst_port_count  = self.utils.intval(pwa.stream.kws, "tcp_dst_port_count", 0)
             if tcp_dst_port_mode in ["increment", "decrement", "incr", "decr"]:
                 if tcp_dst_port_mode in ["increment", "incr"]:
-                    pwa.pkt[TCP].dport = pwa.pkt[TCP].sport + tcp_dst_port_step
+                    pwa.pkt[TCP].dport = pwa.pkt[TCP].dport + tcp_dst_port_step
                 else:
-                    pwa.pkt[TCP].dport = pwa.pkt[TCP].sport - tcp_dst_port_step
+                    pwa.pkt[TCP].dport = pwa.pkt[TCP].dport - tcp_dst_port_step
                 pwa.tcp_dst_port_count = pwa.tcp_dst_port_count + 1
                 if tcp_dst_port_count > 0 and pwa.tcp_dst_port_count >= tcp_dst_port_count:
                     pwa.pkt[TCP].dport = self.utils.intval(pwa.stream.kws, "tcp_dst_port", 0)
@@ -1019,9 +1095,9 @@ class ScapyPacket(object):
             udp_dst_port_count  = self.utils.intval(pwa.stream.kws, "udp_dst_port_count", 0)
             if udp_dst_port_mode in ["increment", "decrement", "incr", "decr"]:
                 if udp_dst_port_mode in ["increment", "incr"]:
-                    pwa.pkt[UDP].dport = pwa.pkt[UDP].sport + udp_dst_port_step
+                    pwa.pkt[UDP].dport = pwa.pkt[UDP].dport + udp_dst_port_step
                 else:
-                    pwa.pkt[UDP].dport = pwa.pkt[UDP].sport - udp_dst_port_step
+                    pwa.pkt[UDP].dport = pwa.pkt[UDP].dport - udp_dst_port_step
                 pwa.udp_dst_port_count = pwa.udp_dst_port_count + 1
                 if udp_dst_port_count > 0 and pwa.udp_dst_port_count >= udp_dst_port_count:
                     pwa.pkt[UDP].dport = self.utils.intval(pwa.stream.kws, "udp_dst_port", 0)
@@ -1034,6 +1110,12 @@ class ScapyPacket(object):
 
         return pwa
 
+    def build_next_pkt(self, pwa):
+        if pwa.template:
+            pwa.template.advance()
+            return pwa
+        return self.build_next_dma(pwa)
+
     def build_next(self, pwa):
         if self.dbg > 2 or (self.dbg > 1 and pwa.left != 0):
             self.logger.debug("build_next {}/{} {} left={}".format(self.iface, pwa.stream.stream_id, pwa.transmit_mode, pwa.left))
@@ -1041,20 +1123,20 @@ class ScapyPacket(object):
         if pwa.transmit_mode in ["continuous"] and pwa.duration2 > 0:
             if pwa.left <= 0: return None
             pwa.left = pwa.left - 1
-            pwa = self.build_next_dma(pwa)
+            pwa = self.build_next_pkt(pwa)
             return pwa
 
         if pwa.transmit_mode in ["continuous"]:
-            pwa = self.build_next_dma(pwa)
+            pwa = self.build_next_pkt(pwa)
             return pwa
 
         if pwa.transmit_mode in ["continuous_burst"]:
             pwa.burst_sent = pwa.burst_sent + 1
-            pwa = self.build_next_dma(pwa)
+            pwa = self.build_next_pkt(pwa)
             return pwa
 
         if pwa.left > 1:
-            pwa = self.build_next_dma(pwa)
+            pwa = self.build_next_pkt(pwa)
             if not pwa: return None
 
         pwa.burst_sent = pwa.burst_sent + 1
@@ -1072,6 +1154,9 @@ class ScapyPacket(object):
         pps = self.utils.min_value(pwa.rate_pps, self.max_rate_pps)
         return (1.0 * pwa.pkts_per_burst)/float(pps)
 
+    def signature(self, pkt):
+        return bytes(pkt)[-12:-4]
+
     def match_stream(self, stream, pkt):
         sid = stream.get_sid()
         if not sid: return False
@@ -0,0 +1,206 @@
+"""
+Pre-serialized packet templates for the TX fast path
+
+A stream whose packets differ only by fields in fixed, increment, decrement
+or list mode is serialized once into a bytearray. Every next packet is then
+produced by patching the varying fields and the affected IPv4 header and
+TCP/UDP checksums in place (RFC 1624 incremental update), instead of
+modifying and rebuilding the scapy packet.
+"""
+
+import socket
+import struct
+import binascii
+import zlib
+
+from scapy.packet import NoPayload, Padding, Raw
+from scapy.layers.l2 import Ether, Dot1Q, ARP
+from scapy.layers.inet import IP, UDP, TCP, ICMP
+from scapy.layers.inet6 import IPv6
+from scapy.contrib.igmp import IGMP
+
+ADDR_MODES = ["increment", "decrement"]
+MAC_MODES = ["increment", "decrement", "list"]
+PORT_MODES = ["increment", "decrement", "incr", "decr"]
+DECR_MODES = ["decrement", "decr"]
+
+def mac2int(mac):
+    return int(mac.replace(':', '').replace(".", ''), 16)
+
+def ipv42int(ip):
+    return struct.unpack('!I', socket.inet_aton(ip))[0]
+
+def ipv62int(ip):
+    return int(binascii.hexlify(socket.inet_pton(socket.AF_INET6, ip)), 16)
+
+# name, layer, offset in layer, size, value converter, modes,
+# default step, reset value default
+FIELD_SPECS = [
+    ("mac_src", Ether, 6, 6, mac2int, MAC_MODES, "00:00:00:00:00:01", None),
+    ("mac_dst", Ether, 0, 6, mac2int, MAC_MODES, "00:00:00:00:00:01", None),
+    ("arp_src_hw", ARP, 8, 6, mac2int, ADDR_MODES, "00:00:00:00:00:01", "00:00:01:00:00:02"),
+    ("arp_dst_hw", ARP, 18, 6, mac2int, ADDR_MODES, "00:00:00:00:00:01", "00:00:00:00:00:00"),
+    ("ip_src", IP, 12, 4, ipv42int, ADDR_MODES, "0.0.0.1", "0.0.0.0"),
+    ("ip_dst", IP, 16, 4, ipv42int, ADDR_MODES, "0.0.0.1", "192.0.0.1"),
+    ("ipv6_src", IPv6, 8, 16, ipv62int, ADDR_MODES, "::1", "fe80:0:0:0:0:0:0:12"),
+    ("ipv6_dst", IPv6, 24, 16, ipv62int, ADDR_MODES, "::1", "fe80:0:0:0:0:0:0:22"),
+    ("vlan_id", Dot1Q, 0, 2, int, ADDR_MODES, 1, 0),
+    ("tcp_src_port", TCP, 0, 2, int, PORT_MODES, 1, 0),
+    ("tcp_dst_port", TCP, 2, 2, int, PORT_MODES, 1, 0),
+    ("udp_src_port", UDP, 0, 2, int, PORT_MODES, 1, 0),
+    ("udp_dst_port", UDP, 2, 2, int, PORT_MODES, 1, 0),
+]
+
+# layers which can be part of a templated packet
+TEMPLATE_LAYERS = (Ether, Dot1Q, ARP, IP, IPv6, UDP, TCP, ICMP, IGMP, Padding, Raw)
+
+def int2bytes(value, size):
+    return binascii.unhexlify("%0*x" % (size * 2, value))
+
+def update_checksum(data, offset, old, new, udp=False):
+    """Update the 16-bit checksum at offset for the change of 16-bit aligned bytes"""
+    csum = (data[offset] << 8) | data[offset + 1]
+    if udp and csum == 0:
+        # UDP over IPv4 without checksum
+        return
+    count = len(old) // 2
+    total = (~csum & 0xFFFF) + 0xFFFF * count
+    total = total - sum(struct.unpack("!%dH" % count, old)) + sum(struct.unpack("!%dH" % count, new))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    csum = ~total & 0xFFFF
+    if udp and csum == 0:
+        csum = 0xFFFF
+    data[offset] = csum >> 8
+    data[offset + 1] = csum & 0xFF
+
+class TemplateField(object):
+    """Varying field of a templated packet"""
+
+    def __init__(self, offset, size, mask, step, limit, reset, values, checksums):
+        self.offset = offset
+        self.size = size
+        self.mask = mask
+        self.step = step
+        self.limit = limit
+        self.reset = reset
+        self.values = values
+        self.checksums = checksums
+        self.value = None
+        self.count = 0
+
+    def read(self, data):
+        value = int(binascii.hexlify(bytes(data[self.offset:self.offset + self.size])), 16)
+        return value & self.mask
+
+    def advance(self, data):
+        if self.values is not None:
+            self.count = self.count + 1
+            if self.count >= len(self.values):
+                self.count = 0
+            value = self.values[self.count]
+        else:
+            value = (self.value + self.step) & self.mask
+            self.count = self.count + 1
+            if self.limit > 0 and self.count >= self.limit:
+                value = self.reset
+                self.count = 0
+        self.write(data, value)
+
+    def write(self, data, value):
+        end = self.offset + self.size
+        old = bytes(data[self.offset:end])
+        if self.mask != (1 << (self.size * 8)) - 1:
+            value = (value & self.mask) | (int(binascii.hexlify(old), 16) & ~self.mask)
+        new = int2bytes(value & ((1 << (self.size * 8)) - 1), self.size)
+        data[self.offset:end] = new
+        for offset, udp in self.checksums:
+            update_checksum(data, offset, old, new, udp)
+        self.value = value & self.mask
+
+class PacketTemplate(object):
+    """Serialized frame of a stream patched in place for each next packet"""
+
+    def __init__(self, data, fields):
+        self.data = bytearray(data)
+        self.fields = fields
+        for field in fields:
+            field.value = field.read(self.data)
+
+    def advance(self):
+        for field in self.fields:
+            field.advance(self.data)
+
+    def frame(self):
+        data = bytes(self.data)
+        crc = socket.htonl(zlib.crc32(data) & 0xFFFFFFFF)
+        return data + struct.pack("!I", crc)
+
+    @staticmethod
+    def layer_offsets(pkt):
+        offsets, offset, layer = {}, 0, pkt
+        while not isinstance(layer, NoPayload):
+            if not isinstance(layer, TEMPLATE_LAYERS):
+                return None
+            offsets.setdefault(type(layer), (offset, layer))
+            offset = offset + len(layer) - len(layer.payload)
+            layer = layer.payload
+        return offsets
+
+    @staticmethod
+    def l4_checksum(offsets):
+        """Return the offset of TCP/UDP checksum, which covers the IP pseudo header"""
+        for l4_layer, csum_offset, udp in [(TCP, 16, False), (UDP, 6, True)]:
+            if l4_layer in offsets:
+                return (offsets[l4_layer][0] + csum_offset, udp)
+        return None
+
+    @classmethod
+    def create(cls, pwa, data):
+        """
+        Create the template of the stream from the serialized first packet
+        Returns None if the stream packets can't be templated
+        """
+        if pwa.length_mode != "fixed" or pwa.padding:
+            return None
+        offsets = cls.layer_offsets(pwa.pkt)
+        if not offsets:
+            return None
+        kws = pwa.stream.kws
+        l4_checksum = cls.l4_checksum(offsets)
+
+        fields = []
+        for name, layer, offset, size, conv, modes, step, reset in FIELD_SPECS:
+            if layer not in offsets:
+                continue
+            mode = kws.get("{}_mode".format(name), "fixed").strip()
+            if mode == "fixed":
+                continue
+            if mode not in modes:
+                return None
+            checksums = []
+            if layer == IP:
+                checksums.append((offsets[IP][0] + 10, False))
+            if layer in [IP, IPv6, TCP, UDP] and l4_checksum:
+                checksums.append(l4_checksum)
+            mask = 0x0FFF if layer == Dot1Q else (1 << (size * 8)) - 1
+            values = None
+            if mode == "list":
+                values = [conv(value) for value in kws[name]]
+            step = conv(str(kws.get("{}_step".format(name), step)))
+            if mode in DECR_MODES:
+                step = -step
+            limit = int(kws.get("{}_count".format(name), 0))
+            if name in ["mac_src", "mac_dst"]:
+                reset = kws[name][0]
+            elif name in ["arp_src_hw", "arp_dst_hw"]:
+                reset = kws.get("{}_addr".format(name), reset).replace(".", ":")
+            elif name in ["ip_src", "ip_dst", "ipv6_src", "ipv6_dst"]:
+                reset = kws.get("{}_addr".format(name), reset)
+            else:
+                reset = kws.get(name, reset)
+            field = TemplateField(offsets[layer][0] + offset, size, mask, step,
+                                  limit, conv(str(reset)), values, checksums)
+            fields.append(field)
+
+        return cls(data, fields)
@@ -166,9 +166,16 @@ class ScapyPort(object):
         return incrStat(self.stats, name, val)
 
     def getStats(self):
+        self.driver.fold_stats()
         return self.stats
 
     def getStreamStats(self):
+        track_ports = []
+        for stream in self.streams.values():
+            if stream.track_port and stream.track_port not in track_ports:
+                track_ports.append(stream.track_port)
+        for track_port in track_ports:
+            track_port.driver.fold_stats()
         res = []
         for _, stream in self.streams.items():
             res.append([stream, stream.stats])
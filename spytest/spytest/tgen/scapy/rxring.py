@@ -0,0 +1,114 @@
+"""
+AF_PACKET TPACKET_V3 receive ring
+
+The kernel fills the blocks of a ring shared with the user space through
+mmap, so that the frames are read without a system call and copy for each
+of them. A block is handed over to the user space when it is full or when
+the block retire timeout expires, and is given back to the kernel after all
+its frames are processed.
+
+When VLAN offload is enabled on the NIC the VLAN tag is not part of the
+frame in the ring, it is returned so that it can be reinserted the same way
+as afpacket.recv does.
+"""
+
+import mmap
+import select
+import socket
+import struct
+
+SOL_PACKET = 263
+PACKET_RX_RING = 5
+PACKET_VERSION = 10
+TPACKET_V3 = 2
+TP_STATUS_KERNEL = 0
+TP_STATUS_USER = 1 << 0
+TP_STATUS_VLAN_VALID = 1 << 4
+TP_STATUS_VLAN_TPID_VALID = 1 << 6
+ETH_P_ALL = 3
+ETH_P_8021Q = 0x8100
+
+# struct tpacket_req3
+TPACKET_REQ3 = struct.Struct("=IIIIIII")
+# struct tpacket_block_desc: version, offset_to_priv and the
+# tpacket_hdr_v1 block_status, num_pkts, offset_to_first_pkt
+BLOCK_DESC = struct.Struct("=IIIII")
+BLOCK_STATUS = struct.Struct("=I")
+BLOCK_STATUS_OFFSET = 8
+# struct tpacket3_hdr: tp_next_offset, tp_sec, tp_nsec, tp_snaplen, tp_len,
+# tp_status, tp_mac, tp_net and the tpacket_hdr_variant1 tp_rxhash,
+# tp_vlan_tci, tp_vlan_tpid
+TPACKET3_HDR = struct.Struct("=IIIIIIHHIIH")
+
+class RxRing(object):
+    def __init__(self, iface, block_size=1 << 17, block_nr=64, frame_size=1 << 14, timeout_ms=20):
+        self.iface = iface
+        self.block_size = block_size
+        self.block_nr = block_nr
+        self.block = 0
+        self.ring = None
+        self.sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+        try:
+            self.sock.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V3)
+            req = TPACKET_REQ3.pack(block_size, block_nr, frame_size,
+                                    block_size * block_nr // frame_size, timeout_ms, 0, 0)
+            self.sock.setsockopt(SOL_PACKET, PACKET_RX_RING, req)
+            self.ring = mmap.mmap(self.sock.fileno(), block_size * block_nr,
+                                  mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+            self.sock.bind((iface, ETH_P_ALL))
+        except Exception:
+            self.close()
+            raise
+        self.poller = select.poll()
+        self.poller.register(self.sock.fileno(), select.POLLIN | select.POLLERR)
+
+    def close(self):
+        if self.ring:
+            try: self.ring.close()
+            except Exception: pass
+            self.ring = None
+        if self.sock:
+            try: self.sock.close()
+            except Exception: pass
+            self.sock = None
+
+    def block_ready(self, offset):
+        status = BLOCK_STATUS.unpack_from(self.ring, offset + BLOCK_STATUS_OFFSET)[0]
+        return bool(status & TP_STATUS_USER)
+
+    def frames(self, timeout_ms=1000):
+        """
+        Yield (offset, snaplen, length, vlan_tag) of the frames in the next
+        block, waiting for the block at most timeout_ms
+        vlan_tag is the offloaded VLAN tag to be reinserted or None
+        """
+        ring = self.ring
+        offset = self.block * self.block_size
+        if not self.block_ready(offset):
+            self.poller.poll(timeout_ms)
+            if not self.block_ready(offset):
+                return
+
+        (_, _, _, num_pkts, first) = BLOCK_DESC.unpack_from(ring, offset)
+        frame = offset + first
+        try:
+            for _ in range(num_pkts):
+                (next_offset, _, _, snaplen, length, status, mac, _, _,
+                    vlan_tci, vlan_tpid) = TPACKET3_HDR.unpack_from(ring, frame)
+                vlan_tag = None
+                if vlan_tci != 0 or status & TP_STATUS_VLAN_VALID:
+                    if not status & TP_STATUS_VLAN_TPID_VALID:
+                        vlan_tpid = ETH_P_8021Q
+                    vlan_tag = struct.pack("!HH", vlan_tpid, vlan_tci)
+                yield (frame + mac, snaplen, length, vlan_tag)
+                frame = frame + next_offset
+        finally:
+            # give the block back to the kernel
+            BLOCK_STATUS.pack_into(ring, offset + BLOCK_STATUS_OFFSET, TP_STATUS_KERNEL)
+            self.block = (self.block + 1) % self.block_nr
+
+    def data(self, offset, snaplen, vlan_tag=None):
+        data = self.ring[offset:offset + snaplen]
+        if vlan_tag:
+            data = data[:12] + vlan_tag + data[12:]
+        return data
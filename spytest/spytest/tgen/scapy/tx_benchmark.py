@@ -0,0 +1,136 @@
+"""
+Benchmark of scapy traffic generator TX path
+
+Creates a veth pair and transmits each stream mode on one end for the given
+duration with the legacy per packet build/send path and with the templated
+batched path, reporting the rate of packets received on the other end.
+The frames of both paths are compared before the measurement.
+
+Usage: sudo python tx_benchmark.py --duration 3 --batch 64
+"""
+
+from __future__ import print_function
+
+import os
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("SCAPY_TGEN_LOGS_PATH", tempfile.mkdtemp(prefix="scapy-tgen-"))
+
+from packet import ScapyPacket
+from port import ScapyStream
+from logger import Logger
+
+STREAM_MODES = [
+    ("fixed", {}),
+    ("mac_src_increment", dict(mac_src_mode="increment", mac_src_count=100)),
+    ("mac_dst_list", dict(mac_dst="00:00:00:00:00:02 00:00:00:00:00:03 00:00:00:00:00:04",
+                          mac_dst_mode="list")),
+    ("vlan_id_increment", dict(l2_encap="ethernet_ii_vlan", vlan_id=10, vlan_id_mode="increment",
+                               vlan_id_count=100)),
+    ("arp_hw_increment", dict(l3_protocol="arp", arp_src_hw_mode="increment", arp_src_hw_count=100)),
+    ("ipv4_increment", dict(l3_protocol="ipv4", ip_src_addr="10.0.0.1", ip_src_mode="increment",
+                            ip_src_count=1000, ip_dst_addr="20.0.0.1", ip_dst_mode="decrement",
+                            ip_dst_count=100)),
+    ("ipv4_udp_increment", dict(l3_protocol="ipv4", l4_protocol="udp", ip_src_addr="10.0.0.1",
+                                ip_src_mode="increment", ip_src_count=1000, udp_src_port=1000,
+                                udp_src_port_mode="increment", udp_src_port_count=500,
+                                udp_dst_port=2000, udp_dst_port_mode="decr", udp_dst_port_count=100)),
+    ("ipv6_tcp_increment", dict(l3_protocol="ipv6", l4_protocol="tcp", ipv6_src_addr="2000::1",
+                                ipv6_src_mode="increment", ipv6_src_count=1000, tcp_src_port=1000,
+                                tcp_src_port_mode="incr", tcp_dst_port=80)),
+    ("length_random", dict(l3_protocol="ipv4", length_mode="random", frame_size_min=64,
+                           frame_size_max=512)),
+]
+
+def veth_create(iface, peer):
+    os.system("ip link del {} 2>/dev/null".format(iface))
+    os.system("ip link add {} type veth peer name {}".format(iface, peer))
+    os.system("ip link set {} up".format(iface))
+    os.system("ip link set {} up".format(peer))
+
+def rx_packets(iface):
+    with open("/sys/class/net/{}/statistics/rx_packets".format(iface)) as fp:
+        return int(fp.read())
+
+def build_stream(index, kws):
+    kws = dict(kws)
+    kws.setdefault("mac_src", "00:00:00:00:00:01")
+    kws.setdefault("mac_dst", "00:00:00:00:00:02")
+    kws.setdefault("frame_size", 128)
+    kws.setdefault("transmit_mode", "continuous")
+    return ScapyStream(1, index, "stream-{}".format(index), None, **kws)
+
+def verify(packet, index, kws, count):
+    packet.tx_template = 0
+    legacy = packet.build_first(build_stream(index, kws))
+    packet.tx_template = 1
+    pwa = packet.build_first(build_stream(index, kws))
+    if not pwa.template:
+        return False
+    for _ in range(count):
+        expected = packet.send_packet(legacy, "", "verify", 0)
+        if pwa.template.frame() != expected:
+            raise ValueError("templated frame differs from legacy: {}".format(kws))
+        legacy = packet.build_next(legacy)
+        pwa = packet.build_next(pwa)
+    return True
+
+def run_legacy(packet, pwa, iface, duration):
+    end = time.time() + duration
+    while time.time() < end:
+        for _ in range(100):
+            packet.send_packet(pwa, iface, "legacy", pwa.left)
+            pwa = packet.build_next(pwa)
+
+def run_template(packet, pwa, iface, duration, batch):
+    end = time.time() + duration
+    while time.time() < end:
+        frames = []
+        for _ in range(batch):
+            frames.append(pwa.template.frame())
+            pwa = packet.build_next(pwa)
+        packet.send_batch(frames, iface, "template", pwa.left)
+
+def measure(func, peer, duration, *args):
+    start = rx_packets(peer)
+    func(*args)
+    return (rx_packets(peer) - start) / float(duration)
+
+def main():
+    parser = argparse.ArgumentParser(description="scapy traffic generator TX benchmark")
+    parser.add_argument("--iface", default="tgbench0", help="veth interface to transmit on")
+    parser.add_argument("--peer", default="tgbench1", help="veth peer interface to count received packets")
+    parser.add_argument("--duration", type=float, default=3, help="seconds per stream mode and path")
+    parser.add_argument("--batch", type=int, default=64, help="frames per sendmmsg call")
+    parser.add_argument("--verify", type=int, default=2000, help="number of frames to compare")
+    args = parser.parse_args()
+
+    veth_create(args.iface, args.peer)
+    logger = Logger(dry=True)
+    logger.logger.disabled = True
+    verifier = ScapyPacket("", dry=True, logger=logger)
+    packet = ScapyPacket("", logger=logger)
+    packet.tx_batch = args.batch
+    try:
+        print("{:<22} {:>12} {:>12} {:>8}".format("stream mode", "legacy pps", "fast pps", "speedup"))
+        for index, (name, kws) in enumerate(STREAM_MODES):
+            templated = verify(verifier, index, kws, args.verify)
+            packet.tx_template = 0
+            pwa = packet.build_first(build_stream(index, kws))
+            legacy_pps = measure(run_legacy, args.peer, args.duration, packet, pwa, args.iface, args.duration)
+            if templated:
+                packet.tx_template = 1
+                pwa = packet.build_first(build_stream(index, kws))
+                fast_pps = measure(run_template, args.peer, args.duration, packet, pwa,
+                                   args.iface, args.duration, args.batch)
+            else:
+                fast_pps = legacy_pps
+            print("{:<22} {:>12.0f} {:>12.0f} {:>7.1f}x{}".format(name, legacy_pps, fast_pps,
+                  fast_pps / max(legacy_pps, 1), "" if templated else " (not templated)"))
+    finally:
+        os.system("ip link del {}".format(args.iface))
+
+if __name__ == "__main__":
+    main()
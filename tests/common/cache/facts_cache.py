@@ -1,14 +1,20 @@
 from __future__ import print_function, division, absolute_import
 
+import fcntl
+import hashlib
 import inspect
+import json
 import logging
 import os
 import pickle
 import shutil
 import sys
+import tempfile
+import time
 
-from collections import defaultdict
-from threading import Lock
+from collections import defaultdict, OrderedDict
+from contextlib import contextmanager
+from threading import Lock, RLock
 from six import with_metaclass
 
 
@@ -17,8 +23,13 @@ logger = logging.getLogger(__name__)
 CURRENT_PATH = os.path.realpath(__file__)
 CACHE_LOCATION = os.path.join(CURRENT_PATH, '../../../_cache')
 
-SIZE_LIMIT = 1000000000  # 1G bytes, max disk usage allowed by cache
-ENTRY_LIMIT = 1000000    # Max number of pickle files allowed in cache.
+SIZE_LIMIT = 1000000000         # 1G bytes, max disk usage allowed by cache
+ENTRY_LIMIT = 1000000           # Max number of pickle files allowed in cache.
+MEMORY_SIZE_LIMIT = 200000000   # 200M bytes, max size of pickled facts kept in memory
+ENTRY_TTL = None                # Seconds before cached facts expire, None for never
+
+INDEX_FILE = '.index.json'
+LOCK_FILE = '.lock'
 
 
 class Singleton(type):
@@ -39,32 +50,143 @@ class FactsCache(with_metaclass(Singleton, object)):
 
     Used singleton design pattern. Only a single instance of this class can be initialized.
 
+    Facts are cached in two tiers. The pickled data of recently used facts is kept in memory up to memory_size_limit
+    bytes, it is unpickled on each read so that callers modifying the facts don't change the cached facts. All the
+    facts are stored in pickle files, with an index of their sizes and access times shared by the processes using the
+    same cache folder, e.g. pytest-xdist workers. The index is only updated by writes and cleanups, reads set the
+    access time of the pickle files. The least recently used facts are evicted when a tier exceeds its limits, and
+    facts older than ttl seconds are ignored.
+
     Args:
         with_metaclass ([function]): Python 2&3 compatible function from the six library for adding metaclass.
     """
 
     NOTEXIST = object()
 
-    def __init__(self, cache_location=CACHE_LOCATION):
+    def __init__(self, cache_location=CACHE_LOCATION, size_limit=SIZE_LIMIT, entry_limit=ENTRY_LIMIT,
+                 memory_size_limit=MEMORY_SIZE_LIMIT, ttl=ENTRY_TTL):
         self._cache_location = os.path.abspath(cache_location)
-        self._cache = defaultdict(dict)
-        self._write_lock = Lock()
-
-    def _check_usage(self):
-        """Check cache usage, raise exception if usage exceeds the limitations.
-        """
-        total_size = 0
-        total_entries = 0
+        self._size_limit = size_limit
+        self._entry_limit = entry_limit
+        self._memory_size_limit = memory_size_limit
+        self._ttl = ttl
+        self._cache = OrderedDict()     # (zone, key) -> (pickled data, mtime), least recently used first
+        self._memory_size = 0
+        self._lock = RLock()
+        self._stats = defaultdict(int)
+
+    def _expired(self, mtime):
+        return self._ttl is not None and time.time() - mtime > self._ttl
+
+    def _facts_file(self, zone, key):
+        return os.path.join(self._cache_location, '{}/{}.pickle'.format(zone, key))
+
+    def _build_index(self):
+        """Build the index from the pickle files, used when the index is missing or corrupted."""
+        index = {}
         for root, _, files in os.walk(self._cache_location):
             for f in files:
+                if f.startswith('.') or not f.endswith('.pickle'):
+                    continue
                 fp = os.path.join(root, f)
-                total_size += os.path.getsize(fp)
-                total_entries += 1
+                name = os.path.relpath(fp, self._cache_location)[:-len('.pickle')]
+                stat = os.stat(fp)
+                index[name] = [stat.st_size, stat.st_atime, stat.st_mtime]
+        return index
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self._cache_location, INDEX_FILE)) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return self._build_index()
+
+    def _save_index(self, index):
+        fd, tmp_file = tempfile.mkstemp(dir=self._cache_location, prefix='.index.')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(index, f)
+        os.rename(tmp_file, os.path.join(self._cache_location, INDEX_FILE))
+
+    @contextmanager
+    def _locked_index(self):
+        """Lock the cache folder against other processes and yield its index, which is saved after the changes."""
+        try:
+            os.makedirs(self._cache_location)
+        except OSError:
+            if not os.path.isdir(self._cache_location):
+                raise
+        with open(os.path.join(self._cache_location, LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                index = self._load_index()
+                yield index
+                self._save_index(index)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _evict_files(self, index, keep):
+        """Remove the expired pickle files, then the least recently used ones until the limits are satisfied."""
+        for name in [name for name, (_, _, mtime) in index.items() if name != keep and self._expired(mtime)]:
+            self._evict_file(index, name)
+        total_size = sum(size for size, _, _ in index.values())
+        if total_size > self._size_limit or len(index) > self._entry_limit:
+            self._update_access_times(index)
+            total_size = sum(size for size, _, _ in index.values())
+            for name in sorted(index, key=lambda name: index[name][1]):
+                if total_size <= self._size_limit and len(index) <= self._entry_limit:
+                    break
+                if name != keep:
+                    total_size -= index[name][0]
+                    self._evict_file(index, name)
+
+    def _update_access_times(self, index):
+        """Update the access times in the index with the access times of the pickle files set by the reads."""
+        for name in list(index.keys()):
+            try:
+                atime = os.stat(os.path.join(self._cache_location, '{}.pickle'.format(name))).st_atime
+            except OSError:
+                del index[name]
+                continue
+            index[name][1] = max(index[name][1], atime)
+
+    def _evict_file(self, index, name):
+        del index[name]
+        try:
+            os.remove(os.path.join(self._cache_location, '{}.pickle'.format(name)))
+        except OSError:
+            pass
+        self._stats['disk_evictions'] += 1
+        logger.debug('Evicted cache file "{}.pickle"'.format(name))
+
+    def _memory_put(self, zone, key, data, mtime):
+        self._memory_remove(zone, key)
+        if len(data) > self._memory_size_limit:
+            return
+        self._cache[(zone, key)] = (data, mtime)
+        self._memory_size += len(data)
+        while self._memory_size > self._memory_size_limit:
+            _, (evicted_data, _) = self._cache.popitem(last=False)
+            self._memory_size -= len(evicted_data)
+            self._stats['memory_evictions'] += 1
+
+    def _memory_remove(self, zone, key):
+        item = self._cache.pop((zone, key), None)
+        if item:
+            self._memory_size -= len(item[0])
+
+    def stats(self):
+        """Get the counters of the cache usage by this process.
 
-        if total_size > SIZE_LIMIT or total_entries > ENTRY_LIMIT:
-            msg = 'Cache usage exceeds limitations. total_size={}, SIZE_LIMIT={}, total_entries={}, ENTRY_LIMIT={}' \
-                .format(total_size, SIZE_LIMIT, total_entries, ENTRY_LIMIT)
-            raise Exception(msg)
+        Returns:
+            dict: Number of hits in memory and in files, misses, writes and evictions from memory and files.
+        """
+        with self._lock:
+            stats = dict((counter, 0) for counter in
+                         ['memory_hits', 'disk_hits', 'misses', 'writes', 'memory_evictions', 'disk_evictions'])
+            stats.update(self._stats)
+            stats['memory_entries'] = len(self._cache)
+            stats['memory_size'] = self._memory_size
+            return stats
 
     def read(self, zone, key):
         """Read cached facts.
@@ -77,22 +199,40 @@ class FactsCache(with_metaclass(Singleton, object)):
         Returns:
             obj: Cached object, usually a dictionary.
         """
-        # Lazy load
-        if zone in self._cache and key in self._cache[zone]:
-            logger.debug('Read cached facts "{}.{}"'.format(zone, key))
-            return self._cache[zone][key]
-        else:
-            facts_file = os.path.join(self._cache_location, '{}/{}.pickle'.format(zone, key))
+        with self._lock:
+            item = self._cache.get((zone, key))
+            if item is not None and not self._expired(item[1]):
+                # Move to the most recently used end
+                self._cache[(zone, key)] = self._cache.pop((zone, key))
+                self._stats['memory_hits'] += 1
+                logger.debug('Read cached facts "{}.{}"'.format(zone, key))
+                return pickle.loads(item[0])
+
+            facts_file = self._facts_file(zone, key)
             try:
                 with open(facts_file, 'rb') as f:
-                    self._cache[zone][key] = pickle.load(f)
-                    logger.debug('Loaded cached facts "{}.{}" from {}'.format(zone, key, facts_file))
-                    return self._cache[zone][key]
-            except (IOError, ValueError) as e:
+                    mtime = os.fstat(f.fileno()).st_mtime
+                    if self._expired(mtime):
+                        raise ValueError('Cached facts expired')
+                    data = f.read()
+                value = pickle.loads(data)
+            except (IOError, ValueError, EOFError, pickle.UnpicklingError) as e:
                 logger.info('Load cache file "{}" failed with exception: {}'
                             .format(os.path.abspath(facts_file), repr(e)))
+                self._stats['misses'] += 1
                 return self.NOTEXIST
 
+            # The access time is taken into the index when files are evicted, keep the mtime for the ttl
+            try:
+                os.utime(facts_file, (time.time(), mtime))
+            except OSError as e:
+                logger.debug('Update access time of cache file "{}" failed with exception: {}'
+                             .format(facts_file, repr(e)))
+            self._memory_put(zone, key, data, mtime)
+            self._stats['disk_hits'] += 1
+            logger.debug('Loaded cached facts "{}.{}" from {}'.format(zone, key, facts_file))
+            return value
+
     def write(self, zone, key, value):
         """Store facts to cache.
 
@@ -105,24 +245,34 @@ class FactsCache(with_metaclass(Singleton, object)):
         Returns:
             boolean: Caching facts is successful or not.
         """
-        with self._write_lock:
-            self._check_usage()
-            facts_file = os.path.join(self._cache_location, '{}/{}.pickle'.format(zone, key))
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            facts_file = self._facts_file(zone, key)
             try:
-                cache_subfolder = os.path.join(self._cache_location, zone)
-                if not os.path.exists(cache_subfolder):
-                    logger.info('Create cache dir {}'.format(cache_subfolder))
-                    os.makedirs(cache_subfolder)
-
-                with open(facts_file, 'wb') as f:
-                    pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
-                    self._cache[zone][key] = value
-                    logger.info('Cached facts "{}.{}" to {}'.format(zone, key, facts_file))
-                    return True
-            except (IOError, ValueError) as e:
+                with self._locked_index() as index:
+                    cache_subfolder = os.path.join(self._cache_location, zone)
+                    if not os.path.exists(cache_subfolder):
+                        logger.info('Create cache dir {}'.format(cache_subfolder))
+                        os.makedirs(cache_subfolder)
+
+                    # Write to a temporary file and rename it, so that other processes never read a partial file
+                    fd, tmp_file = tempfile.mkstemp(dir=cache_subfolder, prefix='.{}.'.format(key))
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(data)
+                    os.rename(tmp_file, facts_file)
+                    now = time.time()
+                    name = '{}/{}'.format(zone, key)
+                    index[name] = [len(data), now, now]
+                    self._evict_files(index, keep=name)
+            except (IOError, OSError, ValueError) as e:
                 logger.error('Dump cache file "{}" failed with exception: {}'.format(facts_file, repr(e)))
                 return False
 
+            self._memory_put(zone, key, data, now)
+            self._stats['writes'] += 1
+            logger.info('Cached facts "{}.{}" to {}'.format(zone, key, facts_file))
+            return True
+
     def cleanup(self, zone=None, key=None):
         """Cleanup cached files.
 
@@ -132,35 +282,43 @@ class FactsCache(with_metaclass(Singleton, object)):
                 will be cleaned up.
             key (str): Name of cached facts. Default is None.
         """
-        if zone:
-            if key:
-                if zone in self._cache and key in self._cache[zone]:
-                    del self._cache[zone][key]
-                    logger.debug('Removed "{}.{}" from cache.'.format(zone, key))
-                try:
-                    cache_file = os.path.join(self._cache_location, zone, '{}.pickle'.format(key))
-                    os.remove(cache_file)
-                    logger.debug('Removed cache file "{}.pickle"'.format(cache_file))
-                except OSError as e:
-                    logger.error('Cleanup cache {}.{}.pickle failed with exception: {}'.format(zone, key, repr(e)))
+        with self._lock:
+            if zone:
+                for cached_zone, cached_key in list(self._cache.keys()):
+                    if cached_zone == zone and (not key or cached_key == key):
+                        self._memory_remove(cached_zone, cached_key)
+                        logger.debug('Removed "{}.{}" from cache.'.format(cached_zone, cached_key))
+                if not os.path.isdir(self._cache_location):
+                    return
+                with self._locked_index() as index:
+                    for name in list(index.keys()):
+                        if name == '{}/{}'.format(zone, key) or (not key and name.startswith(zone + '/')):
+                            del index[name]
+                    if key:
+                        try:
+                            cache_file = self._facts_file(zone, key)
+                            os.remove(cache_file)
+                            logger.debug('Removed cache file "{}"'.format(cache_file))
+                        except OSError as e:
+                            logger.error('Cleanup cache {}.{}.pickle failed with exception: {}'
+                                         .format(zone, key, repr(e)))
+                    else:
+                        try:
+                            cache_subfolder = os.path.join(self._cache_location, zone)
+                            shutil.rmtree(cache_subfolder)
+                            logger.debug('Removed cache subfolder "{}"'.format(cache_subfolder))
+                        except OSError as e:
+                            logger.error('Remove cache subfolder "{}" failed with exception: {}'
+                                         .format(zone, repr(e)))
             else:
-                if zone in self._cache:
-                    del self._cache[zone]
-                    logger.debug('Removed zone "{}" from cache'.format(zone))
+                self._cache = OrderedDict()
+                self._memory_size = 0
                 try:
-                    cache_subfolder = os.path.join(self._cache_location, zone)
-                    shutil.rmtree(cache_subfolder)
-                    logger.debug('Removed cache subfolder "{}"'.format(cache_subfolder))
+                    shutil.rmtree(self._cache_location)
+                    logger.debug('Removed all cache files under "{}"'.format(self._cache_location))
                 except OSError as e:
-                    logger.error('Remove cache subfolder "{}" failed with exception: {}'.format(zone, repr(e)))
-        else:
-            self._cache = defaultdict(dict)
-            try:
-                shutil.rmtree(self._cache_location)
-                logger.debug('Removed all cache files under "{}"'.format(self._cache_location))
-            except OSError as e:
-                logger.error('Remove cache folder "{}" failed with exception: {}'
-                             .format(self._cache_location, repr(e)))
+                    logger.error('Remove cache folder "{}" failed with exception: {}'
+                                 .format(self._cache_location, repr(e)))
 
 
 def _get_default_zone(function, func_args, func_kargs):
@@ -192,6 +350,35 @@ def _get_default_zone(function, func_args, func_kargs):
     return zone
 
 
+_inventory_digests = {}
+
+
+def inventory_digest(inv_files):
+    """Get the digest of the content of inventory files.
+
+    Args:
+        inv_files (list or string): List of inventory file paths, or string of a single inventory file path.
+
+    Returns:
+        str: Hex digest, changed when any of the inventory files is changed.
+    """
+    if not isinstance(inv_files, (list, tuple)):
+        inv_files = [inv_files]
+    digest = hashlib.sha1()
+    for inv_file in inv_files:
+        path = os.path.abspath(str(inv_file))
+        try:
+            stat = os.stat(path)
+            file_key = (path, stat.st_mtime, stat.st_size)
+            if file_key not in _inventory_digests:
+                with open(path, 'rb') as f:
+                    _inventory_digests[file_key] = hashlib.sha1(f.read()).hexdigest()
+            digest.update(_inventory_digests[file_key].encode())
+        except (IOError, OSError):
+            digest.update(path.encode())
+    return digest.hexdigest()[:16]
+
+
 def cached(name, zone_getter=None, after_read=None, before_write=None):
     """Decorator for enabling cache for facts.
 
@@ -204,6 +391,9 @@ def cached(name, zone_getter=None, after_read=None, before_write=None):
     if the function is a bound method of class AnsibleHostBase and its derivatives, it will try to use its
     attribute 'hostname' as zone, or raises an error if 'hostname' doesn't exists or is not a string.
 
+    If the decorated function has an argument 'inv_files', the digest of the content of the inventory files is added
+    to the name, so that the facts are cached again when the inventory is changed.
+
     Args:
         name ([str]): Name of the cached facts.
         zone_getter ([function]): Function used to get hostname used as zone.
@@ -215,11 +405,24 @@ def cached(name, zone_getter=None, after_read=None, before_write=None):
     cache = FactsCache()
 
     def decorator(target):
+        if sys.version_info.major > 2:
+            arg_names = inspect.getfullargspec(target)[0]
+        else:
+            arg_names = inspect.getargspec(target)[0]
+
         def wrapper(*args, **kargs):
             _zone_getter = zone_getter or _get_default_zone
             zone = _zone_getter(target, args, kargs)
 
-            cached_facts = cache.read(zone, name)
+            key = name
+            if 'inv_files' in arg_names:
+                index = arg_names.index('inv_files')
+                inv_files = kargs['inv_files'] if 'inv_files' in kargs else \
+                    args[index] if index < len(args) else None
+                if inv_files:
+                    key = '{}-{}'.format(name, inventory_digest(inv_files))
+
+            cached_facts = cache.read(zone, key)
             if after_read:
                 cached_facts = after_read(cached_facts, target, args, kargs)
             if cached_facts is not FactsCache.NOTEXIST:
@@ -228,9 +431,9 @@ def cached(name, zone_getter=None, after_read=None, before_write=None):
                 facts = target(*args, **kargs)
                 if before_write:
                     _facts = before_write(facts, target, args, kargs)
-                    cache.write(zone, name, _facts)
+                    cache.write(zone, key, _facts)
                 else:
-                    cache.write(zone, name, facts)
+                    cache.write(zone, key, facts)
                 return facts
         return wrapper
     return decorator
@@ -1,9 +1,11 @@
 
+import functools
 import ipaddress
 import json
 import logging
 import os
 import re
+import shlex
 import socket
 import time
 
@@ -12,15 +14,19 @@ from datetime import datetime, timedelta
 
 from ansible import constants as ansible_constants
 from ansible.plugins.loader import connection_loader
+from six import string_types
+from six.moves import shlex_quote
 
 from tests.common.devices.base import AnsibleHostBase
 from tests.common.devices.constants import ACL_COUNTERS_UPDATE_INTERVAL_IN_SEC
+from tests.common.devices.ssh_session_pool import SshSessionPool, exec_commands
 from tests.common.helpers.dut_utils import is_supervisor_node
 from tests.common.utilities import get_host_visible_vars
 from tests.common.cache import cached
 from tests.common.helpers.constants import DEFAULT_ASIC_ID, DEFAULT_NAMESPACE
 from tests.common.helpers.platform_api.chassis import is_inband_port
 from tests.common.helpers.parallel import parallel_run_threaded
+from tests.common.helpers import tabular
 from tests.common.errors import RunAnsibleModuleFail
 from tests.common import constants
 
@@ -36,10 +42,16 @@ class SonicHost(AnsibleHostBase):
     """
     DEFAULT_ASIC_SERVICES = ["bgp", "database", "lldp", "swss", "syncd", "teamd"]
 
+    FAST_EXEC_MODULES = ("shell", "command")
+    # Run the shell/command module calls through exec_cmd when possible, enabled by the --fast_exec option
+    fast_exec = False
+
     def __init__(self, ansible_adhoc, hostname,
                  shell_user=None, shell_passwd=None,
                  ssh_user=None, ssh_passwd=None):
         AnsibleHostBase.__init__(self, ansible_adhoc, hostname)
+        self._ssh_pool = None
+        self._become_pass = None
 
         self.DEFAULT_ASIC_SERVICES = ["bgp", "database", "lldp", "swss", "syncd", "teamd"]
 
@@ -87,6 +99,87 @@ class SonicHost(AnsibleHostBase):
     def __repr__(self):
         return self.__str__()
 
+    def __getattr__(self, module_name):
+        if module_name in self.FAST_EXEC_MODULES and self.fast_exec:
+            return functools.partial(self._fast_run, module_name)
+        return AnsibleHostBase.__getattr__(self, module_name)
+
+    def _fast_run(self, module_name, *module_args, **complex_args):
+        """
+        Run a shell/command module call through exec_cmd if it has just the command line and no other module
+        options, otherwise run the Ansible module.
+        """
+        extra_args = set(complex_args) - set(["module_ignore_errors", "verbose"])
+        if len(module_args) != 1 or not isinstance(module_args[0], string_types) or extra_args:
+            return AnsibleHostBase.__getattr__(self, module_name)(*module_args, **complex_args)
+
+        cmd = module_args[0]
+        if module_name == "command":
+            # The command module doesn't process the command line with a shell
+            cmd = " ".join(shlex_quote(arg) for arg in shlex.split(cmd))
+        return self.exec_cmd(cmd, **complex_args)
+
+    def _get_ssh_pool(self):
+        if self._ssh_pool is None:
+            hostvars = self.host.options['variable_manager']._hostvars[self.hostname]
+            user = hostvars.get("ansible_ssh_user") or hostvars.get("ansible_user") or hostvars.get("sonicadmin_user")
+            password = hostvars.get("ansible_ssh_pass") or hostvars.get("ansible_password") \
+                or hostvars.get("sonicadmin_password")
+            self._become_pass = hostvars.get("ansible_become_pass") or password
+            self._ssh_pool = SshSessionPool.get(self.mgmt_ip, user, password)
+        return self._ssh_pool
+
+    def exec_cmd(self, cmd, module_ignore_errors=False, verbose=True, timeout=None):
+        """
+        Run a shell command line on the DUT over a persistent SSH connection.
+
+        This avoids the cost of an Ansible module invocation, that is several SSH round trips plus copying and
+        starting the module on the DUT. The command is run as root, same as with the shell module.
+
+        Args:
+            cmd: Shell command line.
+            module_ignore_errors: Don't raise RunAnsibleModuleFail when the command fails.
+            verbose: Log the command output.
+            timeout: Seconds to wait for the command to complete, None to wait forever.
+
+        Returns:
+            dict: Same keys as the result of the shell module, e.g. "stdout", "stdout_lines", "stderr", "rc".
+        """
+        return self.exec_cmds([cmd], module_ignore_errors=module_ignore_errors, verbose=verbose,
+                              timeout=timeout)[0]
+
+    def exec_cmds(self, cmds, module_ignore_errors=False, verbose=True, timeout=None):
+        """
+        Run several shell command lines one after another on the DUT in a single SSH round trip.
+
+        All the commands are run even if some of them fail, the first failed command raises RunAnsibleModuleFail
+        unless module_ignore_errors is set.
+
+        Args:
+            cmds: List of shell command lines.
+            module_ignore_errors: Don't raise RunAnsibleModuleFail when a command fails.
+            verbose: Log the command outputs.
+            timeout: Seconds to wait for all the commands to complete, None to wait forever.
+
+        Returns:
+            list: Result of each command, see exec_cmd.
+        """
+        pool = self._get_ssh_pool()
+        logger.debug("[{}] exec: {}".format(self.hostname, json.dumps(cmds)))
+        results = exec_commands(pool, cmds, become_pass=self._become_pass, timeout=timeout)
+
+        for res in results:
+            if verbose:
+                logger.debug("[{}] exec: {} Result => {}".format(self.hostname, res["cmd"], json.dumps(res)))
+            else:
+                logger.debug("[{}] exec: {} done, rc={}".format(self.hostname, res["cmd"], res["rc"]))
+
+        if not module_ignore_errors:
+            for res in results:
+                if res.is_failed:
+                    raise RunAnsibleModuleFail("run command {} failed".format(res["cmd"]), res)
+        return results
+
     @property
     def facts(self):
         """
@@ -474,9 +567,16 @@ class SonicHost(AnsibleHostBase):
         @return: A dictionary in which key is the service name and values are service status
                  and service type.
         """
-        monit_services_status = {}
-
         services_status_result = self.shell("sudo monit status", module_ignore_errors=True, verbose=False)
+        return self.parse_monit_services_status(services_status_result)
+
+    def parse_monit_services_status(self, services_status_result):
+        """
+        @summary: Parse the result of command "sudo monit status"
+        @return: A dictionary in which key is the service name and values are service status
+                 and service type.
+        """
+        monit_services_status = {}
 
         exit_code = services_status_result["rc"]
         if exit_code != 0:
@@ -552,15 +652,27 @@ class SonicHost(AnsibleHostBase):
 
         return critical_group_list, critical_process_list, succeeded
 
-    def critical_group_process(self):
-        # Get critical group and process definitions by running cmds in batch to save overhead
+    def critical_group_process_cmds(self):
+        """
+        @summary: Commands getting critical group and process definitions of all critical services
+        """
         cmds = []
         for service in self.critical_services:
             cmd = "docker exec {} bash -c '[ -f /etc/supervisor/critical_processes ]" \
                   " && cat /etc/supervisor/critical_processes'".format(service)
 
             cmds.append(cmd)
-        results = self.shell_cmds(cmds=cmds, continue_on_fail=True, module_ignore_errors=True)['results']
+        return cmds
+
+    def critical_group_process(self, results=None):
+        """
+        @param results: Results of the commands of critical_group_process_cmds run by shell_cmds, they are run if
+            not specified.
+        """
+        if results is None:
+            # Get critical group and process definitions by running cmds in batch to save overhead
+            results = self.shell_cmds(cmds=self.critical_group_process_cmds(), continue_on_fail=True,
+                                      module_ignore_errors=True)['results']
 
         # Extract service name of each command result, transform results list to a dict keyed by service name
         service_results = {}
@@ -628,19 +740,27 @@ class SonicHost(AnsibleHostBase):
             critical_process_list=critical_process_list
         )
 
-    def all_critical_process_status(self):
+    def critical_process_status_cmds(self):
+        """
+        @summary: Commands getting process status of all critical services
+        """
+        return ['docker exec {} supervisorctl status'.format(service) for service in self.critical_services]
+
+    def all_critical_process_status(self, group_results=None, status_results=None):
         """
         @summary: Check whether all critical processes status for all critical services
+        @param group_results: Results of the commands of critical_group_process_cmds run by shell_cmds.
+        @param status_results: Results of the commands of critical_process_status_cmds run by shell_cmds.
+            The commands are run if their results are not specified.
         """
         # Get critical process definition of all services
-        group_process_results = self.critical_group_process()
+        group_process_results = self.critical_group_process(results=group_results)
 
-        # Get process status of all services. Run cmds in batch to save overhead
-        cmds = []
-        for service in self.critical_services:
-            cmd = 'docker exec {} supervisorctl status'.format(service)
-            cmds.append(cmd)
-        results = self.shell_cmds(cmds=cmds, continue_on_fail=True, module_ignore_errors=True)['results']
+        results = status_results
+        if results is None:
+            # Get process status of all services. Run cmds in batch to save overhead
+            results = self.shell_cmds(cmds=self.critical_process_status_cmds(), continue_on_fail=True,
+                                      module_ignore_errors=True)['results']
 
         # Extract service name of each command result, transform results list to a dict keyed by service name
         service_results = {}
@@ -1467,61 +1587,17 @@ Totals               6450                 6449
             Returns a list. Each item is a tuple with two elements. The first element is start position of a column.
             The second element is the end position of the column.
         """
-        prev = ' ',
-        positions = []
-        for pos, char in enumerate(sep_line + ' '):
-            if char == sep_char:
-                if char != prev:
-                    left = pos
-            else:
-                if char != prev:
-                    right = pos
-                    positions.append((left, right))
-            prev = char
-        return positions
+        return tabular.parse_column_positions(sep_line, sep_char)
 
     def _parse_show(self, output_lines, header_len=1):
+        return self._parse_show_table(output_lines, header_len).to_list()
 
-        result = []
-
-        sep_line_pattern = re.compile(r"^( *-+ *)+$")
-        sep_line_found = False
-        for idx, line in enumerate(output_lines):
-            if sep_line_pattern.match(line):
-                sep_line_found = True
-                header_lines = output_lines[idx-header_len:idx]
-                sep_line = output_lines[idx]
-                content_lines = output_lines[idx+1:]
-                break
-
-        if not sep_line_found:
-            logging.error('Failed to find separation line in the show command output')
-            return result
-
+    def _parse_show_table(self, output_lines, header_len=1):
         try:
-            positions = self._parse_column_positions(sep_line)
+            return tabular.parse_table(output_lines, header_len)
         except Exception as e:
             logging.error('Possibly bad command output, exception: {}'.format(repr(e)))
-            return result
-
-        headers = []
-        for (left, right) in positions:
-            header = " ".join([header_line[left:right].strip().lower() for header_line in header_lines]).strip()
-            headers.append(header)
-
-        for content_line in content_lines:
-            # When an empty line is encountered while parsing the tabulate content, it is highly possible that the
-            # tabulate content has been drained. The empty line and rest of the lines should not be parsed.
-            if len(content_line) == 0:
-                break
-            item = {}
-            for idx, (left, right) in enumerate(positions):
-                k = headers[idx]
-                v = content_line[left:right].strip()
-                item[k] = v
-            result.append(item)
-
-        return result
+            return tabular.Table([])
 
     def show_and_parse(self, show_cmd, header_len=1, **kwargs):
         """Run a show command and parse the output using a generic pattern.
@@ -1593,6 +1669,21 @@ Totals               6450                 6449
             corresponding to one content line under the header in the output. Keys of the dictionary are the column
             headers in lowercase.
         """
+        return self.show_and_parse_table(show_cmd, header_len, **kwargs).to_list()
+
+    def show_and_parse_table(self, show_cmd, header_len=1, **kwargs):
+        """Run a show command and parse the output like show_and_parse, keeping the values per column.
+
+        For large outputs like 'show interfaces counters' on chassis with hundreds of ports, the returned
+        tabular.Table avoids building a dict for every row. It can be filtered by column values and its rows
+        are only converted to dicts when accessed, for example:
+
+            table = duthost.show_and_parse_table("show interface status")
+            down_ports = table.filter(oper="down").column("interface")
+
+        Returns:
+            tabular.Table of the parsed output.
+        """
         start_line_index = kwargs.pop("start_line_index", 0)
         end_line_index = kwargs.pop("end_line_index", None)
         output = self.shell(show_cmd, **kwargs)["stdout_lines"]
@@ -1600,7 +1691,7 @@ Totals               6450                 6449
             output = output[start_line_index:]
         else:
             output = output[start_line_index:end_line_index]
-        return self._parse_show(output, header_len)
+        return self._parse_show_table(output, header_len)
 
     @cached(name='mg_facts')
     def get_extended_minigraph_facts(self, tbinfo, namespace=DEFAULT_NAMESPACE):
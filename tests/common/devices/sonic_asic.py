@@ -521,6 +521,30 @@ class SonicAsic(object):
     def shell(self, *module_args, **complex_args):
         return self.sonichost.shell(*module_args, **complex_args)
 
+    def exec_cmd(self, cmd, **kwargs):
+        """
+        Run a shell command line in the namespace of this ASIC over a persistent SSH connection
+
+        Args:
+            cmd: Shell command line
+            kwargs: Other arguments of SonicHost.exec_cmd
+        Returns:
+            Result of the command with the same keys as the result of the shell module
+        """
+        return self.sonichost.exec_cmd(self.ns_arg + cmd, **kwargs)
+
+    def exec_cmds(self, cmds, **kwargs):
+        """
+        Run several shell command lines in the namespace of this ASIC in a single SSH round trip
+
+        Args:
+            cmds: List of shell command lines
+            kwargs: Other arguments of SonicHost.exec_cmds
+        Returns:
+            List of the results of the commands
+        """
+        return self.sonichost.exec_cmds([self.ns_arg + cmd for cmd in cmds], **kwargs)
+
     def port_on_asic(self, portname):
         cmd = 'sudo sonic-cfggen {} -v "PORT.keys()" -d'.format(self.cli_ns_option)
         ports = self.shell(cmd)["stdout_lines"][0].decode("utf-8")
@@ -0,0 +1,251 @@
+"""
+Pool of persistent SSH connections to run shell commands on a host without Ansible.
+
+Running a command through an Ansible module costs several SSH round trips plus the transfer and start of the module
+on the remote host. The connections of the pool are kept open and every command only opens a new channel on an idle
+connection. Several commands can be pipelined in one channel, their outputs and return codes are separated by a
+random marker printed after each of them.
+"""
+import logging
+import os
+import re
+import select
+import socket
+import threading
+import uuid
+
+from datetime import datetime
+
+import paramiko
+import six
+
+from six.moves import shlex_quote
+
+logger = logging.getLogger(__name__)
+
+SSH_CONNECT_TIMEOUT = 30
+SSH_KEEPALIVE_INTERVAL = 30
+SSH_POOL_SIZE = 4
+
+
+class ExecResult(dict):
+    """
+    @summary: Result of a command with the same keys as the result of the Ansible shell/command module.
+    """
+
+    @property
+    def is_failed(self):
+        return self.get("failed", False)
+
+
+class SshSessionPool(object):
+    """
+    @summary: Persistent SSH connections to a host, shared by all the users of the same address and credentials.
+
+    The connections are not shared with forked processes, e.g. the processes of parallel_run: the threads of the
+    paramiko transports don't run in the child process, and both processes would use the same sockets. A child process
+    drops the pools and the connections inherited from its parent without closing them and opens its own.
+    """
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, address, username, password, port=22, size=SSH_POOL_SIZE):
+        self.address = address
+        self.username = username
+        self.password = password
+        self.port = port
+        self.size = size
+        self.pid = os.getpid()
+        self.idle = []
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(size)
+
+    @classmethod
+    def get(cls, address, username, password, port=22, size=SSH_POOL_SIZE):
+        key = (os.getpid(), address, port, username, password)
+        with cls._pools_lock:
+            if key not in cls._pools:
+                cls._pools[key] = cls(address, username, password, port, size)
+            return cls._pools[key]
+
+    @classmethod
+    def close_all(cls):
+        with cls._pools_lock:
+            for key, pool in list(cls._pools.items()):
+                if key[0] == os.getpid():
+                    pool.close()
+            cls._pools.clear()
+
+    @classmethod
+    def _after_fork_in_child(cls):
+        # The lock could be held by a thread of the parent, which doesn't exist in the child
+        cls._pools_lock = threading.Lock()
+        cls._pools = {}
+
+    def _check_fork(self):
+        """Drop the connections inherited from the parent process, closing them would disconnect the parent"""
+        if self.pid != os.getpid():
+            self.idle = []
+            self.lock = threading.Lock()
+            self.slots = threading.BoundedSemaphore(self.size)
+            self.pid = os.getpid()
+
+    def close(self):
+        with self.lock:
+            for client in self.idle:
+                client.close()
+            self.idle = []
+
+    def _connect(self):
+        logger.debug("Opening SSH connection to {}@{}:{}".format(self.username, self.address, self.port))
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(self.address, port=self.port, username=self.username, password=self.password,
+                       timeout=SSH_CONNECT_TIMEOUT, allow_agent=False, look_for_keys=False)
+        transport = client.get_transport()
+        transport.set_keepalive(SSH_KEEPALIVE_INTERVAL)
+        # Every command is a few small packets exchanged, don't let Nagle's algorithm delay them
+        transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return client
+
+    def _acquire(self):
+        with self.lock:
+            while self.idle:
+                client = self.idle.pop()
+                transport = client.get_transport()
+                if transport and transport.is_active():
+                    return client
+                client.close()
+        return self._connect()
+
+    def _release(self, client):
+        with self.lock:
+            self.idle.append(client)
+
+    def run(self, command, stdin=None, timeout=None):
+        """
+        @summary: Run a command in a new channel of an idle connection.
+        @param command: Command line to be executed by the login shell of the user.
+        @param stdin: Data written to the standard input of the command.
+        @param timeout: Seconds to wait for the command output, None to wait forever.
+        @return: Tuple of return code, stdout and stderr as bytes.
+        """
+        self._check_fork()
+        with self.slots:
+            client = self._acquire()
+            try:
+                try:
+                    channel = client.get_transport().open_session()
+                except (paramiko.SSHException, EOFError, OSError):
+                    # The connection was dropped since its last use, e.g. by a reboot of the host
+                    client.close()
+                    client = self._connect()
+                    channel = client.get_transport().open_session()
+                result = self._run_channel(channel, command, stdin, timeout)
+            except Exception:
+                client.close()
+                raise
+            self._release(client)
+            return result
+
+    @staticmethod
+    def _run_channel(channel, command, stdin, timeout):
+        stdout, stderr = [], []
+        try:
+            channel.exec_command(command)
+            if stdin:
+                channel.sendall(stdin)
+            channel.shutdown_write()
+            # Read both streams as their data arrives, a command writing a lot to stderr would otherwise block on
+            # the channel window while stdout is read
+            while True:
+                readable, _, _ = select.select([channel], [], [], timeout)
+                if not readable:
+                    raise socket.timeout("Timeout waiting for command output after {} seconds".format(timeout))
+                while channel.recv_ready():
+                    stdout.append(channel.recv(65536))
+                while channel.recv_stderr_ready():
+                    stderr.append(channel.recv_stderr(65536))
+                if channel.eof_received and not channel.recv_ready() and not channel.recv_stderr_ready():
+                    break
+            rc = channel.recv_exit_status()
+        finally:
+            channel.close()
+        return rc, b"".join(stdout), b"".join(stderr)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=SshSessionPool._after_fork_in_child)
+
+
+def _to_text(data):
+    if six.PY2:
+        return data
+    return data.decode("utf-8", errors="replace")
+
+
+def build_script(commands, marker):
+    """
+    @summary: Build a shell script running the commands one after another in sub-shells, each followed by the marker
+              and its return code on stdout and by the marker on stderr.
+    """
+    lines = []
+    for command in commands:
+        lines.append("( {}\n) </dev/null".format(command))
+        lines.append("printf '\\n{} %d\\n' $?".format(marker))
+        lines.append("printf '\\n{}\\n' >&2".format(marker))
+    return "\n".join(lines)
+
+
+def exec_commands(pool, commands, become=True, become_pass=None, timeout=None):
+    """
+    @summary: Run the commands in one round trip on the host.
+    @param pool: SshSessionPool of the host.
+    @param commands: List of shell command lines.
+    @param become: Run the commands as root with sudo, same as the Ansible modules run by AnsibleHostBase.
+    @param become_pass: Password for sudo, None if sudo doesn't ask for a password.
+    @param timeout: Seconds to wait for the output of all commands.
+    @return: List of ExecResult, one for each command.
+    """
+    marker = "__EXEC_{}__".format(uuid.uuid4().hex)
+    script = shlex_quote(build_script(commands, marker))
+    stdin = None
+    if not become:
+        remote_cmd = "/bin/sh -c {}".format(script)
+    elif become_pass:
+        remote_cmd = "sudo -H -S -p '' /bin/sh -c {}".format(script)
+        stdin = "{}\n".format(become_pass)
+    else:
+        remote_cmd = "sudo -H -n /bin/sh -c {}".format(script)
+
+    start = datetime.now()
+    rc, stdout, stderr = pool.run(remote_cmd, stdin=stdin, timeout=timeout)
+    end = datetime.now()
+
+    stdout_parts = re.split(r"\n{} (\d+)\n".format(marker), _to_text(stdout))
+    stderr_parts = _to_text(stderr).split("\n{}\n".format(marker))
+    results = []
+    for index, command in enumerate(commands):
+        if 2 * index + 1 < len(stdout_parts):
+            (out, cmd_rc) = (stdout_parts[2 * index], int(stdout_parts[2 * index + 1]))
+            err = stderr_parts[index] if index < len(stderr_parts) else ""
+        else:
+            # The script didn't get to run the command, e.g. sudo failed
+            (out, cmd_rc) = ("", rc if rc else 1)
+            err = stderr_parts[-1] if index == len(stderr_parts) - 1 else ""
+        out = out.rstrip("\r\n")
+        err = err.rstrip("\r\n")
+        results.append(ExecResult(
+            cmd=command,
+            rc=cmd_rc,
+            stdout=out,
+            stdout_lines=out.splitlines(),
+            stderr=err,
+            stderr_lines=err.splitlines(),
+            start=str(start),
+            end=str(end),
+            delta=str(end - start),
+            changed=True,
+            failed=cmd_rc != 0
+        ))
+    return results
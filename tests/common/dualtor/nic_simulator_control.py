@@ -80,6 +80,50 @@ def call_grpc(func, args=None, kwargs=None, timeout=5, retries=3, ignore_errors=
     return response
 
 
+def failed_nics(nic_addresses, reply):
+    """Return the NiCs failed in the ListOf*Reply from the nic simulator with their error messages."""
+    return {
+        nic_address: error_message
+        for nic_address, success, error_message in zip(nic_addresses, reply.success, reply.error_messages)
+        if not success
+    }
+
+
+def call_grpc_nics(func, request_type, requests_field, replies_field, nic_addresses, requests,
+                   timeout=5, retries=3):
+    """
+    Call a mgmt service of the nic simulator with one request per NiC.
+
+    The NiCs failed in a successful ListOf*Reply are not covered by the retries of call_grpc,
+    so the requests of the failed NiCs only are sent again, up to `retries` times.
+
+    Return the replies in the order of `nic_addresses`, None for a NiC still failed, and the
+    NiCs still failed with their error messages.
+    """
+    replies = [None] * len(nic_addresses)
+    pending = list(range(len(nic_addresses)))
+    failed = {}
+    for i in range(retries):
+        request = request_type(**{
+            "nic_addresses": [nic_addresses[index] for index in pending],
+            requests_field: [requests[index] for index in pending]
+        })
+        reply = call_grpc(func, [request], timeout=timeout, retries=retries)
+        failed = failed_nics(request.nic_addresses, reply)
+        still_pending = []
+        for index, success, nic_reply in zip(pending, reply.success, getattr(reply, replies_field)):
+            if success:
+                replies[index] = nic_reply
+            else:
+                still_pending.append(index)
+        pending = still_pending
+        if not pending:
+            break
+        logger.debug("Calling %s %dth time failed on NiCs %s" % (func, i + 1, failed))
+
+    return replies, failed
+
+
 @pytest.fixture(scope="session")
 def nic_simulator_info(request, tbinfo):
     """Fixture to gather nic_simulator related infomation."""
@@ -183,14 +227,19 @@ def mux_status_from_nic_simulator(duthost, nic_simulator_client, active_active_p
             return {}
 
         nic_addresses = [active_active_ports_config[port]["SERVER"]["soc_ipv4"].split("/")[0] for port in ports]
-        request = nic_simulator_grpc_mgmt_service_pb2.ListOfAdminRequest(
-            nic_addresses=nic_addresses,
-            admin_requests=admin_requests[:len(nic_addresses)]
+        admin_replies, failed = call_grpc_nics(
+            client_stub.QueryAdminForwardingPortState,
+            nic_simulator_grpc_mgmt_service_pb2.ListOfAdminRequest,
+            "admin_requests",
+            "admin_replies",
+            nic_addresses,
+            admin_requests[:len(nic_addresses)]
         )
-        reply = call_grpc(client_stub.QueryAdminForwardingPortState, [request])
+        if failed:
+            raise ValueError("failed to query mux status from nic simulator: %s" % failed)
 
         mux_status = {}
-        for port, port_status in zip(ports, reply.admin_replies):
+        for port, port_status in zip(ports, admin_replies):
             mux_status[ptf_index_map[port]] = dict(zip(port_status.portid, port_status.state))
 
         return mux_status
@@ -273,12 +322,18 @@ def set_drop_active_active(mux_config, nic_simulator_client):       # noqa F811
             )
             drop_requests.append(drop_request)
 
-        request = nic_simulator_grpc_mgmt_service_pb2.ListOfDropRequest(
-            nic_addresses=list(nic_addresses),
-            drop_requests=drop_requests
-        )
         client_stub = nic_simulator_client()
-        call_grpc(client_stub.SetDrop, [request], timeout=10)
+        _, failed = call_grpc_nics(
+            client_stub.SetDrop,
+            nic_simulator_grpc_mgmt_service_pb2.ListOfDropRequest,
+            "drop_requests",
+            "drop_replies",
+            list(nic_addresses),
+            drop_requests,
+            timeout=10
+        )
+        if failed:
+            raise ValueError("failed to set drop on nic simulator: %s" % failed)
 
     def _set_drop_active_active(interface_names, portids, directions):
         """
@@ -340,14 +395,18 @@ def toggle_active_active_simulator_ports(active_active_ports_config, nic_simulat
         nic_addresses = [active_active_ports_config[port]["SERVER"]["soc_ipv4"].split("/")[0] for port in mux_ports]
         admin_requests = [nic_simulator_grpc_service_pb2.AdminRequest(portid=[portid], state=[state])
                           for _ in nic_addresses]
-        request = nic_simulator_grpc_mgmt_service_pb2.ListOfAdminRequest(
-            nic_addresses=nic_addresses,
-            admin_requests=admin_requests
+        admin_replies, failed = call_grpc_nics(
+            client_stub.SetAdminForwardingPortState,
+            nic_simulator_grpc_mgmt_service_pb2.ListOfAdminRequest,
+            "admin_requests",
+            "admin_replies",
+            nic_addresses,
+            admin_requests
         )
+        if failed:
+            raise ValueError("failed to toggle ports on nic simulator: %s" % failed)
 
-        reply = call_grpc(client_stub.SetAdminForwardingPortState, [request])
-
-        for mux_port, port_status in zip(mux_ports, reply.admin_replies):
+        for mux_port, port_status in zip(mux_ports, admin_replies):
             status = dict(zip(port_status.portid, port_status.state))
             if status[portid] != state:
                 raise ValueError("failed to toggle port %s, portid %s, state %s" % (mux_port, portid, state))
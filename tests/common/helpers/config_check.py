@@ -0,0 +1,197 @@
+"""
+Comparison of the running config of the DUTs with their running golden config.
+
+The digest of each table of the config is computed on the DUT by
+CONFIG_CHECK_SCRIPT, only the tables whose digest is different in the running
+config and in the golden config are fetched for the detailed comparison. The
+configs of all the namespaces of a DUT are dumped concurrently by the script.
+
+The digests and the fetched tables of the golden configs are cached for the
+session, the golden config file is only read again when its mtime or size
+changed.
+"""
+import base64
+import copy
+import json
+import logging
+import zlib
+
+from six.moves import shlex_quote
+
+logger = logging.getLogger(__name__)
+
+# Python script run on the DUT, argv[1] is a JSON request:
+#   {"golden": {<namespace>: <stamp of the cached golden config or null>},
+#    "running": {<namespace>: {<table>: <digest of the golden table>}},
+#    "tables": {<namespace>: [<table of the golden config>]}}
+# The namespace of the host is "". The golden config file is generated when it does not exist. The output is:
+#   {"golden": {<namespace>: {"stamp": <stamp>, "digests": {<table>: <digest>} or null when the stamp is unchanged}},
+#    "running": {<namespace>: {"digests": {<table>: <digest>}, "changed": {<table>: <value of changed table>}}},
+#    "tables": {<namespace>: {<table>: <value>}}}
+CONFIG_CHECK_SCRIPT = """
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+request = json.loads(sys.argv[1])
+
+def golden_file(ns):
+    return "/etc/sonic/running_golden_config{}.json".format(ns[len("asic"):])
+
+def cfggen(ns):
+    return "sonic-cfggen {}-d --print-data".format("-n {} ".format(ns) if ns else "")
+
+def stamp(path):
+    st = os.stat(path)
+    return "{}-{}".format(st.st_mtime, st.st_size)
+
+def digests(config):
+    return dict((table, hashlib.md5(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest())
+                for table, value in config.items())
+
+procs = {}
+for ns in request.get("golden", {}):
+    path = golden_file(ns)
+    if not os.path.exists(path):
+        subprocess.check_call("{} > {}".format(cfggen(ns), path), shell=True)
+for ns, known_stamp in request.get("golden", {}).items():
+    if known_stamp != stamp(golden_file(ns)):
+        procs[("golden", ns)] = subprocess.Popen(["cat", golden_file(ns)], stdout=subprocess.PIPE)
+for ns in request.get("tables", {}):
+    if ("golden", ns) not in procs:
+        procs[("golden", ns)] = subprocess.Popen(["cat", golden_file(ns)], stdout=subprocess.PIPE)
+for ns in request.get("running", {}):
+    procs[("running", ns)] = subprocess.Popen(cfggen(ns), shell=True, stdout=subprocess.PIPE)
+
+result = {"golden": {}, "running": {}, "tables": {}}
+for ns in request.get("golden", {}):
+    result["golden"][ns] = {"stamp": stamp(golden_file(ns)), "digests": None}
+for (source, ns), proc in procs.items():
+    out = proc.communicate()[0]
+    if proc.returncode != 0:
+        sys.exit("Failed to get {} config of namespace '{}'".format(source, ns))
+    config = json.loads(out.decode("utf-8"))
+    if source == "golden":
+        if ns in result["golden"]:
+            result["golden"][ns]["digests"] = digests(config)
+        if ns in request.get("tables", {}):
+            result["tables"][ns] = dict((table, config[table]) for table in request["tables"][ns] if table in config)
+    else:
+        golden_digests = request["running"][ns]
+        running_digests = digests(config)
+        result["running"][ns] = {
+            "digests": running_digests,
+            "changed": dict((table, config[table]) for table, digest in running_digests.items()
+                            if golden_digests.get(table) != digest)
+        }
+print(json.dumps(result))
+"""
+
+# Golden configs cached for the session, by (hostname, namespace):
+#   {"stamp": <stamp>, "digests": {<table>: <digest>}, "tables": {<table>: (<digest>, <value>)}}
+_golden_configs = {}
+
+
+def _script_ns(namespace):
+    return namespace or ""
+
+
+def get_config_namespaces(duthost):
+    """Returns the namespaces of the configs of a DUT, None for the host"""
+    namespaces = [None]
+    if duthost.is_multi_asic:
+        namespaces.extend(["asic{}".format(asic_index) for asic_index in range(duthost.facts.get("num_asic"))])
+    return namespaces
+
+
+def run_config_check_script(duthost, request):
+    """
+    Runs CONFIG_CHECK_SCRIPT on the DUT, the JSON output is compressed on the DUT.
+
+    Args:
+        duthost: The DUT.
+        request: The request of the script, see CONFIG_CHECK_SCRIPT.
+
+    Returns:
+        Dictionary of the output of the script.
+    """
+    cmd = "set -o pipefail; $(command -v python3 || command -v python) -c {} {} | gzip -c | base64 -w 0".format(
+        shlex_quote(CONFIG_CHECK_SCRIPT), shlex_quote(json.dumps(request)))
+    result = duthost.shell(cmd, executable="/bin/bash", verbose=False)
+    output = zlib.decompress(base64.b64decode(result["stdout"]), 16 + zlib.MAX_WBITS).decode("utf-8")
+    return json.loads(output)
+
+
+def collect_golden_config_digests(duthost, namespaces):
+    """
+    Gets the digests of the tables of the golden configs of a DUT, generating the golden configs which do not exist.
+
+    The golden configs which are cached and whose file did not change are not read again.
+
+    Returns:
+        Dictionary of the digest of each table, by namespace.
+    """
+    request = {"golden": {}}
+    for ns in namespaces:
+        cached = _golden_configs.get((duthost.hostname, ns))
+        request["golden"][_script_ns(ns)] = cached["stamp"] if cached else None
+    output = run_config_check_script(duthost, request)
+
+    digests = {}
+    for ns in namespaces:
+        golden = output["golden"][_script_ns(ns)]
+        cached = _golden_configs.get((duthost.hostname, ns))
+        if golden["digests"] is not None:
+            logger.info("Golden config of {} namespace {} is read".format(duthost.hostname, ns))
+            tables = cached["tables"] if cached else {}
+            cached = {"stamp": golden["stamp"], "digests": golden["digests"], "tables": tables}
+            _golden_configs[(duthost.hostname, ns)] = cached
+        digests[ns] = cached["digests"]
+    return digests
+
+
+def collect_config_changes(duthost, golden_digests):
+    """
+    Gets the tables of the running config of a DUT which are different from the golden config.
+
+    Args:
+        duthost: The DUT.
+        golden_digests: The digests of the golden configs returned by collect_golden_config_digests.
+
+    Returns:
+        Tuple of the golden config and the running config of each namespace, with only the tables which are in one
+        config and not in the other or which are different in the two configs.
+    """
+    output = run_config_check_script(duthost, {
+        "running": dict((_script_ns(ns), digests) for ns, digests in golden_digests.items())
+    })
+
+    golden_config = {}
+    running_config = {}
+    missing_tables = {}
+    for ns, digests in golden_digests.items():
+        running = output["running"][_script_ns(ns)]
+        changed_tables = set(running["changed"].keys()) | (set(digests.keys()) - set(running["digests"].keys()))
+        cached_tables = _golden_configs[(duthost.hostname, ns)]["tables"]
+        missing = [table for table in changed_tables
+                   if table in digests and cached_tables.get(table, (None,))[0] != digests[table]]
+        if missing:
+            missing_tables[_script_ns(ns)] = missing
+        running_config[ns] = running["changed"]
+        golden_config[ns] = changed_tables
+
+    if missing_tables:
+        logger.info("Fetching tables of the golden config of {}: {}".format(duthost.hostname, missing_tables))
+        output = run_config_check_script(duthost, {"tables": missing_tables})
+        for ns in golden_digests:
+            cached_tables = _golden_configs[(duthost.hostname, ns)]["tables"]
+            for table, value in output["tables"].get(_script_ns(ns), {}).items():
+                cached_tables[table] = (golden_digests[ns][table], value)
+
+    for ns, digests in golden_digests.items():
+        cached_tables = _golden_configs[(duthost.hostname, ns)]["tables"]
+        golden_config[ns] = dict((table, copy.deepcopy(cached_tables[table][1]))
+                                 for table in golden_config[ns] if table in digests)
+    return golden_config, running_config
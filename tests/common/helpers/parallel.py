@@ -5,17 +5,24 @@ import os
 import shutil
 import tempfile
 import signal
+import threading
 import traceback
 import time
 
 from multiprocessing import Process, Manager, Pipe, TimeoutError
 from multiprocessing.pool import ThreadPool
 from psutil import wait_procs
+from six.moves import queue
 
 from tests.common.helpers.assertions import pytest_assert as pt_assert
 
 logger = logging.getLogger(__name__)
 
+# Backends of parallel_run, the default backend can be overridden by the PARALLEL_RUN_BACKEND environment variable
+BACKEND_PROCESS = "process"
+BACKEND_THREAD = "thread"
+PARALLEL_RUN_BACKEND_ENV = "PARALLEL_RUN_BACKEND"
+
 
 class SonicProcess(Process):
     """
@@ -54,8 +61,37 @@ class SonicProcess(Process):
         return self._exception
 
 
+class SonicThread(threading.Thread):
+    """
+    Thread running the target function on a node for the thread backend of parallel_run.
+
+    The exception (including backtrace) thrown by the target function is captured like SonicProcess does. The thread
+    puts itself in the done queue when the target function returns.
+    """
+    def __init__(self, done, node, results, name, target, args, kwargs):
+        threading.Thread.__init__(self, name=name)
+        # A thread can't be killed, a thread exceeding its timeout is abandoned and must not block the exit
+        self.daemon = True
+        self.node = node
+        self.results = results
+        self.exception = None
+        self._done = done
+        self._target_function = target
+        self._target_args = args
+        self._target_kwargs = kwargs
+
+    def run(self):
+        try:
+            self._target_function(*self._target_args, **self._target_kwargs)
+        except BaseException as e:
+            # BaseException for pytest.fail, which does not derive from Exception
+            self.exception = (e, traceback.format_exc())
+        finally:
+            self._done.put(self)
+
+
 def parallel_run(
-    target, args, kwargs, nodes_list, timeout=None, concurrent_tasks=24, init_result=None
+    target, args, kwargs, nodes_list, timeout=None, concurrent_tasks=24, init_result=None, backend=None
 ):
     """Run target function on nodes in parallel
 
@@ -70,6 +106,9 @@ def parallel_run(
         timeout (int or float, optional): Total time allowed for the spawned multiple processes to run. Defaults to
             None. When timeout is specified, this function will wait at most 'timeout' seconds for the processes to
             run. When time is up, this function will try to terminate or even kill all the processes.
+        backend (str, optional): BACKEND_PROCESS to run the target function in a process per node, BACKEND_THREAD to
+            run it in a bounded pool of threads, see parallel_run_iter. Defaults to None, which is the value of the
+            PARALLEL_RUN_BACKEND environment variable or BACKEND_PROCESS.
 
     Raises:
         flag.: In case any of the spawned process cannot be terminated, fail the test.
@@ -78,6 +117,15 @@ def parallel_run(
         dict: An instance of multiprocessing.Manager().dict(). It is a proxy to the shared dict that is used by all the
             spawned processes.
     """
+    backend = backend or os.environ.get(PARALLEL_RUN_BACKEND_ENV, BACKEND_PROCESS)
+    pt_assert(backend in [BACKEND_PROCESS, BACKEND_THREAD], 'Unknown parallel_run backend "{}"'.format(backend))
+    if backend == BACKEND_THREAD:
+        results = {}
+        for _, node_results in parallel_run_iter(target, args, kwargs, nodes_list, timeout=timeout,
+                                                 concurrent_tasks=concurrent_tasks, init_result=init_result):
+            results.update(node_results)
+        return results
+
     nodes = [node for node in nodes_list]
 
     # Callback API for wait_procs
@@ -227,6 +275,102 @@ def parallel_run(
     return dict(results)
 
 
+def parallel_run_iter(target, args, kwargs, nodes_list, timeout=None, concurrent_tasks=24, init_result=None):
+    """Run target function on nodes in a bounded pool of threads, yield the results of the nodes as they complete
+
+    It is the thread backend of parallel_run, for target functions whose work is I/O bound, e.g. running commands on
+    the nodes through ansible. There is no process to start and no shared dict proxy to go through, the kwargs are
+    not copied into another process.
+
+    Args:
+        target (function): The target function to be executed in parallel.
+        args (list of tuple): List of arguments for the target function.
+        kwargs (dict): Keyword arguments for the target function, same as parallel_run. The 'results' key holds a
+            dict of the node, initialized with init_result like parallel_run does.
+        nodes_list (list of nodes): List of nodes to be used by the target function
+        timeout (int or float, optional): Time allowed for the target function to run on each node. Defaults to None.
+            A thread can't be killed, the thread running on a node which exceeds the timeout is abandoned, the results
+            it puts later are ignored.
+        concurrent_tasks (int, optional): Number of threads running at the same time. Defaults to 24.
+        init_result (dict, optional): Initial results of each node, same as parallel_run.
+
+    Raises:
+        flag.: When the iteration completes, fail the test in case the target function raised on any of the nodes.
+
+    Yields:
+        tuple: The node and the dict of the results of the node, in the order the nodes complete. The results of a
+            node which exceeded the timeout are marked as failed like parallel_run does. When the iteration is stopped
+            early, the nodes which are not started yet are cancelled.
+    """
+    nodes = [node for node in nodes_list]
+    done = queue.Queue()
+    running = {}
+    failed_threads = {}
+    start_time = time.time()
+
+    try:
+        while nodes or running:
+            while nodes and len(running) < concurrent_tasks:
+                node = nodes.pop(0)
+                node_results = {}
+                # For sanity check, initial results in case of timeout.
+                if init_result:
+                    node_results[node.hostname] = dict(init_result, host=node.hostname)
+                worker = SonicThread(
+                    done, node, node_results, name="{}--{}".format(target.__name__, node), target=target, args=args,
+                    kwargs=dict(kwargs, node=node, results=node_results)
+                )
+                worker.start()
+                running[worker] = time.time() + timeout if timeout else None
+                logger.debug('Started thread running target "{}"'.format(worker.name))
+
+            deadlines = [deadline for deadline in running.values() if deadline is not None]
+            try:
+                worker = done.get(timeout=max(min(deadlines) - time.time(), 0) if deadlines else None)
+            except queue.Empty:
+                worker = None
+
+            # A worker which is not running any more has been abandoned for exceeding the timeout
+            if worker in running:
+                del running[worker]
+                if worker.exception:
+                    failed_threads[worker.name] = worker.exception
+                yield worker.node, worker.results
+
+            now = time.time()
+            for worker, deadline in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    logger.error('Thread {} execution time exceeds {} seconds, abandon it.'.format(
+                        worker.name, timeout
+                    ))
+                    del running[worker]
+                    if init_result:
+                        yield worker.node, {worker.node.hostname: dict(init_result, host=worker.node.hostname,
+                                                                       failed=True)}
+                    else:
+                        yield worker.node, {worker.name: {'failed': True}}
+    finally:
+        if nodes:
+            logger.info('Cancelled target "{}" on nodes {}'.format(target.__name__, [str(node) for node in nodes]))
+        if running:
+            logger.info('Abandoned threads {}'.format([worker.name for worker in running]))
+
+    # if we have failed threads, we should log the exception of each thread and fail
+    for exception, tb in failed_threads.values():
+        pt_assert(
+            False,
+            'Threads "{}" failed\nException:\n{}\nTraceback:\n{}'.format(
+                list(failed_threads.keys()), exception, tb
+            )
+        )
+
+    logger.info(
+        'Completed running threads for target "{}" in {} seconds'.format(
+            target.__name__, datetime.timedelta(seconds=time.time() - start_time)
+        )
+    )
+
+
 def reset_ansible_local_tmp(target):
     """Decorator for resetting ansible default local tmp dir for parallel multiprocessing.Process
 
@@ -236,6 +380,11 @@ def reset_ansible_local_tmp(target):
 
     def wrapper(*args, **kwargs):
 
+        # The threads of the thread backend of parallel_run share the ansible default local tmp directory of the process
+        if isinstance(threading.current_thread(), SonicThread):
+            target(*args, **kwargs)
+            return
+
         # Reset the ansible default local tmp directory for the current subprocess
         # Otherwise, multiple processes could share a same ansible default tmp directory and there could be conflicts
         from ansible import constants
@@ -0,0 +1,85 @@
+"""
+Benchmark of the backends of parallel_run
+
+Runs an I/O bound target function, which sleeps for a fixed latency like a
+command run on a node through ansible, on 1, 8 and 32 fake nodes with the
+process backend and the thread backend of parallel_run, and compares the
+results returned by both. The time to the first result yielded by
+parallel_run_iter is measured too.
+
+Usage:
+    python -m tests.common.helpers.parallel_benchmark --latency 0.5
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+from tests.common.helpers.parallel import parallel_run, parallel_run_iter, BACKEND_PROCESS, BACKEND_THREAD
+
+
+class FakeNode(object):
+
+    def __init__(self, index):
+        self.hostname = "node-{}".format(index)
+        self.index = index
+
+    def __str__(self):
+        return self.hostname
+
+
+def run_on_node(latency, **kwargs):
+    node = kwargs['node']
+    results = kwargs['results']
+    time.sleep(latency)
+    results[node.hostname] = {"failed": False, "host": node.hostname, "index": node.index}
+
+
+def run_backend(backend, nodes, latency, iterations):
+    start = time.time()
+    for _ in range(iterations):
+        results = parallel_run(run_on_node, (latency,), {}, nodes, timeout=60,
+                               init_result={"failed": True}, backend=backend)
+    return (time.time() - start) / iterations, results
+
+
+def first_result_latency(nodes, latency):
+    # The latency of a node grows with its index, the first node completes first
+    start = time.time()
+    results = parallel_run_iter(lambda *args, **kwargs: run_on_node(latency * (1 + kwargs['node'].index), **kwargs),
+                                (), {}, nodes, timeout=60)
+    next(results)
+    first = time.time() - start
+    results.close()
+    return first
+
+
+def main():
+    parser = argparse.ArgumentParser(description='parallel_run backend benchmark')
+    parser.add_argument('--nodes', type=int, nargs='+', default=[1, 8, 32], help='numbers of nodes')
+    parser.add_argument('--latency', type=float, default=0.5, help='latency of the work on each node in seconds')
+    parser.add_argument('--iterations', type=int, default=3, help='number of parallel_run calls of each backend')
+    args = parser.parse_args()
+
+    identical = True
+    print('{:.3f} sec of work per node, {} calls per backend'.format(args.latency, args.iterations))
+    for num_nodes in args.nodes:
+        nodes = [FakeNode(index) for index in range(num_nodes)]
+        process_time, process_results = run_backend(BACKEND_PROCESS, nodes, args.latency, args.iterations)
+        thread_time, thread_results = run_backend(BACKEND_THREAD, nodes, args.latency, args.iterations)
+        first = first_result_latency(nodes, args.latency)
+        print('{:3d} nodes  process {:8.3f} sec  thread {:8.3f} sec  speedup {:.1f}x  '
+              'first streamed result {:.3f} sec'.format(num_nodes, process_time, thread_time,
+                                                        process_time / max(thread_time, 1e-6), first))
+        identical = identical and process_results == thread_results
+
+    if not identical:
+        print('Results of the backends are different')
+        return 1
+    print('Results of the backends are identical')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,10 +1,84 @@
+import base64
+import fnmatch
 import logging
 import json
+import os
+import re
+import zlib
+
+from six.moves import shlex_quote
+
 from tests.common.helpers.constants import DEFAULT_NAMESPACE
 from tests.common.devices.sonic_asic import SonicAsic
 
 logger = logging.getLogger(__name__)
 
+# Lua script run by redis to read many keys in one request. ARGV[1] is 'keys' to read the keys given by the next
+# arguments, or 'patterns' to read all the keys matching the patterns given by the next arguments. Returns a JSON
+# object with the fields of the hash keys and the values of the string keys.
+DB_READ_SCRIPT = """
+local keys = {}
+if ARGV[1] == 'keys' then
+    for i = 2, #ARGV do keys[#keys + 1] = ARGV[i] end
+else
+    for i = 2, #ARGV do
+        for _, key in ipairs(redis.call('KEYS', ARGV[i])) do keys[#keys + 1] = key end
+    end
+end
+local result = {}
+for _, key in ipairs(keys) do
+    local key_type = redis.call('TYPE', key)['ok']
+    if key_type == 'hash' then
+        local fields = redis.call('HGETALL', key)
+        local value = {}
+        for i = 1, #fields, 2 do value[fields[i]] = fields[i + 1] end
+        result[key] = value
+    elseif key_type == 'string' then
+        result[key] = redis.call('GET', key)
+    end
+end
+return cjson.encode(result)
+"""
+
+# Maximum length in bytes of the quoted keys read by one multi_hgetall request. The command is run by bash -c as a
+# single argument, which Linux limits to 128KB (MAX_ARG_STRLEN), including DB_READ_SCRIPT.
+MULTI_HGETALL_BATCH_BYTES = 96 * 1024
+
+# Snapshots taken by SonicDbCli.snapshot(), by (hostname, namespace, database). A snapshot is only used by the test
+# that took it.
+_db_snapshots = {}
+
+
+def _current_test():
+    """Returns the node id of the running test, pytest sets it in the environment during setup, call and teardown"""
+    return os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" ", 1)[0]
+
+
+def _literal_prefix(pattern):
+    """Returns the beginning of a redis glob pattern up to its first special character"""
+    return re.split(r"[*?\[\\]", pattern, 1)[0]
+
+
+def _batches_by_length(args, max_bytes):
+    """Splits the arguments in batches whose quoted length is at most max_bytes, an argument longer is alone"""
+    batch = []
+    length = 0
+    for arg in args:
+        arg_length = len(shlex_quote(arg).encode("utf-8")) + 1
+        if batch and length + arg_length > max_bytes:
+            yield batch
+            batch = []
+            length = 0
+        batch.append(arg)
+        length += arg_length
+    if batch:
+        yield batch
+
+
+def invalidate_db_snapshots():
+    """Drops the snapshots of all databases"""
+    _db_snapshots.clear()
+
 
 class SonicDbCli(object):
     """Base class for interface to SonicDb using sonic-db-cli command.
@@ -23,6 +97,133 @@ class SonicDbCli(object):
         """Builds opening of sonic-db-cli command for other methods."""
         return " {db} ".format(db=self.database)
 
+    def _snapshot_id(self):
+        if isinstance(self.host, SonicAsic):
+            return (self.host.sonichost.hostname, self.host.namespace, self.database)
+        return (self.host.hostname, DEFAULT_NAMESPACE, self.database)
+
+    def _run_read_script(self, mode, args):
+        """
+        Runs DB_READ_SCRIPT in redis, the JSON output is compressed on the DUT.
+
+        Args:
+            mode: 'keys' or 'patterns'.
+            args: The keys or patterns to read.
+
+        Returns:
+            Dictionary of the keys read.
+
+        Raises:
+            SonicDbNoCommandOutput: If the script had no output.
+
+        """
+        sonic_db_cli = getattr(self.host, "sonic_db_cli", "sonic-db-cli")
+        cmd = "set -o pipefail; {} {} EVAL {} 0 {} {} | gzip -c | base64 -w 0".format(
+            sonic_db_cli, self.database, shlex_quote(DB_READ_SCRIPT), mode,
+            " ".join(shlex_quote(arg) for arg in args))
+        logger.debug("SONIC-DB-CLI: %s read of %d %s", self.database, len(args), mode)
+        result = self.host.shell(cmd, executable="/bin/bash", verbose=False)
+
+        output = zlib.decompress(base64.b64decode(result["stdout"]), 16 + zlib.MAX_WBITS).decode("utf-8").strip()
+        if not output:
+            raise SonicDbNoCommandOutput("Read of %s %s in %s returned no response." % (mode, args, self.database))
+        return json.loads(output)
+
+    def multi_hgetall(self, keys):
+        """
+        Gets all the fields of many keys in a few requests.
+
+        Args:
+            keys: Full names of the keys to get.
+
+        Returns:
+            Dictionary of the fields of each key, keys which are not present are left out.
+
+        """
+        keys = list(keys)
+        snapshot = self._get_snapshot()
+        if snapshot is not None and all(self._snapshot_covers(key) for key in keys):
+            return dict((key, snapshot[key]) for key in keys if key in snapshot)
+
+        result = {}
+        for batch in _batches_by_length(keys, MULTI_HGETALL_BATCH_BYTES):
+            result.update(self._run_read_script("keys", batch))
+        return result
+
+    def scan_table(self, pattern):
+        """
+        Gets all the fields of the keys matching a pattern in one request.
+
+        Args:
+            pattern: Redis glob pattern of the keys, e.g. "ASIC_STATE:SAI_OBJECT_TYPE_PORT:*".
+
+        Returns:
+            Dictionary of the fields of each key matching the pattern.
+
+        """
+        snapshot = self._get_snapshot()
+        if snapshot is not None and self._snapshot_covers(_literal_prefix(pattern)):
+            return dict((key, value) for key, value in snapshot.items() if fnmatch.fnmatchcase(key, pattern))
+        return self._run_read_script("patterns", [pattern])
+
+    def snapshot(self, patterns=("*",)):
+        """
+        Reads the keys matching the patterns in one request and keeps them for the running test.
+
+        Until the end of the test or invalidate_snapshot(), the lookups of keys covered by the snapshot by this and
+        other instances for the same host, namespace and database are done locally instead of on the DUT.
+        Only the patterns ending with the single wildcard '*', e.g. "ASIC_STATE:SAI_OBJECT_TYPE_NEIGHBOR_ENTRY*",
+        are used to decide whether the snapshot covers a lookup.
+
+        Args:
+            patterns: Redis glob patterns of the keys to read, all keys by default.
+
+        Returns:
+            Dictionary of the fields of each key of the snapshot.
+
+        """
+        patterns = list(patterns)
+        data = self._run_read_script("patterns", patterns)
+        prefixes = [_literal_prefix(pattern) for pattern in patterns if pattern == _literal_prefix(pattern) + "*"]
+        _db_snapshots[self._snapshot_id()] = {"test": _current_test(), "prefixes": prefixes, "data": data}
+        logger.debug("Snapshot of %d keys of %s %s", len(data), self.database, patterns)
+        return data
+
+    def invalidate_snapshot(self):
+        """Drops the snapshot of the database, e.g. after the test changed it."""
+        _db_snapshots.pop(self._snapshot_id(), None)
+
+    def _get_snapshot(self):
+        """Returns the data of the snapshot taken by the running test, None if there is none."""
+        snapshot = _db_snapshots.get(self._snapshot_id())
+        if snapshot is None:
+            return None
+        if snapshot["test"] != _current_test():
+            self.invalidate_snapshot()
+            return None
+        return snapshot["data"]
+
+    def _snapshot_covers(self, prefix):
+        """Returns True if all the keys starting with prefix are in the snapshot."""
+        snapshot = _db_snapshots.get(self._snapshot_id())
+        return any(prefix.startswith(snap_prefix) for snap_prefix in snapshot["prefixes"])
+
+    def _get_key_list(self, pattern):
+        """
+        Gets the keys matching a pattern, from the snapshot if it covers them.
+
+        Raises:
+            SonicDbNoCommandOutput: If no key matches.
+
+        """
+        snapshot = self._get_snapshot()
+        if snapshot is not None and self._snapshot_covers(_literal_prefix(pattern)):
+            keys = [key for key in snapshot if fnmatch.fnmatchcase(key, pattern)]
+            if not keys:
+                raise SonicDbNoCommandOutput("No keys matching %s in snapshot of %s" % (pattern, self.database))
+            return keys
+        return self._run_and_raise(self._cli_prefix() + "KEYS %s" % shlex_quote(pattern))["stdout_lines"]
+
     def _run_and_check(self, cmd):
         """
         Executes a sonic-db CLI command and checks the output for empty string.
@@ -82,6 +283,12 @@ class SonicDbCli(object):
 
 
         """
+        snapshot = self._get_snapshot()
+        if snapshot is not None and self._snapshot_covers(key):
+            if field not in snapshot.get(key, {}):
+                raise SonicDbKeyNotFound("Key: %s, field: %s not found in snapshot of %s" % (key, field, self.database))
+            return snapshot[key][field]
+
         cmd = self._cli_prefix() + "hget {} {}".format(key, field)
         result = self._run_and_check(cmd)
         if result == {}:
@@ -149,6 +356,12 @@ class SonicDbCli(object):
             Dictionary containing the parsed json output of the sonic-db-dump.
 
         """
+        snapshot = self._get_snapshot()
+        pattern = "*{}*".format(table)
+        if snapshot is not None and self._snapshot_covers(_literal_prefix(pattern)):
+            return dict((key, {"type": "hash" if isinstance(value, dict) else "string", "value": value})
+                        for key, value in snapshot.items() if fnmatch.fnmatchcase(key, pattern))
+
         cli = "sonic-db-dump"
         cmd_str = ""
 
@@ -203,16 +416,14 @@ class AsicDbCli(SonicDbCli):
 
     def get_switch_key(self):
         """Returns a list of keys in the switch table"""
-        cmd = self._cli_prefix() + "KEYS %s*" % AsicDbCli.ASIC_SWITCH_TABLE
-        return self._run_and_raise(cmd)["stdout_lines"][0]
+        return self._get_key_list("%s*" % AsicDbCli.ASIC_SWITCH_TABLE)[0]
 
     def get_system_port_key_list(self, refresh=False):
         """Returns a list of keys in the system port table"""
         if self.system_port_key_list != [] and refresh is False:
             return self.system_port_key_list
 
-        cmd = self._cli_prefix() + "KEYS %s*" % AsicDbCli.ASIC_SYSPORT_TABLE
-        self.system_port_key_list = self._run_and_raise(cmd)["stdout_lines"]
+        self.system_port_key_list = self._get_key_list("%s*" % AsicDbCli.ASIC_SYSPORT_TABLE)
         return self.system_port_key_list
 
     def get_port_key_list(self, refresh=False):
@@ -221,38 +432,32 @@ class AsicDbCli(SonicDbCli):
         if self.port_key_list != [] and refresh is False:
             return self.port_key_list
 
-        cmd = self._cli_prefix() + "KEYS %s*" % AsicDbCli.ASIC_PORT_TABLE
-        self.port_key_list = self._run_and_raise(cmd)["stdout_lines"]
+        self.port_key_list = self._get_key_list("%s*" % AsicDbCli.ASIC_PORT_TABLE)
         return self.port_key_list
 
     def get_hostif_list(self):
         """Returns a list of keys in the host interface table"""
-        cmd = self._cli_prefix() + "KEYS %s:*" % AsicDbCli.ASIC_HOSTIF_TABLE
-        return self._run_and_raise(cmd)["stdout_lines"]
+        return self._get_key_list("%s:*" % AsicDbCli.ASIC_HOSTIF_TABLE)
 
     def get_asic_db_lag_list(self, refresh=False):
         """Returns a list of keys in the lag table"""
         if self.lagid_key_list != [] and refresh is False:
             return self.lagid_key_list
 
-        cmd = self._cli_prefix() + "KEYS %s:*" % AsicDbCli.ASIC_LAG_TABLE
-        self.lagid_key_list = self._run_and_raise(cmd)["stdout_lines"]
+        self.lagid_key_list = self._get_key_list("%s:*" % AsicDbCli.ASIC_LAG_TABLE)
         return self.lagid_key_list
 
     def get_asic_db_lag_member_list(self):
         """Returns a list of keys in the lag member table"""
-        cmd = self._cli_prefix() + "KEYS %s:*" % AsicDbCli.ASIC_LAG_MEMBER_TABLE
-        return self._run_and_raise(cmd)["stdout_lines"]
+        return self._get_key_list("%s:*" % AsicDbCli.ASIC_LAG_MEMBER_TABLE)
 
     def get_router_if_list(self):
         """Returns a list of keys in the router interface table"""
-        cmd = self._cli_prefix() + "KEYS %s:*" % AsicDbCli.ASIC_ROUTERINTF_TABLE
-        return self._run_and_raise(cmd)["stdout_lines"]
+        return self._get_key_list("%s:*" % AsicDbCli.ASIC_ROUTERINTF_TABLE)
 
     def get_neighbor_list(self):
         """Returns a list of keys in the neighbor table"""
-        cmd = self._cli_prefix() + "KEYS %s:*" % AsicDbCli.ASIC_NEIGH_ENTRY_TABLE
-        return self._run_and_raise(cmd)["stdout_lines"]
+        return self._get_key_list("%s:*" % AsicDbCli.ASIC_NEIGH_ENTRY_TABLE)
 
     def get_neighbor_key_by_ip(self, ipaddr):
         """Returns the key in the neighbor table that is for a specific IP neighbor
@@ -261,9 +466,9 @@ class AsicDbCli(SonicDbCli):
             ipaddr: The IP address to search for in the neighbor table.
 
         """
-        result = self._run_and_raise(self._cli_prefix() + "KEYS %s*%s*" % (AsicDbCli.ASIC_NEIGH_ENTRY_TABLE, ipaddr))
+        keys = self._get_key_list("%s*%s*" % (AsicDbCli.ASIC_NEIGH_ENTRY_TABLE, ipaddr))
         match_str = '"ip":"%s"' % ipaddr
-        for key in result["stdout_lines"]:
+        for key in keys:
             if match_str in key:
                 neighbor_key = key
                 break
@@ -284,6 +489,10 @@ class AsicDbCli(SonicDbCli):
             neighbor_key: The full key of the neighbor table.
             field: The field to get in the neighbor hash table.
         """
+        snapshot = self._get_snapshot()
+        if snapshot is not None and self._snapshot_covers(neighbor_key):
+            return snapshot.get(neighbor_key, {}).get(field, "")
+
         cmd = "%s ASIC_DB HGET '%s' %s" % (self.host.sonic_db_cli, neighbor_key, field)
 
         result = self.host.sonichost.shell(cmd)
@@ -420,9 +629,9 @@ class AppDbCli(SonicDbCli):
             ipaddr: The IP address to search for in the neighbor table.
 
         """
-        result = self._run_and_raise(self._cli_prefix() + "KEYS %s:*%s" % (AppDbCli.APP_NEIGH_TABLE, ipaddr))
+        keys = self._get_key_list("%s:*%s" % (AppDbCli.APP_NEIGH_TABLE, ipaddr))
         neighbor_key = None
-        for key in result["stdout_lines"]:
+        for key in keys:
             if key.endswith(ipaddr):
                 neighbor_key = key
                 break
@@ -433,15 +642,13 @@ class AppDbCli(SonicDbCli):
         """
         Retuns lag list in app db
         """
-        result = self._run_and_raise(self._cli_prefix() + "KEYS *%s*" % AppDbCli.APP_LAG_TABLE)
-        return result["stdout_lines"]
+        return self._get_key_list("*%s*" % AppDbCli.APP_LAG_TABLE)
 
     def get_app_db_lag_member_list(self):
         """
         return lag member list in app db
         """
-        result = self._run_and_raise(self._cli_prefix() + "KEYS *{}:*".format(AppDbCli.APP_LAG_MEMBER_TABLE))
-        return result["stdout_lines"]
+        return self._get_key_list("*{}:*".format(AppDbCli.APP_LAG_MEMBER_TABLE))
 
     def dump_neighbor_table(self):
         """
@@ -475,10 +682,9 @@ class VoqDbCli(SonicDbCli):
             ipaddr: The IP address to search for in the neighbor table.
 
         """
-        cmd = self._cli_prefix() + 'KEYS "%s|*%s"' % (VoqDbCli.SYSTEM_NEIGHBOR_TABLE, ipaddr)
-        result = self._run_and_raise(cmd)
+        keys = self._get_key_list("%s|*%s" % (VoqDbCli.SYSTEM_NEIGHBOR_TABLE, ipaddr))
         neighbor_key = None
-        for key in result["stdout_lines"]:
+        for key in keys:
             if key.endswith(ipaddr):
                 neighbor_key = key
                 break
@@ -512,13 +718,11 @@ class VoqDbCli(SonicDbCli):
 
     def get_lag_list(self):
         """Returns a list of keys in the system lag table"""
-        cmd = self._cli_prefix() + "KEYS *{}*".format(VoqDbCli.SYSTEM_LAG_TABLE)
-        return self._run_and_raise(cmd)["stdout_lines"]
+        return self._get_key_list("*{}*".format(VoqDbCli.SYSTEM_LAG_TABLE))
 
     def get_lag_member_list(self):
         """Returns a list of keys in the ststem lag member table"""
-        cmd = self._cli_prefix() + "KEYS *{}*".format(VoqDbCli.SYSTEM_LAG_MEMBER_TABLE)
-        return self._run_and_raise(cmd)["stdout_lines"]
+        return self._get_key_list("*{}*".format(VoqDbCli.SYSTEM_LAG_MEMBER_TABLE))
 
     def dump_neighbor_table(self):
         """
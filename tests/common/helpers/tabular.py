@@ -0,0 +1,189 @@
+"""
+Parser of the tabular output of show commands.
+
+The output is expected to have one or more lines of headers, a separation
+line with '-' under each column and one content line per row, for example:
+
+      Interface            Lanes    Speed    MTU
+    ---------------  ---------------  -------  -----
+          Ethernet0          0,1,2,3      40G   9100
+
+The column positions are computed once from the separation line and the
+values are sliced out of each content line by a single itemgetter call. The
+parsed values are kept in a Table as one list per row, the row dicts are only
+built when they are accessed and the columns when they are filtered.
+"""
+import logging
+import re
+from operator import itemgetter
+
+logger = logging.getLogger(__name__)
+
+SEP_LINE_PATTERN = re.compile(r"^( *-+ *)+$")
+
+
+def parse_column_positions(sep_line, sep_char='-'):
+    """Parse the position of each column in the command output
+
+    Args:
+        sep_line: The output line separating actual data and column headers
+        sep_char: The character used in separation line. Defaults to '-'.
+
+    Returns:
+        A list of (start, end) tuples, one for each run of sep_char in the separation line.
+    """
+    return [(m.start(), m.end()) for m in re.finditer(re.escape(sep_char) + "+", sep_line)]
+
+
+def column_getter(positions):
+    """Get a function which returns the stripped values of the columns of a content line"""
+    if not positions:
+        return lambda line: []
+    getter = itemgetter(*[slice(left, right) for left, right in positions])
+    if len(positions) == 1:
+        return lambda line: [getter(line).strip()]
+    return lambda line: [value.strip() for value in getter(line)]
+
+
+def column_headers(header_lines, positions):
+    """Get the lowercase header of each column, multi-line headers are joined with a space"""
+    headers = []
+    for left, right in positions:
+        header = " ".join([header_line[left:right].strip().lower() for header_line in header_lines]).strip()
+        headers.append(header)
+    return headers
+
+
+class Table(object):
+    """Parsed tabular output, stored as the list of the values of each row
+
+    Iterating or indexing the table gives a dict per row, keyed by the column headers, as returned by
+    SonicHost.show_and_parse. When headers repeat, the value of the last of the columns is used in the dict.
+    The values of a column are gathered once, when the column is first accessed.
+    """
+
+    def __init__(self, headers, rows=None):
+        self.headers = list(headers)
+        self.rows = rows if rows is not None else []
+        self._index = dict((header, idx) for idx, header in enumerate(self.headers))
+        self._columns = None
+
+    @classmethod
+    def from_lines(cls, content_lines, positions, headers, stop_at_empty=True):
+        """Parse the content lines using the column positions
+
+        Args:
+            content_lines: Iterable of the content lines
+            positions: The column positions from parse_column_positions
+            headers: The header of each column
+            stop_at_empty: Stop at the first empty line. The blank lines are skipped otherwise.
+        """
+        getter = column_getter(positions)
+        rows = []
+        for line in content_lines:
+            if len(line) == 0 and stop_at_empty:
+                break
+            if not stop_at_empty and not line.strip():
+                continue
+            rows.append(getter(line))
+        return cls(headers, rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        for values in self.rows:
+            yield dict(zip(self.headers, values))
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [dict(zip(self.headers, values)) for values in self.rows[idx]]
+        return dict(zip(self.headers, self.rows[idx]))
+
+    @property
+    def columns(self):
+        """The list of the values of each column"""
+        if self._columns is None:
+            if self.rows:
+                self._columns = [list(values) for values in zip(*self.rows)]
+            else:
+                self._columns = [[] for _ in self.headers]
+        return self._columns
+
+    def column(self, header):
+        """Get the list of the values of a column, the last column with the header when headers repeat"""
+        return self.columns[self._index[header]]
+
+    def filter(self, **conditions):
+        """Get the rows matching all the conditions as a new Table, without building the row dicts
+
+        The conditions are given as header=value or header=callable, the header names with spaces are given
+        using the ** syntax, for example: table.filter(**{"oper": "up", "asym pfc": "off"})
+        """
+        selected = range(len(self.rows))
+        for header, cond in conditions.items():
+            values = self.column(header)
+            if callable(cond):
+                selected = [idx for idx in selected if cond(values[idx])]
+            else:
+                selected = [idx for idx in selected if values[idx] == cond]
+        return Table(self.headers, [self.rows[idx] for idx in selected])
+
+    def to_list(self):
+        """Get the rows as a list of dicts"""
+        headers = self.headers
+        return [dict(zip(headers, values)) for values in self.rows]
+
+
+def _find_sep_line(output_lines):
+    for idx, line in enumerate(output_lines):
+        if SEP_LINE_PATTERN.match(line):
+            return idx
+    return None
+
+
+def parse_table(output_lines, header_len=1):
+    """Parse the output lines of a show command
+
+    Args:
+        output_lines: List of the output lines
+        header_len: Number of header lines above the separation line
+
+    Returns:
+        Table, empty when the separation line is not found
+    """
+    idx = _find_sep_line(output_lines)
+    if idx is None:
+        logger.error('Failed to find separation line in the show command output')
+        return Table([])
+
+    positions = parse_column_positions(output_lines[idx])
+    headers = column_headers(output_lines[idx - header_len:idx], positions)
+    # When an empty line is encountered while parsing the tabulate content, it is highly possible that the
+    # tabulate content has been drained. The empty line and rest of the lines should not be parsed.
+    return Table.from_lines(output_lines[idx + 1:], positions, headers)
+
+
+def iter_rows(output_lines, header_len=1):
+    """Parse the output lines one by one, yielding a dict per row
+
+    The output_lines can be any iterable, e.g. the lines of a file or of a command output being read, only the
+    header lines are kept.
+    """
+    header_lines = []
+    lines = iter(output_lines)
+    for line in lines:
+        if SEP_LINE_PATTERN.match(line):
+            break
+        header_lines = (header_lines + [line])[-header_len:] if header_len else []
+    else:
+        logger.error('Failed to find separation line in the show command output')
+        return
+
+    positions = parse_column_positions(line)
+    headers = column_headers(header_lines, positions)
+    getter = column_getter(positions)
+    for line in lines:
+        if len(line) == 0:
+            break
+        yield dict(zip(headers, getter(line)))
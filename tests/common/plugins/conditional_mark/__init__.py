@@ -389,6 +389,55 @@ def find_longest_matches(nodeid, conditions):
     return longest_matches
 
 
+class ConditionsTrie(object):
+    """Prefix trie of the mark conditions for looking up the matches of a test case name.
+
+    Test case names are split into path segments ending with '/' or '::'. Each condition is stored in the node of the
+    complete segments of its test case name, so only the conditions stored along the path of the nodeid need to be
+    checked instead of all the conditions.
+    """
+
+    _segment_pattern = re.compile(r'.*?(?:/|::)|.+')
+
+    def __init__(self, conditions):
+        """
+        Args:
+            conditions (list): List of conditions loaded by load_conditions().
+        """
+        self.root = ({}, [])
+        for index, condition in enumerate(conditions):
+            # condition is a dict which has only one item, so we use condition.keys()[0] to get its key.
+            name = list(condition.keys())[0]
+            children, entries = self.root
+            for segment in self._segments(name):
+                if not segment.endswith(('/', '::')):
+                    break
+                children, entries = children.setdefault(segment, ({}, []))
+            entries.append((index, name, condition))
+
+    @classmethod
+    def _segments(cls, name):
+        return cls._segment_pattern.findall(name)
+
+    def find_longest_matches(self, nodeid):
+        """Find the matches of the given test case name, same as function find_longest_matches.
+
+        Args:
+            nodeid (str): Full test case name
+
+        Returns:
+            list: Matched conditions in the order of the conditions list
+        """
+        children, entries = self.root
+        matches = [entry for entry in entries if nodeid.startswith(entry[1])]
+        for segment in self._segments(nodeid):
+            if segment not in children:
+                break
+            children, entries = children[segment]
+            matches.extend(entry for entry in entries if nodeid.startswith(entry[1]))
+        return [condition for _, _, condition in sorted(matches, key=lambda entry: entry[0])]
+
+
 def update_issue_status(condition_str, session):
     """Replace issue URL with 'True' or 'False' based on its active state.
 
@@ -428,7 +477,54 @@ def update_issue_status(condition_str, session):
     return condition_str
 
 
-def evaluate_condition(dynamic_update_skip_reason, mark_details, condition, basic_facts, session):
+class ConditionEvaluator(object):
+    """Evaluate condition strings based on one set of basic facts.
+
+    Every distinct condition string is compiled once and its result is memoized, the same conditions are shared by
+    many test cases.
+    """
+
+    _compiled = {}
+
+    def __init__(self, basic_facts, session):
+        """
+        Args:
+            basic_facts (dict): A one level dict with basic facts. Keys of the dict can be used as variables in the
+                condition string evaluation.
+            session (obj): Pytest session object, for getting cached data.
+        """
+        self.basic_facts = basic_facts
+        self.session = session
+        self.results = {}
+
+    @classmethod
+    def compile(cls, condition_str):
+        if condition_str not in cls._compiled:
+            cls._compiled[condition_str] = compile(condition_str, '<condition>', 'eval')
+        return cls._compiled[condition_str]
+
+    def evaluate(self, condition):
+        """Evaluate a raw condition string.
+
+        Args:
+            condition (str): A raw condition string that may contain issue URLs.
+
+        Returns:
+            bool: True or False based on condition string evaluation result.
+        """
+        if condition not in self.results:
+            condition_str = update_issue_status(condition, self.session)
+            try:
+                self.results[condition] = bool(eval(self.compile(condition_str), self.basic_facts))
+            except Exception:
+                logger.error('Failed to evaluate condition, raw_condition={}, condition_str={}'.format(
+                    condition,
+                    condition_str))
+                self.results[condition] = False
+        return self.results[condition]
+
+
+def evaluate_condition(dynamic_update_skip_reason, mark_details, condition, basic_facts, session, evaluator=None):
     """Evaluate a condition string based on supplied basic facts.
 
     Args:
@@ -440,6 +536,8 @@ def evaluate_condition(dynamic_update_skip_reason, mark_details, condition, basi
         basic_facts (dict): A one level dict with basic facts. Keys of the dict can be used as variables in the
             condition string evaluation.
         session (obj): Pytest session object, for getting cached data.
+        evaluator (ConditionEvaluator): Evaluator memoizing the results for basic_facts, None to evaluate the
+            condition string without memoizing.
 
     Returns:
         bool: True or False based on condition string evaluation result.
@@ -447,21 +545,16 @@ def evaluate_condition(dynamic_update_skip_reason, mark_details, condition, basi
     if condition is None or condition.strip() == '':
         return True    # Empty condition item will be evaluated as True. Equivalent to be ignored.
 
-    condition_str = update_issue_status(condition, session)
-    try:
-        condition_result = bool(eval(condition_str, basic_facts))
-        if condition_result and dynamic_update_skip_reason:
-            mark_details['reason'].append(condition)
-        return condition_result
-    except Exception:
-        logger.error('Failed to evaluate condition, raw_condition={}, condition_str={}'.format(
-            condition,
-            condition_str))
-        return False
+    if evaluator is None:
+        evaluator = ConditionEvaluator(basic_facts, session)
+    condition_result = evaluator.evaluate(condition)
+    if condition_result and dynamic_update_skip_reason:
+        mark_details['reason'].append(condition)
+    return condition_result
 
 
 def evaluate_conditions(dynamic_update_skip_reason, mark_details, conditions, basic_facts,
-                        conditions_logical_operator, session):
+                        conditions_logical_operator, session, evaluator=None):
     """Evaluate all the condition strings.
 
     Evaluate a single condition or multiple conditions. If multiple conditions are supplied, apply AND or OR
@@ -476,6 +569,8 @@ def evaluate_conditions(dynamic_update_skip_reason, mark_details, conditions, ba
             condition string evaluation.
         conditions_logical_operator (str): logical operator which should be applied to conditions(by default 'AND')
         session (obj): Pytest session object, for getting cached data.
+        evaluator (ConditionEvaluator): Evaluator memoizing the results for basic_facts, None to evaluate the
+            condition strings without memoizing.
 
     Returns:
         bool: True or False based on condition strings evaluation result.
@@ -485,15 +580,16 @@ def evaluate_conditions(dynamic_update_skip_reason, mark_details, conditions, ba
     if isinstance(conditions, list):
         # Apply 'AND' or 'OR' operation to list of conditions based on conditions_logical_operator(by default 'AND')
         if conditions_logical_operator == 'OR':
-            return any([evaluate_condition(dynamic_update_skip_reason, mark_details, c, basic_facts, session)
-                        for c in conditions])
+            return any([evaluate_condition(dynamic_update_skip_reason, mark_details, c, basic_facts, session,
+                                           evaluator) for c in conditions])
         else:
-            return all([evaluate_condition(dynamic_update_skip_reason, mark_details, c, basic_facts, session)
-                        for c in conditions])
+            return all([evaluate_condition(dynamic_update_skip_reason, mark_details, c, basic_facts, session,
+                                           evaluator) for c in conditions])
     else:
         if conditions is None or conditions.strip() == '':
             return True
-        return evaluate_condition(dynamic_update_skip_reason, mark_details, conditions, basic_facts, session)
+        return evaluate_condition(dynamic_update_skip_reason, mark_details, conditions, basic_facts, session,
+                                  evaluator)
 
 
 def pytest_collection(session):
@@ -540,8 +636,10 @@ def pytest_collection_modifyitems(session, config, items):
     logger.info('Available basic facts that can be used in conditional skip:\n{}'.format(
         json.dumps(basic_facts, indent=2)))
     dynamic_update_skip_reason = session.config.option.dynamic_update_skip_reason
+    conditions_trie = ConditionsTrie(conditions)
+    evaluator = ConditionEvaluator(basic_facts, session)
     for item in items:
-        longest_matches = find_longest_matches(item.nodeid, conditions)
+        longest_matches = conditions_trie.find_longest_matches(item.nodeid)
 
         if longest_matches:
             logger.debug('Found match "{}" for test case "{}"'.format(longest_matches, item.nodeid))
@@ -560,7 +658,8 @@ def pytest_collection_modifyitems(session, config, items):
                             add_mark = True
                         else:
                             add_mark = evaluate_conditions(dynamic_update_skip_reason, mark_details, mark_conditions,
-                                                           basic_facts, conditions_logical_operator, session)
+                                                           basic_facts, conditions_logical_operator, session,
+                                                           evaluator)
 
                     if add_mark:
                         reason = ''
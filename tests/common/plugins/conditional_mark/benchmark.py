@@ -0,0 +1,203 @@
+"""Benchmark of adding the conditional marks at collection time.
+
+Runs the pytest_collection_modifyitems hook of the conditional mark plugin over the test cases of the tests/ tree,
+once with the legacy linear scan of the conditions and evaluation of the condition strings for each test case, once
+with the conditions trie and the memoized condition evaluation. The marks added by both runs are compared.
+
+The test cases are the nodeids listed by 'pytest --collect-only -q' if supplied, otherwise the test functions and
+methods found in the test scripts without the parameters.
+
+Usage, from the root of the repository:
+    python -m tests.common.plugins.conditional_mark.benchmark --facts basic_facts.json --nodeids collected.txt
+"""
+import argparse
+import ast
+import copy
+import glob
+import json
+import logging
+import os
+import re
+import time
+
+from tests.common.plugins import conditional_mark
+
+PLUGIN_DIR = os.path.dirname(os.path.abspath(__file__))
+TESTS_DIR = os.path.abspath(os.path.join(PLUGIN_DIR, '../../..'))
+
+DEFAULT_BASIC_FACTS = {
+    'topo_type': 't0',
+    'topo_name': 't0',
+    'testbed': 'vms-kvm-t0',
+    'asic_type': 'vs',
+    'asic_gen': 'unknown',
+    'platform': 'x86_64-kvm_x86_64-r0',
+    'hwsku': 'Force10-S6000',
+    'release': 'master',
+    'build_version': 'master.0-dirty',
+    'num_asic': 1,
+    'is_multi_asic': False,
+    'is_supervisor': False,
+    'is_chassis': False,
+    'asic_subtype': '',
+    'minigraph_interfaces': [],
+    'minigraph_portchannels': {},
+    'minigraph_portchannel_interfaces': [],
+    'minigraph_neighbors': {},
+    'VOQ_INBAND_INTERFACE': {},
+    'BGP_VOQ_CHASSIS_NEIGHBOR': {},
+    'INTERFACE': {},
+    'switch': {},
+}
+
+
+class FakeCache(object):
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, default):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+class FakeOption(object):
+    def __init__(self, conditions_files):
+        self.mark_conditions_files = list(conditions_files)
+        self.dynamic_update_skip_reason = False
+
+
+class FakeConfig(object):
+    def __init__(self, conditions_files):
+        self.cache = FakeCache()
+        self.option = FakeOption(conditions_files)
+
+
+class FakeSession(object):
+    def __init__(self, conditions_files):
+        self.config = FakeConfig(conditions_files)
+
+
+class FakeItem(object):
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+        self.user_properties = []
+        self.marks = []
+
+    def add_marker(self, mark):
+        self.marks.append((mark.name, mark.kwargs))
+
+
+class LinearConditions(object):
+    """Legacy lookup scanning all the conditions for each test case"""
+
+    def __init__(self, conditions):
+        self.conditions = conditions
+
+    def find_longest_matches(self, nodeid):
+        return conditional_mark.find_longest_matches(nodeid, self.conditions)
+
+
+class LegacyEvaluator(conditional_mark.ConditionEvaluator):
+    """Legacy evaluation of the condition string each time it is used"""
+
+    def evaluate(self, condition):
+        condition_str = conditional_mark.update_issue_status(condition, self.session)
+        try:
+            return bool(eval(condition_str, self.basic_facts))
+        except Exception:
+            return False
+
+
+def find_nodeids(tests_dir):
+    """Find the test functions and methods of the test scripts, without the parameters"""
+    nodeids = []
+    for path in sorted(glob.glob(os.path.join(tests_dir, '**', 'test_*.py'), recursive=True)):
+        try:
+            with open(path) as f:
+                tree = ast.parse(f.read())
+        except (SyntaxError, UnicodeDecodeError, ValueError):
+            continue
+        name = os.path.relpath(path, tests_dir)
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith('test'):
+                nodeids.append('{}::{}'.format(name, node.name))
+            elif isinstance(node, ast.ClassDef) and node.name.startswith('Test'):
+                for method in node.body:
+                    if isinstance(method, (ast.FunctionDef, ast.AsyncFunctionDef)) \
+                            and method.name.startswith('test'):
+                        nodeids.append('{}::{}::{}'.format(name, node.name, method.name))
+    return nodeids
+
+
+def read_nodeids(nodeids_file):
+    """Read the nodeids in the output of 'pytest --collect-only -q'"""
+    with open(nodeids_file) as f:
+        return [line.strip() for line in f if '::' in line and not line.startswith(' ')]
+
+
+def run(conditions_files, basic_facts, nodeids, legacy):
+    session = FakeSession(conditions_files)
+    conditions = conditional_mark.load_conditions(session)
+    # Don't query the issues, consider all of them as active
+    issues = set()
+    for condition in conditions:
+        for mark_details in list(condition.values())[0].values():
+            mark_conditions = (mark_details or {}).get('conditions') or []
+            if not isinstance(mark_conditions, list):
+                mark_conditions = [mark_conditions]
+            for mark_condition in mark_conditions:
+                issues.update(re.findall('https?://[^ )]+', mark_condition or ''))
+    session.config.cache.set('ISSUE_STATUS', dict((issue, True) for issue in issues))
+    session.config.cache.set('TESTS_MARK_CONDITIONS', conditions)
+    session.config.cache.set('BASIC_FACTS', copy.deepcopy(basic_facts))
+    items = [FakeItem(nodeid) for nodeid in nodeids]
+
+    trie_class, evaluator_class = conditional_mark.ConditionsTrie, conditional_mark.ConditionEvaluator
+    if legacy:
+        conditional_mark.ConditionsTrie, conditional_mark.ConditionEvaluator = LinearConditions, LegacyEvaluator
+    try:
+        start = time.time()
+        conditional_mark.pytest_collection_modifyitems(session, session.config, items)
+        elapsed = time.time() - start
+    finally:
+        conditional_mark.ConditionsTrie, conditional_mark.ConditionEvaluator = trie_class, evaluator_class
+    return items, len(conditions), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Conditional mark collection time benchmark')
+    parser.add_argument('--conditions-files', nargs='*',
+                        default=sorted(glob.glob(os.path.join(PLUGIN_DIR, 'tests_mark_conditions*.yaml'))),
+                        help='mark conditions files, by default the files of the plugin')
+    parser.add_argument('--facts', help='json file of the basic facts, by default facts of a KVM t0 testbed')
+    parser.add_argument('--nodeids', help="output of 'pytest --collect-only -q', by default the test functions of "
+                                          "the tests/ tree without parameters")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    basic_facts = DEFAULT_BASIC_FACTS
+    if args.facts:
+        with open(args.facts) as f:
+            basic_facts = json.load(f)
+    nodeids = read_nodeids(args.nodeids) if args.nodeids else find_nodeids(TESTS_DIR)
+
+    legacy_items, conditions_count, legacy_time = run(args.conditions_files, basic_facts, nodeids, True)
+    items, _, elapsed = run(args.conditions_files, basic_facts, nodeids, False)
+
+    mismatches = [item.nodeid for legacy_item, item in zip(legacy_items, items)
+                  if (legacy_item.marks, legacy_item.user_properties) != (item.marks, item.user_properties)]
+    print('{} test cases, {} conditions, {} marks added'.format(
+        len(nodeids), conditions_count, sum(len(item.marks) for item in items)))
+    print('legacy: {:.3f} sec, trie: {:.3f} sec, speedup {:.1f}x'.format(
+        legacy_time, elapsed, legacy_time / max(elapsed, 1e-6)))
+    if mismatches:
+        print('{} test cases got different marks, e.g. {}'.format(len(mismatches), mismatches[:5]))
+        return 1
+    print('Marks of all test cases are identical')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
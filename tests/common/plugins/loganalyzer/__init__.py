@@ -9,6 +9,9 @@ from tests.common.helpers.parallel import parallel_run, reset_ansible_local_tmp
 def pytest_addoption(parser):
     parser.addoption("--disable_loganalyzer", action="store_true", default=False,
                      help="disable loganalyzer analysis for 'loganalyzer' fixture")
+    parser.addoption("--loganalyzer_offset_mode", action="store_true", default=False,
+                     help="analyze only logs appended since test start by recorded file offsets "
+                          "instead of start/end markers for 'loganalyzer' fixture")
 
 
 @reset_ansible_local_tmp
@@ -50,7 +53,8 @@ def loganalyzer(duthosts, request):
     analyzers = {}
     parallel_run(analyzer_logrotate, [], {}, duthosts, timeout=120)
     for duthost in duthosts:
-        analyzer = LogAnalyzer(ansible_host=duthost, marker_prefix=request.node.name)
+        analyzer = LogAnalyzer(ansible_host=duthost, marker_prefix=request.node.name,
+                               offset_mode=request.config.getoption("--loganalyzer_offset_mode"))
         analyzer.load_common_config()
         analyzers[duthost.hostname] = analyzer
     markers = parallel_run(analyzer_add_marker, [analyzers], {}, duthosts, timeout=120)
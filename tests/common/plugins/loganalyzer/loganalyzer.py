@@ -1,9 +1,12 @@
+import json
 import logging
 import os
 import re
 import time
 import pprint
 
+from functools import lru_cache
+
 from . import system_msg_handler
 
 from .system_msg_handler import AnsibleLogAnalyzer as ansible_loganalyzer
@@ -14,6 +17,19 @@ COMMON_MATCH = join(split(__file__)[0], "loganalyzer_common_match.txt")
 COMMON_IGNORE = join(split(__file__)[0], "loganalyzer_common_ignore.txt")
 COMMON_EXPECT = join(split(__file__)[0], "loganalyzer_common_expect.txt")
 SYSLOG_TMP_FOLDER = "/tmp/syslog"
+SYSLOG_FILE = "/var/log/syslog"
+
+
+@lru_cache(maxsize=None)
+def compile_regex_list(regex_list):
+    """
+    Compile list of regular expressions into one alternation. Compiled regex is cached for the whole session,
+    common match/ignore lists are the same for every test.
+
+    :param regex_list: Tuple of regular expressions.
+    :return: Compiled regex or None if the list is empty.
+    """
+    return re.compile('|'.join(regex_list)) if regex_list else None
 
 
 class DisableLogrotateCronContext:
@@ -71,7 +87,13 @@ class LogAnalyzerError(Exception):
 
 
 class LogAnalyzer:
-    def __init__(self, ansible_host, marker_prefix, dut_run_dir="/tmp", start_marker=None, additional_files={}):
+    def __init__(self, ansible_host, marker_prefix, dut_run_dir="/tmp", start_marker=None, additional_files={},
+                 offset_mode=False):
+        """
+        @param offset_mode: Instead of placing start/end markers into syslog, record inode and offset of monitored
+                            files on init and analyze only content appended since then. Ignored when custom start
+                            strings are used, as they refer to messages logged before init.
+        """
         self.ansible_host = ansible_host
         self.dut_run_dir = dut_run_dir
         self.extracted_syslog = os.path.join(self.dut_run_dir, "syslog")
@@ -89,6 +111,9 @@ class LogAnalyzer:
 
         self.additional_files = list(additional_files.keys())
         self.additional_start_str = list(additional_files.values())
+        self.offset_mode = offset_mode
+        # Monitored files positions recorded on init, by marker
+        self._offsets = {}
 
     def _add_end_marker(self, marker):
         """
@@ -235,6 +260,9 @@ class LogAnalyzer:
 
         self.ansible_host.copy(src=ANSIBLE_LOGANALYZER_MODULE, dest=os.path.join(self.dut_run_dir, "loganalyzer.py"))
 
+        if self._use_offsets():
+            return self._record_offsets()
+
         log_files = []
         for idx, path in enumerate(self.additional_files):
             if not self.additional_start_str or self.additional_start_str[idx] == '':
@@ -283,6 +311,36 @@ class LogAnalyzer:
         self.ansible_host.command(cmd)
         return start_marker
 
+    def _use_offsets(self):
+        """
+        Check whether monitored files positions can be used instead of start marker
+        """
+        return self.offset_mode and not self.start_marker and not any(self.additional_start_str)
+
+    def _record_offsets(self):
+        """
+        Record inode and offset of syslog and additional files on the DUT
+        """
+        marker = ".".join((self.marker_prefix, time.strftime("%Y-%m-%d-%H:%M:%S", time.gmtime())))
+        cmd = "python {run_dir}/loganalyzer.py --action record_offsets --run_id {marker} --logs {log_files}"\
+            .format(run_dir=self.dut_run_dir, marker=marker, log_files=",".join([SYSLOG_FILE] + self.additional_files))
+
+        logging.debug("Recording log offsets for '{}'".format(marker))
+        self._offsets[marker] = json.loads(self.ansible_host.command(cmd)["stdout"])
+        return marker
+
+    def _extract_delta(self, marker):
+        """
+        Extract content appended to the monitored files since offsets were recorded into the DUT run directory
+        """
+        offsets = ",".join("{}:{}:{}".format(path, inode, offset)
+                           for path, (inode, offset) in self._offsets.pop(marker).items())
+        cmd = "python {run_dir}/loganalyzer.py --action extract_delta --run_id {marker} --out_dir {run_dir}"\
+            " --offsets {offsets}".format(run_dir=self.dut_run_dir, marker=marker, offsets=offsets)
+
+        logging.debug("Extracting log delta for '{}'".format(marker))
+        self.ansible_host.command(cmd)
+
     def analyze(self, marker, fail=True):
         """
         @summary: Extract syslog logs based on the start/stop markers and compose one file.
@@ -296,14 +354,7 @@ class LogAnalyzer:
                  If "fail" is True and if found match messages - raise exception.
         """
         logging.debug("Loganalyzer analyze")
-        analyzer_summary = {"total": {"match": 0, "expected_match": 0, "expected_missing_match": 0},
-                            "match_files": {},
-                            "match_messages": {},
-                            "expect_messages": {},
-                            "unused_expected_regexp": []
-                            }
         timestamp = time.strftime("%Y-%m-%d-%H:%M:%S", time.gmtime())
-        tmp_folder = ".".join((SYSLOG_TMP_FOLDER, self.ansible_host.hostname, timestamp))
         marker = marker.replace(' ', '_')
         self.ansible_loganalyzer.run_id = marker
 
@@ -312,22 +363,44 @@ class LogAnalyzer:
         else:
             start_string = self.start_marker
 
+        use_offsets = marker in self._offsets
         with DisableLogrotateCronContext(self.ansible_host):
-            # Add end marker into DUT syslog
-            self._add_end_marker(marker)
-
-            # On DUT extract syslog files from /var/log/ and create one file by location - /tmp/syslog
-            self.ansible_host.extract_log(directory='/var/log', file_prefix='syslog', start_string=start_string,
-                                          target_filename=self.extracted_syslog)
-            for idx, path in enumerate(self.additional_files):
-                file_dir, file_name = split(path)
-                extracted_file_name = os.path.join(self.dut_run_dir, file_name)
-                if self.additional_start_str and self.additional_start_str[idx] != '':
-                    start_str = self.additional_start_str[idx]
-                else:
-                    start_str = start_string
-                self.ansible_host.extract_log(directory=file_dir, file_prefix=file_name, start_string=start_str,
-                                              target_filename=extracted_file_name)
+            if use_offsets:
+                # Extract only content appended since init, no end marker is needed
+                self._extract_delta(marker)
+            else:
+                # Add end marker into DUT syslog
+                self._add_end_marker(marker)
+
+                # On DUT extract syslog files from /var/log/ and create one file by location - /tmp/syslog
+                self.ansible_host.extract_log(directory='/var/log', file_prefix='syslog', start_string=start_string,
+                                              target_filename=self.extracted_syslog)
+                for idx, path in enumerate(self.additional_files):
+                    file_dir, file_name = split(path)
+                    extracted_file_name = os.path.join(self.dut_run_dir, file_name)
+                    if self.additional_start_str and self.additional_start_str[idx] != '':
+                        start_str = self.additional_start_str[idx]
+                    else:
+                        start_str = start_string
+                    self.ansible_host.extract_log(directory=file_dir, file_prefix=file_name, start_string=start_str,
+                                                  target_filename=extracted_file_name)
+
+        return self._analyze_extracted(timestamp, fail, require_markers=False if use_offsets else None)
+
+    def _analyze_extracted(self, timestamp, fail, require_markers=None):
+        """
+        @summary: Download extracted logs and analyze them based on defined regular expressions.
+
+        @param require_markers: Whether start/end markers are expected in the extracted logs,
+                                False for logs extracted by offsets.
+        """
+        analyzer_summary = {"total": {"match": 0, "expected_match": 0, "expected_missing_match": 0},
+                            "match_files": {},
+                            "match_messages": {},
+                            "expect_messages": {},
+                            "unused_expected_regexp": []
+                            }
+        tmp_folder = ".".join((SYSLOG_TMP_FOLDER, self.ansible_host.hostname, timestamp))
 
         # Download extracted logs from the DUT to the temporal folder defined in SYSLOG_TMP_FOLDER
         self.save_extracted_log(dest=tmp_folder)
@@ -340,16 +413,17 @@ class LogAnalyzer:
             self.save_extracted_file(dest=tmp_folder, src=extracted_file_name)
             file_list.append(tmp_folder)
 
-        match_messages_regex = re.compile('|'.join(self.match_regex)) if len(self.match_regex) else None
-        ignore_messages_regex = re.compile('|'.join(self.ignore_regex)) if len(self.ignore_regex) else None
-        expect_messages_regex = re.compile('|'.join(self.expect_regex)) if len(self.expect_regex) else None
+        match_messages_regex = compile_regex_list(tuple(self.match_regex))
+        ignore_messages_regex = compile_regex_list(tuple(self.ignore_regex))
+        expect_messages_regex = compile_regex_list(tuple(self.expect_regex))
 
         logging.debug("Analyze files {}".format(file_list))
         logging.debug('    match_regex="{}"'.format(match_messages_regex.pattern if match_messages_regex else ''))
         logging.debug('    ignore_regex="{}"'.format(ignore_messages_regex.pattern if ignore_messages_regex else ''))
         logging.debug('    expect_regex="{}"'.format(expect_messages_regex.pattern if expect_messages_regex else ''))
         analyzer_parse_result = self.ansible_loganalyzer.analyze_file_list(file_list, match_messages_regex,
-                                                                           ignore_messages_regex, expect_messages_regex)
+                                                                           ignore_messages_regex, expect_messages_regex,
+                                                                           require_markers)
         # Print file content and remove the file
         for folder in file_list:
             with open(folder) as fo:
@@ -6,11 +6,13 @@ import json
 import pytest
 
 from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 
 from tests.common.plugins.sanity_check import constants
 from tests.common.plugins.sanity_check import checks
 from tests.common.plugins.sanity_check.checks import *      # noqa: F401, F403
 from tests.common.plugins.sanity_check.recover import recover
+from tests.common.plugins.sanity_check.snapshot import collect_snapshots
 from tests.common.plugins.sanity_check.constants import STAGE_PRE_TEST, STAGE_POST_TEST
 from tests.common.helpers.assertions import pytest_assert as pt_assert
 
@@ -107,10 +109,29 @@ def filter_check_items(tbinfo, check_items):
 
 
 def do_checks(request, check_items, *args, **kwargs):
+    """
+    Run the check items concurrently, each item in a thread.
+
+    The state of the DUTs used by several check items is collected once in a snapshot of each DUT, passed to the
+    check items in the 'snapshots' keyword argument.
+    """
     check_results = []
-    for item in check_items:
-        check_fixture = request.getfixturevalue(item)
-        results = check_fixture(*args, **kwargs)
+    if not check_items:
+        return check_results
+
+    # The fixtures must be got in the main thread
+    check_fixtures = [request.getfixturevalue(item) for item in check_items]
+    if "snapshots" not in kwargs:
+        kwargs["snapshots"] = collect_snapshots(request.getfixturevalue("duthosts"), check_items)
+
+    pool = ThreadPool(len(check_fixtures))
+    try:
+        items_results = pool.map(lambda check_fixture: check_fixture(*args, **kwargs), check_fixtures)
+    finally:
+        pool.close()
+        pool.join()
+
+    for results in items_results:
         logger.debug("check results of each item {}".format(results))
         if results and isinstance(results, list):
             check_results.extend(results)
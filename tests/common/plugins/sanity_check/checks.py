@@ -11,7 +11,8 @@ from tests.common.dualtor.constants import UPPER_TOR, LOWER_TOR, NIC
 from tests.common.dualtor.dual_tor_common import CableType
 from tests.common.cache import FactsCache
 from tests.common.plugins.sanity_check.constants import STAGE_PRE_TEST, STAGE_POST_TEST
-from tests.common.helpers.parallel import parallel_run, reset_ansible_local_tmp
+from tests.common.helpers.parallel import parallel_run, reset_ansible_local_tmp, BACKEND_THREAD
+from tests.common.plugins.sanity_check.snapshot import get_snapshot
 
 logger = logging.getLogger(__name__)
 SYSTEM_STABILIZE_MAX_TIME = 300
@@ -32,6 +33,26 @@ CHECK_ITEMS = [
 __all__ = CHECK_ITEMS
 
 
+def _get_networking_uptime(dut, snapshot):
+    """Gets the networking uptime from the sanity check snapshot of the DUT, from the DUT if it is not available"""
+    uptime = snapshot.networking_uptime() if snapshot else None
+    return uptime if uptime is not None else dut.get_networking_uptime()
+
+
+def _snapshot_then_poll(snapshot_value, poll):
+    """
+    Returns a function which returns the value from the sanity check snapshot on its first call and polls the DUT on
+    the next calls, or on all the calls if the value is not in the snapshot.
+    """
+    values = [snapshot_value] if snapshot_value is not None else []
+
+    def _get():
+        if values:
+            return values.pop()
+        return poll()
+    return _get
+
+
 def _find_down_phy_ports(dut, phy_interfaces):
     down_phy_ports = []
     intf_facts = dut.show_interface(command='status',
@@ -82,16 +103,17 @@ def check_interfaces(duthosts):
 
     def _check(*args, **kwargs):
         result = parallel_run(_check_interfaces_on_dut, args, kwargs, duthosts.frontend_nodes,
-                              timeout=600, init_result=init_result)
+                              timeout=600, init_result=init_result, backend=BACKEND_THREAD)
         return result.values()
 
     @reset_ansible_local_tmp
     def _check_interfaces_on_dut(*args, **kwargs):
         dut = kwargs['node']
         results = kwargs['results']
+        snapshot = get_snapshot(kwargs, dut)
         logger.info("Checking interfaces status on %s..." % dut.hostname)
 
-        networking_uptime = dut.get_networking_uptime().seconds
+        networking_uptime = _get_networking_uptime(dut, snapshot).seconds
         timeout = max((SYSTEM_STABILIZE_MAX_TIME - networking_uptime), 0)
         interval = 20
         logger.info("networking_uptime=%d seconds, timeout=%d seconds, interval=%d seconds" %
@@ -100,15 +122,19 @@ def check_interfaces(duthosts):
         down_ports = []
         check_result = {"failed": True, "check_item": "interfaces", "host": dut.hostname}
         for asic in dut.asics:
-            ip_interfaces = []
-            cfg_facts = asic.config_facts(host=dut.hostname,
-                                          source="persistent", verbose=False)['ansible_facts']
-            phy_interfaces = [k for k, v in cfg_facts["PORT"].items() if
-                              "admin_status" in v and v["admin_status"] == "up"]
-            if "PORTCHANNEL_INTERFACE" in cfg_facts:
-                ip_interfaces = list(cfg_facts["PORTCHANNEL_INTERFACE"].keys())
-            if "VLAN_INTERFACE" in cfg_facts:
-                ip_interfaces += list(cfg_facts["VLAN_INTERFACE"].keys())
+            interface_config = snapshot.interface_config(asic.namespace) if snapshot else None
+            if interface_config is not None:
+                phy_interfaces, ip_interfaces = interface_config
+            else:
+                ip_interfaces = []
+                cfg_facts = asic.config_facts(host=dut.hostname,
+                                              source="persistent", verbose=False)['ansible_facts']
+                phy_interfaces = [k for k, v in cfg_facts["PORT"].items() if
+                                  "admin_status" in v and v["admin_status"] == "up"]
+                if "PORTCHANNEL_INTERFACE" in cfg_facts:
+                    ip_interfaces = list(cfg_facts["PORTCHANNEL_INTERFACE"].keys())
+                if "VLAN_INTERFACE" in cfg_facts:
+                    ip_interfaces += list(cfg_facts["VLAN_INTERFACE"].keys())
 
             logger.info(json.dumps(phy_interfaces, indent=4))
             logger.info(json.dumps(ip_interfaces, indent=4))
@@ -146,7 +172,7 @@ def check_bgp(duthosts):
 
     def _check(*args, **kwargs):
         result = parallel_run(_check_bgp_on_dut, args, kwargs, duthosts.frontend_nodes,
-                              timeout=600, init_result=init_result)
+                              timeout=600, init_result=init_result, backend=BACKEND_THREAD)
         return result.values()
 
     @reset_ansible_local_tmp
@@ -204,7 +230,7 @@ def check_bgp(duthosts):
         logger.info("Checking bgp status on host %s ..." % dut.hostname)
         check_result = {"failed": False, "check_item": "bgp", "host": dut.hostname}
 
-        networking_uptime = dut.get_networking_uptime().seconds
+        networking_uptime = _get_networking_uptime(dut, get_snapshot(kwargs, dut)).seconds
         if SYSTEM_STABILIZE_MAX_TIME - networking_uptime + 480 > 500:
             # If max_timeout is higher than 600, it will exceed parallel_run's timeout
             # the check will be killed by parallel_run, we can't get expected results.
@@ -253,7 +279,8 @@ def _is_db_omem_over_threshold(command_output):
 def check_dbmemory(duthosts):
     def _check(*args, **kwargs):
         init_result = {"failed": False, "check_item": "dbmemory"}
-        result = parallel_run(_check_dbmemory_on_dut, args, kwargs, duthosts, timeout=600, init_result=init_result)
+        result = parallel_run(_check_dbmemory_on_dut, args, kwargs, duthosts, timeout=600, init_result=init_result,
+                              backend=BACKEND_THREAD)
         return result.values()
 
     @reset_ansible_local_tmp
@@ -261,12 +288,15 @@ def check_dbmemory(duthosts):
         dut = kwargs['node']
         results = kwargs['results']
 
+        snapshot = get_snapshot(kwargs, dut)
         logger.info("Checking database memory on %s..." % dut.hostname)
         redis_cmd = "client list"
         check_result = {"failed": False, "check_item": "dbmemory", "host": dut.hostname}
         # check the db memory on the redis instance running on each instance
         for asic in dut.asics:
-            res = asic.run_redis_cli_cmd(redis_cmd)['stdout_lines']
+            res = snapshot.redis_client_list(asic.namespace) if snapshot else None
+            if res is None:
+                res = asic.run_redis_cli_cmd(redis_cmd)['stdout_lines']
             result, total_omem = _is_db_omem_over_threshold(res)
             check_result["total_omem"] = total_omem
             if result:
@@ -631,7 +661,8 @@ def check_monit(duthosts):
     """
     def _check(*args, **kwargs):
         init_result = {"failed": False, "check_item": "monit"}
-        result = parallel_run(_check_monit_on_dut, args, kwargs, duthosts, timeout=600, init_result=init_result)
+        result = parallel_run(_check_monit_on_dut, args, kwargs, duthosts, timeout=600, init_result=init_result,
+                              backend=BACKEND_THREAD)
         return result.values()
 
     @reset_ansible_local_tmp
@@ -639,8 +670,12 @@ def check_monit(duthosts):
         dut = kwargs['node']
         results = kwargs['results']
 
+        snapshot = get_snapshot(kwargs, dut)
+        get_monit_services_status = _snapshot_then_poll(snapshot.monit_services_status() if snapshot else None,
+                                                        dut.get_monit_services_status)
+
         logger.info("Checking status of each Monit service...")
-        networking_uptime = dut.get_networking_uptime().seconds
+        networking_uptime = _get_networking_uptime(dut, snapshot).seconds
         timeout = max((MONIT_STABILIZE_MAX_TIME - networking_uptime), 0)
         interval = 20
         logger.info("networking_uptime = {} seconds, timeout = {} seconds, interval = {} seconds"
@@ -649,7 +684,7 @@ def check_monit(duthosts):
         check_result = {"failed": False, "check_item": "monit", "host": dut.hostname}
 
         if timeout == 0:
-            monit_services_status = dut.get_monit_services_status()
+            monit_services_status = get_monit_services_status()
             if not monit_services_status:
                 logger.info("Monit was not running.")
                 check_result["failed"] = True
@@ -665,7 +700,7 @@ def check_monit(duthosts):
             is_monit_running = False
             while elapsed < timeout:
                 check_result["failed"] = False
-                monit_services_status = dut.get_monit_services_status()
+                monit_services_status = get_monit_services_status()
                 if not monit_services_status:
                     wait(interval, msg="Monit was not started and wait {} seconds to retry. Remaining time: {}."
                          .format(interval, timeout - elapsed))
@@ -703,16 +738,20 @@ def check_processes(duthosts):
             if 'kvm' in node.sonichost.facts['platform'] and node.sonichost.is_multi_asic:
                 timeout = 1000
                 break
-        result = parallel_run(_check_processes_on_dut, args, kwargs, duthosts, timeout=timeout, init_result=init_result)
+        result = parallel_run(_check_processes_on_dut, args, kwargs, duthosts, timeout=timeout,
+                              init_result=init_result, backend=BACKEND_THREAD)
         return result.values()
 
     @reset_ansible_local_tmp
     def _check_processes_on_dut(*args, **kwargs):
         dut = kwargs['node']
         results = kwargs['results']
+        snapshot = get_snapshot(kwargs, dut)
+        all_critical_process_status = _snapshot_then_poll(
+            snapshot.all_critical_process_status() if snapshot else None, dut.all_critical_process_status)
         logger.info("Checking process status on %s..." % dut.hostname)
 
-        networking_uptime = dut.get_networking_uptime().seconds
+        networking_uptime = _get_networking_uptime(dut, snapshot).seconds
         timeout = max((SYSTEM_STABILIZE_MAX_TIME - networking_uptime), 0)
         interval = 20
         logger.info("networking_uptime=%d seconds, timeout=%d seconds, interval=%d seconds" %
@@ -720,7 +759,7 @@ def check_processes(duthosts):
 
         check_result = {"failed": False, "check_item": "processes", "host": dut.hostname}
         if timeout == 0:  # Check processes status, do not retry.
-            processes_status = dut.all_critical_process_status()
+            processes_status = all_critical_process_status()
             check_result["processes_status"] = processes_status
             check_result["services_status"] = {}
             for k, v in processes_status.items():
@@ -732,7 +771,7 @@ def check_processes(duthosts):
             elapsed = 0
             while elapsed < timeout:
                 check_result["failed"] = False
-                processes_status = dut.all_critical_process_status()
+                processes_status = all_critical_process_status()
                 check_result["processes_status"] = processes_status
                 check_result["services_status"] = {}
                 for k, v in processes_status.items():
@@ -894,13 +933,15 @@ def check_neighbor_macsec_empty(ctrl_links):
 
     def _check(*args, **kwargs):
         init_check_result = {"failed": False, "check_item": "neighbor_macsec_empty", "unhealthy_nbrs": []}
-        check_results = parallel_run(_check_macsec_empty, args, kwargs, nodes, timeout=300)
+        check_results = parallel_run(_check_macsec_empty, args, kwargs, nodes, timeout=300, backend=BACKEND_THREAD)
         unhealthy_dut = set()
         for nbr_name, check_result in check_results.items():
             if check_result:
                 init_check_result["failed"] = True
                 init_check_result["unhealthy_nbrs"].append(nbr_name)
-                unhealthy_dut.add(dut_nbr_mapping[nbr_name])
+                # The results of a thread which exceeded the timeout are put under the name of the thread
+                if nbr_name in dut_nbr_mapping:
+                    unhealthy_dut.add(dut_nbr_mapping[nbr_name])
         if len(unhealthy_dut) > 0:
             init_check_result["hosts"] = list(unhealthy_dut)
         return init_check_result
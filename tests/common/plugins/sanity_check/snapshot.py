@@ -0,0 +1,169 @@
+"""
+Snapshot of the DUT state shared by the sanity check items.
+
+The data used by several check items, e.g. the networking uptime, is collected
+once per DUT by running all the commands in one shell_cmds call, before the
+check items are run. The check items evaluate the snapshot on their first
+attempt, only the check items which failed poll the DUT again while waiting
+for the DUT to be ready.
+"""
+import json
+import logging
+from datetime import datetime
+
+from tests.common.helpers.constants import DEFAULT_NAMESPACE
+from tests.common.helpers.parallel import parallel_run_threaded
+
+logger = logging.getLogger(__name__)
+
+# Check items evaluating the snapshot, the snapshot is not collected if none of them is run
+SNAPSHOT_CHECK_ITEMS = ['check_processes', 'check_interfaces', 'check_bgp', 'check_dbmemory', 'check_monit']
+
+NETWORKING_START_CMD = "systemctl -p ExecMainStartTimestamp show networking"
+NOW_CMD = 'date +"%Y-%m-%d %H:%M:%S"'
+MONIT_STATUS_CMD = "sudo monit status"
+REDIS_CLIENT_LIST_CMD = "/usr/bin/redis-cli client list"
+
+# Tables of the persistent config used by check_interfaces, read from the config_db json file of the ASIC
+INTERFACE_CONFIG_TABLES = ["PORT", "PORTCHANNEL_INTERFACE", "VLAN_INTERFACE"]
+INTERFACE_CONFIG_CMD = "$(command -v python3 || command -v python) -c 'import json, sys; " \
+                       "config = json.load(open(sys.argv[1])); " \
+                       "print(json.dumps(dict((t, config.get(t, {{}})) for t in sys.argv[2:])))' " \
+                       "/etc/sonic/config_db{}.json " + " ".join(INTERFACE_CONFIG_TABLES)
+
+
+class DutStateSnapshot(object):
+    """
+    Results of the commands collecting the state of a DUT, keyed by name.
+
+    The getters return None when the data could not be collected, the check items poll the DUT in that case.
+    """
+
+    def __init__(self, dut, results):
+        self.dut = dut
+        self.results = results
+
+    @classmethod
+    def collect(cls, dut):
+        """Runs all the commands of the snapshot on the DUT in one shell_cmds call"""
+        names = ["networking_start", "now", "monit"]
+        cmds = [NETWORKING_START_CMD, NOW_CMD, MONIT_STATUS_CMD]
+
+        group_cmds = dut.critical_group_process_cmds()
+        status_cmds = dut.critical_process_status_cmds()
+        names.extend([("critical_group", idx) for idx in range(len(group_cmds))])
+        cmds.extend(group_cmds)
+        names.extend([("critical_status", idx) for idx in range(len(status_cmds))])
+        cmds.extend(status_cmds)
+
+        for asic in dut.asics:
+            # Same commands as SonicAsic.run_redis_cli_cmd and the config file read by SonicAsic.config_facts
+            names.append(("client_list", asic.namespace))
+            if asic.namespace != DEFAULT_NAMESPACE:
+                cmds.append("sudo ip netns exec {} {}".format(asic.namespace, REDIS_CLIENT_LIST_CMD))
+            else:
+                cmds.append(REDIS_CLIENT_LIST_CMD)
+            names.append(("interface_config", asic.namespace))
+            cmds.append(INTERFACE_CONFIG_CMD.format(asic.namespace.split("asic")[1] if asic.namespace else ""))
+
+        logger.info("Collecting sanity check snapshot of {} with {} commands".format(dut.hostname, len(cmds)))
+        results = dut.shell_cmds(cmds=cmds, continue_on_fail=True, module_ignore_errors=True,
+                                 verbose=False)['results']
+        return cls(dut, dict(zip(names, results)))
+
+    def _result(self, name):
+        result = self.results.get(name)
+        if result is None or result.get('rc') != 0:
+            return None
+        return result
+
+    def networking_uptime(self):
+        """Same as SonicHost.get_networking_uptime"""
+        start_result = self._result("networking_start")
+        now_result = self._result("now")
+        if start_result is None or now_result is None:
+            return None
+        props = {}
+        for line in start_result["stdout_lines"]:
+            fields = line.split("=")
+            if len(fields) >= 2:
+                props[fields[0]] = fields[1]
+        try:
+            return datetime.strptime(now_result["stdout"].strip(), "%Y-%m-%d %H:%M:%S") - \
+                datetime.strptime(props["ExecMainStartTimestamp"], "%a %Y-%m-%d %H:%M:%S %Z")
+        except Exception as e:
+            logger.error("Exception raised while getting networking restart time: %s" % repr(e))
+            return None
+
+    def monit_services_status(self):
+        """Same as SonicHost.get_monit_services_status, the status is empty when monit is not running"""
+        result = self.results.get("monit")
+        if result is None:
+            return None
+        return self.dut.parse_monit_services_status(result)
+
+    def all_critical_process_status(self):
+        """Same as SonicHost.all_critical_process_status"""
+        group_results = [result for name, result in self.results.items()
+                         if isinstance(name, tuple) and name[0] == "critical_group"]
+        status_results = [result for name, result in self.results.items()
+                          if isinstance(name, tuple) and name[0] == "critical_status"]
+        if not group_results and not status_results:
+            return None
+        return self.dut.all_critical_process_status(group_results=group_results, status_results=status_results)
+
+    def redis_client_list(self, namespace):
+        """Output lines of redis-cli client list of the ASIC"""
+        result = self._result(("client_list", namespace))
+        return None if result is None else result["stdout_lines"]
+
+    def interface_config(self, namespace):
+        """
+        The admin up ports and the L3 interfaces in the persistent config of the ASIC, as check_interfaces gets them
+        from config_facts.
+        """
+        result = self._result(("interface_config", namespace))
+        if result is None:
+            return None
+        try:
+            config = json.loads(result["stdout"])
+        except ValueError:
+            return None
+        phy_interfaces = [k for k, v in config["PORT"].items() if "admin_status" in v and v["admin_status"] == "up"]
+        ip_interfaces = []
+        for table in ["PORTCHANNEL_INTERFACE", "VLAN_INTERFACE"]:
+            for key in config[table]:
+                intf = key.split("|", 1)[0]
+                if intf not in ip_interfaces:
+                    ip_interfaces.append(intf)
+        return phy_interfaces, ip_interfaces
+
+
+def collect_snapshots(duthosts, check_items):
+    """
+    Collects the snapshots of the DUTs concurrently.
+
+    Returns:
+        Dictionary of the DutStateSnapshot of each DUT, by hostname. It is empty if none of the check items evaluates
+        the snapshot. The DUTs whose snapshot failed to be collected are left out.
+    """
+    if not any(item in SNAPSHOT_CHECK_ITEMS for item in check_items):
+        return {}
+
+    def _collect(dut):
+        try:
+            return DutStateSnapshot.collect(dut)
+        except Exception as e:
+            logger.warning("Failed to collect sanity check snapshot of {}: {}".format(dut.hostname, repr(e)))
+            return None
+
+    duts = [dut for dut in duthosts]
+    snapshots = parallel_run_threaded([lambda dut=dut: _collect(dut) for dut in duts], timeout=300,
+                                      thread_count=len(duts))
+    return dict((dut.hostname, snapshot) for dut, snapshot in zip(duts, snapshots) if snapshot is not None)
+
+
+def get_snapshot(kwargs, dut):
+    """Gets the snapshot of a DUT from the kwargs of a check item, None if there is none"""
+    snapshots = kwargs.get("snapshots") or {}
+    return snapshots.get(dut.hostname)
@@ -1,5 +1,7 @@
 import logging
 
+from tests.common.helpers import tabular
+
 logger = logging.getLogger('__name__')
 
 
@@ -14,18 +16,7 @@ def parse_column_positions(separation_line, separation_char='-'):
         [list]: A list. Each item is a tuple with two elements. The first element is start position of a column. The
                 second element is the end position of the column.
     '''
-    prev = ' ',
-    positions = []
-    for pos, char in enumerate(separation_line + ' '):
-        if char == separation_char:
-            if char != prev:
-                left = pos
-        else:
-            if char != prev:
-                right = pos
-                positions.append((left, right))
-        prev = char
-    return positions
+    return tabular.parse_column_positions(separation_line, separation_char)
 
 
 def parse_portstat(content_lines):
@@ -56,26 +47,15 @@ def parse_portstat(content_lines):
         logger.error('Possibly bad command output')
         return {}
 
-    headers = []
-    for pos in positions:
-        header = header_line[pos[0]:pos[1]].strip().lower()
-        headers.append(header)
-
+    headers = tabular.column_headers([header_line], positions)
     if not headers:
         return {}
 
+    table = tabular.Table.from_lines(content_lines[separation_line_number+1:reminder_line_number], positions, headers,
+                                     stop_at_empty=False)
     results = {}
-    for line in content_lines[separation_line_number+1:reminder_line_number]:
-        if not line.strip(): # skip empty line or newline
-            continue
-        portstats = []
-        for pos in positions:
-            portstat = line[pos[0]:pos[1]].strip()
-            portstats.append(portstat)
-
-        intf = portstats[0]
-        results[intf] = {}
-        for idx in range(1, len(portstats)):    # Skip the first column interface name
-            results[intf][headers[idx]] = portstats[idx]
+    for values in table.rows:
+        # Skip the first column interface name
+        results[values[0]] = dict(zip(headers[1:], values[1:]))
 
     return results
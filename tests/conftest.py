@@ -10,6 +10,7 @@ import pytest
 import yaml
 import jinja2
 import copy
+import functools
 
 from datetime import datetime
 from ipaddress import ip_interface, IPv4Interface
@@ -25,7 +26,9 @@ from tests.common.devices.duthosts import DutHosts
 from tests.common.devices.vmhost import VMHost
 from tests.common.devices.base import NeighborDevice
 from tests.common.devices.cisco import CiscoHost
-from tests.common.helpers.parallel import parallel_run
+from tests.common.helpers.parallel import parallel_run, parallel_run_threaded
+from tests.common.helpers.config_check import get_config_namespaces
+from tests.common.helpers.config_check import collect_golden_config_digests, collect_config_changes
 from tests.common.fixtures.duthost_utils import backup_and_restore_config_db_session    # noqa F401
 from tests.common.fixtures.ptfhost_utils import ptf_portmap_file                        # noqa F401
 from tests.common.fixtures.ptfhost_utils import run_icmp_responder_session              # noqa F401
@@ -182,10 +185,18 @@ def pytest_addoption(parser):
     parser.addoption("--public_docker_registry", action="store_true", default=False,
                      help="To use public docker registry for syncd swap, by default is disabled (False)")
 
+    ############################
+    #   fast exec options      #
+    ############################
+    parser.addoption("--fast_exec", action="store_true", default=False,
+                     help="Run shell/command modules on SONiC DUTs over persistent SSH connections when possible")
+
 
 def pytest_configure(config):
     if config.getoption("enable_macsec"):
         config.pluginmanager.register(MacsecPlugin())
+    if config.getoption("fast_exec"):
+        SonicHost.fast_exec = True
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -236,6 +247,11 @@ def pytest_cmdline_main(config):
         dataplane_logger.setLevel(logging.ERROR)
 
 
+def pytest_sessionfinish(session, exitstatus):
+    # Each pytest-xdist worker reports the usage of the facts cache by its own process
+    logger.info("Facts cache statistics: {}".format(cache.stats()))
+
+
 def pytest_collection(session):
     """Workaround to reduce messy plugin logs generated during collection only
 
@@ -1838,31 +1854,57 @@ def collect_db_dump(request, duthosts):
         collect_db_dump_on_duts(request, duthosts)
 
 
-def __dut_reload(duts_data, node=None, results=None):
+def __dut_reload(node=None, results=None):
     if node is None or results is None:
         logger.error('Missing kwarg "node" or "results"')
         return
     logger.info("dut reload called on {}".format(node.hostname))
-    node.copy(content=json.dumps(duts_data[node.hostname]["pre_running_config"][None], indent=4),
-              dest='/etc/sonic/config_db.json', verbose=False)
+    # The running golden config is the config before test, restore it on the DUT without fetching it
+    node.shell("cp /etc/sonic/running_golden_config.json /etc/sonic/config_db.json")
 
     if node.is_multi_asic:
         for asic_index in range(0, node.facts.get('num_asic')):
-            asic_ns = "asic{}".format(asic_index)
-            asic_cfg_file = "/tmp/{}_config_db{}.json".format(node.hostname, asic_index)
-            with open(asic_cfg_file, "w") as outfile:
-                outfile.write(json.dumps(duts_data[node.hostname]['pre_running_config'][asic_ns], indent=4))
-            node.copy(src=asic_cfg_file, dest='/etc/sonic/config_db{}.json'.format(asic_index), verbose=False)
-            os.remove(asic_cfg_file)
+            node.shell("cp /etc/sonic/running_golden_config{0}.json /etc/sonic/config_db{0}.json".format(asic_index))
 
     config_reload(node)
 
 
+def __collect_core_dumps(duthost):
+    if "20191130" in duthost.os_version:
+        return duthost.shell('ls /var/core/ | grep -v python || true')['stdout'].split()
+    return duthost.shell('ls /var/core/')['stdout'].split()
+
+
+def __collect_pre_check_data(duthost):
+    logger.info("Collecting core dumps before test on {}".format(duthost.hostname))
+    pre_core_dumps = __collect_core_dumps(duthost)
+
+    logger.info("Collecting running golden config digests before test on {}".format(duthost.hostname))
+    golden_digests = collect_golden_config_digests(duthost, get_config_namespaces(duthost))
+    return {"pre_core_dumps": pre_core_dumps, "golden_digests": golden_digests}
+
+
+def __collect_post_check_data(duthost, golden_digests):
+    logger.info("Collecting core dumps after test on {}".format(duthost.hostname))
+    cur_core_dumps = __collect_core_dumps(duthost)
+
+    logger.info("Collecting running config changes after test on {}".format(duthost.hostname))
+    pre_running_config, cur_running_config = collect_config_changes(duthost, golden_digests)
+    return {
+        "cur_core_dumps": cur_core_dumps,
+        "pre_running_config": pre_running_config,
+        "cur_running_config": cur_running_config
+    }
+
+
 @pytest.fixture(scope="module", autouse=True)
 def core_dump_and_config_check(duthosts, tbinfo, request):
     '''
     Check if there are new core dump files and if the running config is modified after the test case running.
     If so, we will reload the running config after test case running.
+
+    The DUTs are checked concurrently. Only the tables of the running config whose digest computed on the DUT is
+    different from the running golden config are fetched and compared.
     '''
     check_flag = True
     if hasattr(request.config.option, 'enable_macsec') and request.config.option.enable_macsec:
@@ -1886,69 +1928,38 @@ def core_dump_and_config_check(duthosts, tbinfo, request):
     check_result = {}
 
     if check_flag:
-        for duthost in duthosts:
-            logger.info("Collecting core dumps before test on {}".format(duthost.hostname))
-            duts_data[duthost.hostname] = {}
-
-            if "20191130" in duthost.os_version:
-                pre_existing_core_dumps = duthost.shell('ls /var/core/ | grep -v python || true')['stdout'].split()
-            else:
-                pre_existing_core_dumps = duthost.shell('ls /var/core/')['stdout'].split()
-            duts_data[duthost.hostname]["pre_core_dumps"] = pre_existing_core_dumps
-
-            logger.info("Collecting running config before test on {}".format(duthost.hostname))
-            duts_data[duthost.hostname]["pre_running_config"] = {}
-            if not duthost.stat(path="/etc/sonic/running_golden_config.json")['stat']['exists']:
-                logger.info("Collecting running golden config before test on {}".format(duthost.hostname))
-                duthost.shell("sonic-cfggen -d --print-data > /etc/sonic/running_golden_config.json")
-            duts_data[duthost.hostname]["pre_running_config"][None] = \
-                json.loads(duthost.shell("cat /etc/sonic/running_golden_config.json", verbose=False)['stdout'])
-
-            if duthost.is_multi_asic:
-                for asic_index in range(0, duthost.facts.get('num_asic')):
-                    asic_ns = "asic{}".format(asic_index)
-                    if not duthost.stat(
-                            path="/etc/sonic/running_golden_config{}.json".format(asic_index))['stat']['exists']:
-                        duthost.shell("sonic-cfggen -n {} -d --print-data > /etc/sonic/running_golden_config{}.json".
-                                      format(asic_ns, asic_index))
-                    duts_data[duthost.hostname]['pre_running_config'][asic_ns] = \
-                        json.loads(duthost.shell("cat /etc/sonic/running_golden_config{}.json".format(asic_index),
-                                                 verbose=False)['stdout'])
+        outputs = parallel_run_threaded(
+            [functools.partial(__collect_pre_check_data, duthost) for duthost in duthosts],
+            timeout=300,
+            thread_count=len(duthosts)
+        )
+        for duthost, output in zip(duthosts, outputs):
+            duts_data[duthost.hostname] = output
 
     yield
 
     if check_flag:
+        outputs = parallel_run_threaded(
+            [functools.partial(__collect_post_check_data, duthost, duts_data[duthost.hostname]["golden_digests"])
+             for duthost in duthosts],
+            timeout=300,
+            thread_count=len(duthosts)
+        )
+        for duthost, output in zip(duthosts, outputs):
+            duts_data[duthost.hostname].update(output)
+
         for duthost in duthosts:
             inconsistent_config[duthost.hostname] = {}
             pre_only_config[duthost.hostname] = {}
             cur_only_config[duthost.hostname] = {}
             new_core_dumps[duthost.hostname] = []
 
-            logger.info("Collecting core dumps after test on {}".format(duthost.hostname))
-            if "20191130" in duthost.os_version:
-                cur_cores = duthost.shell('ls /var/core/ | grep -v python || true')['stdout'].split()
-            else:
-                cur_cores = duthost.shell('ls /var/core/')['stdout'].split()
-            duts_data[duthost.hostname]["cur_core_dumps"] = cur_cores
-
             new_core_dumps[duthost.hostname] = list(
                 set(duts_data[duthost.hostname]["cur_core_dumps"]) - set(duts_data[duthost.hostname]["pre_core_dumps"]))
 
             if new_core_dumps[duthost.hostname]:
                 core_dump_check_pass = False
 
-            logger.info("Collecting running config after test on {}".format(duthost.hostname))
-            # get running config after running
-            duts_data[duthost.hostname]["cur_running_config"] = {}
-            duts_data[duthost.hostname]["cur_running_config"][None] = \
-                json.loads(duthost.shell("sonic-cfggen -d --print-data", verbose=False)['stdout'])
-            if duthost.is_multi_asic:
-                for asic_index in range(0, duthost.facts.get('num_asic')):
-                    asic_ns = "asic{}".format(asic_index)
-                    duts_data[duthost.hostname]["cur_running_config"][asic_ns] = \
-                        json.loads(duthost.shell("sonic-cfggen -n {} -d --print-data".format(asic_ns),
-                                                 verbose=False)['stdout'])
-
             # The tables that we don't care
             EXCLUDE_CONFIG_TABLE_NAMES = set([])
             # The keys that we don't care
@@ -2060,7 +2071,7 @@ def core_dump_and_config_check(duthosts, tbinfo, request):
             }
             logger.warning("Core dump or config check failed for {}, results: {}"
                            .format(module_name, json.dumps(check_result)))
-            results = parallel_run(__dut_reload, (), {"duts_data": duts_data}, duthosts, timeout=300)
+            results = parallel_run(__dut_reload, (), {}, duthosts, timeout=300)
             logger.debug('Results of dut reload: {}'.format(json.dumps(dict(results))))
         else:
             logger.info("Core dump and config check passed for {}".format(module_name))
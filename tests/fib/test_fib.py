@@ -110,7 +110,8 @@ def test_basic_fib(duthosts, ptfhost, ipv4, ipv6, mtu,
             "test_balancing": test_balancing,
             "ignore_ttl": ignore_ttl,
             "single_fib_for_duts": single_fib_for_duts,
-            "switch_type": switch_type
+            "switch_type": switch_type,
+            "burst_mode": True
         },
         log_file=log_file,
         qlen=PTF_QLEN,
@@ -312,7 +313,8 @@ def test_hash(add_default_route_to_dut, duthosts, fib_info_files_per_function, s
                 "vlan_ids": VLANIDS,
                 "ignore_ttl": ignore_ttl,
                 "single_fib_for_duts": single_fib_for_duts,
-                "switch_type": switch_type
+                "switch_type": switch_type,
+                "burst_mode": True
                 },
         log_file=log_file,
         qlen=PTF_QLEN,
@@ -0,0 +1,100 @@
+"""
+Benchmark of the persistent SSH exec path of SonicHost
+
+Runs the same command 500 times on a DUT through an Ansible shell module
+invocation, which is what shell() does, through exec_cmd() over the pool of
+persistent SSH connections, and through exec_cmds() pipelining several
+commands in one round trip. Reports the calls per second of each path and
+checks that all paths return the same rc and output.
+
+Usage:
+    python -m tests.ssh.ssh_exec_benchmark -i ansible/veos_vtb -d vlab-01 --calls 500
+"""
+
+from __future__ import print_function
+
+import argparse
+import re
+import subprocess
+import time
+
+from ansible.inventory.manager import InventoryManager
+from ansible.parsing.dataloader import DataLoader
+from ansible.vars.manager import VariableManager
+
+from tests.common.devices.ssh_session_pool import SshSessionPool, exec_commands
+
+DEFAULT_CMD = "redis-cli -n 4 hget 'DEVICE_METADATA|localhost' hostname"
+
+
+def get_host_vars(inventory, hostname):
+    loader = DataLoader()
+    inv_mgr = InventoryManager(loader=loader, sources=inventory)
+    var_mgr = VariableManager(loader=loader, inventory=inv_mgr)
+    return var_mgr.get_vars(host=inv_mgr.get_host(hostname))
+
+
+def run_calls(func, count):
+    """Call func count times, return the results and the calls per second"""
+    results = []
+    start = time.time()
+    for _ in range(count):
+        results.append(func())
+    return results, count / (time.time() - start)
+
+
+def ansible_shell(inventory, hostname, cmd):
+    """Run cmd with the same module invocation as shell() of SonicHost, return the rc and stdout"""
+    out = subprocess.Popen(["ansible", hostname, "-i", inventory, "-b", "-m", "shell", "-a", cmd, "-o"],
+                           stdout=subprocess.PIPE).communicate()[0]
+    match = re.search(r"rc=(\d+) \| \(stdout\) ?(.*)$", out.decode("utf-8", "replace").strip(), re.MULTILINE)
+    if not match:
+        return None, out
+    return int(match.group(1)), match.group(2).replace("\\n", "\n")
+
+
+def exec_cmds(pool, cmds, become_pass):
+    """Run cmds with exec_cmds() of SonicHost, return the rc and stdout of each of them"""
+    return [(res["rc"], res["stdout"]) for res in exec_commands(pool, cmds, become_pass=become_pass)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='persistent SSH exec benchmark')
+    parser.add_argument('-i', '--inventory', required=True, help='ansible inventory file')
+    parser.add_argument('-d', '--dut', required=True, help='DUT hostname in the inventory')
+    parser.add_argument('--cmd', default=DEFAULT_CMD, help='command to run on the DUT')
+    parser.add_argument('--calls', type=int, default=500, help='number of calls of each path')
+    parser.add_argument('--pipeline', type=int, default=50, help='number of commands of each exec_cmds() call')
+    args = parser.parse_args()
+
+    hostvars = get_host_vars(args.inventory, args.dut)
+    user = hostvars.get("ansible_ssh_user") or hostvars.get("ansible_user") or hostvars.get("sonicadmin_user")
+    password = hostvars.get("ansible_ssh_pass") or hostvars.get("ansible_password") \
+        or hostvars.get("sonicadmin_password")
+    become_pass = hostvars.get("ansible_become_pass") or password
+    pool = SshSessionPool.get(hostvars["ansible_host"], user, password)
+
+    shell_results, shell_rate = run_calls(
+        lambda: ansible_shell(args.inventory, args.dut, args.cmd), args.calls)
+    exec_results, exec_rate = run_calls(
+        lambda: exec_cmds(pool, [args.cmd], become_pass)[0], args.calls)
+    pipelined_results, pipelined_rate = run_calls(
+        lambda: exec_cmds(pool, [args.cmd] * args.pipeline, become_pass), args.calls // args.pipeline)
+    SshSessionPool.close_all()
+
+    print("{} calls of '{}'".format(args.calls, args.cmd))
+    print("shell()                    {:8.1f} calls/sec".format(shell_rate))
+    print("exec_cmd()                 {:8.1f} calls/sec  speedup {:.1f}x".format(exec_rate, exec_rate / shell_rate))
+    print("exec_cmds() of {:3d} commands {:7.1f} commands/sec  speedup {:.1f}x".format(
+        args.pipeline, pipelined_rate * args.pipeline, pipelined_rate * args.pipeline / shell_rate))
+
+    results = set(shell_results + exec_results + [res for results in pipelined_results for res in results])
+    if len(results) != 1:
+        print('Results of the paths are different: {}'.format(list(results)))
+        return 1
+    print('Results of the paths are identical')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
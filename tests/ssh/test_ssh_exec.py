@@ -0,0 +1,69 @@
+import logging
+import time
+
+import pytest
+
+from tests.common.helpers.assertions import pytest_assert
+from tests.common.helpers.parallel import parallel_run, BACKEND_PROCESS
+
+pytestmark = [
+    pytest.mark.disable_loganalyzer,
+    pytest.mark.topology("any"),
+    pytest.mark.device_type("vs"),
+]
+
+logger = logging.getLogger(__name__)
+
+CALLS = 20
+PIPELINE_SIZE = 10
+TEST_CMD = "redis-cli -n 4 hget 'DEVICE_METADATA|localhost' hostname"
+
+
+def run_calls(func, count):
+    """Call func count times, return the results and the calls per second"""
+    results = []
+    start = time.time()
+    for _ in range(count):
+        results.append(func())
+    return results, count / (time.time() - start)
+
+
+def test_ssh_exec(duthosts, rand_one_dut_hostname):
+    """Check that exec_cmd() and pipelined exec_cmds() on persistent SSH return the same results as shell()"""
+    duthost = duthosts[rand_one_dut_hostname]
+
+    shell_results, shell_rate = run_calls(lambda: duthost.shell(TEST_CMD, verbose=False), CALLS)
+    exec_results, exec_rate = run_calls(lambda: duthost.exec_cmd(TEST_CMD, verbose=False), CALLS)
+    pipelined_results, pipelined_rate = run_calls(
+        lambda: duthost.exec_cmds([TEST_CMD] * PIPELINE_SIZE, verbose=False), CALLS // PIPELINE_SIZE)
+
+    # The rates depend on the load of the testbed, they are only logged
+    logger.info("{} calls of '{}': shell() {:.1f} calls/sec, exec_cmd() {:.1f} calls/sec, "
+                "exec_cmds() of {} commands {:.1f} commands/sec".format(
+                    CALLS, TEST_CMD, shell_rate, exec_rate, PIPELINE_SIZE, pipelined_rate * PIPELINE_SIZE))
+
+    expected = shell_results[0]
+    for res in shell_results + exec_results + [res for results in pipelined_results for res in results]:
+        for key in ["stdout", "stdout_lines", "rc"]:
+            pytest_assert(res[key] == expected[key],
+                          "exec result {} '{}' differs from shell result '{}'".format(key, res[key], expected[key]))
+
+    failed = duthost.exec_cmd("exit 3", module_ignore_errors=True)
+    pytest_assert(failed["rc"] == 3 and failed["failed"], "exec_cmd() result of failed command: {}".format(failed))
+
+
+def test_ssh_exec_after_fork(duthosts, rand_one_dut_hostname):
+    """Check that exec_cmd() works in a forked process, e.g. of parallel_run, while the parent has open connections"""
+    duthost = duthosts[rand_one_dut_hostname]
+    expected = duthost.exec_cmd(TEST_CMD, verbose=False)
+
+    def exec_in_child(node=None, results=None):
+        results[node.hostname] = node.exec_cmd(TEST_CMD, verbose=False)["stdout"]
+
+    results = parallel_run(exec_in_child, (), {}, [duthost], timeout=60, backend=BACKEND_PROCESS)
+    pytest_assert(results.get(duthost.hostname) == expected["stdout"],
+                  "exec_cmd() result in child process: {}".format(results))
+
+    # The connections of the parent are not disturbed by the child
+    res = duthost.exec_cmd(TEST_CMD, verbose=False)
+    pytest_assert(res["stdout"] == expected["stdout"], "exec_cmd() result after fork: {}".format(res))